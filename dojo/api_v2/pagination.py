@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+import coreapi
+import coreschema
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class IdCursorPagination(CursorPagination):
+    # the id is unique, so the cursor is a plain keyset on the id without offsets in the cursor
+    ordering = "id"
+    page_size_query_param = "limit"
+
+
+class KeysetLimitOffsetPagination(LimitOffsetPagination):
+    """Limit/offset pagination with two opt-ins for large collections:
+
+    - ``cursor``: keyset pagination on the id, the pages are read with ``id > last id`` instead of an offset.
+      Start with an empty ``cursor`` parameter and follow the ``next`` links.
+    - ``count=false``: skip the total count of the collection, ``count`` is null in the response.
+    """
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    cursor_query_description = "Use keyset pagination on the id, start with an empty value and follow the next links. " \
+                               "The ordering and the offset are ignored and the total count is skipped."
+    count_query_description = "Set to false to skip the total count of the results."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_pagination = None
+        self.skip_count = False
+
+        if self.cursor_query_param in request.query_params:
+            self.cursor_pagination = IdCursorPagination()
+            self.template = self.cursor_pagination.template
+            self.display_page_controls = True
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+
+        if request.query_params.get(self.count_query_param, "").lower() not in ["false", "0"]:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.skip_count = True
+        # without a count there are no page numbers, only the previous and next pages
+        self.template = CursorPagination.template
+        self.display_page_controls = True
+        self.count = None
+        self.offset = self.get_offset(request)
+        self.request = request
+        # one more result tells if there is a next page without counting
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        return results[:self.limit]
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("count", self.count if self.cursor_pagination is None else None),
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
+
+    def get_next_link(self):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_next_link()
+        if not self.skip_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_previous_link(self):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_previous_link()
+        return super().get_previous_link()
+
+    def get_html_context(self):
+        if self.cursor_pagination is not None or self.skip_count:
+            return {"previous_url": self.get_previous_link(), "next_url": self.get_next_link()}
+        return super().get_html_context()
+
+    def get_schema_fields(self, view):
+        return super().get_schema_fields(view) + [
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location="query",
+                schema=coreschema.String(title="Cursor", description=self.cursor_query_description),
+            ),
+            coreapi.Field(
+                name=self.count_query_param,
+                required=False,
+                location="query",
+                schema=coreschema.Boolean(title="Count", description=self.count_query_description),
+            ),
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.cursor_query_description,
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.count_query_description,
+                "schema": {"type": "boolean"},
+            },
+        ]
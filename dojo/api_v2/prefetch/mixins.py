@@ -19,7 +19,8 @@ class PrefetchListMixin(ListModelMixin):
 
         for entry in queryset:
             results.append(serializer.to_representation(entry))
-            prefetcher._prefetch(entry, prefetch_params)
+        # The related instances are fetched for the whole page at once
+        prefetcher._prefetch_all(queryset, prefetch_params)
 
         # Done in the original list method so we do it as well
         response = self.get_paginated_response(results)
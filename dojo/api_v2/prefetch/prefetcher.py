@@ -1,7 +1,8 @@
+from django.db.models import prefetch_related_objects
 from rest_framework.serializers import ModelSerializer
 from . import utils
+import importlib
 import inspect
-import sys
 
 # Reduce the scope of search for serializers.
 SERIALIZER_DEFS_MODULE = "dojo.api_v2.serializers"
@@ -24,7 +25,7 @@ class _Prefetcher:
         # We process all the serializers found in the module SERIALIZER_DEFS_MODULE. We restrict the scope to avoid
         # processing all the classes in the symbol table
         available_serializers = inspect.getmembers(
-            sys.modules[SERIALIZER_DEFS_MODULE], _is_model_serializer
+            importlib.import_module(SERIALIZER_DEFS_MODULE), _is_model_serializer
         )
 
         for _, serializer in available_serializers:
@@ -36,7 +37,7 @@ class _Prefetcher:
         return serializers
 
     def __init__(self):
-        self._serializers = _Prefetcher._build_serializers()
+        self._serializers = _SERIALIZERS
         self._prefetch_data = dict()
 
     def _find_serializer(self, field_type):
@@ -66,38 +67,110 @@ class _Prefetcher:
             entry (ModelInstance): Instance of a model as returned by a django queryset
             field_to_fetch (list[string]): fields to prefetch
         """
+        self._prefetch_all([entry], fields_to_fetch)
+
+    def _prefetch_all(self, entries, fields_to_fetch):
+        """Apply prefetching for the given fields on all the given entries. The related instances of a field are
+        fetched for all the entries at once and serialized in one batch.
+
+        Args:
+            entries (list[ModelInstance]): Instances of a model as returned by a django queryset
+            field_to_fetch (list[string]): fields to prefetch
+        """
+        entries = [entry for entry in entries if entry is not None]
+        if not entries:
+            return
+
         for field_to_fetch in fields_to_fetch:
-            # Get the field from the instance
-            field_value = getattr(entry, field_to_fetch, None)
-            if field_value is None:
+            # Get the concrete field type
+            field_meta = getattr(type(entries[0]), field_to_fetch, None)
+            if utils._is_one_to_one_relation(field_meta):
+                model_type = field_meta.field.related_model
+                field_values = self._get_foreign_key_values(entries, field_meta)
+                # Entries without a related instance are skipped
+                if not field_values:
+                    continue
+            elif utils._is_many_to_many_relation(field_meta):
+                # ManyToMany relationship can be reverse
+                model_type = field_meta.field.model if field_meta.reverse else field_meta.field.related_model
+                field_values = self._get_many_to_many_values(entries, field_to_fetch, field_meta)
+            else:
+                # Any other attribute is fetched and serialized entry by entry
+                for entry in entries:
+                    field_value = getattr(entry, field_to_fetch, None)
+                    if field_value is not None:
+                        model_type = getattr(field_value, "model", type(field_value))
+                        self._prefetch_values(field_to_fetch, model_type, field_value,
+                                              utils._is_many_to_many_relation(field_meta))
                 continue
 
-            # Get the model related to the field
-            model_type = getattr(field_value, "model", type(field_value))
-            extra_serializer = self._find_serializer(model_type)
-            if extra_serializer is None:
-                continue
+            self._prefetch_values(field_to_fetch, model_type, field_values, True)
 
-            # Get the concrete field type
-            field_meta = getattr(type(entry), field_to_fetch, None)
-            # Check if the field represents a many-to-many relationship as we need to instantiate
-            # the serializer accordingly
-            many = utils._is_many_to_many_relation(field_meta)
-            field_data = extra_serializer(many=many).to_representation(
-                field_value
-            )
-            # For convenience in processing we store the field data in a list
-            field_data_list = (
-                field_data if isinstance(field_data, list) else [field_data]
-            )
-
-            if field_to_fetch not in self._prefetch_data:
-                self._prefetch_data[field_to_fetch] = dict()
-
-            # Should not fail as django always generate an id field
-            for data in field_data_list:
-                self._prefetch_data[field_to_fetch][data["id"]] = data
+    @staticmethod
+    def _get_foreign_key_values(entries, field_meta):
+        """Fetch the instances referenced by a foreign key of the entries with one query"""
+        field = field_meta.field
+        ids = {getattr(entry, field.attname) for entry in entries} - {None}
+        if not ids:
+            return []
+        return list(field.related_model._base_manager.in_bulk(ids, field_name=field.target_field.name).values())
+
+    @staticmethod
+    def _get_many_to_many_values(entries, field_to_fetch, field_meta):
+        """Fetch the instances of a many-to-many relationship of the entries with at most one query"""
+        managers = [getattr(entry, field_to_fetch) for entry in entries]
+        # Use the instances of a prefetch_related of the queryset if all entries have them
+        if all(manager.prefetch_cache_name in getattr(entry, "_prefetched_objects_cache", {})
+               for entry, manager in zip(entries, managers)):
+            values = {}
+            for manager in managers:
+                for value in manager.all():
+                    values[value.pk] = value
+            return list(values.values())
+
+        field = field_meta.field
+        if field_meta.reverse:
+            model, lookup = field.model, field.name
+        else:
+            model, lookup = field.related_model, field.related_query_name()
+        return list(model._default_manager.filter(**{lookup + "__in": [entry.pk for entry in entries]}).distinct())
+
+    def _prefetch_values(self, field_to_fetch, model_type, field_value, many):
+        """Serialize and store the prefetched data of a field
+
+        Args:
+            field_to_fetch (string): the prefetched field
+            model_type (type): the model of the related instances
+            field_value: the related instance, or the related instances if many is true
+            many (bool): true if the field value holds several related instances
+        """
+        extra_serializer = self._find_serializer(model_type)
+        if extra_serializer is None:
+            return
+
+        if isinstance(field_value, list):
+            # The relations of the serializer are fetched for all instances at once
+            prefetch_related_objects(field_value, *utils._get_serializer_prefetch_lookups(extra_serializer))
+
+        field_data = extra_serializer(many=many).to_representation(
+            field_value
+        )
+        # For convenience in processing we store the field data in a list
+        field_data_list = (
+            field_data if isinstance(field_data, list) else [field_data]
+        )
+
+        if field_to_fetch not in self._prefetch_data:
+            self._prefetch_data[field_to_fetch] = dict()
+
+        # Should not fail as django always generate an id field
+        for data in field_data_list:
+            self._prefetch_data[field_to_fetch][data["id"]] = data
 
     @property
     def prefetched_data(self):
         return self._prefetch_data
+
+
+# The serializers do not change at runtime, so the map is built once at import
+_SERIALIZERS = _Prefetcher._build_serializers()
@@ -1,4 +1,8 @@
+import functools
+
 from django.db.models.fields import related
+from rest_framework.serializers import BaseSerializer
+from tagulous.models.descriptors import TagDescriptor
 
 
 def _is_many_to_many_relation(field):
@@ -61,3 +65,26 @@ def _get_prefetchable_fields(serializer):
                 fields.append((field_name, field.field.related_model))
 
     return fields
+
+
+@functools.lru_cache(maxsize=None)
+def _get_serializer_prefetch_lookups(serializer):
+    """Get the relations read by the fields of the serializer that can be fetched with prefetch_related for a batch
+    of instances: many-to-many relationships, reverse foreign keys, tags and foreign keys with a nested serializer.
+
+    Args:
+        serializer (Serializer): The serializer class
+
+    Returns:
+        tuple[string]: the lookups for prefetch_related
+    """
+    model = serializer.Meta.model
+    lookups = []
+    for field in serializer().fields.values():
+        if field.write_only or field.source == "*" or "." in field.source:
+            continue
+        descriptor = getattr(model, field.source, None)
+        if isinstance(descriptor, (related.ReverseManyToOneDescriptor, TagDescriptor)) or \
+                (_is_one_to_one_relation(descriptor) and isinstance(field, BaseSerializer)):
+            lookups.append(field.source)
+    return tuple(lookups)
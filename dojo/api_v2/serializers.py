@@ -2824,6 +2824,82 @@ class FindingCloseSerializer(serializers.ModelSerializer):
         )
 
 
+class FindingBulkSerializer(serializers.Serializer):
+    findings = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.FINDING_BULK_API_MAX_IDS,
+        help_text="Ids of the findings to change",
+    )
+
+
+class FindingBulkUpdateSerializer(FindingBulkSerializer):
+    active = serializers.BooleanField(required=False)
+    verified = serializers.BooleanField(required=False)
+    false_p = serializers.BooleanField(required=False)
+    out_of_scope = serializers.BooleanField(required=False)
+    is_mitigated = serializers.BooleanField(required=False)
+    under_review = serializers.BooleanField(required=False)
+    push_to_jira = serializers.BooleanField(default=False)
+
+    status_fields = (
+        "active",
+        "verified",
+        "false_p",
+        "out_of_scope",
+        "is_mitigated",
+        "under_review",
+    )
+
+    def validate(self, data):
+        if not any(field in data for field in self.status_fields):
+            raise serializers.ValidationError(
+                "At least one of {} is required.".format(
+                    ", ".join(self.status_fields)
+                )
+            )
+        if data.get("false_p") and data.get("verified"):
+            raise serializers.ValidationError(
+                "False positive findings cannot be verified."
+            )
+        return data
+
+
+class FindingBulkCloseSerializer(FindingBulkSerializer):
+    mitigated = serializers.DateTimeField(required=False)
+    false_p = serializers.BooleanField(default=False)
+    out_of_scope = serializers.BooleanField(default=False)
+    duplicate = serializers.BooleanField(default=False)
+    note = serializers.CharField(required=False, allow_blank=False)
+    push_to_jira = serializers.BooleanField(default=False)
+
+
+class FindingBulkTagSerializer(FindingBulkSerializer):
+    add_tags = TagListSerializerField(required=False)
+    remove_tags = TagListSerializerField(required=False)
+
+    def validate(self, data):
+        if not data.get("add_tags") and not data.get("remove_tags"):
+            raise serializers.ValidationError(
+                "At least one of add_tags, remove_tags is required."
+            )
+        return data
+
+
+class FindingBulkResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=["updated", "not_found", "forbidden", "invalid"]
+    )
+    errors = serializers.ListField(
+        child=serializers.CharField(), required=False
+    )
+
+
+class FindingBulkResponseSerializer(serializers.Serializer):
+    results = FindingBulkResultSerializer(many=True)
+
+
 class ReportGenerateOptionSerializer(serializers.Serializer):
     include_finding_notes = serializers.BooleanField(default=False)
     include_finding_images = serializers.BooleanField(default=False)
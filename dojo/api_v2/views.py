@@ -3,6 +3,7 @@ from drf_spectacular.types import OpenApiTypes
 from crum import get_current_user
 from django.http import HttpResponse, Http404, FileResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth.models import Permission
 from django.core.exceptions import ValidationError
@@ -121,8 +122,10 @@ from dojo.api_v2 import (
     prefetch,
     schema,
     mixins as dojo_mixins,
+    pagination,
 )
 import dojo.jira_link.helper as jira_helper
+import dojo.finding.helper as finding_helper
 import logging
 import tagulous
 from dojo.product_type.queries import (
@@ -169,7 +172,9 @@ from drf_spectacular.utils import (
 )
 from drf_spectacular.views import SpectacularAPIView
 from drf_spectacular.renderers import OpenApiJsonRenderer2
+from dojo.authorization.authorization import user_has_permission
 from dojo.authorization.roles_permissions import Permissions
+from dojo.notifications.helper import create_notification
 from dojo.user.utils import get_configuration_permissions_codenames
 
 logger = logging.getLogger(__name__)
@@ -334,6 +339,7 @@ class EndPointViewSet(
     queryset = Endpoint.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiEndpointFilter
+    pagination_class = pagination.KeysetLimitOffsetPagination
     swagger_schema = prefetch.get_prefetch_schema(
         ["endpoints_list", "endpoints_read"], serializers.EndpointSerializer
     ).to_schema()
@@ -394,6 +400,7 @@ class EndpointStatusViewSet(
     serializer_class = serializers.EndpointStatusSerializer
     queryset = Endpoint_Status.objects.none()
     filter_backends = (DjangoFilterBackend,)
+    pagination_class = pagination.KeysetLimitOffsetPagination
     filterset_fields = [
         "mitigated",
         "false_positive",
@@ -427,6 +434,7 @@ class EngagementViewSet(
     queryset = Engagement.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiEngagementFilter
+    pagination_class = pagination.KeysetLimitOffsetPagination
     swagger_schema = (
         prefetch.get_prefetch_schema(
             ["engagements_list", "engagements_read"],
@@ -937,6 +945,7 @@ class FindingViewSet(
     queryset = Finding.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiFindingFilter
+    pagination_class = pagination.KeysetLimitOffsetPagination
     permission_classes = (
         IsAuthenticated,
         permissions.UserHasFindingPermission,
@@ -1068,6 +1077,216 @@ class FindingViewSet(
         serialized_finding = serializers.FindingCloseSerializer(finding)
         return Response(serialized_finding.data)
 
+    def _get_bulk_findings(self, finding_ids):
+        """
+        Returns the findings of finding_ids the user is allowed to edit and the result per id. The edit
+        permission is checked once per product instead of once per finding.
+        """
+        results = {
+            finding_id: {"id": finding_id, "status": "not_found"}
+            for finding_id in finding_ids
+        }
+        findings = (
+            get_authorized_findings(Permissions.Finding_View)
+            .filter(id__in=finding_ids)
+            .select_related("test__engagement__product", "test__test_type")
+            .distinct()
+            .order_by("id")
+        )
+        product_permissions = {}
+        editable_findings = []
+        for finding in findings:
+            product = finding.test.engagement.product
+            if product.id not in product_permissions:
+                product_permissions[product.id] = user_has_permission(
+                    self.request.user, product, Permissions.Finding_Edit
+                )
+            if product_permissions[product.id]:
+                results[finding.id]["status"] = "updated"
+                editable_findings.append(finding)
+            else:
+                results[finding.id]["status"] = "forbidden"
+        return editable_findings, results
+
+    def _push_bulk_findings_to_jira(self, findings, push_to_jira):
+        # as in perform_update, findings are pushed when requested or when their JIRA project pushes all issues
+        jira_projects = {}
+        finding_ids = []
+        for finding in findings:
+            engagement = finding.test.engagement
+            if engagement.id not in jira_projects:
+                jira_projects[engagement.id] = jira_helper.get_jira_project(
+                    engagement
+                )
+            jira_project = jira_projects[engagement.id]
+            if jira_project and (push_to_jira or jira_project.push_all_issues):
+                finding_ids.append(finding.id)
+        if finding_ids:
+            jira_helper.push_findings_to_jira(finding_ids)
+
+    def _bulk_response(self, results):
+        serialized_results = serializers.FindingBulkResponseSerializer(
+            {"results": list(results.values())}
+        )
+        return Response(serialized_results.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request=serializers.FindingBulkUpdateSerializer,
+        responses={status.HTTP_200_OK: serializers.FindingBulkResponseSerializer},
+    )
+    @swagger_auto_schema(
+        request_body=serializers.FindingBulkUpdateSerializer,
+        responses={status.HTTP_200_OK: serializers.FindingBulkResponseSerializer},
+    )
+    @action(detail=False, methods=["patch"])
+    def bulk_update(self, request):
+        """Update the status of many findings at once"""
+        bulk_update = serializers.FindingBulkUpdateSerializer(data=request.data)
+        if not bulk_update.is_valid():
+            return Response(
+                bulk_update.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = bulk_update.validated_data
+        finding_status = {
+            field: data[field]
+            for field in serializers.FindingBulkUpdateSerializer.status_fields
+            if field in data
+        }
+        findings, results = self._get_bulk_findings(data["findings"])
+
+        valid_findings = []
+        for finding in findings:
+            # the checks of FindingSerializer.validate for a PATCH of these fields
+            is_active = finding_status.get("active", finding.active)
+            is_verified = finding_status.get("verified", finding.verified)
+            is_false_p = finding_status.get("false_p", finding.false_p)
+            errors = []
+            if (is_active or is_verified) and finding.duplicate:
+                errors.append("Duplicate findings cannot be verified or active")
+            if is_false_p and is_verified:
+                errors.append("False positive findings cannot be verified.")
+            if is_active and finding.risk_accepted:
+                errors.append("Active findings cannot be risk accepted.")
+            if errors:
+                results[finding.id].update(status="invalid", errors=errors)
+            else:
+                valid_findings.append(finding)
+
+        if valid_findings:
+            finding_status["last_reviewed"] = timezone.now()
+            finding_status["last_reviewed_by"] = request.user
+            finding_helper.save_findings_status_batch(
+                valid_findings,
+                finding_status,
+                finding_helper.BULK_UPDATE_FINDINGS_UPDATE_FIELDS,
+            )
+            finding_helper.post_process_findings_status_batch(valid_findings)
+            self._push_bulk_findings_to_jira(
+                valid_findings, data["push_to_jira"]
+            )
+
+        return self._bulk_response(results)
+
+    @extend_schema(
+        request=serializers.FindingBulkCloseSerializer,
+        responses={status.HTTP_200_OK: serializers.FindingBulkResponseSerializer},
+    )
+    @swagger_auto_schema(
+        request_body=serializers.FindingBulkCloseSerializer,
+        responses={status.HTTP_200_OK: serializers.FindingBulkResponseSerializer},
+    )
+    @action(detail=False, methods=["post"])
+    def bulk_close(self, request):
+        """Close many findings at once, optionally with a note on each of them"""
+        bulk_close = serializers.FindingBulkCloseSerializer(data=request.data)
+        if not bulk_close.is_valid():
+            return Response(
+                bulk_close.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = bulk_close.validated_data
+        findings, results = self._get_bulk_findings(data["findings"])
+
+        if findings:
+            if settings.EDITABLE_MITIGATED_DATA:
+                mitigated = data.get("mitigated") or timezone.now()
+            else:
+                mitigated = timezone.now()
+            finding_status = {
+                "active": False,
+                "is_mitigated": True,
+                "mitigated": mitigated,
+                "mitigated_by": request.user,
+                "false_p": data["false_p"],
+                "out_of_scope": data["out_of_scope"],
+                "duplicate": data["duplicate"],
+            }
+            finding_helper.save_findings_status_batch(
+                findings,
+                finding_status,
+                finding_helper.CLOSE_FINDINGS_UPDATE_FIELDS,
+            )
+            finding_helper.mitigate_endpoint_status_batch(
+                findings, request.user, mitigated
+            )
+            if data.get("note"):
+                finding_helper.add_note_to_findings_batch(
+                    findings, request.user, data["note"]
+                )
+            finding_helper.post_process_findings_status_batch(findings)
+            self._push_bulk_findings_to_jira(findings, data["push_to_jira"])
+
+            product_findings = {}
+            for finding in findings:
+                product_findings.setdefault(
+                    finding.test.engagement.product, []
+                ).append(finding)
+            for product, closed_findings in product_findings.items():
+                create_notification(
+                    event="other",
+                    title="Closing of %i findings" % len(closed_findings),
+                    description='%i findings of "%s" were closed by %s'
+                    % (len(closed_findings), product.name, request.user),
+                    product=product,
+                    url=request.build_absolute_uri(
+                        reverse("product_closed_findings", args=(product.id,))
+                    ),
+                )
+
+        return self._bulk_response(results)
+
+    @extend_schema(
+        request=serializers.FindingBulkTagSerializer,
+        responses={status.HTTP_200_OK: serializers.FindingBulkResponseSerializer},
+    )
+    @swagger_auto_schema(
+        request_body=serializers.FindingBulkTagSerializer,
+        responses={status.HTTP_200_OK: serializers.FindingBulkResponseSerializer},
+    )
+    @action(detail=False, methods=["post"])
+    def bulk_tags(self, request):
+        """Add and remove tags of many findings at once"""
+        bulk_tags = serializers.FindingBulkTagSerializer(data=request.data)
+        if not bulk_tags.is_valid():
+            return Response(
+                bulk_tags.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = bulk_tags.validated_data
+        findings, results = self._get_bulk_findings(data["findings"])
+
+        if findings:
+            finding_helper.update_findings_tags_batch(
+                findings,
+                add_tags=tagulous.utils.parse_tags(data.get("add_tags", "")),
+                remove_tags=tagulous.utils.parse_tags(
+                    data.get("remove_tags", "")
+                ),
+            )
+
+        return self._bulk_response(results)
+
     @extend_schema(
         methods=["GET"],
         responses={status.HTTP_200_OK: serializers.TagSerializer},
@@ -2470,6 +2689,7 @@ class TestsViewSet(
     queryset = Test.objects.none()
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ApiTestFilter
+    pagination_class = pagination.KeysetLimitOffsetPagination
     swagger_schema = prefetch.get_prefetch_schema(
         ["tests_list", "tests_read"], serializers.TestSerializer
     ).to_schema()
@@ -2743,6 +2963,7 @@ class TestImportViewSet(
     serializer_class = serializers.TestImportSerializer
     queryset = Test_Import.objects.none()
     filter_backends = (DjangoFilterBackend,)
+    pagination_class = pagination.KeysetLimitOffsetPagination
     filterset_fields = [
         "test",
         "findings_affected",
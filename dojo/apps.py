@@ -72,7 +72,11 @@ class DojoAppConfig(AppConfig):
         # Load any signals here that will be ready for runtime
         # Importing the signals file is good enough if using the reciever decorator
         import dojo.announcement.signals  # noqa
+        import dojo.authorization.signals  # noqa
+        import dojo.finding.signals  # noqa
+        import dojo.metrics.signals  # noqa
         import dojo.product.signals  # noqa
+        import dojo.reports.signals  # noqa
         import dojo.test.signals  # noqa
 
 
@@ -1,5 +1,9 @@
+import functools
+
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from dojo.request_cache import cache_for_request
+from dojo.request_cache import cache_calculate_key, cache_for_request
+from dojo.shared_cache import bump_version, get_version, is_shared_cache
 from dojo.authorization.roles_permissions import (
     Permissions,
     Roles,
@@ -256,6 +260,7 @@ def user_has_global_permission_or_403(user, permission):
         raise PermissionDenied()
 
 
+@functools.lru_cache(maxsize=None)
 def get_roles_for_permission(permission):
     if not Permissions.has_value(permission):
         raise PermissionDoesNotExistError(
@@ -309,11 +314,65 @@ class RoleDoesNotExistError(Exception):
         self.message = message
 
 
+AUTHORIZATION_CACHE_KEY = 'authorization_{}_{}'
+AUTHORIZATION_VERSION_CACHE_KEY = 'authorization_version'
+# a change of memberships missed by the version, e.g. made directly in the database, is seen after a few minutes
+AUTHORIZATION_CACHE_TIMEOUT = 60 * 5
+
+
+def bump_authorization_version():
+    """
+    Invalidates everything cached for the authorization of all users, after a change of memberships, groups or roles.
+    """
+    bump_version(AUTHORIZATION_VERSION_CACHE_KEY)
+
+
+def get_authorization_version():
+    return get_version(AUTHORIZATION_VERSION_CACHE_KEY)
+
+
+def get_authorization_key(name, *args):
+    return AUTHORIZATION_CACHE_KEY.format(name, cache_calculate_key(*args, get_authorization_version()))
+
+
+def get_cached_for_authorization(name, compute, *args):
+    """
+    Returns the result of compute for the authorization of a user, kept in the shared cache under name and args
+    until memberships, groups or roles change. Without a shared cache the result is computed on every call, the
+    changes of memberships made by other processes would not be seen. The callers keep the result for the request
+    with cache_for_request.
+    """
+    if not is_shared_cache():
+        return compute()
+    key = get_authorization_key(name, *args)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, AUTHORIZATION_CACHE_TIMEOUT)
+    return result
+
+
+def cache_for_authorization(fn):
+    """
+    Decorator that caches the result of a function of a user in the cache shared by all processes, so web requests
+    and celery tasks don't load the memberships of the user again until memberships, groups or roles change.
+    Within a request the result is also kept in the cache of the request, which is the only cache used when the
+    cache is not shared.
+    """
+    @cache_for_request
+    @functools.wraps(fn)
+    def wrapper(user):
+        if user.pk is None:
+            return fn(user)
+        return get_cached_for_authorization(fn.__name__, lambda: fn(user), user.pk)
+    return wrapper
+
+
 def get_product_member(user, product):
     return get_product_member_dict(user).get(product.id)
 
 
-@cache_for_request
+@cache_for_authorization
 def get_product_member_dict(user):
     pm_dict = {}
     for product_member in (
@@ -329,7 +388,7 @@ def get_product_type_member(user, product_type):
     return get_product_type_member_dict(user).get(product_type.id)
 
 
-@cache_for_request
+@cache_for_authorization
 def get_product_type_member_dict(user):
     ptm_dict = {}
     for product_type_member in (
@@ -345,7 +404,7 @@ def get_product_groups(user, product):
     return get_product_groups_dict(user).get(product.id, [])
 
 
-@cache_for_request
+@cache_for_authorization
 def get_product_groups_dict(user):
     pg_dict = {}
     for product_group in (
@@ -366,7 +425,7 @@ def get_product_type_groups(user, product_type):
     return get_product_type_groups_dict(user).get(product_type.id, [])
 
 
-@cache_for_request
+@cache_for_authorization
 def get_product_type_groups_dict(user):
     pgt_dict = {}
     for product_type_group in (
@@ -383,16 +442,16 @@ def get_product_type_groups_dict(user):
     return pgt_dict
 
 
-@cache_for_request
+@cache_for_authorization
 def get_groups(user):
-    return Dojo_Group.objects.select_related("global_role").filter(users=user)
+    return list(Dojo_Group.objects.select_related("global_role").filter(users=user))
 
 
 def get_group_member(user, group):
     return get_group_members_dict(user).get(group.id)
 
 
-@cache_for_request
+@cache_for_authorization
 def get_group_members_dict(user):
     gu_dict = {}
     for group_member in (
@@ -1,4 +1,5 @@
 from enum import IntEnum
+from functools import lru_cache
 
 
 class Roles(IntEnum):
@@ -278,6 +279,8 @@ class Permissions(IntEnum):
         }
 
 
+# the tables are constant, they are built once per process
+@lru_cache(maxsize=None)
 def get_roles_with_permissions():
     return {
         Roles.Reader: {
@@ -516,6 +519,7 @@ def get_roles_with_permissions():
     }
 
 
+@lru_cache(maxsize=None)
 def get_global_roles_with_permissions():
     """
     Extra permissions for global roles, on top of the permissions granted to the "normal" roles above.
@@ -0,0 +1,50 @@
+from django.db.models import signals
+from django.dispatch import receiver
+from fieldsignals import post_save_changed
+
+from dojo.authorization.authorization import bump_authorization_version
+from dojo.models import Dojo_Group, Dojo_Group_Member, Global_Role, Product, Product_Group, Product_Member, \
+    Product_Type_Group, Product_Type_Member, Role
+
+
+@receiver(signals.post_save, sender=Product_Member)
+@receiver(signals.post_delete, sender=Product_Member)
+@receiver(signals.post_save, sender=Product_Type_Member)
+@receiver(signals.post_delete, sender=Product_Type_Member)
+@receiver(signals.post_save, sender=Product_Group)
+@receiver(signals.post_delete, sender=Product_Group)
+@receiver(signals.post_save, sender=Product_Type_Group)
+@receiver(signals.post_delete, sender=Product_Type_Group)
+@receiver(signals.post_save, sender=Dojo_Group_Member)
+@receiver(signals.post_delete, sender=Dojo_Group_Member)
+@receiver(signals.post_save, sender=Dojo_Group)
+@receiver(signals.post_delete, sender=Dojo_Group)
+@receiver(signals.post_save, sender=Global_Role)
+@receiver(signals.post_delete, sender=Global_Role)
+@receiver(signals.post_save, sender=Role)
+@receiver(signals.post_delete, sender=Role)
+@receiver(signals.post_delete, sender=Product)
+def authorization_post_save_delete(sender, **kwargs):
+    bump_authorization_version()
+
+
+@receiver(signals.m2m_changed, sender=Dojo_Group.users.through)
+def authorization_group_users_changed(sender, action, **kwargs):
+    # users added to or removed from a group without saving the members one by one
+    if action in ["post_add", "post_remove", "post_clear"]:
+        bump_authorization_version()
+
+
+@receiver(signals.post_save, sender=Product)
+def authorization_product_post_save(sender, instance, created, **kwargs):
+    # members of the product type are authorized for the new product
+    if created:
+        bump_authorization_version()
+
+
+def authorization_product_type_changed(sender, instance, changed_fields=None, created=False, **kwargs):
+    if not created:
+        bump_authorization_version()
+
+
+post_save_changed.connect(authorization_product_type_changed, sender=Product, fields=['prod_type'])
@@ -0,0 +1,64 @@
+# Generated by Django 4.1.13 on 2026-10-18 20:18
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def rebuild_finding_counts(apps, schema_editor):
+    # the counts of dojo.metrics.rollup as of this migration, the rollup module changes with the models
+    Finding = apps.get_model('dojo', 'Finding')
+    Finding_Daily_Count = apps.get_model('dojo', 'Finding_Daily_Count')
+
+    counts = []
+    rows = Finding.objects.values('test__engagement__product', 'date', 'severity').annotate(
+        opened=Count('id', filter=Q(verified=True)),
+        active=Count('id', filter=Q(verified=True, false_p=False, duplicate=False, out_of_scope=False, mitigated__isnull=True)),
+        accepted=Count('id', filter=Q(risk_accepted=True)),
+    ).order_by()
+    for row in rows.iterator():
+        for status in ('opened', 'active', 'accepted'):
+            if row[status]:
+                counts.append(Finding_Daily_Count(product_id=row['test__engagement__product'], date=row['date'],
+                                                  severity=row['severity'], status=status, count=row[status]))
+
+    rows = Finding.objects.filter(mitigated__isnull=False).annotate(
+        closed_date=TruncDate('mitigated', tzinfo=timezone.get_default_timezone()),
+    ).values('test__engagement__product', 'closed_date', 'severity').annotate(closed=Count('id')).order_by()
+    for row in rows.iterator():
+        counts.append(Finding_Daily_Count(product_id=row['test__engagement__product'], date=row['closed_date'],
+                                          severity=row['severity'], status='closed', count=row['closed']))
+
+    Finding_Daily_Count.objects.bulk_create(counts, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dojo', '0194_alter_finding_component_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Finding_Daily_Count',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(editable=False)),
+                ('severity', models.CharField(editable=False, max_length=200)),
+                ('status', models.CharField(choices=[('opened', 'Opened'), ('active', 'Active'), ('closed', 'Closed'), ('accepted', 'Accepted')], editable=False, max_length=20)),
+                ('count', models.PositiveIntegerField(default=0, editable=False)),
+                ('product', models.ForeignKey(db_constraint=False, editable=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='dojo.product')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='finding_daily_count',
+            index=models.Index(fields=['status', 'date', 'product'], name='dojo_findin_status_fe28d0_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='finding_daily_count',
+            unique_together={('product', 'date', 'severity', 'status')},
+        ),
+        migrations.RunPython(rebuild_finding_counts, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,7 @@
 from crum import get_current_user
-from django.db.models import Exists, OuterRef, Q
-from dojo.models import Endpoint, Endpoint_Status, Product_Member, Product_Type_Member, \
-    Product_Group, Product_Type_Group
-from dojo.authorization.authorization import get_roles_for_permission, user_has_global_permission
+from dojo.models import Endpoint, Endpoint_Status
+from dojo.authorization.authorization import user_has_global_permission
+from dojo.product.queries import get_authorized_product_ids
 
 
 def get_authorized_endpoints(permission, queryset=None, user=None):
@@ -24,31 +23,7 @@ def get_authorized_endpoints(permission, queryset=None, user=None):
     if user_has_global_permission(user, permission):
         return endpoints
 
-    roles = get_roles_for_permission(permission)
-    authorized_product_type_roles = Product_Type_Member.objects.filter(
-        product_type=OuterRef('product__prod_type_id'),
-        user=user,
-        role__in=roles)
-    authorized_product_roles = Product_Member.objects.filter(
-        product=OuterRef('product_id'),
-        user=user,
-        role__in=roles)
-    authorized_product_type_groups = Product_Type_Group.objects.filter(
-        product_type=OuterRef('product__prod_type_id'),
-        group__users=user,
-        role__in=roles)
-    authorized_product_groups = Product_Group.objects.filter(
-        product=OuterRef('product_id'),
-        group__users=user,
-        role__in=roles)
-    endpoints = endpoints.annotate(
-        product__prod_type__member=Exists(authorized_product_type_roles),
-        product__member=Exists(authorized_product_roles),
-        product__prod_type__authorized_group=Exists(authorized_product_type_groups),
-        product__authorized_group=Exists(authorized_product_groups))
-    endpoints = endpoints.filter(
-        Q(product__prod_type__member=True) | Q(product__member=True) |
-        Q(product__prod_type__authorized_group=True) | Q(product__authorized_group=True))
+    endpoints = endpoints.filter(product_id__in=get_authorized_product_ids(permission, user=user))
 
     return endpoints
 
@@ -72,30 +47,6 @@ def get_authorized_endpoint_status(permission, queryset=None, user=None):
     if user_has_global_permission(user, permission):
         return endpoint_status
 
-    roles = get_roles_for_permission(permission)
-    authorized_product_type_roles = Product_Type_Member.objects.filter(
-        product_type=OuterRef('endpoint__product__prod_type_id'),
-        user=user,
-        role__in=roles)
-    authorized_product_roles = Product_Member.objects.filter(
-        product=OuterRef('endpoint__product_id'),
-        user=user,
-        role__in=roles)
-    authorized_product_type_groups = Product_Type_Group.objects.filter(
-        product_type=OuterRef('endpoint__product__prod_type_id'),
-        group__users=user,
-        role__in=roles)
-    authorized_product_groups = Product_Group.objects.filter(
-        product=OuterRef('endpoint__product_id'),
-        group__users=user,
-        role__in=roles)
-    endpoint_status = endpoint_status.annotate(
-        endpoint__product__prod_type__member=Exists(authorized_product_type_roles),
-        endpoint__product__member=Exists(authorized_product_roles),
-        endpoint__product__prod_type__authorized_group=Exists(authorized_product_type_groups),
-        endpoint__product__authorized_group=Exists(authorized_product_groups))
-    endpoint_status = endpoint_status.filter(
-        Q(endpoint__product__prod_type__member=True) | Q(endpoint__product__member=True) |
-        Q(endpoint__product__prod_type__authorized_group=True) | Q(endpoint__product__authorized_group=True))
+    endpoint_status = endpoint_status.filter(endpoint__product_id__in=get_authorized_product_ids(permission, user=user))
 
     return endpoint_status
@@ -0,0 +1,155 @@
+import logging
+from itertools import groupby
+
+from django.conf import settings
+from django.db.models import Q, prefetch_related_objects
+from django.utils import timezone
+
+from dojo.metrics.rollup import mark_findings_dirty
+from dojo.models import Finding, System_Settings
+from dojo.utils import are_endpoints_duplicates, deduplicate_legacy, is_deduplication_on_engagement_mismatch, \
+    is_duplicate_reopen, set_duplicate, set_duplicate_reopen
+
+logger = logging.getLogger(__name__)
+deduplicationLogger = logging.getLogger("dojo.specific-loggers.deduplication")
+
+BULK_BATCH_SIZE = 1000
+
+
+def dedupe_batch(findings):
+    """
+    Set based counterpart of do_dedupe_finding for findings that have just been created, i.e. by an import.
+
+    For every test the candidate originals are fetched with a single query on the hash_codes and/or
+    unique_id_from_tool values of the new findings, and the duplicates are resolved in memory in the
+    order the findings were created. The result is the same as running do_dedupe_finding on every finding
+    in that order, but the number of queries does not depend on the number of findings.
+    The legacy algorithm still deduplicates finding by finding.
+    """
+    try:
+        enabled = System_Settings.objects.get(no_cache=True).enable_deduplication
+    except System_Settings.DoesNotExist:
+        logger.warning("system settings not found")
+        enabled = False
+
+    if not enabled:
+        deduplicationLogger.debug("dedupe: skipping batch dedupe because it's disabled in system settings get()")
+        return
+
+    # post processing only deduplicates findings that have a hash_code
+    findings = sorted([finding for finding in findings if finding.hash_code is not None], key=lambda finding: (finding.test_id, finding.id))
+    for test_id, test_findings in groupby(findings, key=lambda finding: finding.test_id):
+        test_findings = list(test_findings)
+        deduplicationAlgorithm = test_findings[0].test.deduplication_algorithm
+        deduplicationLogger.debug('batch dedupe for %i findings of test %i with algorithm %s', len(test_findings), test_id, deduplicationAlgorithm)
+        if deduplicationAlgorithm in [settings.DEDUPE_ALGO_HASH_CODE, settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL, settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE]:
+            dedupe_test_findings(test_findings, deduplicationAlgorithm)
+        else:
+            deduplicationLogger.debug("no configuration per parser found; using legacy algorithm")
+            for finding in test_findings:
+                deduplicate_legacy(finding, ignore_newer_in_test=True)
+
+
+def dedupe_test_findings(findings, deduplicationAlgorithm):
+    test = findings[0].test
+    engagement = test.engagement
+    use_hash_code = deduplicationAlgorithm in [settings.DEDUPE_ALGO_HASH_CODE, settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE]
+    use_unique_id = deduplicationAlgorithm in [settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL, settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE]
+    compare_endpoints = use_hash_code and len(settings.DEDUPE_ALGO_ENDPOINT_FIELDS) > 0
+
+    # one query for the candidates of all findings, with the same conditions as the deduplicate_* functions
+    candidates_query = Q()
+    if use_hash_code:
+        candidates_query |= Q(hash_code__in={finding.hash_code for finding in findings})
+    if use_unique_id:
+        unique_ids = {finding.unique_id_from_tool for finding in findings if finding.unique_id_from_tool is not None}
+        if deduplicationAlgorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL and engagement.deduplication_on_engagement:
+            candidates_query |= Q(unique_id_from_tool__in=unique_ids)
+        else:
+            # the unique_id_from_tool is unique for a given tool: do not compare with other tools
+            candidates_query |= Q(unique_id_from_tool__in=unique_ids, test__test_type=test.test_type)
+
+    if engagement.deduplication_on_engagement:
+        candidates = Finding.objects.filter(candidates_query, test__engagement=engagement)
+    else:
+        candidates = Finding.objects.filter(candidates_query, test__engagement__product=engagement.product)
+    candidates = candidates.exclude(duplicate=True).select_related('test__engagement').order_by('id')
+    if compare_endpoints:
+        candidates = candidates.prefetch_related('endpoints')
+        prefetch_related_objects(findings, 'endpoints')
+
+    # the new findings are part of the candidates: use the instances passed in so duplicates found along the way are seen
+    findings_by_id = {finding.id: finding for finding in findings}
+    candidates_by_hash_code = {}
+    candidates_by_unique_id = {}
+    for candidate in candidates:
+        candidate = findings_by_id.get(candidate.id, candidate)
+        if use_hash_code and candidate.hash_code is not None:
+            candidates_by_hash_code.setdefault(candidate.hash_code, []).append(candidate)
+        if use_unique_id and candidate.unique_id_from_tool is not None:
+            if deduplicationAlgorithm == settings.DEDUPE_ALGO_UNIQUE_ID_FROM_TOOL_OR_HASH_CODE and candidate.test.test_type_id != test.test_type_id:
+                continue
+            candidates_by_unique_id.setdefault(candidate.unique_id_from_tool, []).append(candidate)
+
+    # findings that are already the original of other findings need the transitive flattening of set_duplicate
+    findings_with_duplicates = set(Finding.objects.filter(duplicate_finding__test=test).values_list('duplicate_finding_id', flat=True))
+
+    duplicates = []
+    found_by = set()
+    for new_finding in findings:
+        existing_findings = []
+        if use_hash_code:
+            existing_findings += candidates_by_hash_code.get(new_finding.hash_code, [])
+        if use_unique_id and new_finding.unique_id_from_tool is not None:
+            existing_findings += candidates_by_unique_id.get(new_finding.unique_id_from_tool, [])
+        if use_hash_code and use_unique_id:
+            existing_findings = sorted(set(existing_findings), key=lambda finding: finding.id)
+
+        for find in existing_findings:
+            if find.id == new_finding.id or find.duplicate:
+                continue
+            # findings of the same test that were created later are not there yet in a sequential import
+            if find.test_id == new_finding.test_id and find.id > new_finding.id:
+                continue
+            if is_deduplication_on_engagement_mismatch(new_finding, find):
+                deduplicationLogger.debug(
+                    'deduplication_on_engagement_mismatch, skipping dedupe.')
+                continue
+
+            is_duplicate = not compare_endpoints or are_endpoints_duplicates(new_finding, find)
+            if is_duplicate:
+                if new_finding.id in findings_with_duplicates:
+                    set_duplicate(new_finding, find)
+                else:
+                    found_by.add((find.id, new_finding.test.test_type_id))
+                    duplicates.append(new_finding)
+                    set_duplicate_in_memory(new_finding, find)
+
+            # hash_code matches only count if the endpoints match as well, unique_id_from_tool matches always end the search
+            if is_duplicate or deduplicationAlgorithm != settings.DEDUPE_ALGO_HASH_CODE:
+                break
+
+    Finding.objects.bulk_update(duplicates, ['duplicate', 'duplicate_finding', 'active', 'verified', 'last_status_update'], batch_size=BULK_BATCH_SIZE)
+    mark_findings_dirty(duplicates)
+
+    found_by_model = Finding.found_by.through
+    found_by_model.objects.bulk_create(
+        [found_by_model(finding_id=finding_id, test_type_id=test_type_id) for finding_id, test_type_id in found_by],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True)
+
+    deduplicationLogger.debug('batch dedupe marked %i of %i findings as duplicate', len(duplicates), len(findings))
+
+
+def set_duplicate_in_memory(new_finding, existing_finding):
+    # same as set_duplicate for a finding that is not the original of other findings, except that the new finding is saved by the caller
+    deduplicationLogger.debug('Setting new finding ' + str(new_finding.id) + ' as a duplicate of existing finding ' + str(existing_finding.id))
+    if is_duplicate_reopen(new_finding, existing_finding):
+        set_duplicate_reopen(new_finding, existing_finding)
+    # the status change signal only fires if active or verified actually change
+    if new_finding.active or new_finding.verified:
+        new_finding.last_status_update = timezone.now()
+    new_finding.duplicate = True
+    new_finding.active = False
+    new_finding.verified = False
+    new_finding.duplicate_finding = existing_finding
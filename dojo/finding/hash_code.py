@@ -0,0 +1,157 @@
+import hashlib
+import logging
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import prefetch_related_objects
+from django.dispatch import receiver
+
+from dojo.models import Finding, Vulnerability_Id
+
+logger = logging.getLogger(__name__)
+deduplicationLogger = logging.getLogger("dojo.specific-loggers.deduplication")
+
+BULK_BATCH_SIZE = 1000
+
+# hash code computers by (test type name, scan type)
+_computers = {}
+
+
+class HashCodeComputer(object):
+    """
+    Computes the hash_code of the findings of one test type. The hash_code settings of the test type are resolved
+    and validated once, when the computer is created. Without valid hash_code_fields the legacy algorithm is used.
+
+    compute accepts the endpoints and vulnerability ids of a saved finding as prefetched strings, so a batch of
+    findings can be hashed without a query per finding.
+    """
+
+    def __init__(self, hash_code_fields=None, allows_null_cwe=True):
+        self.hash_code_fields = tuple(hash_code_fields) if hash_code_fields else None
+        self.allows_null_cwe = allows_null_cwe
+        self.fields_always = tuple(getattr(settings, 'HASH_CODE_FIELDS_ALWAYS', ()))
+        self.uses_endpoints = self.hash_code_fields is not None and 'endpoints' in self.hash_code_fields
+        self.uses_vulnerability_ids = self.hash_code_fields is not None and 'vulnerability_ids' in self.hash_code_fields
+        self.getters = tuple(self.get_getter(field) for field in self.hash_code_fields or ())
+
+    @classmethod
+    def for_test(cls, test):
+        # Check if all needed settings are defined
+        if not hasattr(settings, 'HASHCODE_FIELDS_PER_SCANNER') or not hasattr(settings, 'HASHCODE_ALLOWS_NULL_CWE') or not hasattr(settings, 'HASHCODE_ALLOWED_FIELDS'):
+            deduplicationLogger.debug("no or incomplete configuration per hash_code found; using legacy algorithm")
+            return cls()
+
+        hash_code_fields = test.hash_code_fields
+
+        # Check if hash_code fields are found in the settings
+        if not hash_code_fields:
+            deduplicationLogger.debug("No configuration for hash_code computation found for %s; using legacy algorithm", test.test_type.name)
+            return cls()
+
+        # Check if all elements of HASHCODE_FIELDS_PER_SCANNER are in HASHCODE_ALLOWED_FIELDS
+        if not (all(elem in settings.HASHCODE_ALLOWED_FIELDS for elem in hash_code_fields)):
+            deduplicationLogger.debug(
+                "compute_hash_code - configuration error: some elements of HASHCODE_FIELDS_PER_SCANNER are not in the allowed list HASHCODE_ALLOWED_FIELDS. "
+                "Using default fields")
+            return cls()
+
+        return cls(hash_code_fields, test.hash_code_allows_null_cwe)
+
+    @staticmethod
+    def get_getter(field):
+        if field == 'endpoints':
+            return lambda finding, endpoints, vulnerability_ids: finding.get_endpoints() if endpoints is None else endpoints
+        if field == 'vulnerability_ids':
+            return lambda finding, endpoints, vulnerability_ids: finding.get_vulnerability_ids() if vulnerability_ids is None else vulnerability_ids
+        # Generically use the finding attribute having the same name, converts to str in case it's integer
+        getter = attrgetter(field)
+        return lambda finding, endpoints, vulnerability_ids: str(getter(finding))
+
+    def compute(self, finding, endpoints=None, vulnerability_ids=None):
+        if self.hash_code_fields is None:
+            return self.compute_legacy(finding)
+
+        # Make sure that we have a cwe if we need one
+        if finding.cwe == 0 and not self.allows_null_cwe:
+            deduplicationLogger.warning(
+                "Cannot compute hash_code based on configured fields because cwe is 0 for finding of title '" + finding.title + "' found in file '" + str(finding.file_path) +
+                "'. Fallback to legacy mode for this finding.")
+            return self.compute_legacy(finding)
+
+        return self.hash(finding, ''.join([getter(finding, endpoints, vulnerability_ids) for getter in self.getters]))
+
+    def compute_legacy(self, finding):
+        return self.hash(finding, finding.title + str(finding.cwe) + str(finding.line) + str(finding.file_path) + finding.description)
+
+    def hash(self, finding, fields_to_hash):
+        for field in self.fields_always:
+            value = getattr(finding, field)
+            if value:
+                fields_to_hash += str(value)
+        return hashlib.sha256(fields_to_hash.casefold().encode('utf-8').strip()).hexdigest()
+
+
+def get_hash_code_computer(test):
+    key = (test.test_type.name, test.scan_type)
+    computer = _computers.get(key)
+    if computer is None:
+        computer = _computers[key] = HashCodeComputer.for_test(test)
+    return computer
+
+
+@receiver(setting_changed)
+def reset_hash_code_computers(setting, **kwargs):
+    if setting.startswith('HASHCODE_') or setting == 'HASH_CODE_FIELDS_ALWAYS':
+        _computers.clear()
+
+
+def compute_hash_codes(findings):
+    """
+    Sets the hash_code of a batch of saved findings, prefetching the endpoints and vulnerability ids needed
+    by their test types with one query each. Returns the findings for which the hash_code changed.
+    """
+    findings = list(findings)
+    prefetch_related_objects(findings, 'test__test_type')
+    computers = {finding.test_id: get_hash_code_computer(finding.test) for finding in findings}
+
+    endpoint_findings = [finding for finding in findings if computers[finding.test_id].uses_endpoints]
+    prefetch_related_objects(endpoint_findings, 'endpoints')
+
+    vulnerability_ids = {}
+    vulnerability_id_findings = [finding.id for finding in findings if computers[finding.test_id].uses_vulnerability_ids]
+    if vulnerability_id_findings:
+        for finding_id, vulnerability_id in Vulnerability_Id.objects.filter(finding__in=vulnerability_id_findings).values_list('finding_id', 'vulnerability_id'):
+            vulnerability_ids.setdefault(finding_id, []).append(vulnerability_id)
+
+    changed_findings = []
+    for finding in findings:
+        computer = computers[finding.test_id]
+        endpoints = ''.join(sorted([str(endpoint) for endpoint in finding.endpoints.all()])) if computer.uses_endpoints else None
+        finding_vulnerability_ids = ''.join(sorted(vulnerability_ids.get(finding.id, []))) if computer.uses_vulnerability_ids else None
+        hash_code = computer.compute(finding, endpoints=endpoints, vulnerability_ids=finding_vulnerability_ids)
+        if hash_code != finding.hash_code:
+            deduplicationLogger.debug('%d: hash_code changed from %s to %s', finding.id, finding.hash_code, hash_code)
+            finding.hash_code = hash_code
+            changed_findings.append(finding)
+    return changed_findings
+
+
+def recompute_hash_codes(findings, batch_size=BULK_BATCH_SIZE):
+    """
+    Recomputes and saves the hash_code of the findings of a queryset, batch by batch. Returns the number of
+    findings for which the hash_code changed.
+    """
+    changed = 0
+    last_id = 0
+    findings = findings.order_by('id')
+    while True:
+        batch = list(findings.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1].id
+        changed_findings = compute_hash_codes(batch)
+        Finding.objects.bulk_update(changed_findings, ['hash_code'], batch_size=batch_size)
+        changed += len(changed_findings)
+        logger.debug('hash_code computation: %i findings up to id %i processed, %i changed so far', len(batch), last_id, changed)
+    return changed
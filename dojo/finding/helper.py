@@ -1,3 +1,8 @@
+import copy
+import json
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import prefetch_related_objects
 from django.db.models.query_utils import Q
 from django.db.models.signals import post_delete, pre_delete
 from django.dispatch.dispatcher import receiver
@@ -7,12 +12,14 @@ import dojo.jira_link.helper as jira_helper
 import logging
 from time import strftime
 from django.utils import timezone
+from django.utils.encoding import smart_str
 from django.conf import settings
 from fieldsignals import pre_save_changed
-from dojo.utils import get_current_user, mass_model_updater, to_str_typed
+from dojo.utils import get_current_user, is_finding_groups_enabled, mass_model_updater, to_str_typed
 from dojo.models import Engagement, Finding, Finding_Group, System_Settings, Test, Endpoint, Endpoint_Status, \
-    Vulnerability_Id, Vulnerability_Id_Template
+    Notes, Vulnerability_Id, Vulnerability_Id_Template
 from dojo.endpoint.utils import save_endpoints_to_add
+from dojo.metrics.rollup import defer_finding_counts, get_product_id, mark_findings_dirty
 
 
 logger = logging.getLogger(__name__)
@@ -29,6 +36,13 @@ WAS_ACCEPTED_FINDINGS_QUERY = Q(risk_acceptance__isnull=False) & Q(risk_acceptan
 CLOSED_FINDINGS_QUERY = Q(is_mitigated=True)
 UNDER_REVIEW_QUERY = Q(under_review=True)
 
+BULK_BATCH_SIZE = 1000
+# the fields update_finding_status may change when closing a finding
+CLOSE_FINDINGS_UPDATE_FIELDS = ['active', 'verified', 'false_p', 'out_of_scope', 'is_mitigated', 'mitigated', 'mitigated_by',
+                                'duplicate', 'duplicate_finding', 'last_status_update']
+# the fields update_finding_status may change when updating the status of findings in bulk through the API
+BULK_UPDATE_FINDINGS_UPDATE_FIELDS = CLOSE_FINDINGS_UPDATE_FIELDS + ['under_review', 'last_reviewed', 'last_reviewed_by']
+
 
 # this signal is triggered just before a finding is getting saved
 # and one of the status related fields has changed
@@ -51,21 +65,23 @@ def pre_save_finding_status_change(sender, instance, changed_fields=None, **kwar
         update_finding_status(instance, user, changed_fields)
 
 
+FINDING_STATUS_FIELDS = [
+    "id",
+    "active",
+    "verified",
+    "false_p",
+    "is_mitigated",
+    "mitigated",
+    "mitigated_by",
+    "out_of_scope",
+    "risk_accepted",
+]
+
 # also get signal when id is set/changed so we can process new findings
 pre_save_changed.connect(
     pre_save_finding_status_change,
     sender=Finding,
-    fields=[
-        "id",
-        "active",
-        "verified",
-        "false_p",
-        "is_mitigated",
-        "mitigated",
-        "mitigated_by",
-        "out_of_scope",
-        "risk_accepted",
-    ],
+    fields=FINDING_STATUS_FIELDS,
 )
 
 
@@ -335,6 +351,7 @@ def add_findings_to_auto_group(name, findings, group_by, create_finding_groups_f
 @dojo_async_task
 @app.task
 @dojo_model_from_id
+@defer_finding_counts()
 def post_process_finding_save(finding, dedupe_option=True, rules_option=True, product_grading_option=True,
              issue_updater_option=True, push_to_jira=False, user=None, *args, **kwargs):
 
@@ -366,8 +383,8 @@ def post_process_finding_save(finding, dedupe_option=True, rules_option=True, pr
 
     if product_grading_option:
         if system_settings.enable_product_grade:
-            from dojo.utils import calculate_grade
-            calculate_grade(finding.test.engagement.product)
+            from dojo.utils import schedule_calculate_grade
+            schedule_calculate_grade(finding.test.engagement.product)
         else:
             deduplicationLogger.debug("skipping product grading because it's disabled in system settings")
 
@@ -385,6 +402,199 @@ def post_process_finding_save(finding, dedupe_option=True, rules_option=True, pr
             jira_helper.push_to_jira(finding.finding_group)
 
 
+@dojo_async_task
+@app.task
+def post_process_findings_batch(finding_ids, dedupe_option=True, rules_option=True, product_grading_option=True,
+             issue_updater_option=True, push_to_jira=False, user=None, *args, **kwargs):
+    """
+    post_process_finding_save for a batch of new findings of an import: the findings are deduplicated
+    with a constant number of queries and the product grade is only calculated once.
+    """
+    findings = list(Finding.objects.filter(id__in=finding_ids).select_related('test__engagement__product', 'test__test_type').order_by('id'))
+
+    if dedupe_option:
+        from dojo.finding.deduplication import dedupe_batch
+        dedupe_batch(findings)
+
+    # this batch is already running in the background or was meant to run in the foreground, so no task per finding
+    kwargs['sync'] = True
+    for finding in findings:
+        post_process_finding_save(finding, dedupe_option=False, rules_option=rules_option, product_grading_option=False,
+                                  issue_updater_option=issue_updater_option, push_to_jira=push_to_jira, user=user, *args, **kwargs)
+
+    if product_grading_option and findings:
+        if System_Settings.objects.get().enable_product_grade:
+            from dojo.utils import schedule_calculate_grade
+            schedule_calculate_grade(findings[0].test.engagement.product)
+        else:
+            deduplicationLogger.debug("skipping product grading because it's disabled in system settings")
+
+
+def close_findings_batch(findings, user, mitigated, note_entry, mitigated_by=None, tags=None, push_to_jira=False):
+    """
+    Set based counterpart of closing findings one by one with finding.save(dedupe_option=False), i.e. when an
+    import or reimport closes the findings that are no longer present in the scan report.
+
+    The status fields are set in memory by update_finding_status as the pre_save signal would do and saved with a
+    single bulk update. The notes, the mitigated endpoint statuses, the tags and the audit log entries are created
+    in bulk, the product grade is calculated once per product and the findings are pushed to JIRA by a single task.
+    Returns the list of closed findings.
+    """
+    findings = list(findings)
+    if not findings:
+        return findings
+
+    status = {'active': False, 'is_mitigated': True, 'mitigated': mitigated}
+    if mitigated_by:
+        status['mitigated_by'] = mitigated_by
+    save_findings_status_batch(findings, status, CLOSE_FINDINGS_UPDATE_FIELDS)
+
+    mitigate_endpoint_status_batch(findings, user)
+    add_note_to_findings_batch(findings, user, note_entry)
+    if tags:
+        update_findings_tags_batch(findings, add_tags=tags)
+
+    post_process_findings_status_batch(findings)
+
+    if push_to_jira:
+        # findings in a group are pushed as a group by the caller
+        finding_ids = [finding.id for finding in findings if not (is_finding_groups_enabled() and finding.finding_group)]
+        if finding_ids:
+            jira_helper.push_findings_to_jira(finding_ids)
+
+    return findings
+
+
+def save_findings_status_batch(findings, status, update_fields):
+    """
+    Sets the status fields in status on all findings and saves them with a single bulk update of update_fields.
+    The depending fields are set by update_finding_status as the pre_save signal would do for each finding, the
+    daily finding counts are marked dirty and the audit log entries are created in bulk.
+    Returns the copies of the findings before the update.
+    """
+    prefetch_related_objects(findings, 'test__engagement__product', 'test__test_type')
+
+    # same user as the one used by the pre_save signal
+    status_user = get_current_user() if get_current_user() and get_current_user().is_authenticated else None
+    status_attnames = {field: Finding._meta.get_field(field).attname for field in FINDING_STATUS_FIELDS}
+
+    old_findings = []
+    for finding in findings:
+        old_findings.append(copy.copy(finding))
+        for field, value in status.items():
+            setattr(finding, field, value)
+
+        changed_fields = {}
+        for field, attname in status_attnames.items():
+            old_value, new_value = getattr(old_findings[-1], attname), getattr(finding, attname)
+            if old_value != new_value:
+                changed_fields[field] = (old_value, new_value)
+        if changed_fields:
+            update_finding_status(finding, status_user, changed_fields)
+
+    Finding.objects.bulk_update(findings, update_fields, batch_size=BULK_BATCH_SIZE)
+    with defer_finding_counts():
+        mark_findings_dirty(old_findings)
+        mark_findings_dirty(findings)
+
+    if settings.ENABLE_AUDITLOG:
+        # bulk updates bypass the signals auditlog relies on, so the log entries are created here
+        from auditlog.diff import model_instance_diff
+        from auditlog.models import LogEntry
+        content_type = ContentType.objects.get_for_model(Finding)
+        log_entries = []
+        for old_finding, finding in zip(old_findings, findings):
+            changes = model_instance_diff(old_finding, finding, fields_to_check=update_fields)
+            if changes:
+                log_entries.append(LogEntry(
+                    content_type=content_type,
+                    object_pk=str(finding.pk),
+                    object_id=finding.pk,
+                    object_repr=smart_str(finding),
+                    action=LogEntry.Action.UPDATE,
+                    changes=json.dumps(changes),
+                    actor=status_user))
+        LogEntry.objects.bulk_create(log_entries, batch_size=BULK_BATCH_SIZE)
+
+    return old_findings
+
+
+def mitigate_endpoint_status_batch(findings, user, mitigated_time=None):
+    now = timezone.now()
+    Endpoint_Status.objects.filter(finding__in=findings, mitigated=False).update(
+        mitigated=True, mitigated_by=user, mitigated_time=mitigated_time or now, last_modified=now)
+
+
+def add_note_to_findings_batch(findings, user, note_entry):
+    """
+    Adds a note with note_entry to each finding, the notes and their relations to the findings are created in bulk.
+    """
+    notes = [Notes(entry=note_entry, author=user) for finding in findings]
+    if connection.features.can_return_rows_from_bulk_insert:
+        Notes.objects.bulk_create(notes, batch_size=BULK_BATCH_SIZE)
+    else:
+        # mysql doesn't return the ids of bulk created rows, which are needed for the relations to the findings
+        for note in notes:
+            note.save()
+    notes_model = Finding.notes.through
+    notes_model.objects.bulk_create(
+        [notes_model(finding_id=finding.id, notes_id=note.id) for finding, note in zip(findings, notes)],
+        batch_size=BULK_BATCH_SIZE)
+    return notes
+
+
+def update_findings_tags_batch(findings, add_tags=None, remove_tags=None):
+    """
+    Adds and removes tags on all findings with one insert / delete per tag instead of a save per finding.
+    Like the single finding updates, only the tags of the findings themselves are changed.
+    """
+    tags_model = Finding.tags.through
+    tag_model = Finding.tags.tag_model
+    finding_ids = [finding.id for finding in findings]
+    if tag_model.tag_options.force_lowercase:
+        add_tags = [tag.lower() for tag in add_tags or []]
+        remove_tags = [tag.lower() for tag in remove_tags or []]
+
+    for tag in add_tags or []:
+        tag, _ = tag_model.objects.get_or_create(name=tag)
+        tags_model.objects.bulk_create(
+            [tags_model(finding_id=finding_id, tagulous_finding_tags_id=tag.id) for finding_id in finding_ids],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True)
+        tag.update_count()
+
+    if remove_tags:
+        for tag in tag_model.objects.filter(name__in=remove_tags):
+            tags_model.objects.filter(finding_id__in=finding_ids, tagulous_finding_tags_id=tag.id).delete()
+            tag.update_count()
+
+    # the tags are changed without signals, the rendered reports of the findings are outdated
+    from dojo.reports.helper import bump_report_data_version
+    for product_id in {get_product_id(finding) for finding in findings}:
+        bump_report_data_version(product_id)
+
+
+def post_process_findings_status_batch(findings):
+    """
+    The side effects of post_process_finding_save(dedupe_option=False) for findings of which the status was
+    changed in bulk: the product grade is calculated once per product. Pushing to JIRA is left to the caller.
+    """
+    system_settings = System_Settings.objects.get()
+    if system_settings.false_positive_history and not system_settings.enable_deduplication:
+        from dojo.utils import do_false_positive_history
+        for finding in findings:
+            do_false_positive_history(finding)
+
+    from dojo.tools import tool_issue_updater
+    for finding in findings:
+        tool_issue_updater.async_tool_issue_update(finding)
+
+    if system_settings.enable_product_grade:
+        from dojo.utils import schedule_calculate_grade
+        for product in {finding.test.engagement.product for finding in findings}:
+            schedule_calculate_grade(product)
+
+
 @receiver(pre_delete, sender=Finding)
 def finding_pre_delete(sender, instance, **kwargs):
     logger.debug('finding pre_delete: %d', instance.id)
@@ -0,0 +1,36 @@
+from django.db.models import signals
+from django.dispatch import receiver
+from fieldsignals import post_save_changed
+
+from dojo.metrics.rollup import get_product_id, get_test_product_id
+from dojo.models import Finding
+from dojo.utils import FINDING_WORDS_FIELDS, add_finding_values, clear_finding_values
+
+
+@receiver(signals.post_save, sender=Finding)
+def finding_values_post_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        add_finding_values([instance])
+
+
+def finding_values_changed(sender, instance, changed_fields=None, created=False, **kwargs):
+    if created:
+        return
+    old_test_id = changed_fields['test'][0] if 'test' in changed_fields else instance.test_id
+    if old_test_id != instance.test_id:
+        # the finding moves to another product
+        clear_finding_values(get_test_product_id(old_test_id))
+        clear_finding_values(get_product_id(instance))
+    else:
+        clear_finding_values(get_product_id(instance), [fieldname for fieldname in FINDING_WORDS_FIELDS if fieldname in changed_fields])
+
+
+post_save_changed.connect(finding_values_changed, sender=Finding, fields=FINDING_WORDS_FIELDS + ['test'])
+
+
+@receiver(signals.post_delete, sender=Finding)
+def finding_values_post_delete(sender, instance, **kwargs):
+    # other findings might have the same values, so the values of the product are read again
+    fieldnames = [fieldname for fieldname in FINDING_WORDS_FIELDS if getattr(instance, fieldname)]
+    if fieldnames:
+        clear_finding_values(get_product_id(instance), fieldnames)
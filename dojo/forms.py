@@ -2114,6 +2114,21 @@ class ProductTypeCountsForm(forms.Form):
         self.fields['product_type'].queryset = get_authorized_product_types(Permissions.Product_Type_View)
 
 
+class ProductCountsForm(forms.Form):
+    month = forms.ChoiceField(choices=list(MONTHS.items()), required=True, error_messages={
+        'required': '*'})
+    year = forms.ChoiceField(choices=get_years, required=True, error_messages={
+        'required': '*'})
+    product = forms.ModelChoiceField(required=True,
+                                     queryset=Product.objects.none(),
+                                     error_messages={
+                                         'required': '*'})
+
+    def __init__(self, *args, **kwargs):
+        super(ProductCountsForm, self).__init__(*args, **kwargs)
+        self.fields['product'].queryset = get_authorized_products(Permissions.Product_View)
+
+
 class APIKeyForm(forms.ModelForm):
     id = forms.IntegerField(required=True,
                             widget=forms.widgets.HiddenInput())
@@ -10,11 +10,12 @@ from django.shortcuts import render
 from django.utils import timezone
 
 from django.db.models import Count, Q
-from dojo.utils import add_breadcrumb, get_punchcard_data
+from dojo.utils import add_breadcrumb, get_products_punchcard_data
 from dojo.models import Answered_Survey
 from dojo.authorization.roles_permissions import Permissions
 from dojo.engagement.queries import get_authorized_engagements
 from dojo.finding.queries import get_authorized_findings
+from dojo.product.queries import get_authorized_products
 from dojo.authorization.authorization import user_has_configuration_permission
 
 
@@ -45,7 +46,7 @@ def dashboard(request: HttpRequest) -> HttpResponse:
 
     severity_count_all = get_severities_all(findings)
     severity_count_by_month = get_severities_by_month(findings, today)
-    punchcard, ticks = get_punchcard_data(findings, today - relativedelta(weeks=26), 26)
+    punchcard, ticks = get_products_punchcard_data(get_authorized_products(Permissions.Finding_View), today - relativedelta(weeks=26), 26)
 
     if user_has_configuration_permission(request.user, 'dojo.view_engagement_survey'):
         unassigned_surveys = Answered_Survey.objects.filter(assignee_id__isnull=True, completed__gt=0, ) \
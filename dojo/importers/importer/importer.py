@@ -1,13 +1,17 @@
 import base64
+from itertools import chain
 
+from cvss import CVSS3
 from django.db.models.query_utils import Q
 from dojo.importers import utils as importer_utils
 from dojo.decorators import dojo_async_task
-from dojo.utils import get_current_user, is_finding_groups_enabled
+from dojo.metrics.rollup import defer_finding_counts, mark_findings_dirty
+from dojo.utils import add_finding_values, apply_cwe_to_template, defer_calculate_grade, get_current_user, get_system_setting, \
+    is_finding_groups_enabled
 from dojo.celery import app
 from django.core.exceptions import ValidationError
-from django.core import serializers
 import dojo.finding.helper as finding_helper
+from dojo.finding.hash_code import get_hash_code_computer
 import dojo.jira_link.helper as jira_helper
 import dojo.notifications.helper as notifications_helper
 from django.conf import settings
@@ -15,7 +19,9 @@ from django.core.files.base import ContentFile
 from django.utils import timezone
 from dojo.models import (BurpRawRequestResponse, FileUpload,
                          Finding, Test, Test_Import, Test_Type)
+from dojo.product.signals import inherit_product_tags, inherit_tags_on_instance
 from dojo.tools.factory import get_parser
+from titlecase import titlecase
 import logging
 
 
@@ -65,15 +71,30 @@ class DojoDefaultImporter(object):
 
     @dojo_async_task
     @app.task(ignore_result=False)
+    @defer_calculate_grade()
+    @defer_finding_counts()
     def process_parsed_findings(self, test, parsed_findings, scan_type, user, active=None, verified=None, minimum_severity=None,
                                 endpoints_to_add=None, push_to_jira=None, group_by=None, now=timezone.now(), service=None, scan_date=None,
                                 create_finding_groups_for_all_findings=True, **kwargs):
         logger.debug('endpoints_to_add: %s', endpoints_to_add)
+        if importer_utils.can_bulk_create_findings():
+            new_findings = self.bulk_create_parsed_findings(test, parsed_findings, user, active=active, verified=verified,
+                                                            minimum_severity=minimum_severity, endpoints_to_add=endpoints_to_add,
+                                                            push_to_jira=push_to_jira, group_by=group_by, now=now, service=service,
+                                                            scan_date=scan_date,
+                                                            create_finding_groups_for_all_findings=create_finding_groups_for_all_findings,
+                                                            **kwargs)
+            sync = kwargs.get('sync', False)
+            if not sync:
+                return [finding.id for finding in new_findings]
+            return new_findings
+
         new_findings = []
         items = parsed_findings
-        logger.debug('starting import of %i items.', len(items) if items else 0)
+        logger.debug('starting import of items.')
         i = 0
         group_names_to_findings_dict = {}
+        endpoint_resolver = importer_utils.EndpointResolver(test.engagement.product)
 
         for item in items:
             # FIXME hack to remove when all parsers have unit tests for this attribute
@@ -138,9 +159,9 @@ class DojoDefaultImporter(object):
                 burp_rr.clean()
                 burp_rr.save()
 
-            importer_utils.chunk_endpoints_and_disperse(item, test, item.unsaved_endpoints)
+            importer_utils.chunk_endpoints_and_disperse(item, test, item.unsaved_endpoints, endpoint_resolver=endpoint_resolver)
             if endpoints_to_add:
-                importer_utils.chunk_endpoints_and_disperse(item, test, endpoints_to_add)
+                importer_utils.chunk_endpoints_and_disperse(item, test, endpoints_to_add, endpoint_resolver=endpoint_resolver)
 
             if item.unsaved_tags:
                 item.tags = item.unsaved_tags
@@ -175,7 +196,155 @@ class DojoDefaultImporter(object):
 
         sync = kwargs.get('sync', False)
         if not sync:
-            return [serializers.serialize('json', [finding, ]) for finding in new_findings]
+            # only the ids are returned to the caller, it reloads the findings in bulk
+            return [finding.id for finding in new_findings]
+        return new_findings
+
+    def bulk_create_parsed_findings(self, test, parsed_findings, user, active=None, verified=None, minimum_severity=None,
+                                    endpoints_to_add=None, push_to_jira=None, group_by=None, now=timezone.now(), service=None,
+                                    scan_date=None, create_finding_groups_for_all_findings=True, **kwargs):
+        """
+        Bulk counterpart of the loop in process_parsed_findings. All findings are prepared in memory the same
+        way Finding.save() prepares a new finding, and are then persisted together with their vulnerability ids,
+        endpoint statuses, request/responses and found_by entries using bulk inserts.
+        """
+        logger.debug('starting bulk import')
+        reporter = user if user else get_current_user()
+        enable_template_match = get_system_setting('enable_template_match')
+        new_findings = []
+
+        if endpoints_to_add:
+            for endpoint in endpoints_to_add:
+                importer_utils.clean_endpoint(endpoint)
+
+        # bulk inserts don't trigger the post_save signal that takes care of the product tag inheritance
+        inherit_tags = inherit_product_tags(test)
+
+        group_names_to_findings_dict = {}
+        endpoint_resolver = importer_utils.EndpointResolver(test.engagement.product)
+        hash_code_computer = get_hash_code_computer(test)
+        # the findings are inserted in batches, so only one batch of parsed findings is held in memory at a time
+        for parsed_findings_batch in importer_utils.iter_chunks(parsed_findings, importer_utils.BULK_BATCH_SIZE):
+            batch_findings = []
+            for item in parsed_findings_batch:
+                # FIXME hack to remove when all parsers have unit tests for this attribute
+                if item.severity.lower().startswith('info') and item.severity != 'Info':
+                    item.severity = 'Info'
+
+                item.numerical_severity = Finding.get_numerical_severity(item.severity)
+
+                if minimum_severity and (Finding.SEVERITIES[item.severity] >
+                        Finding.SEVERITIES[minimum_severity]):
+                    # finding's severity is below the configured threshold : ignoring the finding
+                    continue
+
+                item.test = test
+                item.reporter = reporter
+                item.last_reviewed = now
+                item.last_reviewed_by = reporter
+
+                if active is not None:
+                    # indicates an override. Otherwise, do not change the value of item.active
+                    item.active = active
+
+                if verified is not None:
+                    # indicates an override. Otherwise, do not change the value of verified
+                    item.verified = verified
+
+                # if scan_date was provided, override value from parser
+                if scan_date:
+                    item.date = scan_date.date()
+
+                if service:
+                    item.service = service
+
+                # from here on this mirrors what Finding.save() does for a new finding
+                item.title = titlecase(item.title[:511])
+
+                if item.cvssv3:
+                    try:
+                        # use the environmental score, which is the most refined score
+                        item.cvssv3_score = CVSS3(item.cvssv3).scores()[2]
+                    except Exception as ex:
+                        logger.error("Can't compute cvssv3 score for finding '%s'. Invalid cvssv3 vector found: '%s'. Exception: %s", item.title, item.cvssv3, ex)
+
+                if enable_template_match:
+                    apply_cwe_to_template(item)
+
+                if (item.file_path is not None) and (len(item.unsaved_endpoints) == 0):
+                    item.static_finding = True
+                    item.dynamic_finding = False
+                elif (item.file_path is not None):
+                    item.static_finding = True
+
+                finding_helper.update_finding_status(item, reporter, changed_fields={'id': (None, None)})
+
+                # the hash_code of the regular import is computed from the cleaned endpoints after they have been saved,
+                # including endpoints_to_add
+                for endpoint in item.unsaved_endpoints:
+                    importer_utils.clean_endpoint(endpoint)
+                if endpoints_to_add:
+                    item.unsaved_endpoints = item.unsaved_endpoints + endpoints_to_add
+
+                importer_utils.prepare_vulnerability_ids(item)
+                item.hash_code = hash_code_computer.compute(item)
+
+                batch_findings.append(item)
+
+            Finding.objects.bulk_create(batch_findings, batch_size=importer_utils.BULK_BATCH_SIZE)
+            mark_findings_dirty(batch_findings)
+            add_finding_values(batch_findings)
+            logger.debug('IMPORT_SCAN: %i findings bulk created', len(batch_findings))
+
+            importer_utils.bulk_add_found_by(batch_findings, test.test_type)
+            importer_utils.bulk_create_vulnerability_ids(batch_findings)
+            importer_utils.bulk_create_burp_request_responses(batch_findings)
+            importer_utils.bulk_add_endpoints_to_findings(batch_findings, test, endpoint_resolver=endpoint_resolver)
+
+            for item in batch_findings:
+                if item.unsaved_tags:
+                    item.tags = item.unsaved_tags
+                    item.tags.save()
+
+                if inherit_tags:
+                    inherit_tags_on_instance(Finding, item, created=True)
+
+                if item.unsaved_files:
+                    for unsaved_file in item.unsaved_files:
+                        data = base64.b64decode(unsaved_file.get('data'))
+                        title = unsaved_file.get('title', '<No title>')
+                        file_upload, file_upload_created = FileUpload.objects.get_or_create(
+                            title=title,
+                        )
+                        file_upload.file.save(title, ContentFile(data))
+                        file_upload.save()
+                        item.files.add(file_upload)
+
+                if is_finding_groups_enabled() and group_by:
+                    # If finding groups are enabled, group all findings by group name
+                    name = finding_helper.get_group_by_group_name(item, group_by)
+                    if name is not None:
+                        if name in group_names_to_findings_dict:
+                            group_names_to_findings_dict[name].append(item)
+                        else:
+                            group_names_to_findings_dict[name] = [item]
+            new_findings += batch_findings
+
+        # deduplicate and post process all new findings at once, the product grade is only calculated once for the whole batch.
+        # to avoid pushing a finding group multiple times, we push those outside of the loop
+        if new_findings:
+            finding_helper.post_process_findings_batch([item.id for item in new_findings],
+                                                       push_to_jira=push_to_jira and not (is_finding_groups_enabled() and group_by),
+                                                       user=user)
+
+        for (group_name, findings) in group_names_to_findings_dict.items():
+            finding_helper.add_findings_to_auto_group(group_name, findings, group_by, create_finding_groups_for_all_findings, **kwargs)
+            if push_to_jira:
+                if findings[0].finding_group is not None:
+                    jira_helper.push_to_jira(findings[0].finding_group)
+                else:
+                    jira_helper.push_to_jira(findings[0])
+
         return new_findings
 
     def close_old_findings(self, test, scan_date_time, user, push_to_jira=None, service=None, close_old_findings_product_scope=False):
@@ -211,29 +380,11 @@ class DojoDefaultImporter(object):
         else:
             old_findings = old_findings.filter(Q(service__isnull=True) | Q(service__exact=''))
 
-        for old_finding in old_findings:
-            old_finding.active = False
-            old_finding.is_mitigated = True
-            old_finding.mitigated = scan_date_time
-            old_finding.notes.create(author=user,
-                                        entry="This finding has been automatically closed"
-                                        " as it is not present anymore in recent scans.")
-            endpoint_status = old_finding.status_finding.all()
-            for status in endpoint_status:
-                status.mitigated_by = user
-                status.mitigated_time = timezone.now()
-                status.mitigated = True
-                status.last_modified = timezone.now()
-                status.save()
-
-            old_finding.tags.add('stale')
-
-            # to avoid pushing a finding group multiple times, we push those outside of the loop
-            if is_finding_groups_enabled() and old_finding.finding_group:
-                # don't try to dedupe findings that we are closing
-                old_finding.save(dedupe_option=False)
-            else:
-                old_finding.save(dedupe_option=False, push_to_jira=push_to_jira)
+        # don't try to dedupe findings that we are closing
+        old_findings = finding_helper.close_findings_batch(
+            old_findings.select_related('test__engagement__product', 'test__test_type'), user, scan_date_time,
+            "This finding has been automatically closed as it is not present anymore in recent scans.",
+            tags=['stale'], push_to_jira=push_to_jira)
 
         if is_finding_groups_enabled() and push_to_jira:
             for finding_group in set([finding.finding_group for finding in old_findings if finding.finding_group is not None]):
@@ -241,6 +392,8 @@ class DojoDefaultImporter(object):
 
         return old_findings
 
+    @defer_calculate_grade()
+    @defer_finding_counts()
     def import_scan(self, scan, scan_type, engagement, lead, environment, active=None, verified=None, tags=None, minimum_severity=None,
                     user=None, endpoints_to_add=None, scan_date=None, version=None, branch_tag=None, build_id=None,
                     commit_hash=None, push_to_jira=None, close_old_findings=False, close_old_findings_product_scope=False,
@@ -297,9 +450,7 @@ class DojoDefaultImporter(object):
                 # currently we only support import one Test
                 # so for parser that support multiple tests (like SARIF)
                 # we aggregate all the findings into one uniq test
-                parsed_findings = []
-                for test_raw in tests:
-                    parsed_findings.extend(test_raw.findings)
+                parsed_findings = chain.from_iterable(test_raw.findings for test_raw in tests)
             else:
                 logger.info(f'No tests found in import for {scan_type}')
         else:
@@ -312,7 +463,8 @@ class DojoDefaultImporter(object):
             logger.debug('IMPORT_SCAN: Parse findings')
             parser = get_parser(scan_type)
             try:
-                parsed_findings = parser.get_findings(scan, test)
+                # parsers that implement iter_findings are consumed while they parse the report
+                parsed_findings = importer_utils.parse_findings(parser, scan, test)
             except ValueError as e:
                 logger.warning(e)
                 raise ValidationError(e)
@@ -320,10 +472,9 @@ class DojoDefaultImporter(object):
         logger.debug('IMPORT_SCAN: Processing findings')
         new_findings = []
         if settings.ASYNC_FINDING_IMPORT:
-            chunk_list = importer_utils.chunk_list(parsed_findings)
             results_list = []
             # First kick off all the workers
-            for findings_list in chunk_list:
+            for findings_list in importer_utils.iter_chunks(parsed_findings):
                 result = self.process_parsed_findings(test, findings_list, scan_type, user, active=active,
                                                             verified=verified, minimum_severity=minimum_severity,
                                                             endpoints_to_add=endpoints_to_add, push_to_jira=push_to_jira,
@@ -334,9 +485,10 @@ class DojoDefaultImporter(object):
                 results_list += [result]
             # After all tasks have been started, time to pull the results
             logger.info('IMPORT_SCAN: Collecting Findings')
+            new_finding_ids = []
             for results in results_list:
-                serial_new_findings = results.get()
-                new_findings += [next(serializers.deserialize("json", finding)).object for finding in serial_new_findings]
+                new_finding_ids += results.get()
+            new_findings = importer_utils.get_findings_by_ids(new_finding_ids)
             logger.info('IMPORT_SCAN: All Findings Collected')
             # Indicate that the test is not complete yet as endpoints will still be rolling in.
             test.percent_complete = 50
@@ -1,21 +1,23 @@
 import base64
 import logging
+from itertools import chain
 
 import dojo.finding.helper as finding_helper
+from dojo.finding.hash_code import get_hash_code_computer
 import dojo.jira_link.helper as jira_helper
 import dojo.notifications.helper as notifications_helper
 from dojo.decorators import dojo_async_task
 from dojo.celery import app
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.core import serializers
 from django.core.files.base import ContentFile
 from django.utils import timezone
 from dojo.importers import utils as importer_utils
 from dojo.importers.reimporter import utils as reimporter_utils
 from dojo.models import BurpRawRequestResponse, FileUpload, Finding, Notes, Test_Import
 from dojo.tools.factory import get_parser
-from dojo.utils import get_current_user, is_finding_groups_enabled
+from dojo.metrics.rollup import defer_finding_counts
+from dojo.utils import defer_calculate_grade, get_current_user, is_finding_groups_enabled
 from django.db.models import Q
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,8 @@ deduplicationLogger = logging.getLogger("dojo.specific-loggers.deduplication")
 class DojoDefaultReImporter(object):
     @dojo_async_task
     @app.task(ignore_result=False)
+    @defer_calculate_grade()
+    @defer_finding_counts()
     def process_parsed_findings(
         self,
         test,
@@ -46,7 +50,6 @@ class DojoDefaultReImporter(object):
     ):
 
         items = parsed_findings
-        original_items = list(test.finding_set.all())
         new_items = []
         mitigated_count = 0
         finding_count = 0
@@ -56,8 +59,14 @@ class DojoDefaultReImporter(object):
         unchanged_count = 0
         unchanged_items = []
 
-        logger.debug("starting reimport of %i items.", len(items) if items else 0)
+        logger.debug("starting reimport of items.")
         deduplication_algorithm = test.deduplication_algorithm
+        # only the matching fields of the existing findings are loaded, the matched findings are loaded in full by the index
+        existing_findings = reimporter_utils.ExistingFindingsIndex.for_test(test, deduplication_algorithm)
+        original_finding_ids = existing_findings.finding_ids()
+        processed_finding_ids = set()
+        endpoint_resolver = importer_utils.EndpointResolver(test.engagement.product)
+        hash_code_computer = get_hash_code_computer(test)
 
         i = 0
         group_names_to_findings_dict = {}
@@ -105,12 +114,10 @@ class DojoDefaultReImporter(object):
                             "{}".format(err)
                         )
 
-            item.hash_code = item.compute_hash_code()
+            item.hash_code = hash_code_computer.compute(item)
             deduplicationLogger.debug("item's hash_code: %s", item.hash_code)
 
-            findings = reimporter_utils.match_new_finding_to_existing_finding(
-                item, test, deduplication_algorithm
-            )
+            findings = existing_findings.match(item)
 
             deduplicationLogger.debug(
                 "found %i findings matching with current new finding", len(findings)
@@ -118,7 +125,10 @@ class DojoDefaultReImporter(object):
 
             if findings:
                 # existing finding found
-                finding = findings[0]
+                finding = existing_findings.load(findings[0])
+                if finding.id in processed_finding_ids:
+                    # the finding was already matched by an earlier finding of this report, pick up changes made by its post processing
+                    finding.refresh_from_db()
                 if finding.false_p or finding.out_of_scope or finding.risk_accepted:
                     logger.debug(
                         "%i: skipping existing finding (it is marked as false positive:%s and/or out of scope:%s or is a risk accepted:%s): %i:%s:%s:%s",
@@ -351,6 +361,7 @@ class DojoDefaultReImporter(object):
 
                 finding_added_count += 1
                 new_items.append(item)
+                existing_findings.add(item)
                 finding = item
 
                 if hasattr(item, "unsaved_req_resp"):
@@ -383,12 +394,13 @@ class DojoDefaultReImporter(object):
             # for existing findings: make sure endpoints are present or created
             if finding:
                 finding_count += 1
+                processed_finding_ids.add(finding.id)
                 importer_utils.chunk_endpoints_and_disperse(
-                    finding, test, item.unsaved_endpoints
+                    finding, test, item.unsaved_endpoints, endpoint_resolver=endpoint_resolver
                 )
                 if endpoints_to_add:
                     importer_utils.chunk_endpoints_and_disperse(
-                        finding, test, endpoints_to_add
+                        finding, test, endpoints_to_add, endpoint_resolver=endpoint_resolver
                     )
 
                 if item.unsaved_tags:
@@ -428,8 +440,10 @@ class DojoDefaultReImporter(object):
                 else:
                     finding.save(push_to_jira=push_to_jira)
 
-        to_mitigate = (
-            set(original_items) - set(reactivated_items) - set(unchanged_items)
+        finding_ids_to_mitigate = (
+            original_finding_ids
+            - {finding.id for finding in reactivated_items}
+            - {finding.id for finding in unchanged_items}
         )
         # due to #3958 we can have duplicates inside the same report
         # this could mean that a new finding is created and right after
@@ -437,7 +451,7 @@ class DojoDefaultReImporter(object):
         # following finding in the same report
         # this means untouched can have this finding inside it,
         # while it is in fact a new finding. So we substract new_items
-        untouched = set(unchanged_items) - set(to_mitigate) - set(new_items)
+        untouched = set(unchanged_items) - set(new_items)
 
         for (group_name, findings) in group_names_to_findings_dict.items():
             finding_helper.add_findings_to_auto_group(group_name, findings, group_by, create_finding_groups_for_all_findings, **kwargs)
@@ -459,82 +473,25 @@ class DojoDefaultReImporter(object):
 
         sync = kwargs.get("sync", False)
         if not sync:
-            serialized_new_items = [
-                serializers.serialize(
-                    "json",
-                    [
-                        finding,
-                    ],
-                )
-                for finding in new_items
-            ]
-            serialized_reactivated_items = [
-                serializers.serialize(
-                    "json",
-                    [
-                        finding,
-                    ],
-                )
-                for finding in reactivated_items
-            ]
-            serialized_to_mitigate = [
-                serializers.serialize(
-                    "json",
-                    [
-                        finding,
-                    ],
-                )
-                for finding in to_mitigate
-            ]
-            serialized_untouched = [
-                serializers.serialize(
-                    "json",
-                    [
-                        finding,
-                    ],
-                )
-                for finding in untouched
-            ]
+            # only the ids are returned to the caller, it reloads the findings in bulk
             return (
-                serialized_new_items,
-                serialized_reactivated_items,
-                serialized_to_mitigate,
-                serialized_untouched,
+                [finding.id for finding in new_items],
+                [finding.id for finding in reactivated_items],
+                sorted(finding_ids_to_mitigate),
+                [finding.id for finding in untouched],
             )
 
+        # the findings to mitigate keep the state from before the reimport, like the ids returned by the chunks
+        to_mitigate = existing_findings.get_original_findings(finding_ids_to_mitigate)
         return new_items, reactivated_items, to_mitigate, untouched
 
     def close_old_findings(
         self, test, to_mitigate, scan_date_time, user, push_to_jira=None
     ):
         logger.debug("IMPORT_SCAN: Closing findings no longer present in scan report")
-        mitigated_findings = []
-        for finding in to_mitigate:
-            if not finding.mitigated or not finding.is_mitigated:
-                logger.debug("mitigating finding: %i:%s", finding.id, finding)
-                finding.mitigated = scan_date_time
-                finding.is_mitigated = True
-                finding.mitigated_by = user
-                finding.active = False
-
-                endpoint_status = finding.status_finding.all()
-                reimporter_utils.mitigate_endpoint_status(
-                    endpoint_status, user, kwuser=user, sync=True
-                )
-
-                # to avoid pushing a finding group multiple times, we push those outside of the loop
-                if is_finding_groups_enabled() and finding.finding_group:
-                    # don't try to dedupe findings that we are closing
-                    finding.save(dedupe_option=False)
-                else:
-                    finding.save(push_to_jira=push_to_jira, dedupe_option=False)
-
-                note = Notes(
-                    entry="Mitigated by %s re-upload." % test.test_type, author=user
-                )
-                note.save()
-                finding.notes.add(note)
-                mitigated_findings.append(finding)
+        mitigated_findings = finding_helper.close_findings_batch(
+            [finding for finding in to_mitigate if not finding.mitigated or not finding.is_mitigated],
+            user, scan_date_time, "Mitigated by %s re-upload." % test.test_type, mitigated_by=user, push_to_jira=push_to_jira)
 
         if is_finding_groups_enabled() and push_to_jira:
             for finding_group in set(
@@ -548,6 +505,8 @@ class DojoDefaultReImporter(object):
 
         return mitigated_findings
 
+    @defer_calculate_grade()
+    @defer_finding_counts()
     def reimport_scan(
         self,
         scan,
@@ -600,13 +559,12 @@ class DojoDefaultReImporter(object):
             # for now we only consider the first test in the list and artificially aggregate all findings of all tests
             # this is the same as the old behavior as current import/reimporter implementation doesn't handle the case
             # when there is more than 1 test
-            parsed_findings = []
-            for test_raw in tests:
-                parsed_findings.extend(test_raw.findings)
+            parsed_findings = chain.from_iterable(test_raw.findings for test_raw in tests)
         else:
             logger.debug("REIMPORT_SCAN: Parse findings")
             try:
-                parsed_findings = parser.get_findings(scan, test)
+                # parsers that implement iter_findings are consumed while they parse the report
+                parsed_findings = importer_utils.parse_findings(parser, scan, test)
             except ValueError as e:
                 logger.warning(e)
                 raise ValidationError(e)
@@ -617,10 +575,9 @@ class DojoDefaultReImporter(object):
         findings_to_mitigate = []
         untouched_findings = []
         if settings.ASYNC_FINDING_IMPORT:
-            chunk_list = importer_utils.chunk_list(parsed_findings)
             results_list = []
             # First kick off all the workers
-            for findings_list in chunk_list:
+            for findings_list in importer_utils.iter_chunks(parsed_findings):
                 result = self.process_parsed_findings(
                     test,
                     findings_list,
@@ -645,29 +602,31 @@ class DojoDefaultReImporter(object):
                 results_list += [result]
             # After all tasks have been started, time to pull the results
             logger.debug("REIMPORT_SCAN: Collecting Findings")
+            new_finding_ids = []
+            reactivated_finding_ids = []
+            finding_ids_to_mitigate = None
+            untouched_finding_ids = []
             for results in results_list:
                 (
-                    serial_new_findings,
-                    serial_reactivated_findings,
-                    serial_findings_to_mitigate,
-                    serial_untouched_findings,
+                    chunk_new_finding_ids,
+                    chunk_reactivated_finding_ids,
+                    chunk_finding_ids_to_mitigate,
+                    chunk_untouched_finding_ids,
                 ) = results.get()
-                new_findings += [
-                    next(serializers.deserialize("json", finding)).object
-                    for finding in serial_new_findings
-                ]
-                reactivated_findings += [
-                    next(serializers.deserialize("json", finding)).object
-                    for finding in serial_reactivated_findings
-                ]
-                findings_to_mitigate += [
-                    next(serializers.deserialize("json", finding)).object
-                    for finding in serial_findings_to_mitigate
-                ]
-                untouched_findings += [
-                    next(serializers.deserialize("json", finding)).object
-                    for finding in serial_untouched_findings
-                ]
+                new_finding_ids += chunk_new_finding_ids
+                reactivated_finding_ids += chunk_reactivated_finding_ids
+                untouched_finding_ids += chunk_untouched_finding_ids
+                # every chunk only sees part of the report: a finding has to be mitigated
+                # if none of the chunks matched it
+                if finding_ids_to_mitigate is None:
+                    finding_ids_to_mitigate = chunk_finding_ids_to_mitigate
+                else:
+                    chunk_finding_ids_to_mitigate = set(chunk_finding_ids_to_mitigate)
+                    finding_ids_to_mitigate = [finding_id for finding_id in finding_ids_to_mitigate if finding_id in chunk_finding_ids_to_mitigate]
+            new_findings = importer_utils.get_findings_by_ids(new_finding_ids)
+            reactivated_findings = importer_utils.get_findings_by_ids(reactivated_finding_ids)
+            findings_to_mitigate = importer_utils.get_findings_by_ids(finding_ids_to_mitigate or [])
+            untouched_findings = importer_utils.get_findings_by_ids(untouched_finding_ids)
             logger.debug("REIMPORT_SCAN: All Findings Collected")
             # Indicate that the test is not complete yet as endpoints will still be rolling in.
             test.percent_complete = 50
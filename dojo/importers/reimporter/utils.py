@@ -1,3 +1,4 @@
+import copy
 from datetime import timedelta
 from crum import get_current_user
 from django.conf import settings
@@ -55,6 +56,82 @@ def match_new_finding_to_existing_finding(new_finding, test, deduplication_algor
         return None
 
 
+class ExistingFindingsIndex(object):
+    """
+    In memory counterpart of match_new_finding_to_existing_finding: the findings of the test are indexed once
+    on the fields used by the deduplication algorithm, so every reimported finding is matched without a query.
+    Findings created during the reimport have to be added, so that they can be matched by later findings of the same report.
+    The index only needs the matching fields, see for_test: a matched finding is loaded with all its fields by load.
+    """
+
+    fields = ('id', 'hash_code', 'unique_id_from_tool', 'title', 'severity', 'numerical_severity')
+
+    def __init__(self, findings, deduplication_algorithm):
+        self.deduplication_algorithm = deduplication_algorithm
+        self.findings_by_hash_code = {}
+        self.findings_by_unique_id_from_tool = {}
+        self.findings_by_title_and_severity = {}
+        self.loaded_findings = {}
+        self.original_findings = {}
+        for finding in sorted(findings, key=lambda finding: finding.id):
+            self.original_findings[finding.id] = None
+            self.add(finding)
+
+    @classmethod
+    def for_test(cls, test, deduplication_algorithm):
+        return cls(test.finding_set.only(*cls.fields), deduplication_algorithm)
+
+    def finding_ids(self):
+        # the findings of the test before the reimport
+        return set(self.original_findings)
+
+    def get_original_findings(self, finding_ids):
+        # the findings as they were before the reimport: the matched ones were copied before they were changed, the others are loaded now
+        findings = {finding_id: self.original_findings[finding_id] for finding_id in finding_ids if self.original_findings.get(finding_id)}
+        findings.update(Finding.objects.in_bulk([finding_id for finding_id in finding_ids if finding_id not in findings]))
+        return [findings[finding_id] for finding_id in sorted(finding_ids) if finding_id in findings]
+
+    def load(self, finding):
+        # the matched findings are loaded once with all their fields, they are then changed and saved by the reimport
+        if finding.id not in self.loaded_findings:
+            if finding.get_deferred_fields():
+                self.loaded_findings.update(Finding.objects.in_bulk([finding.id]))
+            else:
+                self.loaded_findings[finding.id] = finding
+            if finding.id in self.original_findings:
+                self.original_findings[finding.id] = copy.copy(self.loaded_findings[finding.id])
+        return self.loaded_findings[finding.id]
+
+    def add(self, finding):
+        if finding.hash_code is not None:
+            self.findings_by_hash_code.setdefault(finding.hash_code, []).append(finding)
+        if finding.unique_id_from_tool is not None:
+            self.findings_by_unique_id_from_tool.setdefault(finding.unique_id_from_tool, []).append(finding)
+        self.findings_by_title_and_severity.setdefault((finding.title, finding.severity, finding.numerical_severity), []).append(finding)
+
+    def match(self, new_finding):
+        # returns the matching findings ordered by id, like match_new_finding_to_existing_finding does
+        deduplicationLogger.debug('return findings bases on algorithm: %s', self.deduplication_algorithm)
+        if self.deduplication_algorithm == 'hash_code':
+            return self.findings_by_hash_code.get(new_finding.hash_code, []) if new_finding.hash_code is not None else []
+        elif self.deduplication_algorithm == 'unique_id_from_tool':
+            return self.findings_by_unique_id_from_tool.get(new_finding.unique_id_from_tool, []) if new_finding.unique_id_from_tool is not None else []
+        elif self.deduplication_algorithm == 'unique_id_from_tool_or_hash_code':
+            findings = []
+            if new_finding.hash_code is not None:
+                findings += self.findings_by_hash_code.get(new_finding.hash_code, [])
+            if new_finding.unique_id_from_tool is not None:
+                findings += self.findings_by_unique_id_from_tool.get(new_finding.unique_id_from_tool, [])
+            return sorted(set(findings), key=lambda finding: finding.id)
+        elif self.deduplication_algorithm == 'legacy':
+            # see match_new_finding_to_existing_finding about the legacy reimport behavior
+            logger.debug("Legacy reimport. In case of issue, you're advised to create a deduplication configuration in order not to go through this section")
+            return self.findings_by_title_and_severity.get((new_finding.title, new_finding.severity, Finding.get_numerical_severity(new_finding.severity)), [])
+        else:
+            logger.error("Internal error: unexpected deduplication_algorithm: '%s' ", self.deduplication_algorithm)
+            return None
+
+
 def update_endpoint_status(existing_finding, new_finding, user):
     # New endpoints are already added in serializers.py / views.py (see comment "# for existing findings: make sure endpoints are present or created")
     # So we only need to mitigate endpoints that are no longer present
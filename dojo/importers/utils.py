@@ -1,20 +1,31 @@
+import base64
+import hashlib
+from itertools import chain, islice
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.core.exceptions import MultipleObjectsReturned
 from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils.timezone import make_aware
+from hyperlink._url import SCHEME_PORT_MAP
 from dojo.decorators import dojo_async_task
 from dojo.celery import app
-from dojo.endpoint.utils import endpoint_get_or_create
+from dojo.product.signals import inherit_product_tags
 from dojo.utils import max_safe
 from django.urls import reverse
 from dojo.models import IMPORT_CLOSED_FINDING, IMPORT_CREATED_FINDING, \
     IMPORT_REACTIVATED_FINDING, IMPORT_UNTOUCHED_FINDING, Test_Import, Test_Import_Finding_Action, \
-    Endpoint_Status, Vulnerability_Id
+    BurpRawRequestResponse, Endpoint, Endpoint_Status, Finding, Vulnerability_Id
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+BULK_BATCH_SIZE = 1000
+# resolved endpoints are shared between the chunks of an import through the cache
+ENDPOINT_CACHE_TIMEOUT = 60 * 60
+
 
 def update_timestamps(test, version, branch_tag, build_id, commit_hash, now, scan_date):
     if not scan_date:
@@ -117,7 +128,56 @@ def chunk_list(list):
     return chunk_list
 
 
-def chunk_endpoints_and_disperse(finding, test, endpoints, **kwargs):
+def get_findings_by_ids(finding_ids):
+    """
+    Reloads the findings returned by the import chunk tasks, which return finding ids instead of serialized findings.
+    The findings are loaded with one query and returned in the order of finding_ids, without repeated ids.
+    """
+    finding_ids = list(dict.fromkeys(finding_ids))
+    findings = Finding.objects.in_bulk(finding_ids)
+    return [findings[finding_id] for finding_id in finding_ids if finding_id in findings]
+
+
+def iter_chunks(iterable, chunk_size=None):
+    # Break the parsed findings into "chunk_size" lists while they are being parsed, without holding all of them
+    chunk_size = chunk_size or settings.ASYNC_FINDING_IMPORT_CHUNK_SIZE
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
+def iter_parser_findings(parser, scan, test):
+    # the parsers raise a ValueError for a report they can't parse, which might only happen after some findings
+    try:
+        yield from parser.iter_findings(scan, test)
+    except ValueError as e:
+        logger.warning(e)
+        raise ValidationError(e)
+
+
+def parse_findings(parser, scan, test):
+    """
+    Returns an iterator over the findings of the scan report. Parsers that implement iter_findings(file, test)
+    produce the findings one by one, so a large report is never turned into one big list of findings.
+    The first finding is parsed right away, so a report that can't be parsed fails before any finding is processed.
+    A report that can't be parsed raises a ValidationError wherever the findings are consumed.
+    """
+    if not hasattr(parser, 'iter_findings'):
+        return iter(parser.get_findings(scan, test))
+
+    findings = iter_parser_findings(parser, scan, test)
+    first_finding = next(findings, None)
+    if first_finding is None:
+        return iter([])
+    return chain([first_finding], findings)
+
+
+def chunk_endpoints_and_disperse(finding, test, endpoints, endpoint_resolver=None, **kwargs):
+    # the endpoints are resolved here, so the tasks only have to create the endpoint statuses
+    endpoint_resolver = endpoint_resolver or EndpointResolver(test.engagement.product)
+    endpoints = endpoint_resolver.get_or_create(endpoints)
     if settings.ASYNC_FINDING_IMPORT:
         chunked_list = chunk_list(endpoints)
         # If there is only one chunk, then do not bother with async
@@ -137,35 +197,144 @@ def chunk_endpoints_and_disperse(finding, test, endpoints, **kwargs):
 @app.task()
 def add_endpoints_to_unsaved_finding(finding, test, endpoints, **kwargs):
     logger.debug('IMPORT_SCAN: Adding ' + str(len(endpoints)) + ' endpoints to finding:' + str(finding))
-    for endpoint in endpoints:
-        try:
-            endpoint.clean()
-        except ValidationError as e:
-            logger.warning("DefectDojo is storing broken endpoint because cleaning wasn't successful: "
-                            "{}".format(e))
-        ep = None
-        try:
-            ep, created = endpoint_get_or_create(
-                protocol=endpoint.protocol,
-                userinfo=endpoint.userinfo,
-                host=endpoint.host,
-                port=endpoint.port,
-                path=endpoint.path,
-                query=endpoint.query,
-                fragment=endpoint.fragment,
-                product=test.engagement.product)
-        except (MultipleObjectsReturned):
-            raise Exception("Endpoints in your database are broken. Please access {} and migrate them to new format or "
-                            "remove them.".format(reverse('endpoint_migrate')))
-
-        eps, created = Endpoint_Status.objects.get_or_create(
-            finding=finding,
-            endpoint=ep,
-            defaults={'date': finding.date})
+    endpoints = EndpointResolver(test.engagement.product).get_or_create(endpoints)
+    # existing endpoint statuses are left untouched
+    Endpoint_Status.objects.bulk_create(
+        [Endpoint_Status(finding=finding, endpoint=ep, date=finding.date) for ep in {ep.id: ep for ep in endpoints}.values()],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True)
 
     logger.debug('IMPORT_SCAN: ' + str(len(endpoints)) + ' imported')
 
 
+def clean_endpoint(endpoint):
+    try:
+        endpoint.clean()
+    except ValidationError as e:
+        logger.warning("DefectDojo is storing broken endpoint because cleaning wasn't successful: "
+                        "{}".format(e))
+
+
+class EndpointResolver(object):
+    """
+    Import scoped counterpart of endpoint_get_or_create for the endpoints of a product.
+
+    Endpoints match with the same rules as endpoint_filter: protocol and host are compared case insensitive and a
+    missing port equals the default port of the protocol. The endpoints that are not known yet are looked up with
+    one query and the missing ones are created with one bulk insert. The resolved endpoints are memoized per
+    (product, normalized endpoint) for the lifetime of the resolver, and their ids in the cache so the async
+    chunks of an import don't look them up again.
+    """
+
+    def __init__(self, product):
+        self.product = product
+        self.endpoints = {}
+
+    @staticmethod
+    def get_key(endpoint):
+        protocol = endpoint.protocol.lower() if endpoint.protocol else None
+        port = endpoint.port or None
+        if protocol in SCHEME_PORT_MAP and port == SCHEME_PORT_MAP[protocol]:
+            port = None
+        return (protocol, endpoint.userinfo or None, endpoint.host.lower() if endpoint.host else None, port,
+                endpoint.path or None, endpoint.query or None, endpoint.fragment or None)
+
+    def get_cache_key(self, key):
+        return 'dojo_endpoint_resolver:{}:{}'.format(self.product.id, hashlib.sha256(repr(key).encode('utf-8')).hexdigest())
+
+    def get_or_create(self, endpoints):
+        """Returns the saved product endpoints for the (unsaved) endpoints, in the same order"""
+        keys = []
+        missing = {}
+        for endpoint in endpoints:
+            if endpoint.pk is None:
+                clean_endpoint(endpoint)
+            key = self.get_key(endpoint)
+            keys.append(key)
+            if key in self.endpoints:
+                continue
+            if endpoint.pk is not None and endpoint.product_id == self.product.id:
+                self.endpoints[key] = endpoint
+            else:
+                missing.setdefault(key, endpoint)
+
+        if missing:
+            self.load(missing)
+
+        return [self.endpoints[key] for key in keys]
+
+    def load(self, missing):
+        # endpoints resolved by other chunks of the import, they are checked as the cache may be outdated
+        cache_keys = {self.get_cache_key(key): key for key in missing}
+        cached_ids = cache.get_many(list(cache_keys))
+        if cached_ids:
+            for ep in Endpoint.objects.filter(id__in=cached_ids.values(), product=self.product).order_by():
+                key = self.get_key(ep)
+                if key in missing and cached_ids.get(self.get_cache_key(key)) == ep.id:
+                    missing.pop(key)
+                    self.endpoints[key] = ep
+        if not missing:
+            return
+
+        hosts = {key[2] for key in missing}
+        hosts_query = Q(host_lower__in=[host for host in hosts if host is not None])
+        if None in hosts:
+            hosts_query |= Q(host__isnull=True)
+        existing = {}
+        for ep in Endpoint.objects.filter(product=self.product).annotate(host_lower=Lower('host')).filter(hosts_query).order_by():
+            existing.setdefault(self.get_key(ep), []).append(ep)
+
+        new_endpoints = []
+        for key, endpoint in missing.items():
+            eps = existing.get(key, [])
+            if len(eps) > 1:
+                raise Exception("Endpoints in your database are broken. Please access {} and migrate them to new format or "
+                                "remove them.".format(reverse('endpoint_migrate')))
+            if eps:
+                self.endpoints[key] = eps[0]
+            else:
+                self.endpoints[key] = Endpoint(
+                    protocol=endpoint.protocol,
+                    userinfo=endpoint.userinfo,
+                    host=endpoint.host,
+                    port=endpoint.port,
+                    path=endpoint.path,
+                    query=endpoint.query,
+                    fragment=endpoint.fragment,
+                    product=self.product)
+                new_endpoints.append(self.endpoints[key])
+
+        if new_endpoints:
+            if connection.features.can_return_rows_from_bulk_insert:
+                Endpoint.objects.bulk_create(new_endpoints, batch_size=BULK_BATCH_SIZE)
+                # bulk inserts don't trigger the post_save signal that takes care of the product tag inheritance,
+                # the new endpoints have no tags of their own yet
+                if inherit_product_tags(self.product):
+                    for ep in new_endpoints:
+                        ep.inherit_tags([])
+            else:
+                for ep in new_endpoints:
+                    ep.save()
+            logger.debug('IMPORT_SCAN: %i endpoints created for product %i', len(new_endpoints), self.product.id)
+
+        cache.set_many({self.get_cache_key(key): self.endpoints[key].id for key in missing}, ENDPOINT_CACHE_TIMEOUT)
+
+
+def bulk_add_endpoints_to_findings(findings, test, endpoint_resolver=None):
+    """
+    Bulk counterpart of add_endpoints_to_unsaved_finding for findings that have just been bulk created.
+    All Endpoint_Status rows are inserted with a single bulk insert.
+    """
+    endpoint_resolver = endpoint_resolver or EndpointResolver(test.engagement.product)
+    endpoint_statuses = []
+    for finding in findings:
+        for ep in {ep.id: ep for ep in endpoint_resolver.get_or_create(finding.unsaved_endpoints)}.values():
+            endpoint_statuses.append(Endpoint_Status(finding=finding, endpoint=ep, date=finding.date))
+
+    Endpoint_Status.objects.bulk_create(endpoint_statuses, batch_size=BULK_BATCH_SIZE)
+    logger.debug('IMPORT_SCAN: %i endpoint statuses bulk created', len(endpoint_statuses))
+
+
 # This function is added to the async queue at the end of all finding import tasks
 # and after endpoint task, so this should only run after all the other ones are done
 @dojo_async_task
@@ -175,7 +344,7 @@ def update_test_progress(test, **kwargs):
     test.save()
 
 
-def handle_vulnerability_ids(finding):
+def prepare_vulnerability_ids(finding):
     # Synchronize the cve field with the unsaved_vulnerability_ids
     # We do this to be as flexible as possible to handle the fields until
     # the cve field is not needed anymore and can be removed.
@@ -193,9 +362,60 @@ def handle_vulnerability_ids(finding):
         # Remove duplicates
         finding.unsaved_vulnerability_ids = list(dict.fromkeys(finding.unsaved_vulnerability_ids))
 
+
+def handle_vulnerability_ids(finding):
+    prepare_vulnerability_ids(finding)
+
+    if finding.unsaved_vulnerability_ids:
         # Add all vulnerability ids to the database
         for vulnerability_id in finding.unsaved_vulnerability_ids:
             Vulnerability_Id(
                 vulnerability_id=vulnerability_id,
                 finding=finding,
             ).save()
+
+
+def bulk_create_vulnerability_ids(findings):
+    # the findings must have been passed through prepare_vulnerability_ids before they were bulk created
+    vulnerability_ids = []
+    for finding in findings:
+        if finding.unsaved_vulnerability_ids:
+            for vulnerability_id in finding.unsaved_vulnerability_ids:
+                vulnerability_ids.append(Vulnerability_Id(vulnerability_id=vulnerability_id, finding=finding))
+
+    Vulnerability_Id.objects.bulk_create(vulnerability_ids, batch_size=BULK_BATCH_SIZE)
+
+
+def bulk_add_found_by(findings, test_type):
+    found_by_model = Finding.found_by.through
+    found_by_model.objects.bulk_create(
+        [found_by_model(finding_id=finding.id, test_type_id=test_type.id) for finding in findings],
+        batch_size=BULK_BATCH_SIZE,
+        ignore_conflicts=True)
+
+
+def bulk_create_burp_request_responses(findings):
+    burp_rrs = []
+    for finding in findings:
+        if hasattr(finding, 'unsaved_req_resp') and finding.unsaved_req_resp:
+            for req_resp in finding.unsaved_req_resp:
+                burp_rrs.append(BurpRawRequestResponse(
+                    finding=finding,
+                    burpRequestBase64=base64.b64encode(req_resp["req"].encode("utf-8")),
+                    burpResponseBase64=base64.b64encode(req_resp["resp"].encode("utf-8"))))
+
+        if finding.unsaved_request is not None and finding.unsaved_response is not None:
+            burp_rrs.append(BurpRawRequestResponse(
+                finding=finding,
+                burpRequestBase64=base64.b64encode(finding.unsaved_request.encode()),
+                burpResponseBase64=base64.b64encode(finding.unsaved_response.encode())))
+
+    for burp_rr in burp_rrs:
+        burp_rr.clean()
+
+    BurpRawRequestResponse.objects.bulk_create(burp_rrs, batch_size=BULK_BATCH_SIZE)
+
+
+def can_bulk_create_findings():
+    # bulk_create only sets the primary keys on the created objects if the database returns them
+    return settings.BULK_FINDING_IMPORT and connection.features.can_return_rows_from_bulk_insert
@@ -621,6 +621,31 @@ def push_to_jira(obj, *args, **kwargs):
         logger.error('unsupported object passed to push_to_jira: %s %i %s', obj.__name__, obj.id, obj)
 
 
+@dojo_async_task
+@app.task
+def push_findings_to_jira(finding_ids, *args, **kwargs):
+    """
+    push_to_jira for a batch of findings in a single task instead of a task per finding.
+    As in Finding.save, a finding in a group without its own JIRA issue results in a push of the group.
+    """
+    findings = Finding.objects.filter(id__in=finding_ids).order_by('id')
+    finding_groups = {}
+    for finding in findings:
+        if finding.has_jira_issue or not finding.finding_group:
+            if finding.has_jira_issue:
+                update_jira_issue(finding, *args, **kwargs)
+            else:
+                add_jira_issue(finding, *args, **kwargs)
+        else:
+            finding_groups[finding.finding_group.id] = finding.finding_group
+
+    for finding_group in finding_groups.values():
+        if finding_group.has_jira_issue:
+            update_jira_issue(finding_group, *args, **kwargs)
+        else:
+            add_jira_issue(finding_group, *args, **kwargs)
+
+
 def add_issues_to_epic(jira, obj, epic_id, issue_keys, ignore_epics=True):
     try:
         return jira.add_issues_to_epic(epic_id=epic_id, issue_keys=issue_keys, ignore_epics=ignore_epics)
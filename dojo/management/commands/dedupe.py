@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from pytz import timezone
 
+from dojo.finding.hash_code import recompute_hash_codes
 from dojo.models import Finding, Product
 from dojo.utils import calculate_grade, do_dedupe_finding, do_dedupe_finding_task, get_system_setting, mass_model_updater
 import logging
@@ -11,20 +12,12 @@ logger = logging.getLogger(__name__)
 deduplicationLogger = logging.getLogger("dojo.specific-loggers.deduplication")
 
 
-def generate_hash_code(f):
-    old_hash_code = f.hash_code
-    f.hash_code = f.compute_hash_code()
-    if f.hash_code != old_hash_code:
-        logger.debug('%d: hash_code changed from %s to %s', f.id, old_hash_code, f.hash_code)
-    return f
-
-
 class Command(BaseCommand):
     """
     Updates hash codes and/or runs deduplication for findings. Hashcode calculation always runs in the foreground, dedupe by default runs in the background.
-    Usage: manage.py dedupe [--parser "Parser1 Scan" --parser "Parser2 Scan"...] [--hash_code_only] [--dedupe_only] [--dedupe_sync]'
+    Usage: manage.py dedupe [--parser "Parser1 Scan" --parser "Parser2 Scan"...] [--product 1 --product 2...] [--hash_code_only] [--dedupe_only] [--dedupe_sync]'
     """
-    help = 'Usage: manage.py dedupe [--parser "Parser1 Scan" --parser "Parser2 Scan"...] [--hash_code_only] [--dedupe_only] [--dedupe_sync]'
+    help = 'Usage: manage.py dedupe [--parser "Parser1 Scan" --parser "Parser2 Scan"...] [--product 1 --product 2...] [--hash_code_only] [--dedupe_only] [--dedupe_sync]'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -34,12 +27,21 @@ class Command(BaseCommand):
             help='''List of parsers for which hash_code needs recomputing (defaults to all parsers)'''
         )
 
+        parser.add_argument(
+            '--product',
+            dest='product',
+            action='append',
+            type=int,
+            help='''List of product ids for which hash_code needs recomputing (defaults to all products)'''
+        )
+
         parser.add_argument('--hash_code_only', action='store_true', help='Only compute hash codes')
         parser.add_argument('--dedupe_only', action='store_true', help='Only run deduplication')
         parser.add_argument('--dedupe_sync', action='store_true', help='Run dedupe in the foreground, default false')
 
     def handle(self, *args, **options):
         restrict_to_parsers = options['parser']
+        restrict_to_products = options['product']
         hash_code_only = options['hash_code_only']
         dedupe_only = options['dedupe_only']
         dedupe_sync = options['dedupe_sync']
@@ -50,17 +52,21 @@ class Command(BaseCommand):
         else:
             # add filter on id to make counts not slow on mysql
             findings = Finding.objects.all().filter(id__gt=0)
-            logger.info("######## Will process the full database with %d findings ########", findings.count())
+            if restrict_to_products is None:
+                logger.info("######## Will process the full database with %d findings ########", findings.count())
+
+        if restrict_to_products is not None:
+            findings = findings.filter(test__engagement__product__in=restrict_to_products)
+            logger.info("######## Will process only products %s and %d findings ########", restrict_to_products, findings.count())
 
         # Phase 1: update hash_codes without deduplicating
         if not dedupe_only:
             logger.info("######## Start Updating Hashcodes (foreground) ########")
 
-            # only prefetch here for hash_code calculation
-            finds = findings.prefetch_related('endpoints', 'test__test_type')
-            mass_model_updater(Finding, finds, lambda f: generate_hash_code(f), fields=['hash_code'], order='asc', log_prefix='hash_code computation ')
+            # the findings are processed in batches, with the endpoints and vulnerability ids prefetched per batch
+            changed = recompute_hash_codes(findings)
 
-            logger.info("######## Done Updating Hashcodes########")
+            logger.info("######## Done Updating Hashcodes, %d changed ########", changed)
 
         # Phase 2: deduplicate synchronously
         if not hash_code_only:
@@ -0,0 +1,45 @@
+import logging
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from dojo.tools.factory import describe_parser, discover_parsers
+
+logger = logging.getLogger(__name__)
+
+HEADER = '''# Generated by `python manage.py generate_parser_manifest`, do not edit.
+# Regenerate it whenever a parser is added or a scan type, description, requires_file,
+# requires_tool_type or api_scan_configuration_hint of a parser changes.
+'''
+
+
+def get_manifest():
+    return {scan_type: describe_parser(scan_type, parser) for scan_type, parser in discover_parsers().items()}
+
+
+def render_manifest(manifest):
+    lines = [HEADER, "PARSERS_MANIFEST = {"]
+    for scan_type in sorted(manifest):
+        lines.append(f"    {scan_type!r}: {{")
+        for key, value in manifest[scan_type].items():
+            lines.append(f"        {key!r}: {value!r},")
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+class Command(BaseCommand):
+    help = 'Generates dojo/tools/manifest.py, the list of scan types used to load the parsers lazily'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only check that the manifest is up to date')
+
+    def handle(self, *args, **options):
+        manifest_path = Path(__file__).resolve().parents[2] / 'tools' / 'manifest.py'
+        content = render_manifest(get_manifest())
+        if options['check']:
+            if manifest_path.read_text() != content:
+                raise SystemExit(f'{manifest_path} is out of date, run `python manage.py generate_parser_manifest`')
+            logger.info(f'{manifest_path} is up to date')
+        else:
+            manifest_path.write_text(content)
+            logger.info(f'{manifest_path} written')
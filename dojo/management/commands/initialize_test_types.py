@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from dojo.tools.factory import PARSERS
+from dojo.tools.factory import PARSERS, requires_tool_type
 from dojo.models import Test_Type, Tool_Type
 
 
@@ -10,8 +10,6 @@ class Command(BaseCommand):
         # called by the initializer to fill the table with test_types
         for scan_type in PARSERS:
             Test_Type.objects.get_or_create(name=scan_type)
-            parser = PARSERS[scan_type]
-            if hasattr(parser, 'requires_tool_type'):
-                tool_type = parser.requires_tool_type(scan_type)
-                if tool_type:
-                    Tool_Type.objects.get_or_create(name=tool_type)
+            tool_type = requires_tool_type(scan_type)
+            if tool_type:
+                Tool_Type.objects.get_or_create(name=tool_type)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from dojo.metrics.rollup import rebuild_finding_counts
+
+"""
+Rebuilds the daily finding counts used by the metrics from the findings, i.e. after findings have been changed
+directly in the database.
+"""
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily finding counts of all products, or of the given products'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--product', action='append', type=int, dest='products', help='Only rebuild the counts of the product with this id, can be repeated')
+
+    def handle(self, *args, **options):
+        count = rebuild_finding_counts(product_ids=options['products'])
+        self.stdout.write('Rebuilt %i daily finding counts' % count)
@@ -0,0 +1,299 @@
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from dojo.metrics.timeseries import bump_chart_version
+from dojo.models import Finding, Finding_Daily_Count, Product, Test
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+
+# the status of a finding counted as active in the metrics, see opened_in_period
+ACTIVE_QUERY = Q(verified=True, false_p=False, duplicate=False, out_of_scope=False, mitigated__isnull=True)
+
+_deferred_counts = threading.local()
+
+
+def get_upsert_options():
+    options = {'update_conflicts': True, 'update_fields': ['count']}
+    if connection.features.supports_update_conflicts_with_target:
+        # mysql updates the rows conflicting with any unique constraint and doesn't accept the fields
+        options['unique_fields'] = ['product', 'date', 'severity', 'status']
+    return options
+
+
+def get_date(value):
+    # findings created by the parsers might have a datetime or a string as date
+    return Finding._meta.get_field('date').to_python(value)
+
+
+def get_closed_date(mitigated):
+    mitigated = Finding._meta.get_field('mitigated').to_python(mitigated)
+    if mitigated is None:
+        return None
+    if timezone.is_naive(mitigated):
+        mitigated = timezone.make_aware(mitigated)
+    return timezone.localtime(mitigated, timezone.get_default_timezone()).date()
+
+
+def get_test_product_id(test_id):
+    # inside defer_finding_counts the products of the tests are looked up once per block
+    product_ids = getattr(_deferred_counts, 'product_ids', None)
+    if product_ids is not None and test_id in product_ids:
+        return product_ids[test_id]
+    product_id = Test.objects.filter(id=test_id).values_list('engagement__product_id', flat=True).first()
+    if product_ids is not None:
+        product_ids[test_id] = product_id
+    return product_id
+
+
+def get_product_id(finding):
+    if Finding.test.is_cached(finding) and Test.engagement.is_cached(finding.test):
+        return finding.test.engagement.product_id
+    return get_test_product_id(finding.test_id)
+
+
+def count_opened_findings(findings):
+    """
+    Counts the opened, active and accepted findings of a queryset per product, day and severity, in one query.
+    Returns unsaved instances of the rollup model.
+    """
+    counts = []
+    rows = findings.values('test__engagement__product', 'date', 'severity').annotate(
+        opened=Count('id', filter=Q(verified=True)),
+        active=Count('id', filter=ACTIVE_QUERY),
+        accepted=Count('id', filter=Q(risk_accepted=True)),
+    ).order_by()
+    for row in rows.iterator():
+        for status in (Finding_Daily_Count.OPENED, Finding_Daily_Count.ACTIVE, Finding_Daily_Count.ACCEPTED):
+            if row[status]:
+                counts.append(Finding_Daily_Count(product_id=row['test__engagement__product'], date=row['date'],
+                                                  severity=row['severity'], status=status, count=row[status]))
+    return counts
+
+
+def with_closed_date(findings):
+    return findings.filter(mitigated__isnull=False).annotate(
+        closed_date=TruncDate('mitigated', tzinfo=timezone.get_default_timezone()))
+
+
+def count_closed_findings(findings):
+    """
+    Counts the closed findings of a queryset annotated by with_closed_date per product, day and severity, in one query.
+    Returns unsaved instances of the rollup model.
+    """
+    rows = findings.values('test__engagement__product', 'closed_date', 'severity').annotate(closed=Count('id')).order_by()
+    return [Finding_Daily_Count(product_id=row['test__engagement__product'], date=row['closed_date'],
+                                severity=row['severity'], status=Finding_Daily_Count.CLOSED, count=row['closed'])
+            for row in rows.iterator()]
+
+
+def refresh_finding_counts(product_id, dates):
+    """
+    Recounts the findings of a product for the given days and invalidates the cached charts of the product.
+    """
+    dates = sorted({get_date(date) for date in dates if date is not None})
+    if product_id is None or not dates:
+        return
+    findings = Finding.objects.filter(test__engagement__product_id=product_id)
+    with transaction.atomic():
+        Finding_Daily_Count.objects.filter(product_id=product_id, date__in=dates).delete()
+        counts = count_opened_findings(findings.filter(date__in=dates))
+        # the range on mitigated narrows the findings down before their closed date is computed
+        closed = findings.filter(mitigated__range=[
+            timezone.make_aware(datetime.combine(dates[0] - timedelta(days=1), time.min)),
+            timezone.make_aware(datetime.combine(dates[-1] + timedelta(days=2), time.min))])
+        counts += count_closed_findings(with_closed_date(closed).filter(closed_date__in=dates))
+        # a concurrent refresh of the same days might have inserted the rows since the delete
+        Finding_Daily_Count.objects.bulk_create(counts, batch_size=BULK_BATCH_SIZE, **get_upsert_options())
+    # the cached charts are computed from the same findings
+    bump_chart_version(product_id)
+
+
+def rebuild_finding_counts(product_ids=None):
+    """
+    Recounts all findings, or the findings of the given products. Returns the number of rollup rows created.
+    """
+    findings = Finding.objects.all()
+    counts = Finding_Daily_Count.objects.all()
+    if product_ids is not None:
+        findings = findings.filter(test__engagement__product__in=product_ids)
+        counts = counts.filter(product__in=product_ids)
+
+    with transaction.atomic():
+        counts.delete()
+        new_counts = count_opened_findings(findings)
+        new_counts += count_closed_findings(with_closed_date(findings))
+        Finding_Daily_Count.objects.bulk_create(new_counts, batch_size=BULK_BATCH_SIZE)
+    if product_ids is None:
+        bump_chart_version()
+    else:
+        for product_id in product_ids:
+            bump_chart_version(product_id)
+    logger.info('rebuilt %i finding counts', len(new_counts))
+    return len(new_counts)
+
+
+def mark_finding_counts_dirty(product_id, dates):
+    """
+    Refreshes the counts of a product for the given days, or postpones the refresh to the end of the
+    outermost defer_finding_counts block.
+    """
+    dirty = getattr(_deferred_counts, 'dirty', None)
+    if dirty is not None:
+        dirty.setdefault(product_id, set()).update(get_date(date) for date in dates if date is not None)
+        return
+    refresh_finding_counts(product_id, dates)
+
+
+def get_finding_count_keys(product_id, finding, old_values=None):
+    """
+    Returns the rollup rows a finding is counted in as (product, date, severity, status), from the fields of the
+    finding or from old_values, the values of these fields before a change.
+    """
+    values = {field: getattr(finding, field) for field in ('date', 'severity', 'verified', 'false_p', 'duplicate',
+                                                           'out_of_scope', 'risk_accepted', 'mitigated')}
+    values.update(old_values or {})
+    if product_id is None:
+        return []
+    keys = []
+    date = get_date(values['date'])
+    if date is not None:
+        if values['verified']:
+            keys.append((product_id, date, values['severity'], Finding_Daily_Count.OPENED))
+            # see ACTIVE_QUERY
+            if not values['false_p'] and not values['duplicate'] and not values['out_of_scope'] and values['mitigated'] is None:
+                keys.append((product_id, date, values['severity'], Finding_Daily_Count.ACTIVE))
+        if values['risk_accepted']:
+            keys.append((product_id, date, values['severity'], Finding_Daily_Count.ACCEPTED))
+    closed_date = get_closed_date(values['mitigated'])
+    if closed_date is not None:
+        keys.append((product_id, closed_date, values['severity'], Finding_Daily_Count.CLOSED))
+    return keys
+
+
+def add_finding_counts(product_ids, deltas):
+    """
+    Adds a dict of deltas per (product, date, severity, status) to the rollup rows, 1 for the rows of a created
+    finding, -1 for a deleted one, and invalidates the charts of the products of the changed findings. Inside
+    defer_finding_counts the deltas are summed up and applied when the outermost block exits.
+    """
+    deferred = getattr(_deferred_counts, 'deltas', None)
+    if deferred is not None:
+        for key, delta in deltas.items():
+            deferred[key] = deferred.get(key, 0) + delta
+        _deferred_counts.charts.update(product_ids)
+        return
+    apply_finding_count_deltas(deltas, product_ids)
+
+
+def apply_finding_count_deltas(deltas, product_ids=()):
+    """
+    Applies a dict of deltas per (product, date, severity, status) to the rollup rows, with an update per row.
+    Rows are created on their first finding and deleted with their last one.
+    """
+    # the charts also show findings and fields that are not counted
+    product_ids = {product_id for product_id in product_ids if product_id is not None}
+    missing = {}
+    for (product_id, date, severity, status), delta in deltas.items():
+        if not delta:
+            continue
+        product_ids.add(product_id)
+        counts = Finding_Daily_Count.objects.filter(product_id=product_id, date=date, severity=severity, status=status)
+        if delta > 0:
+            if not counts.update(count=F('count') + delta):
+                try:
+                    with transaction.atomic():
+                        Finding_Daily_Count.objects.create(product_id=product_id, date=date, severity=severity, status=status,
+                                                           count=delta)
+                except IntegrityError:
+                    # created by a concurrent change in the meantime
+                    counts.update(count=F('count') + delta)
+        elif not counts.filter(count__gt=-delta).update(count=F('count') + delta):
+            if not counts.filter(count=-delta).delete()[0]:
+                # the row doesn't match the findings, e.g. after changes made without marking the findings dirty
+                missing.setdefault(product_id, set()).add(date)
+    for product_id, dates in missing.items():
+        logger.warning('finding counts of product %s out of sync, recounting %i days', product_id, len(dates))
+        refresh_finding_counts(product_id, dates)
+    for product_id in product_ids - set(missing):
+        bump_chart_version(product_id)
+
+
+def mark_findings_dirty(findings):
+    """
+    Marks the days of a list or queryset of findings as dirty, the day of the finding and the day it was mitigated.
+    Used by code that changes findings without saving them one by one, like bulk_create, bulk_update and update.
+    """
+    with defer_finding_counts():
+        if isinstance(findings, QuerySet):
+            rows = findings.values_list('test__engagement__product_id', 'date', 'mitigated').order_by().iterator()
+        else:
+            rows = ((get_product_id(finding), finding.date, finding.mitigated) for finding in findings)
+        for product_id, date, mitigated in rows:
+            mark_finding_counts_dirty(product_id, [date, get_closed_date(mitigated)])
+
+
+@contextmanager
+def defer_finding_counts():
+    """
+    Days marked as dirty inside this block are recounted once per product when the outermost block exits,
+    instead of once per changed finding. The deltas of single findings are summed up and applied at the same time,
+    except for the days that are recounted.
+    """
+    outermost = getattr(_deferred_counts, 'dirty', None) is None
+    if outermost:
+        _deferred_counts.dirty = {}
+        _deferred_counts.deltas = {}
+        _deferred_counts.charts = set()
+        _deferred_counts.product_ids = {}
+    try:
+        yield
+    finally:
+        if outermost:
+            dirty = _deferred_counts.dirty
+            deltas = _deferred_counts.deltas
+            charts = _deferred_counts.charts
+            _deferred_counts.dirty = None
+            _deferred_counts.deltas = None
+            _deferred_counts.charts = None
+            _deferred_counts.product_ids = None
+            product_ids = set(dirty) | charts | {key[0] for key, delta in deltas.items() if delta}
+            product_ids.discard(None)
+            if product_ids:
+                # the products deleted inside the block are gone together with their counts
+                existing = set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
+                apply_finding_count_deltas({key: delta for key, delta in deltas.items()
+                                            if key[0] in existing and key[1] not in dirty.get(key[0], ())},
+                                           charts & existing - set(dirty))
+                for product_id, dates in dirty.items():
+                    if product_id in existing:
+                        refresh_finding_counts(product_id, dates)
+
+
+def get_finding_counts(status, start_date, end_date, products=None, product_types=None):
+    """
+    Returns the rollup rows of a status for the days between start_date and end_date, both included.
+    products and product_types restrict the rows to those querysets or lists of products and product types.
+    """
+    counts = Finding_Daily_Count.objects.filter(status=status, date__range=[start_date, end_date])
+    if products is not None:
+        counts = counts.filter(product__in=products)
+    if product_types is not None:
+        counts = counts.filter(product__prod_type__in=product_types)
+    return counts
+
+
+def sum_finding_counts(counts, *fields):
+    """
+    Sums up rollup rows grouped by the given fields, in one query.
+    """
+    return counts.values(*fields).annotate(total=Sum('count')).order_by(*fields)
@@ -0,0 +1,65 @@
+from django.db.models import signals
+from django.db.models.query import QuerySet
+from django.dispatch import receiver
+from fieldsignals import post_save_changed
+
+from dojo.metrics import rollup
+from dojo.metrics.timeseries import bump_chart_version
+from dojo.models import Finding, Finding_Daily_Count, Product, Product_Type
+
+# fields of a finding that determine in which rollup rows it is counted
+FINDING_COUNT_FIELDS = ['test', 'date', 'severity', 'verified', 'false_p', 'duplicate', 'out_of_scope', 'risk_accepted',
+                        'mitigated']
+
+
+@receiver(signals.post_save, sender=Finding)
+def finding_counts_post_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        product_id = rollup.get_product_id(instance)
+        rollup.add_finding_counts([product_id], dict.fromkeys(rollup.get_finding_count_keys(product_id, instance), 1))
+
+
+def finding_counts_changed(sender, instance, changed_fields=None, created=False, **kwargs):
+    if created:
+        return
+    old_values = {field: old for field, (old, new) in changed_fields.items()}
+    old_test_id = old_values.pop('test', instance.test_id)
+    product_id = rollup.get_product_id(instance)
+    old_product_id = rollup.get_test_product_id(old_test_id) if old_test_id != instance.test_id else product_id
+    # the finding moves from the rows of the old values to the rows of the new ones, rows in both are not touched
+    deltas = dict.fromkeys(rollup.get_finding_count_keys(old_product_id, instance, old_values), -1)
+    for key in rollup.get_finding_count_keys(product_id, instance):
+        deltas[key] = deltas.get(key, 0) + 1
+    rollup.add_finding_counts([old_product_id, product_id], deltas)
+
+
+post_save_changed.connect(finding_counts_changed, sender=Finding, fields=FINDING_COUNT_FIELDS)
+
+
+def finding_chart_changed(sender, instance, changed_fields=None, created=False, **kwargs):
+    # the charts also depend on fields that are not counted, changes of counted fields refresh the counts and the charts
+    if not created:
+        bump_chart_version(rollup.get_product_id(instance))
+
+
+post_save_changed.connect(finding_chart_changed, sender=Finding, fields=['active'])
+
+
+def is_product_delete(origin):
+    # the products are also deleted together with their product type
+    models = (Product, Product_Type)
+    return isinstance(origin, models) or (isinstance(origin, QuerySet) and origin.model in models)
+
+
+@receiver(signals.post_delete, sender=Finding)
+def finding_counts_post_delete(sender, instance, origin=None, **kwargs):
+    # the findings deleted together with their product don't need to be recounted, the counts are deleted with it
+    if not is_product_delete(origin):
+        product_id = rollup.get_product_id(instance)
+        rollup.add_finding_counts([product_id], dict.fromkeys(rollup.get_finding_count_keys(product_id, instance), -1))
+
+
+@receiver(signals.post_delete, sender=Product)
+def finding_counts_product_post_delete(sender, instance, **kwargs):
+    # the rollup rows have no database constraint on the product, so they are not deleted by the database
+    Finding_Daily_Count.objects.filter(product_id=instance.id).delete()
@@ -0,0 +1,59 @@
+import hashlib
+import logging
+
+from django.core.cache import cache
+
+from dojo.shared_cache import bump_version, get_versions, is_shared_cache
+
+logger = logging.getLogger(__name__)
+
+CHART_CACHE_KEY = 'chart_{}_{}'
+CHART_VERSION_CACHE_KEY = 'chart_version_{}'
+# the version of all products, bumped when all counts are rebuilt
+CHART_VERSION_ALL = 'all'
+# the windows of the charts move with the current day, older entries are not read anymore
+CHART_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_chart_version_key(product_id):
+    return CHART_VERSION_CACHE_KEY.format(product_id)
+
+
+def bump_chart_version(product_id=None):
+    """
+    Invalidates the cached charts containing the findings of a product, or of all products.
+    """
+    bump_version(get_chart_version_key(CHART_VERSION_ALL if product_id is None else product_id))
+
+
+def get_chart_versions(product_ids):
+    """
+    Returns the versions of the products and of all products.
+    """
+    keys = [get_chart_version_key(CHART_VERSION_ALL)] + [get_chart_version_key(product_id) for product_id in product_ids]
+    return get_versions(keys)
+
+
+def get_chart_key(name, product_ids, window):
+    product_ids = sorted(set(product_ids))
+    versions = get_chart_versions(product_ids)
+    digest = hashlib.sha256(repr((window, product_ids, versions)).encode()).hexdigest()
+    return CHART_CACHE_KEY.format(name, digest)
+
+
+def get_cached_series(name, product_ids, window, compute):
+    """
+    Returns the data of a chart over the findings of the products for a window, like the start and end of the chart.
+    The data is computed by compute once per set of products and window, and shared by all users authorized for the
+    same products, until a finding of one of the products changes. Without a shared cache the data is computed on
+    every call, the changes made by other processes would not be seen.
+    """
+    if not is_shared_cache():
+        return compute()
+    key = get_chart_key(name, product_ids, window)
+    series = cache.get(key)
+    if series is None:
+        logger.debug('computing chart %s for %i products', name, len(set(product_ids)))
+        series = compute()
+        cache.set(key, series, CHART_CACHE_TIMEOUT)
+    return series
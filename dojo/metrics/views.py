@@ -4,15 +4,19 @@ import logging
 import operator
 from calendar import monthrange
 from collections import OrderedDict
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
+from itertools import chain
 from math import ceil
 from operator import itemgetter
 
+import pytz
+
 from dateutil.relativedelta import relativedelta
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
 from django.urls import reverse
 from django.db.models import Q, Sum, Case, When, IntegerField, Value, Count
+from django.db.models.functions import TruncDate
 from django.db.models.query import QuerySet
 from django.http import HttpResponseRedirect
 from django.shortcuts import render, get_object_or_404
@@ -21,11 +25,14 @@ from django.views.decorators.cache import cache_page
 from django.utils import timezone
 
 from dojo.filters import MetricsFindingFilter, UserFilter, MetricsEndpointFilter
-from dojo.forms import SimpleMetricsForm, ProductTypeCountsForm
-from dojo.models import Product_Type, Finding, Product, Engagement, Test, \
+from dojo.forms import SimpleMetricsForm, ProductTypeCountsForm, ProductCountsForm
+from dojo.metrics.rollup import get_finding_counts, sum_finding_counts
+from dojo.metrics.timeseries import get_cached_series
+from dojo.models import Product_Type, Finding, Finding_Daily_Count, Product, Engagement, Test, \
     Risk_Acceptance, Dojo_User, Endpoint_Status
-from dojo.utils import get_page_items, add_breadcrumb, findings_this_period, opened_in_period, count_findings, \
-    get_period_counts, get_system_setting, get_punchcard_data, queryset_check
+from dojo.utils import get_page_items, add_breadcrumb, findings_this_period, count_findings, \
+    get_period_counts, get_system_setting, get_punchcard_data, queryset_check, get_daily_finding_counts, get_period_date, \
+    count_in_period, sum_daily_finding_counts
 from functools import reduce
 from django.views.decorators.vary import vary_on_cookie
 from dojo.authorization.roles_permissions import Permissions
@@ -311,70 +318,141 @@ def endpoint_querys(prod_type, request):
     }
 
 
-def get_in_period_details(findings):
-    in_period_counts = {"Critical": 0, "High": 0, "Medium": 0,
-                        "Low": 0, "Info": 0, "Total": 0}
-    in_period_details = {}
-    age_detail = [0, 0, 0, 0]
-
-    for obj in findings:
-        if 0 <= obj.age <= 30:
-            age_detail[0] += 1
-        elif 30 < obj.age <= 60:
-            age_detail[1] += 1
-        elif 60 < obj.age <= 90:
-            age_detail[2] += 1
-        elif obj.age > 90:
-            age_detail[3] += 1
-
-        in_period_counts[obj.severity] += 1
-        in_period_counts['Total'] += 1
-
-        if obj.test.engagement.product.name not in in_period_details:
-            in_period_details[obj.test.engagement.product.name] = {
-                'path': reverse('product_open_findings', args=(obj.test.engagement.product.id,)),
+def count_per_product(findings, prefix=''):
+    """
+    Counts the findings of a queryset per product and severity, in one query. prefix is the path to the findings,
+    like 'finding__' for endpoint statuses.
+    """
+    return findings.values_list(prefix + 'test__engagement__product', prefix + 'test__engagement__product__name', prefix + 'severity') \
+        .annotate(count=Count('id')).order_by(prefix + 'test__engagement__product__name')
+
+
+def get_period_details(counts, get_path):
+    """
+    Sums up counts of (product id, product name, severity, count) per severity and per product.
+    """
+    period_counts = {"Critical": 0, "High": 0, "Medium": 0,
+                     "Low": 0, "Info": 0, "Total": 0}
+    period_details = {}
+
+    for product_id, product_name, severity, count in counts:
+        if severity not in period_counts:
+            continue
+        period_counts[severity] += count
+        period_counts['Total'] += count
+
+        if product_name not in period_details:
+            period_details[product_name] = {
+                'path': get_path(product_id),
                 'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Info': 0, 'Total': 0}
-        in_period_details[obj.test.engagement.product.name][obj.severity] += 1
-        in_period_details[obj.test.engagement.product.name]['Total'] += 1
+        period_details[product_name][severity] += count
+        period_details[product_name]['Total'] += count
+
+    return period_counts, period_details
+
+
+def get_in_period_details(findings, prefix=''):
+    in_period_counts, in_period_details = get_period_details(
+        count_per_product(findings, prefix),
+        lambda product_id: reverse('product_open_findings', args=(product_id,)))
+    age_detail = get_age_detail(findings, prefix)
 
     return in_period_counts, in_period_details, age_detail
 
 
-def get_accepted_in_period_details(findings):
-    accepted_in_period_details = {}
-    for obj in findings:
-        if obj.test.engagement.product.name not in accepted_in_period_details:
-            accepted_in_period_details[obj.test.engagement.product.name] = {
-                'path': reverse('accepted_findings') + '?test__engagement__product=' + str(obj.test.engagement.product.id),
-                'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Info': 0, 'Total': 0}
-        accepted_in_period_details[
-            obj.test.engagement.product.name
-        ][obj.severity] += 1
-        accepted_in_period_details[obj.test.engagement.product.name]['Total'] += 1
+def get_accepted_in_period_details(findings, prefix=''):
+    _, accepted_in_period_details = get_period_details(
+        count_per_product(findings, prefix),
+        lambda product_id: reverse('accepted_findings') + '?test__engagement__product=' + str(product_id))
 
     return accepted_in_period_details
 
 
-def get_closed_in_period_details(findings):
-    closed_in_period_counts = {"Critical": 0, "High": 0, "Medium": 0,
-                               "Low": 0, "Info": 0, "Total": 0}
-    closed_in_period_details = {}
+def get_closed_in_period_details(findings, prefix=''):
+    return get_period_details(
+        count_per_product(findings, prefix),
+        lambda product_id: reverse('closed_findings') + '?test__engagement__product=' + str(product_id))
 
-    for obj in findings:
-        closed_in_period_counts[obj.severity] += 1
-        closed_in_period_counts['Total'] += 1
 
-        if obj.test.engagement.product.name not in closed_in_period_details:
-            closed_in_period_details[obj.test.engagement.product.name] = {
-                'path': reverse('closed_findings') + '?test__engagement__product=' + str(
-                    obj.test.engagement.product.id),
-                'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Info': 0, 'Total': 0}
-        closed_in_period_details[
-            obj.test.engagement.product.name
-        ][obj.severity] += 1
-        closed_in_period_details[obj.test.engagement.product.name]['Total'] += 1
+# request parameters of the finding metrics for which the details can be read from the daily finding counts
+FINDING_COUNTS_PARAMETERS = {'date', 'type', 'view', 'test__engagement__product__prod_type'}
+
+
+def use_finding_counts(request, view):
+    return view == 'Finding' and set(request.GET.keys()) <= FINDING_COUNTS_PARAMETERS
+
+
+def get_period_details_from_counts(counts, get_path):
+    """
+    Counterpart of get_in_period_details, get_accepted_in_period_details and get_closed_in_period_details on the
+    daily finding counts.
+    """
+    return get_period_details(
+        ((count['product'], count['product__name'], count['severity'], count['total'])
+         for count in sum_finding_counts(counts, 'product__name', 'product', 'severity')),
+        get_path)
 
-    return closed_in_period_counts, closed_in_period_details
+
+def get_age_detail(findings, prefix=''):
+    """
+    Counts the findings of a queryset per age bucket, with the findings grouped by their date and the date they
+    have been mitigated in the database. prefix is the path to the findings, like 'finding__' for endpoint statuses.
+    """
+    age_detail = [0, 0, 0, 0]
+
+    open_findings = findings.filter(**{prefix + 'mitigated__isnull': True}).values_list(prefix + 'date') \
+        .annotate(count=Count('id')).order_by()
+    mitigated_findings = findings.filter(**{prefix + 'mitigated__isnull': False}) \
+        .annotate(mitigated_date=TruncDate(prefix + 'mitigated', tzinfo=pytz.utc)) \
+        .values_list(prefix + 'date', 'mitigated_date').annotate(count=Count('id')).order_by()
+
+    rows = chain(((finding_date, None, count) for finding_date, count in open_findings), mitigated_findings)
+    for finding_date, mitigated, count in rows:
+        if mitigated:
+            mitigated = timezone.make_aware(datetime.combine(mitigated, time.min), pytz.utc)
+        age = Finding(date=finding_date, mitigated=mitigated).age
+        if 0 <= age <= 30:
+            age_detail[0] += count
+        elif 30 < age <= 60:
+            age_detail[1] += count
+        elif 60 < age <= 90:
+            age_detail[2] += count
+        elif age > 90:
+            age_detail[3] += count
+
+    return age_detail
+
+
+def get_finding_details_from_counts(request, prod_type, filters):
+    start_date = filters['start_date'].date()
+    end_date = filters['end_date'].date()
+    products = get_authorized_products(Permissions.Finding_View, user=request.user)
+    # same product types as the queries of finding_querys
+    filtered_product_types = request.GET.getlist('test__engagement__product__prod_type') or None
+    product_types = prod_type if len(prod_type) > 0 else None
+
+    in_period_counts, in_period_details = get_period_details_from_counts(
+        get_finding_counts(Finding_Daily_Count.OPENED, start_date, end_date, products=products, product_types=filtered_product_types),
+        lambda product_id: reverse('product_open_findings', args=(product_id,)))
+
+    _, accepted_in_period_details = get_period_details_from_counts(
+        get_finding_counts(Finding_Daily_Count.ACCEPTED, start_date, end_date, products=products, product_types=product_types),
+        lambda product_id: reverse('accepted_findings') + '?test__engagement__product=' + str(product_id))
+
+    closed_in_period_counts, closed_in_period_details = get_period_details_from_counts(
+        get_finding_counts(Finding_Daily_Count.CLOSED, start_date, end_date, products=products, product_types=product_types),
+        lambda product_id: reverse('closed_findings') + '?test__engagement__product=' + str(product_id))
+
+    age_detail = get_age_detail(queryset_check(filters['all']))
+
+    return {
+        'in_period_counts': in_period_counts,
+        'in_period_details': in_period_details,
+        'age_detail': age_detail,
+        'accepted_in_period_details': accepted_in_period_details,
+        'closed_in_period_counts': closed_in_period_counts,
+        'closed_in_period_details': closed_in_period_details,
+    }
 
 
 @cache_page(60 * 5)  # cache for 5 minutes
@@ -409,20 +487,18 @@ def metrics(request, mtype):
         page_name = _('Product Type Metrics by Affected Endpoints')
         filters = endpoint_querys(prod_type, request)
 
-    in_period_counts, in_period_details, age_detail = get_in_period_details([
-        obj.finding if view == 'Endpoint' else obj
-        for obj in queryset_check(filters['all'])
-    ])
-
-    accepted_in_period_details = get_accepted_in_period_details([
-        obj.finding if view == 'Endpoint' else obj
-        for obj in filters['accepted']
-    ])
-
-    closed_in_period_counts, closed_in_period_details = get_closed_in_period_details([
-        obj.finding if view == 'Endpoint' else obj
-        for obj in filters['closed']
-    ])
+    if use_finding_counts(request, view):
+        # without filters other than the date and the product type the details are read from the daily finding counts
+        details = get_finding_details_from_counts(request, prod_type, filters)
+        in_period_counts, in_period_details, age_detail = details['in_period_counts'], details['in_period_details'], details['age_detail']
+        accepted_in_period_details = details['accepted_in_period_details']
+        closed_in_period_counts, closed_in_period_details = details['closed_in_period_counts'], details['closed_in_period_details']
+    else:
+        # endpoint statuses are counted by their findings
+        prefix = 'finding__' if view == 'Endpoint' else ''
+        in_period_counts, in_period_details, age_detail = get_in_period_details(queryset_check(filters['all']), prefix)
+        accepted_in_period_details = get_accepted_in_period_details(filters['accepted'], prefix)
+        closed_in_period_counts, closed_in_period_details = get_closed_in_period_details(filters['closed'], prefix)
 
     punchcard = list()
     ticks = list()
@@ -465,8 +541,34 @@ simple metrics for easy reporting
 """
 
 
-@cache_page(60 * 5)  # cache for 5 minutes
-@vary_on_cookie
+def count_simple_metrics(product_type, year, month):
+    """
+    Counts the findings of a product type found in a month per severity, and how many of them have been closed in
+    the month, in one query.
+    """
+    start = datetime(year, month, 1, tzinfo=pytz.utc)
+    end = start + relativedelta(months=1)
+    main_severities = ['Critical', 'High', 'Medium', 'Low']
+    return Finding.objects.filter(test__engagement__product__prod_type=product_type,
+                                  verified=True,
+                                  false_p=False,
+                                  duplicate=False,
+                                  out_of_scope=False,
+                                  date__month=month,
+                                  date__year=year,
+                                  ).aggregate(
+        Total=Count('id'),
+        S0=Count('id', filter=Q(severity='Critical')),
+        S1=Count('id', filter=Q(severity='High')),
+        S2=Count('id', filter=Q(severity='Medium')),
+        S3=Count('id', filter=Q(severity='Low')),
+        S4=Count('id', filter=~Q(severity__in=main_severities)),
+        # all findings are found in the month
+        Opened=Count('id'),
+        Closed=Count('id', filter=Q(mitigated__gte=start, mitigated__lt=end)),
+    )
+
+
 def simple_metrics(request):
     page_name = _('Simple Metrics')
     now = timezone.now()
@@ -487,53 +589,10 @@ def simple_metrics(request):
     product_types = get_authorized_product_types(Permissions.Product_Type_View)
     product_types = product_types.prefetch_related('prod_type')
     for pt in product_types:
-        total_critical = []
-        total_high = []
-        total_medium = []
-        total_low = []
-        total_info = []
-        total_closed = []
-        total_opened = []
-        findings_broken_out = {}
-
-        total = Finding.objects.filter(test__engagement__product__prod_type=pt,
-                                       verified=True,
-                                       false_p=False,
-                                       duplicate=False,
-                                       out_of_scope=False,
-                                       date__month=now.month,
-                                       date__year=now.year,
-                                       ).distinct()
-
-        for f in total:
-            if f.severity == "Critical":
-                total_critical.append(f)
-            elif f.severity == 'High':
-                total_high.append(f)
-            elif f.severity == 'Medium':
-                total_medium.append(f)
-            elif f.severity == 'Low':
-                total_low.append(f)
-            else:
-                total_info.append(f)
-
-            if f.mitigated and f.mitigated.year == now.year and f.mitigated.month == now.month:
-                total_closed.append(f)
-
-            if f.date.year == now.year and f.date.month == now.month:
-                total_opened.append(f)
-
-        findings_broken_out['Total'] = len(total)
-        findings_broken_out['S0'] = len(total_critical)
-        findings_broken_out['S1'] = len(total_high)
-        findings_broken_out['S2'] = len(total_medium)
-        findings_broken_out['S3'] = len(total_low)
-        findings_broken_out['S4'] = len(total_info)
-
-        findings_broken_out['Opened'] = len(total_opened)
-        findings_broken_out['Closed'] = len(total_closed)
-
-        findings_by_product_type[pt] = findings_broken_out
+        # the counts are cached per product type and month, and shared by all users
+        findings_by_product_type[pt] = get_cached_series(
+            'simple_metrics', [product.id for product in pt.prod_type.all()], (pt.id, now.year, now.month),
+            lambda: count_simple_metrics(pt, now.year, now.month))
 
     add_breadcrumb(title=page_name, top_level=True, request=request)
 
@@ -546,6 +605,104 @@ def simple_metrics(request):
     })
 
 
+def count_in_month(start_date, end_date, end_of_month, **filters):
+    """
+    The findings opened in a month and in each of the 12 months before, the findings closed in the month and the active
+    findings, in two queries on the daily finding counts selected by filters, like product__prod_type=pt.
+    """
+    daily_counts, before = get_daily_finding_counts(get_period_date(start_date + relativedelta(months=-12)), end_date, **filters)
+
+    oip = count_in_period(daily_counts, before, start_date, end_date)
+
+    # trending data - 12 months
+    opened_in_period_list = [
+        count_in_period(daily_counts, before, start_date + relativedelta(months=-x), end_of_month + relativedelta(months=-x))
+        for x in range(12, 0, -1)]
+    opened_in_period_list.append(oip)
+
+    # closed findings of the month and active findings opened before the end of the month
+    closed = sum_daily_finding_counts(daily_counts, Finding_Daily_Count.CLOSED, start_date.date(), end_date.date())
+    overall = sum_daily_finding_counts(daily_counts, Finding_Daily_Count.ACTIVE, end_date=end_date.date() - timedelta(days=1))
+    total_overall = sum_daily_finding_counts(daily_counts, Finding_Daily_Count.ACTIVE, end_date=end_date.date())
+
+    cip = {'S0': 0,
+           'S1': 0,
+           'S2': 0,
+           'S3': 0,
+           'Total': None}
+
+    aip = {'S0': 0,
+           'S1': 0,
+           'S2': 0,
+           'S3': 0,
+           'Total': None}
+
+    for severity in ('Critical', 'High', 'Medium', 'Low'):
+        if closed.get(severity):
+            cip[Finding.get_numerical_severity(severity)] = closed[severity]
+            cip['Total'] = (cip['Total'] or 0) + closed[severity]
+        # the active findings opened before the 12 months are not part of the daily counts
+        overall_count = overall.get(severity, 0) + before.get(severity, 0)
+        if overall_count:
+            aip[Finding.get_numerical_severity(severity)] = overall_count
+        total_overall_count = total_overall.get(severity, 0) + before.get(severity, 0)
+        if total_overall_count:
+            aip['Total'] = (aip['Total'] or 0) + total_overall_count
+
+    return oip, opened_in_period_list, cip, aip
+
+
+def get_current_findings(end_date, **filters):
+    return Finding.objects.filter(date__lte=end_date,
+                                  verified=True,
+                                  false_p=False,
+                                  duplicate=False,
+                                  out_of_scope=False,
+                                  mitigated__isnull=True,
+                                  severity__in=(
+                                      'Critical', 'High', 'Medium', 'Low'),
+                                  **filters).prefetch_related(
+        'test__engagement__product',
+        'test__engagement__product__prod_type',
+        'test__engagement__risk_acceptance',
+        'reporter').order_by(
+        'numerical_severity')
+
+
+def get_counts_period(form):
+    """
+    Returns the first day, the last day and the end of the last day of the month selected in a counts form.
+    """
+    month = int(form.cleaned_data['month'])
+    year = int(form.cleaned_data['year'])
+    today = timezone.now()
+    first_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    first_of_month = first_of_month.replace(month=month, year=year)
+
+    month_requested = datetime(year, month, 1)
+
+    end_of_month = month_requested.replace(day=monthrange(month_requested.year, month_requested.month)[1],
+                                           hour=23, minute=59, second=59, microsecond=999999)
+    start_date = first_of_month
+    start_date = datetime(start_date.year,
+                          start_date.month, start_date.day,
+                          tzinfo=timezone.get_current_timezone())
+    end_date = end_of_month
+    end_date = datetime(end_date.year,
+                        end_date.month, end_date.day,
+                        tzinfo=timezone.get_current_timezone())
+    return start_date, end_date, end_of_month
+
+
+def get_current_month():
+    today = timezone.now()
+    first_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    mid_month = first_of_month.replace(day=15, hour=23, minute=59, second=59, microsecond=999999)
+    end_of_month = mid_month.replace(day=monthrange(today.year, today.month)[1], hour=23, minute=59, second=59,
+                                     microsecond=999999)
+    return first_of_month, end_of_month
+
+
 # @cache_page(60 * 5)  # cache for 5 minutes
 # @vary_on_cookie
 def product_type_counts(request):
@@ -557,97 +714,18 @@ def product_type_counts(request):
     all_current_in_pt = None
     top_ten = None
     pt = None
-    today = timezone.now()
-    first_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    mid_month = first_of_month.replace(day=15, hour=23, minute=59, second=59, microsecond=999999)
-    end_of_month = mid_month.replace(day=monthrange(today.year, today.month)[1], hour=23, minute=59, second=59,
-                                     microsecond=999999)
-    start_date = first_of_month
-    end_date = end_of_month
+    start_date, end_date = get_current_month()
 
     if request.method == 'GET' and 'month' in request.GET and 'year' in request.GET and 'product_type' in request.GET:
         form = ProductTypeCountsForm(request.GET)
         if form.is_valid():
             pt = form.cleaned_data['product_type']
             user_has_permission_or_403(request.user, pt, Permissions.Product_Type_View)
-            month = int(form.cleaned_data['month'])
-            year = int(form.cleaned_data['year'])
-            first_of_month = first_of_month.replace(month=month, year=year)
-
-            month_requested = datetime(year, month, 1)
-
-            end_of_month = month_requested.replace(day=monthrange(month_requested.year, month_requested.month)[1],
-                                                   hour=23, minute=59, second=59, microsecond=999999)
-            start_date = first_of_month
-            start_date = datetime(start_date.year,
-                                  start_date.month, start_date.day,
-                                  tzinfo=timezone.get_current_timezone())
-            end_date = end_of_month
-            end_date = datetime(end_date.year,
-                                end_date.month, end_date.day,
-                                tzinfo=timezone.get_current_timezone())
-
-            oip = opened_in_period(start_date, end_date, pt)
-
-            # trending data - 12 months
-            for x in range(12, 0, -1):
-                opened_in_period_list.append(
-                    opened_in_period(start_date + relativedelta(months=-x), end_of_month + relativedelta(months=-x),
-                                     pt))
-
-            opened_in_period_list.append(oip)
-
-            closed_in_period = Finding.objects.filter(mitigated__date__range=[start_date, end_date],
-                                                      test__engagement__product__prod_type=pt,
-                                                      severity__in=('Critical', 'High', 'Medium', 'Low')).values(
-                'numerical_severity').annotate(Count('numerical_severity')).order_by('numerical_severity')
-
-            total_closed_in_period = Finding.objects.filter(mitigated__date__range=[start_date, end_date],
-                                                            test__engagement__product__prod_type=pt,
-                                                            severity__in=(
-                                                                'Critical', 'High', 'Medium', 'Low')).aggregate(
-                total=Sum(
-                    Case(When(severity__in=('Critical', 'High', 'Medium', 'Low'),
-                              then=Value(1)),
-                         output_field=IntegerField())))['total']
-
-            overall_in_pt = Finding.objects.filter(date__lt=end_date,
-                                                   verified=True,
-                                                   false_p=False,
-                                                   duplicate=False,
-                                                   out_of_scope=False,
-                                                   mitigated__isnull=True,
-                                                   test__engagement__product__prod_type=pt,
-                                                   severity__in=('Critical', 'High', 'Medium', 'Low')).values(
-                'numerical_severity').annotate(Count('numerical_severity')).order_by('numerical_severity')
-
-            total_overall_in_pt = Finding.objects.filter(date__lte=end_date,
-                                                         verified=True,
-                                                         false_p=False,
-                                                         duplicate=False,
-                                                         out_of_scope=False,
-                                                         mitigated__isnull=True,
-                                                         test__engagement__product__prod_type=pt,
-                                                         severity__in=('Critical', 'High', 'Medium', 'Low')).aggregate(
-                total=Sum(
-                    Case(When(severity__in=('Critical', 'High', 'Medium', 'Low'),
-                              then=Value(1)),
-                         output_field=IntegerField())))['total']
-
-            all_current_in_pt = Finding.objects.filter(date__lte=end_date,
-                                                       verified=True,
-                                                       false_p=False,
-                                                       duplicate=False,
-                                                       out_of_scope=False,
-                                                       mitigated__isnull=True,
-                                                       test__engagement__product__prod_type=pt,
-                                                       severity__in=(
-                                                           'Critical', 'High', 'Medium', 'Low')).prefetch_related(
-                'test__engagement__product',
-                'test__engagement__product__prod_type',
-                'test__engagement__risk_acceptance',
-                'reporter').order_by(
-                'numerical_severity')
+            start_date, end_date, end_of_month = get_counts_period(form)
+
+            oip, opened_in_period_list, cip, aip = count_in_month(start_date, end_date, end_of_month, product__prod_type=pt)
+
+            all_current_in_pt = get_current_findings(end_date, test__engagement__product__prod_type=pt)
 
             top_ten = Product.objects.filter(engagement__test__finding__date__lte=end_date,
                                              engagement__test__finding__verified=True,
@@ -659,24 +737,6 @@ def product_type_counts(request):
                                                  'Critical', 'High', 'Medium', 'Low'),
                                              prod_type=pt)
             top_ten = severity_count(top_ten, 'annotate', 'engagement__test__finding__severity').order_by('-critical', '-high', '-medium', '-low')[:10]
-
-            cip = {'S0': 0,
-                   'S1': 0,
-                   'S2': 0,
-                   'S3': 0,
-                   'Total': total_closed_in_period}
-
-            aip = {'S0': 0,
-                   'S1': 0,
-                   'S2': 0,
-                   'S3': 0,
-                   'Total': total_overall_in_pt}
-
-            for o in closed_in_period:
-                cip[o['numerical_severity']] = o['numerical_severity__count']
-
-            for o in overall_in_pt:
-                aip[o['numerical_severity']] = o['numerical_severity__count']
         else:
             messages.add_message(request, messages.ERROR, _("Please choose month and year and the Product Type."),
                                  extra_tags='alert-danger')
@@ -698,6 +758,46 @@ def product_type_counts(request):
                   )
 
 
+def product_counts(request):
+    form = ProductCountsForm()
+    opened_in_period_list = []
+    oip = None
+    cip = None
+    aip = None
+    all_current_in_product = None
+    product = None
+    start_date, end_date = get_current_month()
+
+    if request.method == 'GET' and 'month' in request.GET and 'year' in request.GET and 'product' in request.GET:
+        form = ProductCountsForm(request.GET)
+        if form.is_valid():
+            product = form.cleaned_data['product']
+            user_has_permission_or_403(request.user, product, Permissions.Product_View)
+            start_date, end_date, end_of_month = get_counts_period(form)
+
+            oip, opened_in_period_list, cip, aip = count_in_month(start_date, end_date, end_of_month, product=product)
+
+            all_current_in_product = get_current_findings(end_date, test__engagement__product=product)
+        else:
+            messages.add_message(request, messages.ERROR, _("Please choose month and year and the Product."),
+                                 extra_tags='alert-danger')
+
+    add_breadcrumb(title=_("Bi-Weekly Metrics"), top_level=True, request=request)
+
+    return render(request,
+                  'dojo/pt_counts.html',
+                  {'form': form,
+                   'start_date': start_date,
+                   'end_date': end_date,
+                   'opened_in_period': oip,
+                   'trending_opened': opened_in_period_list,
+                   'closed_in_period': cip,
+                   'overall_in_pt': aip,
+                   'all_current_in_pt': all_current_in_product,
+                   'product': product}
+                  )
+
+
 def engineer_metrics(request):
     # only superusers can select other users to view
     if request.user.is_superuser:
@@ -2,10 +2,12 @@ from django.http import HttpResponseRedirect
 from django.conf import settings
 from urllib.parse import quote
 from re import compile
+import copy
 import logging
 from threading import local
-from django.db import models
+from django.db import connection, models, transaction
 from django.urls import reverse
+from dojo.shared_cache import bump_version, get_version, is_shared_cache
 
 
 logger = logging.getLogger(__name__)
@@ -96,12 +98,28 @@ class DojoSytemSettingsMiddleware(object):
     @classmethod
     def load(cls):
         from dojo.models import System_Settings
-        system_settings = System_Settings.objects.get(no_cache=True)
+        system_settings = System_Settings.objects.get_from_process_cache()
         cls._thread_local.system_settings = system_settings
         return system_settings
 
 
+SYSTEM_SETTINGS_VERSION_CACHE_KEY = 'system_settings_version'
+
+
+def get_system_settings_version():
+    return get_version(SYSTEM_SETTINGS_VERSION_CACHE_KEY)
+
+
+def bump_system_settings_version():
+    bump_version(SYSTEM_SETTINGS_VERSION_CACHE_KEY)
+
+
 class System_Settings_Manager(models.Manager):
+    # the system settings loaded by this process, with the version of the shared cache they were loaded for
+    _process_cache = None
+    # per thread, like the database connection: the system settings were saved in a transaction that is not
+    # committed yet
+    _transaction_state = local()
 
     def get_from_db(self, *args, **kwargs):
         # logger.debug('refreshing system_settings from db')
@@ -115,6 +133,59 @@ class System_Settings_Manager(models.Manager):
             return System_Settings()
         return from_db
 
+    def get_from_process_cache(self):
+        """
+        Returns the system settings kept in the memory of the process, for celery tasks and other code running outside
+        of a request. They are loaded again when the version in the shared cache changes after a save by any process.
+        Without a shared cache the other processes would never see the change, so the settings are read from the
+        database every time.
+        """
+        if not is_shared_cache():
+            return self.get_from_db()
+
+        cls = System_Settings_Manager
+        if cls.is_uncommitted():
+            if connection.in_atomic_block:
+                # other transactions don't see the changes yet, this one reads them from the database
+                return self.get_from_db()
+            # the transaction ended without a commit
+            cls._transaction_state.uncommitted = False
+            bump_system_settings_version()
+
+        version = get_system_settings_version()
+        cached = cls._process_cache
+        if cached is None or cached[0] != version:
+            system_settings = self.get_from_db()
+            if system_settings.pk is None:
+                # the default settings without a database are not kept
+                return system_settings
+            cached = cls._process_cache = (version, system_settings)
+        # callers may change their settings without saving them
+        return copy.copy(cached[1])
+
+    @classmethod
+    def is_uncommitted(cls):
+        return getattr(cls._transaction_state, 'uncommitted', False)
+
+    @classmethod
+    def clear_cache(cls):
+        cls._process_cache = None
+        cls._transaction_state.uncommitted = False
+
+    @classmethod
+    def changed(cls):
+        cls._process_cache = None
+        if connection.in_atomic_block:
+            cls._transaction_state.uncommitted = True
+            transaction.on_commit(cls.committed)
+        else:
+            bump_system_settings_version()
+
+    @classmethod
+    def committed(cls):
+        cls._transaction_state.uncommitted = False
+        bump_system_settings_version()
+
     def get(self, no_cache=False, *args, **kwargs):
         if no_cache:
             # logger.debug('no_cache specified or cached value found, loading system settings from db')
@@ -123,12 +194,19 @@ class System_Settings_Manager(models.Manager):
         from_cache = DojoSytemSettingsMiddleware.get_system_settings()
 
         if not from_cache:
-            # logger.debug('no cached value found, loading system settings from db')
-            return self.get_from_db(*args, **kwargs)
+            # logger.debug('no cached value found, loading system settings from the memory of the process')
+            return self.get_from_process_cache()
 
         return from_cache
 
 
+def system_settings_post_save(sender, **kwargs):
+    System_Settings_Manager.changed()
+
+
+models.signals.post_save.connect(system_settings_post_save, sender='dojo.System_Settings')
+
+
 class APITrailingSlashMiddleware:
     """
     Middleware that will send a more informative error response to POST requests
@@ -1424,8 +1424,11 @@ class Engagement(models.Model):
     def delete(self, *args, **kwargs):
         logger.debug('%d engagement delete', self.id)
         import dojo.finding.helper as helper
+        from dojo.metrics.rollup import defer_finding_counts
         helper.prepare_duplicates_for_delete(engagement=self)
-        super().delete(*args, **kwargs)
+        # the findings deleted together with the engagement are recounted once
+        with defer_finding_counts():
+            super().delete(*args, **kwargs)
         calculate_grade(self.product)
 
     def inherit_tags(self, potentially_existing_tags):
@@ -2038,7 +2041,10 @@ class Test(models.Model):
 
     def delete(self, *args, **kwargs):
         logger.debug('%d test delete', self.id)
-        super().delete(*args, **kwargs)
+        from dojo.metrics.rollup import defer_finding_counts
+        # the findings deleted together with the test are recounted once
+        with defer_finding_counts():
+            super().delete(*args, **kwargs)
         calculate_grade(self.engagement.product)
 
     @property
@@ -2533,54 +2539,9 @@ class Finding(models.Model):
         return None
 
     def compute_hash_code(self):
-
-        # Check if all needed settings are defined
-        if not hasattr(settings, 'HASHCODE_FIELDS_PER_SCANNER') or not hasattr(settings, 'HASHCODE_ALLOWS_NULL_CWE') or not hasattr(settings, 'HASHCODE_ALLOWED_FIELDS'):
-            deduplicationLogger.debug("no or incomplete configuration per hash_code found; using legacy algorithm")
-            return self.compute_hash_code_legacy()
-
-        hash_code_fields = self.test.hash_code_fields
-
-        # Check if hash_code fields are found in the settings
-        if not hash_code_fields:
-            deduplicationLogger.debug(
-                "No configuration for hash_code computation found; using default fields for " + ('dynamic' if self.dynamic_finding else 'static') + ' scanners')
-            return self.compute_hash_code_legacy()
-
-        # Check if all elements of HASHCODE_FIELDS_PER_SCANNER are in HASHCODE_ALLOWED_FIELDS
-        if not (all(elem in settings.HASHCODE_ALLOWED_FIELDS for elem in hash_code_fields)):
-            deduplicationLogger.debug(
-                "compute_hash_code - configuration error: some elements of HASHCODE_FIELDS_PER_SCANNER are not in the allowed list HASHCODE_ALLOWED_FIELDS. "
-                "Using default fields")
-            return self.compute_hash_code_legacy()
-
-        # Make sure that we have a cwe if we need one
-        if self.cwe == 0 and not self.test.hash_code_allows_null_cwe:
-            deduplicationLogger.warning(
-                "Cannot compute hash_code based on configured fields because cwe is 0 for finding of title '" + self.title + "' found in file '" + str(self.file_path) +
-                "'. Fallback to legacy mode for this finding.")
-            return self.compute_hash_code_legacy()
-
-        deduplicationLogger.debug("computing hash_code for finding id " + str(self.id) + " based on: " + ', '.join(hash_code_fields))
-
-        fields_to_hash = ''
-        for hashcodeField in hash_code_fields:
-            if hashcodeField == 'endpoints':
-                # For endpoints, need to compute the field
-                myEndpoints = self.get_endpoints()
-                fields_to_hash = fields_to_hash + myEndpoints
-                deduplicationLogger.debug(hashcodeField + ' : ' + myEndpoints)
-            elif hashcodeField == 'vulnerability_ids':
-                # For vulnerability_ids, need to compute the field
-                my_vulnerability_ids = self.get_vulnerability_ids()
-                fields_to_hash = fields_to_hash + my_vulnerability_ids
-                deduplicationLogger.debug(hashcodeField + ' : ' + my_vulnerability_ids)
-            else:
-                # Generically use the finding attribute having the same name, converts to str in case it's integer
-                fields_to_hash = fields_to_hash + str(getattr(self, hashcodeField))
-                deduplicationLogger.debug(hashcodeField + ' : ' + str(getattr(self, hashcodeField)))
-        deduplicationLogger.debug("compute_hash_code - fields_to_hash = " + fields_to_hash)
-        return self.hash_fields(fields_to_hash)
+        # the hash_code settings of the test type are resolved once per test type
+        from dojo.finding.hash_code import get_hash_code_computer
+        return get_hash_code_computer(self.test).compute(self)
 
     def compute_hash_code_legacy(self):
         fields_to_hash = self.title + str(self.cwe) + str(self.line) + str(self.file_path) + self.description
@@ -2777,8 +2738,8 @@ class Finding(models.Model):
         return self._age(self.date)
 
     def get_sla_periods(self):
-        sla_configuration = SLA_Configuration.objects.filter(id=self.test.engagement.product.sla_configuration_id).first()
-        return sla_configuration
+        # no query when the sla configuration has been selected with the finding
+        return self.test.engagement.product.sla_configuration
 
     def get_sla_start_date(self):
         if self.sla_start_date:
@@ -3141,6 +3102,35 @@ class Stub_Finding(models.Model):
         return bc
 
 
+class Finding_Daily_Count(models.Model):
+    """
+    Pre-aggregated number of findings per day, product, severity and status, maintained by dojo.metrics.rollup.
+    Opened, active and accepted findings are counted on the date of the finding, closed findings on the date they
+    have been mitigated.
+    """
+    OPENED = 'opened'
+    ACTIVE = 'active'
+    CLOSED = 'closed'
+    ACCEPTED = 'accepted'
+    STATUS_CHOICES = ((OPENED, 'Opened'), (ACTIVE, 'Active'), (CLOSED, 'Closed'), (ACCEPTED, 'Accepted'))
+
+    date = models.DateField(editable=False)
+    # no database constraint, so counts can be refreshed while findings are deleted together with their product
+    product = models.ForeignKey(Product, editable=False, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False)
+    severity = models.CharField(max_length=200, editable=False)
+    status = models.CharField(max_length=20, editable=False, choices=STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'date', 'product']),
+        ]
+        unique_together = (('product', 'date', 'severity', 'status'))
+
+    def __str__(self):
+        return '%s %s %s %s: %i' % (self.product_id, self.date, self.severity, self.status, self.count)
+
+
 class Finding_Group(TimeStampedModel):
 
     GROUP_BY_OPTIONS = [('component_name', 'Component Name'),
@@ -4410,3 +4400,4 @@ admin.site.register(General_Survey)
 admin.site.register(Test_Import)
 admin.site.register(Test_Import_Finding_Action)
 admin.site.register(Finding_Group)
+admin.site.register(Finding_Daily_Count)
@@ -4,9 +4,11 @@ from dojo.models import Product, Product_Member, Product_Type_Member, App_Analys
     DojoMeta, Product_Group, Product_Type_Group, Languages, Engagement_Presets, \
     Product_API_Scan_Configuration
 from dojo.authorization.authorization import get_roles_for_permission, user_has_global_permission, user_has_permission, \
-    role_has_permission
+    role_has_permission, get_cached_for_authorization
 
 from dojo.group.queries import get_authorized_groups
+from dojo.request_cache import cache_for_request
+from dojo.shared_cache import is_shared_cache
 from dojo.authorization.roles_permissions import Permissions
 
 
@@ -24,33 +26,44 @@ def get_authorized_products(permission, user=None):
     if user_has_global_permission(user, permission):
         return Product.objects.all().order_by('name')
 
+    return Product.objects.filter(id__in=get_authorized_product_ids(permission, user=user)).order_by('name')
+
+
+# more ids are not inlined into the queries, large lists make large statements and exceed the parameter limits
+AUTHORIZED_PRODUCT_IDS_MAX_LIST = 500
+
+
+@cache_for_request
+def get_authorized_product_ids(permission, user=None):
+    """
+    Returns the ids of the products the user has the permission for, to restrict querysets with a plain filter on
+    the product instead of subqueries for every row. A short list of ids kept in the shared cache until memberships,
+    groups or roles change is returned as a list, otherwise the ids are returned as a subquery.
+    """
+    if user is None:
+        user = get_current_user()
+
+    if user is None:
+        return []
+
+    if user.is_superuser or user_has_global_permission(user, permission):
+        return Product.objects.values_list('id', flat=True)
+
     roles = get_roles_for_permission(permission)
-    authorized_product_type_roles = Product_Type_Member.objects.filter(
-        product_type=OuterRef('prod_type_id'),
-        user=user,
-        role__in=roles)
-    authorized_product_roles = Product_Member.objects.filter(
-        product=OuterRef('pk'),
-        user=user,
-        role__in=roles)
-    authorized_product_type_groups = Product_Type_Group.objects.filter(
-        product_type=OuterRef('prod_type_id'),
-        group__users=user,
-        role__in=roles)
-    authorized_product_groups = Product_Group.objects.filter(
-        product=OuterRef('pk'),
-        group__users=user,
-        role__in=roles)
-    products = Product.objects.annotate(
-        prod_type__member=Exists(authorized_product_type_roles),
-        member=Exists(authorized_product_roles),
-        prod_type__authorized_group=Exists(authorized_product_type_groups),
-        authorized_group=Exists(authorized_product_groups)).order_by('name')
-    products = products.filter(
-        Q(prod_type__member=True) | Q(member=True) |
-        Q(prod_type__authorized_group=True) | Q(authorized_group=True))
-
-    return products
+    product_type_ids = Product_Type_Member.objects.filter(user=user, role__in=roles).values('product_type')
+    group_product_type_ids = Product_Type_Group.objects.filter(group__users=user, role__in=roles).values('product_type')
+    member_product_ids = Product_Member.objects.filter(user=user, role__in=roles).values('product')
+    group_product_ids = Product_Group.objects.filter(group__users=user, role__in=roles).values('product')
+    product_ids = Product.objects.filter(
+        Q(prod_type__in=product_type_ids) | Q(prod_type__in=group_product_type_ids) |
+        Q(id__in=member_product_ids) | Q(id__in=group_product_ids)).values_list('id', flat=True)
+
+    if not is_shared_cache():
+        return product_ids
+    cached_product_ids = get_cached_for_authorization('product_ids', lambda: list(product_ids), user.id, permission)
+    if len(cached_product_ids) > AUTHORIZED_PRODUCT_IDS_MAX_LIST:
+        return product_ids
+    return cached_product_ids
 
 
 def get_authorized_members_for_product(product, permission):
@@ -0,0 +1,554 @@
+import csv
+import hashlib
+import io
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from itertools import islice
+
+from crum import impersonate
+from django.conf import settings
+from django.db.models import Count, Max, Model, Prefetch, Q, Sum
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import QueryDict, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+
+from dojo.celery import app
+from dojo.decorators import dojo_async_task
+from dojo.models import Engagement, Endpoint, Endpoint_Status, Finding, Finding_Group, Notes, Product, Product_Type, Test
+from dojo.notifications.helper import create_notification
+from dojo.shared_cache import bump_version, get_versions, is_shared_cache
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIRECTORY = 'exports'
+# exports created in the background and rendered reports are removed after this time
+EXPORT_RETENTION = timedelta(days=1)
+
+REPORT_DATA_VERSION_CACHE_KEY = 'report_data_version_{}'
+# request parameters that select how a report is generated, not what it contains
+REPORT_ACTIONS = ['_generate', '_background']
+# request headers and server variables used in the links of a report
+REPORT_ENVIRON = ['HTTP_HOST', 'HTTP_X_FORWARDED_PROTO', 'HTTP_X_FORWARDED_FOR', 'SERVER_NAME', 'SERVER_PORT', 'SCRIPT_NAME',
+                  'wsgi.url_scheme']
+
+CSV_EXPORT = 'csv'
+EXCEL_EXPORT = 'xlsx'
+
+VALUE_NOT_SUPPORTED = 'Value not supported'
+
+
+def get_excludes():
+    return ['SEVERITIES', 'age', 'github_issue', 'jira_issue', 'objects', 'risk_acceptance',
+    'test__engagement__product__authorized_group', 'test__engagement__product__member',
+    'test__engagement__product__prod_type__authorized_group', 'test__engagement__product__prod_type__member',
+    'unsaved_endpoints', 'unsaved_vulnerability_ids', 'unsaved_files', 'unsaved_request', 'unsaved_response',
+    'unsaved_tags', 'vulnerability_ids', 'cve']
+
+
+def get_attributes():
+    return ["sla_age", "sla_deadline", "sla_days_remaining"]
+
+
+def get_export_findings(findings):
+    """
+    Returns an iterator over the findings that fetches them in chunks, with everything needed for the export
+    prefetched once per chunk instead of once per finding.
+    """
+    findings = findings.select_related('test__test_type', 'test__engagement__product__sla_configuration').prefetch_related(
+        'endpoints',
+        'vulnerability_id_set',
+        Prefetch('finding_group_set', queryset=Finding_Group.objects.select_related('jira_issue')))
+    return findings.iterator(chunk_size=settings.FINDING_EXPORT_CHUNK_SIZE)
+
+
+def get_field_value(key):
+    return lambda finding: finding.__dict__.get(key)
+
+
+def get_property_value(key):
+    return lambda finding: getattr(finding, key)
+
+
+def get_attribute_value(key):
+    def get_value(finding):
+        value = getattr(finding, key)
+        if callable(value):
+            return value()
+        return str(value) if value else None
+    return get_value
+
+
+def get_empty_value(finding):
+    return None
+
+
+def get_export_columns(finding):
+    """
+    Returns the columns of the export as a list of tuples of the attribute name and a function reading the value
+    of the attribute from a finding. The columns are derived once per export from the attributes of the first
+    finding, in the order of dir().
+    """
+    excludes_list = get_excludes()
+    allowed_attributes = get_attributes()
+    columns = []
+    for key in dir(finding):
+        if key.startswith('_') or key in excludes_list:
+            continue
+        stored = key in finding.__dict__
+        try:
+            value = getattr(finding, key)
+        except Exception as exc:
+            logger.error('Error in attribute: ' + str(exc))
+            columns.append((key, get_empty_value))
+            continue
+        if key in allowed_attributes:
+            columns.append((key, get_attribute_value(key)))
+        elif callable(value):
+            continue
+        elif stored:
+            columns.append((key, get_field_value(key)))
+        elif key in finding.__dict__:
+            # cached properties are only stored on the finding once they have been read
+            columns.append((key, get_property_value(key)))
+        else:
+            # other properties and related objects are not exported
+            columns.append((key, get_empty_value))
+    return columns
+
+
+def get_column_values(finding, columns):
+    values = []
+    for key, get_value in columns:
+        try:
+            values.append(get_value(finding))
+        except Exception as exc:
+            logger.error('Error in attribute: ' + str(exc))
+            values.append(VALUE_NOT_SUPPORTED)
+    return values
+
+
+def join_values(values, separator):
+    # at most five values are exported
+    value = ''
+    for index, item in enumerate(values):
+        if index == 5:
+            value += '...'
+            break
+        value += f'{str(item)}{separator}'
+    return value
+
+
+def get_endpoints_value(finding, separator):
+    value = join_values(finding.endpoints.all(), separator)
+    if value.endswith(separator):
+        value = value[:-len(separator)]
+    return value
+
+
+def get_vulnerability_ids_value(finding, separator):
+    value = join_values(finding.vulnerability_ids, separator)
+    if finding.cve and value.find(finding.cve) < 0:
+        value += finding.cve
+    if value.endswith(separator):
+        value = value[:-len(separator)]
+    return value
+
+
+def get_csv_rows(findings):
+    """
+    Yields the header and a row per finding of the csv export.
+    """
+    columns = None
+    for finding in get_export_findings(findings):
+        if columns is None:
+            columns = get_export_columns(finding)
+            yield [key for key, get_value in columns] + [
+                'test', 'found_by', 'engagement_id', 'engagement', 'product_id', 'product', 'endpoints', 'vulnerability_ids']
+
+        values = []
+        for value in get_column_values(finding, columns):
+            if value and isinstance(value, str):
+                value = value.replace('\n', ' NEWLINE ').replace('\r', '')
+            values.append(value)
+        values += [
+            finding.test.title,
+            finding.test.test_type.name,
+            finding.test.engagement.id,
+            finding.test.engagement.name,
+            finding.test.engagement.product.id,
+            finding.test.engagement.product.name,
+            get_endpoints_value(finding, '; '),
+            get_vulnerability_ids_value(finding, '; '),
+        ]
+        yield values
+
+
+def get_excel_value(value):
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, Model):
+        return str(value)
+    if isinstance(value, str) and ILLEGAL_CHARACTERS_RE.search(value):
+        return VALUE_NOT_SUPPORTED
+    return value
+
+
+def get_excel_rows(findings):
+    """
+    Yields the header and a row per finding of the excel export.
+    """
+    columns = None
+    for finding in get_export_findings(findings):
+        if columns is None:
+            columns = get_export_columns(finding)
+            yield [key for key, get_value in columns] + [
+                'found_by', 'engagement_id', 'engagement', 'product_id', 'product', 'endpoints', 'vulnerability_ids']
+
+        values = [get_excel_value(value) for value in get_column_values(finding, columns)]
+        values += [
+            finding.test.test_type.name,
+            finding.test.engagement.id,
+            finding.test.engagement.name,
+            finding.test.engagement.product.id,
+            finding.test.engagement.product.name,
+            get_excel_value(get_endpoints_value(finding, '; \n')),
+            get_excel_value(get_vulnerability_ids_value(finding, '; \n')),
+        ]
+        yield values
+
+
+class Echo:
+    """
+    A file-like object returning what is written to it, so the csv writer can be used to stream the rows
+    """
+    def write(self, value):
+        return value
+
+
+def stream_csv(findings):
+    writer = csv.writer(Echo())
+    for row in get_csv_rows(findings):
+        yield writer.writerow(row)
+
+
+def write_csv(findings, file):
+    writer = csv.writer(file)
+    for row in get_csv_rows(findings):
+        writer.writerow(row)
+
+
+def write_excel(findings, file):
+    """
+    Writes the excel export to a file or file name. The workbook is written in write-only mode, so the rows are
+    not kept in memory.
+    """
+    workbook = Workbook(write_only=True)
+    workbook.iso_dates = True
+    worksheet = workbook.create_sheet('Findings')
+    font_bold = Font(bold=True)
+    header = True
+    for row in get_excel_rows(findings):
+        if header:
+            cells = []
+            for value in row:
+                cell = WriteOnlyCell(worksheet, value=value)
+                cell.font = font_bold
+                cells.append(cell)
+            row = cells
+            header = False
+        worksheet.append(row)
+    workbook.save(file)
+
+
+def get_export_path(name):
+    return os.path.join(settings.MEDIA_ROOT, EXPORT_DIRECTORY, name)
+
+
+def get_export_name(user, export_format):
+    # the exports are only handed out to the user that is part of the name
+    return f'{user.id}-{uuid.uuid4().hex}.{export_format}'
+
+
+def is_export_of_user(name, user):
+    return name.startswith(f'{user.id}-') and os.path.basename(name) == name
+
+
+def delete_old_exports():
+    directory = get_export_path('')
+    if not os.path.isdir(directory):
+        return
+    expired = (timezone.now() - EXPORT_RETENTION).timestamp()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.getmtime(path) < expired:
+            os.remove(path)
+
+
+@dojo_async_task
+@app.task
+def export_findings(query, export_format, *args, **kwargs):
+    """
+    Writes an export of the findings selected by a query to a file in the media directory and notifies the user
+    that started it. Used for sets of findings too large to be exported while the user waits.
+    """
+    user = kwargs.get('async_user')
+    findings = Finding.objects.all()
+    findings.query = query
+
+    delete_old_exports()
+    name = get_export_name(user, export_format)
+    path = get_export_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if export_format == EXCEL_EXPORT:
+        write_excel(findings, path)
+    else:
+        with open(path, 'w', newline='') as file:
+            write_csv(findings, file)
+    logger.debug('exported findings to %s', path)
+
+    create_notification(event='other',
+                        title='Findings export ready',
+                        description=f'The {export_format} export of the findings you requested is ready for download.',
+                        url=reverse('download_export', args=(name, )),
+                        recipients=[user.username],
+                        icon='download')
+
+
+def get_report_data_version_key(product_id):
+    return REPORT_DATA_VERSION_CACHE_KEY.format(product_id)
+
+
+def bump_report_data_version(product_id):
+    """
+    Invalidates the rendered reports of a product, called whenever a finding of the product changes
+    """
+    bump_version(get_report_data_version_key(product_id))
+
+
+def get_report_product_ids(obj, findings):
+    if isinstance(obj, Product_Type):
+        return list(Product.objects.filter(prod_type=obj).values_list('id', flat=True))
+    elif isinstance(obj, Product):
+        return [obj.id]
+    elif isinstance(obj, Engagement) or isinstance(obj, Endpoint):
+        return [obj.product_id]
+    elif isinstance(obj, Test):
+        return [obj.engagement.product_id]
+    else:
+        return list(findings.order_by().values_list('test__engagement__product', flat=True).distinct())
+
+
+def get_report_data_version(findings, product_ids, include_finding_notes):
+    """
+    Returns a value that changes when the findings of a report change: the status, endpoint statuses and tags of
+    the findings counted in the database, and the versions of the products that are bumped on every change of one of
+    their findings, like an edit of the title or description.
+    """
+    findings = findings.order_by()
+    version = findings.aggregate(
+        count=Count('id', distinct=True),
+        last_id=Max('id'),
+        last_status_update=Max('last_status_update'),
+        last_reviewed=Max('last_reviewed'),
+        last_mitigated=Max('mitigated'),
+        active=Count('id', distinct=True, filter=Q(active=True)),
+        verified=Count('id', distinct=True, filter=Q(verified=True)),
+        closed=Count('id', distinct=True, filter=Q(is_mitigated=True)),
+        false_p=Count('id', distinct=True, filter=Q(false_p=True)),
+        duplicate=Count('id', distinct=True, filter=Q(duplicate=True)),
+        out_of_scope=Count('id', distinct=True, filter=Q(out_of_scope=True)),
+        risk_accepted=Count('id', distinct=True, filter=Q(risk_accepted=True)),
+    )
+    version.update(Endpoint_Status.objects.filter(finding__in=findings.values('id')).aggregate(
+        endpoint_status=Count('id'),
+        endpoint_status_mitigated=Count('id', filter=Q(mitigated=True)),
+        endpoint_status_last_modified=Max('last_modified')))
+    tags_model = Finding.tags.through
+    version.update(tags_model.objects.filter(finding__in=findings.values('id')).aggregate(
+        tags=Count('id'), tag_ids=Sum('tagulous_finding_tags_id')))
+    if include_finding_notes:
+        version.update(Notes.objects.filter(finding__in=findings.values('id')).aggregate(
+            notes=Count('id', distinct=True), last_note=Max('id'), last_note_edit=Max('edit_time')))
+    return sorted(version.items()), get_versions([get_report_data_version_key(product_id) for product_id in sorted(product_ids)])
+
+
+def get_report_artifact_name(request, obj, findings, include_finding_notes, host):
+    """
+    Returns the file name of a rendered report, a hash of everything that determines its content: the report,
+    the user, the filters and options, the host of the links in the report and the version of its findings
+    """
+    parameters = [
+        request.path,
+        type(obj).__name__,
+        getattr(obj, 'id', None),
+        request.user.id,
+        sorted((key, value) for key, value in request.GET.lists() if key not in REPORT_ACTIONS),
+        host,
+        get_report_data_version(findings, get_report_product_ids(obj, findings), include_finding_notes),
+    ]
+    digest = hashlib.sha256(repr(parameters).encode('utf-8')).hexdigest()
+    return f'{request.user.id}-{digest}.html'
+
+
+def get_report_artifact(name):
+    """
+    Returns the path of a rendered report. The version of the findings is only complete with the changes of all
+    processes when the cache is shared, otherwise stored reports are not served again.
+    """
+    if not is_shared_cache():
+        return None
+    path = get_export_path(name)
+    return path if os.path.isfile(path) else None
+
+
+def save_report_artifact(name, content):
+    delete_old_exports()
+    path = get_export_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(content)
+
+
+def get_report_query_string(query_string):
+    # the query string of a report rendered in the foreground
+    query = QueryDict(query_string, mutable=True)
+    for action in REPORT_ACTIONS:
+        query.pop(action, None)
+    query['_generate'] = ''
+    return query.urlencode()
+
+
+def get_report_environ(request):
+    """
+    Returns the parts of the request that are needed to render a report like the request would
+    """
+    return {key: value for key, value in request.META.items() if key in REPORT_ENVIRON}
+
+
+@dojo_async_task
+@app.task
+def render_report(obj, query, host_view, path, query_string, environ, *args, **kwargs):
+    """
+    Renders a report in the background, by running the report view for the user that requested it. The view
+    stores the rendered report, so the link in the notification serves it without rendering it again.
+    """
+    from dojo.reports.views import generate_report
+
+    user = kwargs.get('async_user')
+    if query is not None:
+        obj = Finding.objects.all()
+        obj.query = query
+
+    query_string = get_report_query_string(query_string)
+    request = WSGIRequest(dict(environ, REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query_string,
+                               **{'wsgi.input': io.BytesIO()}))
+    request.user = user
+    request.session = {}
+    with impersonate(user):
+        response = generate_report(request, obj, host_view)
+
+    url = f'{request.path}?{query_string}'
+    if not is_shared_cache():
+        # the report view renders the report again, the user gets the rendered report itself
+        name = get_export_name(user, 'html')
+        save_report_artifact(name, response.content)
+        url = reverse('download_export', args=(name, ))
+
+    create_notification(event='other',
+                        title='Report ready',
+                        description='The report you requested is ready.',
+                        url=url,
+                        recipients=[user.username],
+                        icon='file-lines')
+
+
+def prefetch_related_findings_for_report(findings):
+    return findings.prefetch_related('test',
+                                     'test__engagement__product',
+                                     'test__engagement__product__prod_type',
+                                     'risk_acceptance_set',
+                                     'risk_acceptance_set__accepted_findings',
+                                     'burprawrequestresponse_set',
+                                     'endpoints',
+                                     'tags',
+                                     'notes',
+                                     'files',
+                                     'reporter',
+                                     'mitigated_by'
+                                     )
+
+
+def prefetch_related_endpoints_for_report(endpoints):
+    return endpoints.prefetch_related(
+                                      'product',
+                                      'tags'
+                                     )
+
+
+def get_batches(objects, batch_size=None):
+    """
+    Yields the objects of a queryset in lists of batch_size, together with whether it is the last list. The related
+    objects are prefetched per list, so only one list is kept in memory. An empty queryset yields one empty list.
+    """
+    batch_size = batch_size or settings.REPORT_CHUNK_SIZE
+    iterator = objects.iterator(chunk_size=batch_size)
+    batch = list(islice(iterator, batch_size))
+    while True:
+        next_batch = list(islice(iterator, batch_size)) if len(batch) == batch_size else []
+        yield batch, not next_batch
+        if not next_batch:
+            return
+        batch = next_batch
+
+
+class WidgetPlaceholder:
+    """
+    Takes the place of a widget that is rendered in batches, the page is rendered with a marker where the widget goes
+    """
+    def __init__(self, marker):
+        self.marker = mark_safe(marker)
+
+    def get_html(self):
+        return self.marker
+
+    def get_asciidoc(self):
+        return self.marker
+
+
+def stream_report(request, template, context, report_format):
+    """
+    Returns a response streaming a custom report. Widgets with an iter_html or iter_asciidoc method, like the finding
+    and endpoint lists, are rendered in batches while the response is sent, the rest of the page is rendered at once.
+    """
+    marker = f'<!-- widget {uuid.uuid4().hex} {{}} -->'
+    widgets = []
+    fragments = []
+    for index, widget in enumerate(context['widgets']):
+        iter_fragments = getattr(widget, f'iter_{report_format}', None)
+        if iter_fragments:
+            widgets.append(WidgetPlaceholder(marker.format(index)))
+            fragments.append((marker.format(index), iter_fragments))
+        else:
+            widgets.append(widget)
+    content = render_to_string(template, dict(context, widgets=widgets), request)
+
+    def stream():
+        # the request is over once the response is streamed
+        with impersonate(request.user):
+            rest = content
+            for widget_marker, iter_fragments in fragments:
+                before, _, rest = rest.partition(widget_marker)
+                yield before
+                yield from iter_fragments()
+            yield rest
+
+    return StreamingHttpResponse(stream())
@@ -0,0 +1,21 @@
+from django.db.models import signals
+from django.dispatch import receiver
+
+from dojo.metrics.rollup import get_product_id
+from dojo.models import Finding
+from dojo.reports.helper import bump_report_data_version
+
+
+@receiver(signals.post_save, sender=Finding)
+@receiver(signals.post_delete, sender=Finding)
+def report_data_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_report_data_version(get_product_id(instance))
+
+
+@receiver(signals.m2m_changed, sender=Finding.notes.through)
+@receiver(signals.m2m_changed, sender=Finding.files.through)
+def report_attachments_changed(sender, instance, action, **kwargs):
+    # notes and files are added to and removed from findings, edits of notes are covered by their edit time
+    if isinstance(instance, Finding) and action in ('post_add', 'post_remove', 'post_clear'):
+        bump_report_data_version(get_product_id(instance))
@@ -36,4 +36,10 @@ urlpatterns = [
         views.csv_export, name='csv_export'),
     re_path(r'^reports/excel_export$',
         views.excel_export, name='excel_export'),
+    re_path(r'^reports/csv_export/background$',
+        views.csv_export, {'in_background': True}, name='csv_export_background'),
+    re_path(r'^reports/excel_export/background$',
+        views.excel_export, {'in_background': True}, name='excel_export_background'),
+    re_path(r'^reports/exports/(?P<name>[\w-]+\.(?:csv|xlsx|html))$',
+        views.download_export, name='download_export'),
 ]
@@ -1,19 +1,19 @@
 import logging
+import os
 import re
-import csv
-from openpyxl import Workbook
-from openpyxl.styles import Font
-from tempfile import NamedTemporaryFile
+from tempfile import TemporaryFile
 
 
 from datetime import datetime
 
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
-from django.http import Http404, HttpResponse, QueryDict
+from django.contrib import messages
+from django.http import FileResponse, Http404, QueryDict, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
 from django.core.exceptions import PermissionDenied
+from django.db.models.query import QuerySet
 
 from dojo.filters import ReportFindingFilter, EndpointReportFilter, \
     EndpointFilter
@@ -22,9 +22,13 @@ from dojo.models import Product_Type, Finding, Product, Engagement, Test, \
     Dojo_User, Endpoint, Risk_Acceptance
 from dojo.reports.widgets import CoverPage, PageBreak, TableOfContents, WYSIWYGContent, FindingList, EndpointList, \
     CustomReportJsonForm, ReportOptions, report_widget_factory
+from dojo.reports.helper import CSV_EXPORT, EXCEL_EXPORT, export_findings, get_export_path, is_export_of_user, \
+    stream_csv, write_excel, get_report_artifact, get_report_artifact_name, get_report_environ, render_report, \
+    save_report_artifact, prefetch_related_findings_for_report, prefetch_related_endpoints_for_report, stream_report
 from dojo.utils import get_page_items, add_breadcrumb, get_system_setting, get_period_counts_legacy, Product_Tab, \
-    get_words_for_field
+    get_words_for_field, redirect
 from dojo.authorization.authorization_decorators import user_is_authorized
+from dojo.shared_cache import is_shared_cache
 from dojo.authorization.roles_permissions import Permissions
 from dojo.authorization.authorization import user_has_permission_or_403
 from dojo.finding.queries import get_authorized_findings
@@ -98,22 +102,24 @@ def custom_report(request):
 
         if report_format == 'AsciiDoc':
             widgets = list(selected_widgets.values())
-            return render(request,
-                          'dojo/custom_asciidoc_report.html',
-                          {"widgets": widgets,
-                           "host": host,
-                           "finding_notes": finding_notes,
-                           "finding_images": finding_images,
-                           "user_id": request.user.id})
+            return stream_report(request,
+                                 'dojo/custom_asciidoc_report.html',
+                                 {"widgets": widgets,
+                                  "host": host,
+                                  "finding_notes": finding_notes,
+                                  "finding_images": finding_images,
+                                  "user_id": request.user.id},
+                                 'asciidoc')
         elif report_format == 'HTML':
             widgets = list(selected_widgets.values())
-            return render(request,
-                          'dojo/custom_html_report.html',
-                          {"widgets": widgets,
-                           "host": "",
-                           "finding_notes": finding_notes,
-                           "finding_images": finding_images,
-                           "user_id": request.user.id})
+            return stream_report(request,
+                                 'dojo/custom_html_report.html',
+                                 {"widgets": widgets,
+                                  "host": "",
+                                  "finding_notes": finding_notes,
+                                  "finding_images": finding_images,
+                                  "user_id": request.user.id},
+                                 'html')
         else:
             raise PermissionDenied()
     else:
@@ -391,7 +397,7 @@ def generate_report(request, obj, host_view=False):
     disclaimer = get_system_setting('disclaimer')
     if include_disclaimer and len(disclaimer) == 0:
         disclaimer = 'Please configure in System Settings.'
-    generate = "_generate" in request.GET
+    generate = "_generate" in request.GET or "_background" in request.GET
     report_name = str(obj)
     report_type = type(obj).__name__
     add_breadcrumb(title="Generate Report", top_level=False, request=request)
@@ -410,8 +416,9 @@ def generate_report(request, obj, host_view=False):
                                                 test__finding__in=findings.qs).distinct()
         tests = Test.objects.filter(engagement__product__prod_type=product_type,
                                     finding__in=findings.qs).distinct()
-        if len(findings.qs) > 0:
-            start_date = timezone.make_aware(datetime.combine(findings.qs.last().date, datetime.min.time()))
+        last_finding = findings.qs.last()
+        if last_finding:
+            start_date = timezone.make_aware(datetime.combine(last_finding.date, datetime.min.time()))
         else:
             start_date = timezone.now()
 
@@ -455,7 +462,7 @@ def generate_report(request, obj, host_view=False):
         report_subtitle = str(product)
         findings = ReportFindingFilter(request.GET, product=product, queryset=prefetch_related_findings_for_report(Finding.objects.filter(
             test__engagement__product=product)))
-        ids = set(finding.id for finding in findings.qs)
+        ids = findings.qs.values('id')
         engagements = Engagement.objects.filter(test__finding__id__in=ids).distinct()
         tests = Test.objects.filter(finding__id__in=ids).distinct()
         endpoints = Endpoint.objects.filter(product=product).distinct()
@@ -487,7 +494,7 @@ def generate_report(request, obj, host_view=False):
         report_title = "Engagement Report"
         report_subtitle = str(engagement)
 
-        ids = set(finding.id for finding in findings.qs)
+        ids = findings.qs.values('id')
         tests = Test.objects.filter(finding__id__in=ids).distinct()
         endpoints = Endpoint.objects.filter(product=engagement.product).distinct()
 
@@ -593,8 +600,14 @@ def generate_report(request, obj, host_view=False):
 
     if generate:
         report_form = ReportOptionsForm(request.GET)
+        artifact = get_report_artifact_name(request, obj, findings.qs, include_finding_notes, report_url_resolver(request))
+        if path := get_report_artifact(artifact):
+            return FileResponse(open(path, 'rb'), content_type='text/html')
+        if "_background" in request.GET:
+            return render_report_in_background(request, obj, host_view)
+
         if report_format == 'AsciiDoc':
-            return render(request,
+            response = render(request,
                           'dojo/asciidoc_report.html',
                           {'product_type': product_type,
                            'product': product,
@@ -617,7 +630,7 @@ def generate_report(request, obj, host_view=False):
                            'context': context,
                            })
         elif report_format == 'HTML':
-            return render(request,
+            response = render(request,
                           template,
                           {'product_type': product_type,
                            'product': product,
@@ -641,9 +654,11 @@ def generate_report(request, obj, host_view=False):
                            'host_view': host_view,
                            'context': context,
                            })
-
         else:
             raise Http404()
+        if is_shared_cache():
+            save_report_artifact(artifact, response.content)
+        return response
     paged_findings = get_page_items(request, findings.qs.distinct().order_by('numerical_severity'), 25)
 
     product_tab = None
@@ -663,6 +678,7 @@ def generate_report(request, obj, host_view=False):
 
     return render(request, 'dojo/request_report.html',
                   {'product_type': product_type,
+                   'background': True,
                    'product': product,
                    'product_tab': product_tab,
                    'engagement': engagement,
@@ -676,27 +692,18 @@ def generate_report(request, obj, host_view=False):
                    })
 
 
-def prefetch_related_findings_for_report(findings):
-    return findings.prefetch_related('test',
-                                     'test__engagement__product',
-                                     'test__engagement__product__prod_type',
-                                     'risk_acceptance_set',
-                                     'risk_acceptance_set__accepted_findings',
-                                     'burprawrequestresponse_set',
-                                     'endpoints',
-                                     'tags',
-                                     'notes',
-                                     'files',
-                                     'reporter',
-                                     'mitigated_by'
-                                     )
-
-
-def prefetch_related_endpoints_for_report(endpoints):
-    return endpoints.prefetch_related(
-                                      'product',
-                                      'tags'
-                                     )
+def render_report_in_background(request, obj, host_view):
+    if isinstance(obj, QuerySet):
+        render_report(None, obj.query, host_view, request.path, request.GET.urlencode(), get_report_environ(request))
+    else:
+        render_report(obj, None, host_view, request.path, request.GET.urlencode(), get_report_environ(request))
+    messages.add_message(request,
+                         messages.SUCCESS,
+                         'The report is rendered in the background. You will be notified when it is ready.',
+                         extra_tags='alert-success')
+    query = request.GET.copy()
+    query.pop('_background', None)
+    return redirect(request, f'{request.path}?{query.urlencode()}')
 
 
 def generate_quick_report(request, findings, obj=None):
@@ -731,13 +738,18 @@ def get_list_index(list, index):
     return element
 
 
-def get_findings(request):
+def get_findings_url(request):
     url = request.META.get('QUERY_STRING')
     if not url:
         raise Http404('Please use the report button when viewing findings')
     else:
         if url.startswith('url='):
             url = url[4:]
+    return url
+
+
+def get_findings(request):
+    url = get_findings_url(request)
 
     views = ['all', 'open', 'inactive', 'verified',
              'closed', 'accepted', 'out_of_scope',
@@ -822,236 +834,40 @@ def quick_report(request):
     return generate_quick_report(request, findings, obj)
 
 
-def get_excludes():
-    return ['SEVERITIES', 'age', 'github_issue', 'jira_issue', 'objects', 'risk_acceptance',
-    'test__engagement__product__authorized_group', 'test__engagement__product__member',
-    'test__engagement__product__prod_type__authorized_group', 'test__engagement__product__prod_type__member',
-    'unsaved_endpoints', 'unsaved_vulnerability_ids', 'unsaved_files', 'unsaved_request', 'unsaved_response',
-    'unsaved_tags', 'vulnerability_ids', 'cve']
-
-
-def get_foreign_keys():
-    return ['defect_review_requested_by', 'duplicate_finding', 'finding_group', 'last_reviewed_by',
-        'mitigated_by', 'reporter', 'review_requested_by', 'sonarqube_issue', 'test']
-
-
-def get_attributes():
-    return ["sla_age", "sla_deadline", "sla_days_remaining"]
-
-
-def csv_export(request):
+def csv_export(request, in_background=False):
     findings, obj = get_findings(request)
-    response = HttpResponse(content_type='text/csv')
+    if in_background:
+        return export_in_background(request, findings, CSV_EXPORT)
+    response = StreamingHttpResponse(stream_csv(findings), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename=findings.csv'
-    writer = csv.writer(response)
-    allowed_attributes = get_attributes()
-    excludes_list = get_excludes()
-    allowed_foreign_keys = get_attributes()
-    first_row = True
-
-    for finding in findings:
-        if first_row:
-            fields = []
-            for key in dir(finding):
-                try:
-                    if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith('_'):
-                        if callable(getattr(finding, key)) and key not in allowed_attributes:
-                            continue
-                        fields.append(key)
-                except Exception as exc:
-                    logger.error('Error in attribute: ' + str(exc))
-                    fields.append(key)
-                    continue
-            fields.append('test')
-            fields.append('found_by')
-            fields.append('engagement_id')
-            fields.append('engagement')
-            fields.append('product_id')
-            fields.append('product')
-            fields.append('endpoints')
-            fields.append('vulnerability_ids')
-
-            writer.writerow(fields)
-
-            first_row = False
-        if not first_row:
-            fields = []
-            for key in dir(finding):
-                try:
-                    if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith('_'):
-                        if not callable(getattr(finding, key)):
-                            value = finding.__dict__.get(key)
-                        if (key in allowed_foreign_keys or key in allowed_attributes) and getattr(finding, key):
-                            if callable(getattr(finding, key)):
-                                func = getattr(finding, key)
-                                result = func()
-                                value = result
-                            else:
-                                value = str(getattr(finding, key))
-                        if value and isinstance(value, str):
-                            value = value.replace('\n', ' NEWLINE ').replace('\r', '')
-                        fields.append(value)
-                except Exception as exc:
-                    logger.error('Error in attribute: ' + str(exc))
-                    fields.append("Value not supported")
-                    continue
-            fields.append(finding.test.title)
-            fields.append(finding.test.test_type.name)
-            fields.append(finding.test.engagement.id)
-            fields.append(finding.test.engagement.name)
-            fields.append(finding.test.engagement.product.id)
-            fields.append(finding.test.engagement.product.name)
-
-            endpoint_value = ''
-            num_endpoints = 0
-            for endpoint in finding.endpoints.all():
-                num_endpoints += 1
-                if num_endpoints > 5:
-                    endpoint_value += '...'
-                    break
-                endpoint_value += f'{str(endpoint)}; '
-            if endpoint_value.endswith('; '):
-                endpoint_value = endpoint_value[:-2]
-            fields.append(endpoint_value)
-
-            vulnerability_ids_value = ''
-            num_vulnerability_ids = 0
-            for vulnerability_id in finding.vulnerability_ids:
-                num_vulnerability_ids += 1
-                if num_vulnerability_ids > 5:
-                    vulnerability_ids_value += '...'
-                    break
-                vulnerability_ids_value += f'{str(vulnerability_id)}; '
-            if finding.cve and vulnerability_ids_value.find(finding.cve) < 0:
-                vulnerability_ids_value += finding.cve
-            if vulnerability_ids_value.endswith('; '):
-                vulnerability_ids_value = vulnerability_ids_value[:-2]
-            fields.append(vulnerability_ids_value)
-
-            writer.writerow(fields)
-
     return response
 
 
-def excel_export(request):
+def excel_export(request, in_background=False):
     findings, obj = get_findings(request)
-    workbook = Workbook()
-    workbook.iso_dates = True
-    worksheet = workbook.active
-    worksheet.title = 'Findings'
-    font_bold = Font(bold=True)
-    allowed_attributes = get_attributes()
-    excludes_list = get_excludes()
-    allowed_foreign_keys = get_attributes()
-
-    row_num = 1
-    for finding in findings:
-        if row_num == 1:
-            col_num = 1
-            for key in dir(finding):
-                try:
-                    if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith('_'):
-                        if callable(getattr(finding, key)) and key not in allowed_attributes:
-                            continue
-                        cell = worksheet.cell(row=row_num, column=col_num, value=key)
-                        cell.font = font_bold
-                        col_num += 1
-                except Exception as exc:
-                    logger.error('Error in attribute: ' + str(exc))
-                    cell = worksheet.cell(row=row_num, column=col_num, value=key)
-                    continue
-            cell = worksheet.cell(row=row_num, column=col_num, value='found_by')
-            cell.font = font_bold
-            col_num += 1
-            worksheet.cell(row=row_num, column=col_num, value='engagement_id')
-            cell = cell.font = font_bold
-            col_num += 1
-            cell = worksheet.cell(row=row_num, column=col_num, value='engagement')
-            cell.font = font_bold
-            col_num += 1
-            cell = worksheet.cell(row=row_num, column=col_num, value='product_id')
-            cell.font = font_bold
-            col_num += 1
-            cell = worksheet.cell(row=row_num, column=col_num, value='product')
-            cell.font = font_bold
-            col_num += 1
-            cell = worksheet.cell(row=row_num, column=col_num, value='endpoints')
-            cell.font = font_bold
-            col_num += 1
-            cell = worksheet.cell(row=row_num, column=col_num, value='vulnerability_ids')
-            cell.font = font_bold
-
-            row_num = 2
-        if row_num > 1:
-            col_num = 1
-            for key in dir(finding):
-                try:
-                    if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith('_'):
-                        if not callable(getattr(finding, key)):
-                            value = finding.__dict__.get(key)
-                        if (key in allowed_foreign_keys or key in allowed_attributes) and getattr(finding, key):
-                            if callable(getattr(finding, key)):
-                                func = getattr(finding, key)
-                                result = func()
-                                value = result
-                            else:
-                                value = str(getattr(finding, key))
-                        if value and isinstance(value, datetime):
-                            value = value.replace(tzinfo=None)
-                        worksheet.cell(row=row_num, column=col_num, value=value)
-                        col_num += 1
-                except Exception as exc:
-                    logger.error('Error in attribute: ' + str(exc))
-                    worksheet.cell(row=row_num, column=col_num, value="Value not supported")
-                    continue
-            worksheet.cell(row=row_num, column=col_num, value=finding.test.test_type.name)
-            col_num += 1
-            worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.id)
-            col_num += 1
-            worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.name)
-            col_num += 1
-            worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.product.id)
-            col_num += 1
-            worksheet.cell(row=row_num, column=col_num, value=finding.test.engagement.product.name)
-            col_num += 1
-
-            endpoint_value = ''
-            num_endpoints = 0
-            for endpoint in finding.endpoints.all():
-                num_endpoints += 1
-                if num_endpoints > 5:
-                    endpoint_value += '...'
-                    break
-                endpoint_value += f'{str(endpoint)}; \n'
-            if endpoint_value.endswith('; \n'):
-                endpoint_value = endpoint_value[:-3]
-            worksheet.cell(row=row_num, column=col_num, value=endpoint_value)
-            col_num += 1
-
-            vulnerability_ids_value = ''
-            num_vulnerability_ids = 0
-            for vulnerability_id in finding.vulnerability_ids:
-                num_vulnerability_ids += 1
-                if num_vulnerability_ids > 5:
-                    vulnerability_ids_value += '...'
-                    break
-                vulnerability_ids_value += f'{str(vulnerability_id)}; \n'
-            if finding.cve and vulnerability_ids_value.find(finding.cve) < 0:
-                vulnerability_ids_value += finding.cve
-            if vulnerability_ids_value.endswith('; \n'):
-                vulnerability_ids_value = vulnerability_ids_value[:-3]
-            worksheet.cell(row=row_num, column=col_num, value=vulnerability_ids_value)
-
-        row_num += 1
-
-    with NamedTemporaryFile() as tmp:
-        workbook.save(tmp.name)
-        tmp.seek(0)
-        stream = tmp.read()
-
-    response = HttpResponse(
-        content=stream,
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = 'attachment; filename=findings.xlsx'
-    return response
+    if in_background:
+        return export_in_background(request, findings, EXCEL_EXPORT)
+    file = TemporaryFile()
+    write_excel(findings, file)
+    file.seek(0)
+    return FileResponse(file, as_attachment=True, filename='findings.xlsx',
+                        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+
+def export_in_background(request, findings, export_format):
+    export_findings(findings.query, export_format)
+    messages.add_message(request,
+                         messages.SUCCESS,
+                         'The export is created in the background. You will be notified when it is ready for download.',
+                         extra_tags='alert-success')
+    return redirect(request, get_findings_url(request))
+
+
+def download_export(request, name):
+    path = get_export_path(name)
+    if not is_export_of_user(name, request.user) or not os.path.isfile(path):
+        raise Http404()
+    if name.endswith('.html'):
+        # a report rendered in the background
+        return FileResponse(open(path, 'rb'), content_type='text/html')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename='findings.' + name.rsplit('.', 1)[-1])
@@ -14,6 +14,7 @@ from django.utils.safestring import mark_safe
 from dojo.filters import EndpointFilter, ReportFindingFilter
 from dojo.forms import CustomReportOptionsForm
 from dojo.models import Endpoint, Finding
+from dojo.reports.helper import get_batches, prefetch_related_endpoints_for_report, prefetch_related_findings_for_report
 from dojo.utils import get_page_items, get_words_for_field
 
 """
@@ -285,24 +286,37 @@ class FindingList(Widget):
         else:
             self.paged_findings = self.findings
 
+    def iter_fragments(self, template, context):
+        # the findings are rendered in batches, with the numbering and the severity headings going on across batches
+        offset = 0
+        previous_severity = None
+        for findings, last in get_batches(prefetch_related_findings_for_report(self.findings.qs)):
+            yield render_to_string(template, dict(context, findings=findings, offset=offset,
+                                                  previous_severity=previous_severity, last=last))
+            offset += len(findings)
+            if findings:
+                previous_severity = findings[-1].severity
+
+    def iter_asciidoc(self):
+        return self.iter_fragments("dojo/custom_asciidoc_report_findings.html",
+                                   {"host": self.host,
+                                    "include_finding_notes": self.finding_notes,
+                                    "include_finding_images": self.finding_images,
+                                    "user_id": self.user_id})
+
     def get_asciidoc(self):
-        asciidoc = render_to_string("dojo/custom_asciidoc_report_findings.html",
-                                    {"findings": self.findings.qs,
-                                     "host": self.host,
-                                     "include_finding_notes": self.finding_notes,
-                                     "include_finding_images": self.finding_images,
-                                     "user_id": self.user_id})
-        return mark_safe(asciidoc)
+        return mark_safe(''.join(self.iter_asciidoc()))
+
+    def iter_html(self):
+        return self.iter_fragments("dojo/custom_html_report_finding_list.html",
+                                   {"title": self.title,
+                                    "include_finding_notes": self.finding_notes,
+                                    "include_finding_images": self.finding_images,
+                                    "host": self.host,
+                                    "user_id": self.user_id})
 
     def get_html(self):
-        html = render_to_string("dojo/custom_html_report_finding_list.html",
-                                {"title": self.title,
-                                 "findings": self.findings.qs,
-                                 "include_finding_notes": self.finding_notes,
-                                 "include_finding_images": self.finding_images,
-                                 "host": self.host,
-                                 "user_id": self.user_id})
-        return mark_safe(html)
+        return mark_safe(''.join(self.iter_html()))
 
     def get_option_form(self):
         html = render_to_string('dojo/report_findings.html',
@@ -355,24 +369,35 @@ class EndpointList(Widget):
         self.extra_help = "You can use this form to filter endpoints and select only the ones to be included in the " \
                           "report."
 
+    def iter_fragments(self, template, context):
+        endpoints = prefetch_related_endpoints_for_report(self.endpoints.qs)
+        endpoint_count = endpoints.count()
+        offset = 0
+        for batch, last in get_batches(endpoints):
+            yield render_to_string(template, dict(context, endpoints=batch, endpoint_count=endpoint_count, offset=offset,
+                                                  last=last))
+            offset += len(batch)
+
+    def iter_html(self):
+        return self.iter_fragments("dojo/custom_html_report_endpoint_list.html",
+                                   {"title": self.title,
+                                    "include_finding_notes": self.finding_notes,
+                                    "include_finding_images": self.finding_images,
+                                    "host": self.host,
+                                    "user_id": self.user_id})
+
     def get_html(self):
-        html = render_to_string("dojo/custom_html_report_endpoint_list.html",
-                                {"title": self.title,
-                                 "endpoints": self.endpoints.qs,
-                                 "include_finding_notes": self.finding_notes,
-                                 "include_finding_images": self.finding_images,
-                                 "host": self.host,
-                                 "user_id": self.user_id})
-        return mark_safe(html)
+        return mark_safe(''.join(self.iter_html()))
+
+    def iter_asciidoc(self):
+        return self.iter_fragments("dojo/custom_asciidoc_report_endpoints.html",
+                                   {"host": self.host,
+                                    "include_finding_notes": self.finding_notes,
+                                    "include_finding_images": self.finding_images,
+                                    "user_id": self.user_id})
 
     def get_asciidoc(self):
-        asciidoc = render_to_string("dojo/custom_asciidoc_report_endpoints.html",
-                                    {"endpoints": self.endpoints.qs,
-                                     "host": self.host,
-                                     "include_finding_notes": self.finding_notes,
-                                     "include_finding_images": self.finding_images,
-                                     "user_id": self.user_id})
-        return mark_safe(asciidoc)
+        return mark_safe(''.join(self.iter_asciidoc()))
 
     def get_option_form(self):
         html = render_to_string('dojo/report_endpoints.html',
@@ -1,4 +1,7 @@
+import hashlib
+
 from crum import get_current_request
+from django.db.models import Model
 
 # Attribution: This code has been taken from https://github.com/anexia-it/django-request-cache, which has
 # been published under the MIT License. Since this project hasn't been updated for more than a year,
@@ -13,22 +16,25 @@ def get_request_cache():
     return getattr(get_current_request(), "cache", None)
 
 
-cache_args_kwargs_marker = object()  # marker for separating args from kwargs (needs to be global)
+def cache_key_value(value):
+    # model instances are identified by their primary key, their str() doesn't have to be unique
+    if isinstance(value, Model):
+        return value._meta.label, value.pk if value.pk is not None else id(value)
+    return value
 
 
 def cache_calculate_key(*args, **kwargs):
     """
     Calculate the cache key of a function call with args and kwargs
-    Taken from lru_cache
+    The key is a hash, so it is the same in all processes and can be used in a shared cache as well
     :param args:
     :param kwargs:
     :return: the calculated key for the function call
     :rtype: basestring
     """
-    # combine args with kwargs, separated by the cache_args_kwargs_marker
-    key = args + (cache_args_kwargs_marker,) + tuple(sorted(kwargs.items()))
-    # return as a string
-    return str(key)
+    key = (tuple(cache_key_value(arg) for arg in args),
+           tuple(sorted((name, cache_key_value(value)) for name, value in kwargs.items())))
+    return hashlib.sha256(repr(key).encode()).hexdigest()
 
 
 def cache_for_request(fn):
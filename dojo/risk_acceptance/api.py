@@ -10,6 +10,7 @@ from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 
 from dojo.api_v2.serializers import RiskAcceptanceSerializer
+from dojo.metrics.rollup import mark_findings_dirty
 from dojo.models import Risk_Acceptance, User, Vulnerability_Id
 from django.utils import timezone
 from dojo.authorization.roles_permissions import Permissions
@@ -108,6 +109,7 @@ def _accept_risks(accepted_risks: List[AcceptedRisk], base_findings: QuerySet, o
                                                         accepted_by=risk.accepted_by[:200])
             acceptance.accepted_findings.set(findings)
             findings.update(risk_accepted=True, active=False)
+            mark_findings_dirty(findings)
             acceptance.save()
             accepted.append(acceptance)
 
@@ -59,6 +59,9 @@ env = environ.Env(
     DD_MEDIA_ROOT=(str, root('media')),
     DD_STATIC_URL=(str, '/static/'),
     DD_STATIC_ROOT=(str, root('static')),
+    # Cache shared by the uwsgi and celery processes, for example redis://redis:6379/1.
+    # The default local memory cache is not shared between processes.
+    DD_CACHE_URL=(str, 'locmemcache://'),
     DD_CELERY_BROKER_URL=(str, ''),
     DD_CELERY_BROKER_SCHEME=(str, 'sqla+sqlite'),
     DD_CELERY_BROKER_USER=(str, ''),
@@ -248,6 +251,20 @@ env = environ.Env(
     DD_ASYNC_FINDING_IMPORT=(bool, False),
     # The number of findings to be processed per celeryworker
     DD_ASYNC_FINDING_IMPORT_CHUNK_SIZE=(int, 100),
+    # Seconds to wait before a product grade calculation runs in the background. All changes to the findings of a
+    # product during this time are covered by a single calculation.
+    DD_PRODUCT_GRADE_COUNTDOWN=(int, 10),
+    # When enabled, the importer prepares all new findings in memory and persists them (and their vulnerability ids,
+    # endpoint statuses, ...) with bulk inserts instead of saving them one by one. Bulk inserts bypass model signals,
+    # so no auditlog entries are created for the imported findings. Requires a database that returns primary keys
+    # from bulk inserts (PostgreSQL, SQLite), otherwise the regular import is used.
+    DD_BULK_FINDING_IMPORT=(bool, False),
+    # The number of findings fetched at once by the csv and excel exports of findings
+    DD_FINDING_EXPORT_CHUNK_SIZE=(int, 1000),
+    # The maximum number of findings that can be changed by one request to the bulk finding endpoints of the API
+    DD_FINDING_BULK_API_MAX_IDS=(int, 10000),
+    # The number of findings and endpoints rendered at once by the finding and endpoint lists of custom reports
+    DD_REPORT_CHUNK_SIZE=(int, 200),
     # When enabled, deleting objects will be occur from the bottom up. In the example of deleting an engagement
     # The objects will be deleted as follows Endpoints -> Findings -> Tests -> Engagement
     DD_ASYNC_OBJECT_DELETE=(bool, False),
@@ -379,6 +396,14 @@ else:
         }
     }
 
+CACHES = {
+    'default': env.cache_url('DD_CACHE_URL')
+}
+# Derived data that is invalidated through the cache is only kept across requests when the cache is shared by all
+# uwsgi processes and celery workers, which the local memory cache is not
+CACHE_SHARED = CACHES['default']['BACKEND'] not in ('django.core.cache.backends.locmem.LocMemCache',
+                                                    'django.core.cache.backends.dummy.DummyCache')
+
 # Track migrations through source control rather than making migrations locally
 if env('DD_TRACK_MIGRATIONS'):
     MIGRATION_MODULES = {'dojo': 'dojo.db_migrations'}
@@ -1113,7 +1138,7 @@ CELERY_PASS_MODEL_BY_ID = env('DD_CELERY_PASS_MODEL_BY_ID')
 if len(env('DD_CELERY_BROKER_TRANSPORT_OPTIONS')) > 0:
     CELERY_BROKER_TRANSPORT_OPTIONS = json.loads(env('DD_CELERY_BROKER_TRANSPORT_OPTIONS'))
 
-CELERY_IMPORTS = ('dojo.tools.tool_issue_updater', )
+CELERY_IMPORTS = ('dojo.tools.tool_issue_updater', 'dojo.reports.helper')
 
 # Celery beat scheduled tasks
 CELERY_BEAT_SCHEDULE = {
@@ -1667,6 +1692,16 @@ SONARQUBE_API_PARSER_HOTSPOTS = env("DD_SONARQUBE_API_PARSER_HOTSPOTS")
 ASYNC_FINDING_IMPORT = env("DD_ASYNC_FINDING_IMPORT")
 # The number of findings to be processed per celeryworker
 ASYNC_FINDING_IMPORT_CHUNK_SIZE = env("DD_ASYNC_FINDING_IMPORT_CHUNK_SIZE")
+# When enabled, new findings are persisted with bulk inserts during import
+BULK_FINDING_IMPORT = env("DD_BULK_FINDING_IMPORT")
+# Seconds a background product grade calculation waits for more changes to the findings of the product
+PRODUCT_GRADE_COUNTDOWN = env("DD_PRODUCT_GRADE_COUNTDOWN")
+# The number of findings fetched at once by the csv and excel exports of findings
+FINDING_EXPORT_CHUNK_SIZE = env("DD_FINDING_EXPORT_CHUNK_SIZE")
+# The maximum number of findings that can be changed by one request to the bulk finding endpoints of the API
+FINDING_BULK_API_MAX_IDS = env("DD_FINDING_BULK_API_MAX_IDS")
+# The number of findings and endpoints rendered at once by the finding and endpoint lists of custom reports
+REPORT_CHUNK_SIZE = env("DD_REPORT_CHUNK_SIZE")
 # When enabled, deleting objects will be occur from the bottom up. In the example of deleting an engagement
 # The objects will be deleted as follows Endpoints -> Findings -> Tests -> Engagement
 ASYNC_OBJECT_DELETE = env("DD_ASYNC_OBJECT_DELETE")
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# a version expires like the entries cached for it, a missing version starts over
+VERSION_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def is_shared_cache():
+    """
+    True when the cache configured by DD_CACHE_URL is shared by the uwsgi processes and celery workers. Data that is
+    only invalidated through the cache is only kept across requests when it is, otherwise a change made by one
+    process would not be seen by the others.
+    """
+    return settings.CACHE_SHARED
+
+
+def get_versions(keys):
+    """
+    Returns the versions kept in the cache under keys. A version missing in the cache starts at the current time,
+    so a version evicted from the cache never matches entries cached before.
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = time.time_ns()
+            # add does not overwrite versions added in the meantime by other processes
+            if not cache.add(key, version, VERSION_CACHE_TIMEOUT):
+                version = cache.get(key, version)
+            versions[key] = version
+    return [versions[key] for key in keys]
+
+
+def get_version(key):
+    return get_versions([key])[0]
+
+
+def bump_version(key):
+    """
+    Invalidates the entries cached for the version kept under key.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        # nothing has been cached for this version yet, or it was evicted and starts over
+        pass
@@ -2,8 +2,8 @@ import base64
 import logging
 import re
 import html2text
-from defusedxml import ElementTree as etree
 from dojo.models import Endpoint, Finding
+from dojo.tools.utils import iterparse_elements
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +29,16 @@ class BurpParser(object):
         )
 
     def get_findings(self, xml_output, test):
-        tree = etree.parse(xml_output, etree.XMLParser())
-        return self.get_items(tree, test)
+        return list(self.iter_findings(xml_output, test))
 
-    def get_items(self, tree, test):
+    def iter_findings(self, xml_output, test):
+        # issues of the same type are merged into one finding, so the findings are only complete at the end of the report.
+        # the report itself is read issue by issue, so it is never held in memory as a whole
+        yield from self.get_items(iterparse_elements(xml_output, [["issue"]]), test)
+
+    def get_items(self, nodes, test):
         items = {}
-        for node in tree.findall("issue"):
+        for node in nodes:
             item = get_item(node, test)
             dupe_key = item.vuln_id_from_tool
             if dupe_key in items:
@@ -47,7 +47,6 @@ class CycloneDXParser(object):
         if report_date_raw:
             report_date = dateutil.parser.parse(report_date_raw)
         bom_refs = {}
-        findings = []
         for component in root.findall(
             "b:components/b:component", namespaces=ns
         ):
@@ -71,7 +70,7 @@ class CycloneDXParser(object):
                     component_name=component_name,
                     component_version=component_version,
                 )
-                findings.append(finding_vuln)
+                yield finding_vuln
 
         # manage adhoc vulnerabilities
         for vulnerability in root.findall(
@@ -80,20 +79,16 @@ class CycloneDXParser(object):
             finding_vuln = self.manage_vulnerability_legacy(
                 vulnerability, ns, bom_refs, report_date
             )
-            findings.append(finding_vuln)
+            yield finding_vuln
 
         # manage adhoc vulnerabilities (compatible with 1.4 of the spec)
         for vulnerability in root.findall(
             "b:vulnerabilities/b:vulnerability", namespaces=ns
         ):
-            findings.extend(
-                self._manage_vulnerability_xml(
-                    vulnerability, ns, bom_refs, report_date
-                )
+            yield from self._manage_vulnerability_xml(
+                vulnerability, ns, bom_refs, report_date
             )
 
-        return findings
-
     def internal_deduplicate(self, dupes, dupe_key, finding):
         if dupe_key in dupes:
             find = dupes[dupe_key]
@@ -360,13 +355,16 @@ class CycloneDXParser(object):
         return m.group(0) if m else ""
 
     def get_findings(self, file, test):
+        return list(self.iter_findings(file, test))
+
+    def iter_findings(self, file, test):
         if file.name.strip().lower().endswith(".json"):
             return self._get_findings_json(file, test)
         else:
             return self._get_findings_xml(file, test)
 
     def _get_findings_json(self, file, test):
-        """Load a CycloneDX file in JSON format"""
+        """Load a CycloneDX file in JSON format, as one document: the vulnerabilities refer to the components"""
         data = json.load(file)
 
         # Parse timestamp to get the report date
@@ -381,7 +379,6 @@ class CycloneDXParser(object):
         self._flatten_components(data.get("components", []), components)
 
         # for each vulnerabilities create one finding by component affected
-        findings = []
         for vulnerability in data.get("vulnerabilities", []):
             description = vulnerability.get("description")
             detail = vulnerability.get("detail")
@@ -498,8 +495,7 @@ class CycloneDXParser(object):
                                     )
                                 )
 
-                findings.append(finding)
-        return findings
+                yield finding
 
     def _flatten_components(self, components, flatted_components):
         for component in components:
@@ -4,11 +4,11 @@ import re
 import dateutil
 
 from cpe import CPE
-from defusedxml import ElementTree
 from packageurl import PackageURL
 from datetime import datetime
 
 from dojo.models import Finding
+from dojo.tools.utils import iterparse_elements
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +33,9 @@ class DependencyCheckParser(object):
         )
         key = hashlib.sha256(key_str.encode("utf-8")).hexdigest()
         if key not in dupes:
-            dupes[key] = finding
+            dupes.add(key)
+            return True
+        return False
 
     def get_filename_and_path_from_dependency(
         self, dependency, related_dependency, namespace
@@ -355,84 +357,86 @@ class DependencyCheckParser(object):
         return "OWASP Dependency Check output can be imported in Xml format."
 
     def get_findings(self, filename, test):
-        dupes = dict()
-        namespace = ""
-        content = filename.read()
-        #  'utf-8' This line is to pass a unittest in test_parsers.TestParsers.test_file_existence.
-        scan = ElementTree.fromstring(content)
-        regex = r"{.*}"
-        matches = re.match(regex, scan.tag)
-        try:
-            namespace = matches.group(0)
-        except BaseException:
-            namespace = ""
-
-        dependencies = scan.find(namespace + "dependencies")
+        return list(self.iter_findings(filename, test))
+
+    def iter_findings(self, filename, test):
+        # the report is read dependency by dependency, so large reports are never held in memory as a whole.
+        # only the first finding of a kind is kept (see add_finding), so findings are produced as soon as they are seen
+        dupes = set()
         scan_date = None
-        if scan.find(f"{namespace}projectInfo"):
-            projectInfo_node = scan.find(f"{namespace}projectInfo")
-            if projectInfo_node.findtext(f"{namespace}reportDate"):
-                scan_date = dateutil.parser.parse(
-                    projectInfo_node.findtext(f"{namespace}reportDate")
-                )
+        for node in iterparse_elements(filename, [["projectInfo"], ["dependencies", "dependency"]]):
+            regex = r"{.*}"
+            matches = re.match(regex, node.tag)
+            try:
+                namespace = matches.group(0)
+            except BaseException:
+                namespace = ""
+
+            if node.tag == f"{namespace}projectInfo":
+                # the projectInfo comes before the dependencies in the report
+                if node and node.findtext(f"{namespace}reportDate"):
+                    scan_date = dateutil.parser.parse(
+                        node.findtext(f"{namespace}reportDate")
+                    )
+                continue
 
-        if dependencies:
-            for dependency in dependencies.findall(namespace + "dependency"):
-                vulnerabilities = dependency.find(
-                    namespace + "vulnerabilities"
-                )
-                if vulnerabilities is not None:
-                    for vulnerability in vulnerabilities.findall(
-                        namespace + "vulnerability"
-                    ):
-                        if vulnerability:
-                            finding = self.get_finding_from_vulnerability(
-                                dependency,
-                                None,
-                                vulnerability,
-                                test,
-                                namespace,
-                            )
-                            if scan_date:
-                                finding.date = scan_date
-                            self.add_finding(finding, dupes)
-
-                            relatedDependencies = dependency.find(
-                                namespace + "relatedDependencies"
-                            )
-                            if relatedDependencies:
-                                for (
-                                    relatedDependency
-                                ) in relatedDependencies.findall(
-                                    namespace + "relatedDependency"
-                                ):
-                                    finding = (
-                                        self.get_finding_from_vulnerability(
-                                            dependency,
-                                            relatedDependency,
-                                            vulnerability,
-                                            test,
-                                            namespace,
-                                        )
+            dependency = node
+            vulnerabilities = dependency.find(
+                namespace + "vulnerabilities"
+            )
+            if vulnerabilities is not None:
+                for vulnerability in vulnerabilities.findall(
+                    namespace + "vulnerability"
+                ):
+                    if vulnerability:
+                        finding = self.get_finding_from_vulnerability(
+                            dependency,
+                            None,
+                            vulnerability,
+                            test,
+                            namespace,
+                        )
+                        if scan_date:
+                            finding.date = scan_date
+                        if self.add_finding(finding, dupes):
+                            yield finding
+
+                        relatedDependencies = dependency.find(
+                            namespace + "relatedDependencies"
+                        )
+                        if relatedDependencies:
+                            for (
+                                relatedDependency
+                            ) in relatedDependencies.findall(
+                                namespace + "relatedDependency"
+                            ):
+                                finding = (
+                                    self.get_finding_from_vulnerability(
+                                        dependency,
+                                        relatedDependency,
+                                        vulnerability,
+                                        test,
+                                        namespace,
                                     )
-                                    if finding:  # could be None
-                                        if scan_date:
-                                            finding.date = scan_date
-                                        self.add_finding(finding, dupes)
-
-                    for suppressedVulnerability in vulnerabilities.findall(
-                        namespace + "suppressedVulnerability"
-                    ):
-                        if suppressedVulnerability:
-                            finding = self.get_finding_from_vulnerability(
-                                dependency,
-                                None,
-                                suppressedVulnerability,
-                                test,
-                                namespace,
-                            )
-                            if scan_date:
-                                finding.date = scan_date
-                            self.add_finding(finding, dupes)
-
-        return list(dupes.values())
+                                )
+                                if finding:  # could be None
+                                    if scan_date:
+                                        finding.date = scan_date
+                                    if self.add_finding(finding, dupes):
+                                        yield finding
+
+                for suppressedVulnerability in vulnerabilities.findall(
+                    namespace + "suppressedVulnerability"
+                ):
+                    if suppressedVulnerability:
+                        finding = self.get_finding_from_vulnerability(
+                            dependency,
+                            None,
+                            suppressedVulnerability,
+                            test,
+                            namespace,
+                        )
+                        if scan_date:
+                            finding.date = scan_date
+                        if self.add_finding(finding, dupes):
+                            yield finding
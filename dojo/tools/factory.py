@@ -1,13 +1,50 @@
 import re
 import logging
+from collections.abc import MutableMapping
+from importlib import import_module
 from django.conf import settings
 from dojo.models import Test_Type, Tool_Type, Tool_Configuration
-
-PARSERS = {}
+from dojo.tools.manifest import PARSERS_MANIFEST
 
 logger = logging.getLogger(__name__)
 
 
+class ParserRegistry(MutableMapping):
+    """
+    Parsers by scan type. The scan types, and what the UI and the API need to know about them, come from the
+    generated PARSERS_MANIFEST, so a parser module and its dependencies are only imported when the parser is used.
+    """
+
+    def __init__(self, manifest):
+        self.entries = dict(manifest)
+        self.parsers = {}
+
+    def __getitem__(self, scan_type):
+        if scan_type not in self.parsers:
+            self.parsers[scan_type] = load_parser(self.entries[scan_type])
+        return self.parsers[scan_type]
+
+    def __setitem__(self, scan_type, parser):
+        self.entries[scan_type] = describe_parser(scan_type, parser)
+        self.parsers[scan_type] = parser
+
+    def __delitem__(self, scan_type):
+        del self.entries[scan_type]
+        self.parsers.pop(scan_type, None)
+
+    def __contains__(self, scan_type):
+        return scan_type in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+PARSERS = ParserRegistry(PARSERS_MANIFEST)
+
+
 def register(parser_type):
     for scan_type in parser_type().get_scan_types():
         parser = parser_type()
@@ -24,6 +61,29 @@ def register_parser(scan_type, parser):
     PARSERS[scan_type] = parser
 
 
+def load_parser(entry):
+    logger.debug(f"load parser {entry['module']}.{entry['class']}")
+    parser = getattr(import_module(entry["module"]), entry["class"])()
+    if entry["mode"]:
+        parser.set_mode(entry["mode"])
+    return parser
+
+
+def describe_parser(scan_type, parser):
+    """Return the manifest entry of a parser for a scan type"""
+    return {
+        "module": parser.__class__.__module__,
+        "class": parser.__class__.__name__,
+        "mode": "detailed" if scan_type.endswith("detailed") else None,
+        "description": parser.get_description_for_scan_types(scan_type),
+        # Set a sane default to require files since it is the
+        # more commen scenario.
+        "requires_file": parser.requires_file(scan_type) if hasattr(parser, "requires_file") else True,
+        "requires_tool_type": parser.requires_tool_type(scan_type) if hasattr(parser, "requires_tool_type") else None,
+        "api_scan_configuration_hint": parser.api_scan_configuration_hint() if hasattr(parser, "api_scan_configuration_hint") else None,
+    }
+
+
 def get_parser(scan_type):
     """Return a parser by the scan type"""
     if scan_type not in PARSERS:
@@ -33,14 +93,18 @@ def get_parser(scan_type):
         # update DB dynamicaly
         test_type, _ = Test_Type.objects.get_or_create(name=scan_type)
         if test_type.active:
-            return PARSERS[scan_type]
+            try:
+                return PARSERS[scan_type]
+            except (ImportError, AttributeError) as e:
+                logger.exception(f"failed to load parser '{scan_type}'")
+                raise ValueError(f"Parser '{scan_type}' could not be loaded") from e
     raise ValueError(f"Parser {scan_type} is not active")
 
 
 def get_scan_types_sorted():
     res = list()
-    for key in PARSERS:
-        res.append((key, PARSERS[key].get_description_for_scan_types(key)))
+    for key, entry in PARSERS.entries.items():
+        res.append((key, entry["description"]))
     return sorted(tuple(res), key=lambda x: x[0].lower())
 
 
@@ -54,60 +118,62 @@ def get_choices_sorted():
 def requires_file(scan_type):
     if scan_type not in PARSERS:
         return False
-    parser = PARSERS[scan_type]
-    if hasattr(parser, "requires_file"):
-        return parser.requires_file(scan_type)
-    # Set a sane default to require files since it is the
-    # more commen scenario.
-    return True
+    return PARSERS.entries[scan_type]["requires_file"]
 
 
 def get_api_scan_configuration_hints():
     res = list()
-    for name, parser in PARSERS.items():
-        if hasattr(parser, "api_scan_configuration_hint"):
-            scan_types = parser.get_scan_types()
-            for scan_type in scan_types:
-                tool_type = parser.requires_tool_type(scan_type)
-                res.append({
-                    'name': name,
-                    'id': name.lower().replace(' ', '_').replace('.', ''),
-                    'tool_type_name': tool_type,
-                    'tool_types': Tool_Type.objects.filter(name=tool_type),
-                    'tool_configurations': Tool_Configuration.objects.filter(tool_type__name=tool_type),
-                    'hint': parser.api_scan_configuration_hint(),
-                })
+    for name, entry in PARSERS.entries.items():
+        if entry["api_scan_configuration_hint"] is not None:
+            tool_type = entry["requires_tool_type"]
+            res.append({
+                'name': name,
+                'id': name.lower().replace(' ', '_').replace('.', ''),
+                'tool_type_name': tool_type,
+                'tool_types': Tool_Type.objects.filter(name=tool_type),
+                'tool_configurations': Tool_Configuration.objects.filter(tool_type__name=tool_type),
+                'hint': entry["api_scan_configuration_hint"],
+            })
     return sorted(res, key=lambda x: x['name'].lower())
 
 
 def requires_tool_type(scan_type):
     if scan_type not in PARSERS:
         return None
-    parser = PARSERS[scan_type]
-    if hasattr(parser, "requires_tool_type"):
-        return parser.requires_tool_type(scan_type)
-    return None
-
-
-import os
-from inspect import isclass
-from pathlib import Path
-from importlib import import_module
-from importlib.util import find_spec
-
-# iterate through the modules in the current package
-package_dir = str(Path(__file__).resolve().parent)
-for module_name in os.listdir(package_dir):
-    # check if it's dir
-    if os.path.isdir(os.path.join(package_dir, module_name)):
-        try:
-            # check if it's a Python module
-            if find_spec(f"dojo.tools.{module_name}.parser"):
-                # import the module and iterate through its attributes
-                module = import_module(f"dojo.tools.{module_name}.parser")
-                for attribute_name in dir(module):
-                    attribute = getattr(module, attribute_name)
-                    if isclass(attribute) and attribute_name.lower() == module_name.replace("_", "") + "parser":
-                        register(attribute)
-        except:
-            logger.exception(f"failed to load {module_name}")
+    return PARSERS.entries[scan_type]["requires_tool_type"]
+
+
+def discover_parsers():
+    """
+    Import all parser modules in dojo.tools and return their parsers by scan type.
+    This is what PARSERS_MANIFEST is generated from, see the generate_parser_manifest command.
+    """
+    import os
+    from inspect import isclass
+    from pathlib import Path
+    from importlib.util import find_spec
+
+    parsers = {}
+    # iterate through the modules in the current package
+    package_dir = str(Path(__file__).resolve().parent)
+    for module_name in sorted(os.listdir(package_dir)):
+        # check if it's dir
+        if os.path.isdir(os.path.join(package_dir, module_name)):
+            try:
+                # check if it's a Python module
+                if find_spec(f"dojo.tools.{module_name}.parser"):
+                    # import the module and iterate through its attributes
+                    module = import_module(f"dojo.tools.{module_name}.parser")
+                    for attribute_name in dir(module):
+                        attribute = getattr(module, attribute_name)
+                        if isclass(attribute) and attribute_name.lower() == module_name.replace("_", "") + "parser":
+                            for scan_type in attribute().get_scan_types():
+                                parser = attribute()
+                                if scan_type.endswith("detailed"):
+                                    parser.set_mode("detailed")
+                                if scan_type in parsers:
+                                    raise ValueError(f"Try to register an existing parser '{scan_type}'")
+                                parsers[scan_type] = parser
+            except:
+                logger.exception(f"failed to load {module_name}")
+    return parsers
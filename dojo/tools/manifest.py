@@ -0,0 +1,1527 @@
+# Generated by `python manage.py generate_parser_manifest`, do not edit.
+# Regenerate it whenever a parser is added or a scan type, description, requires_file,
+# requires_tool_type or api_scan_configuration_hint of a parser changes.
+
+PARSERS_MANIFEST = {
+    'AWS Prowler Scan': {
+        'module': 'dojo.tools.aws_prowler.parser',
+        'class': 'AWSProwlerParser',
+        'mode': None,
+        'description': 'Export of AWS Prowler in CSV or JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AWS Prowler V3': {
+        'module': 'dojo.tools.aws_prowler_v3.parser',
+        'class': 'AWSProwlerV3Parser',
+        'mode': None,
+        'description': 'Export of AWS Prowler JSON V3 format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AWS Scout2 Scan': {
+        'module': 'dojo.tools.aws_scout2.parser',
+        'class': 'AWSScout2Parser',
+        'mode': None,
+        'description': 'JS file in scout2-report/inc-awsconfig/aws_config.js.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AWS Security Finding Format (ASFF) Scan': {
+        'module': 'dojo.tools.asff.parser',
+        'class': 'AsffParser',
+        'mode': None,
+        'description': 'AWS Security Finding Format (ASFF).\n        https://docs.aws.amazon.com/securityhub/latest/userguide/securityhub-findings-format-syntax.html',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AWS Security Hub Scan': {
+        'module': 'dojo.tools.awssecurityhub.parser',
+        'class': 'AwsSecurityHubParser',
+        'mode': None,
+        'description': 'AWS Security Hub exports in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Acunetix Scan': {
+        'module': 'dojo.tools.acunetix.parser',
+        'class': 'AcunetixParser',
+        'mode': None,
+        'description': 'XML format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Acunetix360 Scan': {
+        'module': 'dojo.tools.acunetix360.parser',
+        'class': 'Acunetix360Parser',
+        'mode': None,
+        'description': 'Acunetix360 JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Anchore Engine Scan': {
+        'module': 'dojo.tools.anchore_engine.parser',
+        'class': 'AnchoreEngineParser',
+        'mode': None,
+        'description': 'Anchore-CLI JSON vulnerability report format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Anchore Enterprise Policy Check': {
+        'module': 'dojo.tools.anchore_enterprise.parser',
+        'class': 'AnchoreEnterpriseParser',
+        'mode': None,
+        'description': 'Anchore-CLI JSON policy check report format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Anchore Grype': {
+        'module': 'dojo.tools.anchore_grype.parser',
+        'class': 'AnchoreGrypeParser',
+        'mode': None,
+        'description': "A vulnerability scanner for container images and filesystems. JSON report generated with '-o json' format",
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AnchoreCTL Policies Report': {
+        'module': 'dojo.tools.anchorectl_policies.parser',
+        'class': 'AnchoreCTLPoliciesParser',
+        'mode': None,
+        'description': 'AnchoreCTLs JSON policies report format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AnchoreCTL Vuln Report': {
+        'module': 'dojo.tools.anchorectl_vulns.parser',
+        'class': 'AnchoreCTLVulnsParser',
+        'mode': None,
+        'description': 'AnchoreCTLs JSON vulnerability report format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AppSpider Scan': {
+        'module': 'dojo.tools.appspider.parser',
+        'class': 'AppSpiderParser',
+        'mode': None,
+        'description': 'AppSpider (Rapid7) - Use the VulnerabilitiesSummary.xml file found in the zipped report download.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Aqua Scan': {
+        'module': 'dojo.tools.aqua.parser',
+        'class': 'AquaParser',
+        'mode': None,
+        'description': '',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Arachni Scan': {
+        'module': 'dojo.tools.arachni.parser',
+        'class': 'ArachniParser',
+        'mode': None,
+        'description': "Arachni JSON report format (generated with `arachni_reporter --reporter 'json'`).",
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'AuditJS Scan': {
+        'module': 'dojo.tools.auditjs.parser',
+        'class': 'AuditJSParser',
+        'mode': None,
+        'description': 'AuditJS Scanning tool using SonaType OSSIndex database with JSON output format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Azure Security Center Recommendations Scan': {
+        'module': 'dojo.tools.azure_security_center_recommendations.parser',
+        'class': 'AzureSecurityCenterRecommendationsParser',
+        'mode': None,
+        'description': 'Import of Microsoft Defender for Cloud (formerly known as Azure Security Center) recommendations in CSV format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Bandit Scan': {
+        'module': 'dojo.tools.bandit.parser',
+        'class': 'BanditParser',
+        'mode': None,
+        'description': 'JSON report format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'BlackDuck API': {
+        'module': 'dojo.tools.api_blackduck.parser',
+        'class': 'ApiBlackduckParser',
+        'mode': None,
+        'description': 'BlackDuck findings can be directly imported using the Synopsys BlackDuck API. An API Scan Configuration has to be setup in the Product.',
+        'requires_file': False,
+        'requires_tool_type': 'BlackDuck API',
+        'api_scan_configuration_hint': 'the field <b>Service key 1</b> has to be set to ID of the project from which to import findings. <b>Service key 2</b> has to be set to the version of the project',
+    },
+    'Blackduck Binary Analysis': {
+        'module': 'dojo.tools.blackduck_binary_analysis.parser',
+        'class': 'BlackduckBinaryAnalysisParser',
+        'mode': None,
+        'description': 'Blackduck Binary Analysis CSV file containing vulnerable binaries.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Blackduck Component Risk': {
+        'module': 'dojo.tools.blackduck_component_risk.parser',
+        'class': 'BlackduckComponentRiskParser',
+        'mode': None,
+        'description': 'Upload the zip file containing the security.csv and files.csv.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Blackduck Hub Scan': {
+        'module': 'dojo.tools.blackduck.parser',
+        'class': 'BlackduckParser',
+        'mode': None,
+        'description': 'Upload the zip file containing the security.csv and components.csv for Security and License risks.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Brakeman Scan': {
+        'module': 'dojo.tools.brakeman.parser',
+        'class': 'BrakemanParser',
+        'mode': None,
+        'description': 'Import Brakeman Scanner findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'BugCrowd Scan': {
+        'module': 'dojo.tools.bugcrowd.parser',
+        'class': 'BugCrowdParser',
+        'mode': None,
+        'description': 'BugCrowd CSV report format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Bugcrowd API Import': {
+        'module': 'dojo.tools.api_bugcrowd.parser',
+        'class': 'ApiBugcrowdParser',
+        'mode': None,
+        'description': 'Bugcrowd submissions can be directly imported using the Bugcrowd API. An API Scan Configuration has to be setup in the Product.',
+        'requires_file': False,
+        'requires_tool_type': 'Bugcrowd API',
+        'api_scan_configuration_hint': 'the field <b>Service key 1</b> has to be set with the Bugcrowd program code. <b>Service key 2</b> can be set with the target in the Bugcrowd program (will be url encoded for the api call), if not supplied, will fetch all submissions in the program',
+    },
+    'Bundler-Audit Scan': {
+        'module': 'dojo.tools.bundler_audit.parser',
+        'class': 'BundlerAuditParser',
+        'mode': None,
+        'description': "'bundler-audit check' output (in plain text)",
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Burp Enterprise Scan': {
+        'module': 'dojo.tools.burp_enterprise.parser',
+        'class': 'BurpEnterpriseParser',
+        'mode': None,
+        'description': 'Import Burp Enterprise Edition findings in HTML format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Burp GraphQL API': {
+        'module': 'dojo.tools.burp_graphql.parser',
+        'class': 'BurpGraphQLParser',
+        'mode': None,
+        'description': 'Import Burp Enterprise Edition findings from the GraphQL API',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Burp REST API': {
+        'module': 'dojo.tools.burp_api.parser',
+        'class': 'BurpApiParser',
+        'mode': None,
+        'description': 'Import Burp REST API scan data in JSON format (/scan/[task_id] endpoint).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Burp Scan': {
+        'module': 'dojo.tools.burp.parser',
+        'class': 'BurpParser',
+        'mode': None,
+        'description': "When the Burp report is generated, the recommended option is Base64 encoding both the request and response fields. These fields will be processed and made available in the 'Finding View' page.",
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'CargoAudit Scan': {
+        'module': 'dojo.tools.cargo_audit.parser',
+        'class': 'CargoAuditParser',
+        'mode': None,
+        'description': 'Import JSON output for cargo audit scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Checkmarx OSA': {
+        'module': 'dojo.tools.checkmarx_osa.parser',
+        'class': 'CheckmarxOsaParser',
+        'mode': None,
+        'description': 'Checkmarx Open Source Analysis for dependencies (json). Generate with `jq -s . CxOSAVulnerabilities.json CxOSALibraries.json`',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Checkmarx Scan': {
+        'module': 'dojo.tools.checkmarx.parser',
+        'class': 'CheckmarxParser',
+        'mode': None,
+        'description': 'Simple Report. Aggregates vulnerabilities per categories, cwe, name, sinkFilename',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Checkmarx Scan detailed': {
+        'module': 'dojo.tools.checkmarx.parser',
+        'class': 'CheckmarxParser',
+        'mode': 'detailed',
+        'description': 'Detailed Report. Import all vulnerabilities from checkmarx without aggregation',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Checkov Scan': {
+        'module': 'dojo.tools.checkov.parser',
+        'class': 'CheckovParser',
+        'mode': None,
+        'description': 'Import JSON reports of Infrastructure as Code vulnerabilities.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Clair Klar Scan': {
+        'module': 'dojo.tools.clair_klar.parser',
+        'class': 'ClairKlarParser',
+        'mode': None,
+        'description': 'Import JSON reports of Docker image vulnerabilities from clair klar client.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Clair Scan': {
+        'module': 'dojo.tools.clair.parser',
+        'class': 'ClairParser',
+        'mode': None,
+        'description': 'Import JSON reports of Docker image vulnerabilities.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Cloudsploit Scan': {
+        'module': 'dojo.tools.cloudsploit.parser',
+        'class': 'CloudsploitParser',
+        'mode': None,
+        'description': 'Cloudsploit report file can be imported in JSON format (option --json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Cobalt.io API Import': {
+        'module': 'dojo.tools.api_cobalt.parser',
+        'class': 'ApiCobaltParser',
+        'mode': None,
+        'description': 'Cobalt.io findings can be directly imported using the Cobalt.io API. An API Scan Configuration has to be setup in the Product.',
+        'requires_file': False,
+        'requires_tool_type': 'Cobalt.io',
+        'api_scan_configuration_hint': 'the field <b>Service key 1</b> has to be set with the Cobalt.io asset id. <b>Service key 2</b> will be populated with the asset name while saving the configuration.',
+    },
+    'Cobalt.io Scan': {
+        'module': 'dojo.tools.cobalt.parser',
+        'class': 'CobaltParser',
+        'mode': None,
+        'description': 'CSV Report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Codechecker Report native': {
+        'module': 'dojo.tools.codechecker.parser',
+        'class': 'CodeCheckerParser',
+        'mode': None,
+        'description': 'Import Codechecker Report in native JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Contrast Scan': {
+        'module': 'dojo.tools.contrast.parser',
+        'class': 'ContrastParser',
+        'mode': None,
+        'description': 'CSV Report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Coverity API': {
+        'module': 'dojo.tools.coverity_api.parser',
+        'class': 'CoverityApiParser',
+        'mode': None,
+        'description': 'Import Coverity API view data in JSON format (/api/viewContents/issues endpoint).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Crashtest Security JSON File': {
+        'module': 'dojo.tools.crashtest_security.parser',
+        'class': 'CrashtestSecurityParser',
+        'mode': None,
+        'description': 'JSON Report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Crashtest Security XML File': {
+        'module': 'dojo.tools.crashtest_security.parser',
+        'class': 'CrashtestSecurityParser',
+        'mode': None,
+        'description': 'XML Report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'CredScan Scan': {
+        'module': 'dojo.tools.cred_scan.parser',
+        'class': 'CredScanParser',
+        'mode': None,
+        'description': 'Import CSV output of CredScan scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'CycloneDX Scan': {
+        'module': 'dojo.tools.cyclonedx.parser',
+        'class': 'CycloneDXParser',
+        'mode': None,
+        'description': 'Support CycloneDX XML and JSON report formats (compatible with 1.4).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'DSOP Scan': {
+        'module': 'dojo.tools.dsop.parser',
+        'class': 'DsopParser',
+        'mode': None,
+        'description': 'Import XLSX findings from DSOP vulnerability scan pipelines.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'DawnScanner Scan': {
+        'module': 'dojo.tools.dawnscanner.parser',
+        'class': 'DawnScannerParser',
+        'mode': None,
+        'description': 'Dawnscanner (-j) output file can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Dependency Check Scan': {
+        'module': 'dojo.tools.dependency_check.parser',
+        'class': 'DependencyCheckParser',
+        'mode': None,
+        'description': 'OWASP Dependency Check output can be imported in Xml format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Dependency Track Finding Packaging Format (FPF) Export': {
+        'module': 'dojo.tools.dependency_track.parser',
+        'class': 'DependencyTrackParser',
+        'mode': None,
+        'description': 'The Finding Packaging Format (FPF) from OWASP Dependency Track can be imported in JSON format. See here for more info on this JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Detect-secrets Scan': {
+        'module': 'dojo.tools.detect_secrets.parser',
+        'class': 'DetectSecretsParser',
+        'mode': None,
+        'description': 'Import JSON output for detect-secrets scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Dockle Scan': {
+        'module': 'dojo.tools.dockle.parser',
+        'class': 'DockleParser',
+        'mode': None,
+        'description': 'Import JSON output for Dockle scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'DrHeader JSON Importer': {
+        'module': 'dojo.tools.drheader.parser',
+        'class': 'DrHeaderParser',
+        'mode': None,
+        'description': 'Import result of DrHeader JSON output.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'ESLint Scan': {
+        'module': 'dojo.tools.eslint.parser',
+        'class': 'ESLintParser',
+        'mode': None,
+        'description': 'JSON report format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Edgescan Scan': {
+        'module': 'dojo.tools.api_edgescan.parser',
+        'class': 'ApiEdgescanParser',
+        'mode': None,
+        'description': 'Edgescan findings can be imported by API or JSON file.',
+        'requires_file': False,
+        'requires_tool_type': 'Edgescan',
+        'api_scan_configuration_hint': "In the field <b>Service key 1</b>, provide the Edgescan asset ID(s). Leaving it blank will import all assets' findings.",
+    },
+    'Fortify Scan': {
+        'module': 'dojo.tools.fortify.parser',
+        'class': 'FortifyParser',
+        'mode': None,
+        'description': 'Import Findings from XML file format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Generic Findings Import': {
+        'module': 'dojo.tools.generic.parser',
+        'class': 'GenericParser',
+        'mode': None,
+        'description': 'Import Generic findings in CSV or JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Ggshield Scan': {
+        'module': 'dojo.tools.ggshield.parser',
+        'class': 'GgshieldParser',
+        'mode': None,
+        'description': 'Import Ggshield Scan findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'GitLab API Fuzzing Report Scan': {
+        'module': 'dojo.tools.gitlab_api_fuzzing.parser',
+        'class': 'GitlabAPIFuzzingParser',
+        'mode': None,
+        'description': 'GitLab API Fuzzing Report report file can be imported in JSON format (option --json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'GitLab Container Scan': {
+        'module': 'dojo.tools.gitlab_container_scan.parser',
+        'class': 'GitlabContainerScanParser',
+        'mode': None,
+        'description': 'GitLab Container Scan report file can be imported in JSON format (option --json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'GitLab DAST Report': {
+        'module': 'dojo.tools.gitlab_dast.parser',
+        'class': 'GitlabDastParser',
+        'mode': None,
+        'description': 'GitLab DAST Report in JSON format (option --json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'GitLab Dependency Scanning Report': {
+        'module': 'dojo.tools.gitlab_dep_scan.parser',
+        'class': 'GitlabDepScanParser',
+        'mode': None,
+        'description': 'Import GitLab SAST Report vulnerabilities in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'GitLab SAST Report': {
+        'module': 'dojo.tools.gitlab_sast.parser',
+        'class': 'GitlabSastParser',
+        'mode': None,
+        'description': 'Import GitLab SAST Report vulnerabilities in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'GitLab Secret Detection Report': {
+        'module': 'dojo.tools.gitlab_secret_detection_report.parser',
+        'class': 'GitlabSecretDetectionReportParser',
+        'mode': None,
+        'description': 'GitLab Secret Detection Report file can be imported in JSON format (option --json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Github Vulnerability Scan': {
+        'module': 'dojo.tools.github_vulnerability.parser',
+        'class': 'GithubVulnerabilityParser',
+        'mode': None,
+        'description': 'Import vulnerabilities from Github API (GraphQL Query)',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Gitleaks Scan': {
+        'module': 'dojo.tools.gitleaks.parser',
+        'class': 'GitleaksParser',
+        'mode': None,
+        'description': 'Import Gitleaks Scan findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Gosec Scanner': {
+        'module': 'dojo.tools.gosec.parser',
+        'class': 'GosecParser',
+        'mode': None,
+        'description': 'Import Gosec Scanner findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Govulncheck Scanner': {
+        'module': 'dojo.tools.govulncheck.parser',
+        'class': 'GovulncheckParser',
+        'mode': None,
+        'description': 'Import Govulncheck Scanner findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'HCLAppScan XML': {
+        'module': 'dojo.tools.hcl_appscan.parser',
+        'class': 'HCLAppScanParser',
+        'mode': None,
+        'description': 'Import XML output of HCL AppScan.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'HackerOne Cases': {
+        'module': 'dojo.tools.h1.parser',
+        'class': 'H1Parser',
+        'mode': None,
+        'description': 'Import HackerOne cases findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Hadolint Dockerfile check': {
+        'module': 'dojo.tools.hadolint.parser',
+        'class': 'HadolintParser',
+        'mode': None,
+        'description': 'Import Hadolint Dockerfile check findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Harbor Vulnerability Scan': {
+        'module': 'dojo.tools.harbor_vulnerability.parser',
+        'class': 'HarborVulnerabilityParser',
+        'mode': None,
+        'description': 'Import vulnerabilities from Harbor API.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Horusec Scan': {
+        'module': 'dojo.tools.horusec.parser',
+        'class': 'HorusecParser',
+        'mode': None,
+        'description': 'JSON output of Horusec cli.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Humble Json Importer': {
+        'module': 'dojo.tools.humble.parser',
+        'class': 'HumbleParser',
+        'mode': None,
+        'description': 'JSON output of Humble scan.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'HuskyCI Report': {
+        'module': 'dojo.tools.huskyci.parser',
+        'class': 'HuskyCIParser',
+        'mode': None,
+        'description': 'Import HuskyCI Report vulnerabilities in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Hydra Scan': {
+        'module': 'dojo.tools.hydra.parser',
+        'class': 'HydraParser',
+        'mode': None,
+        'description': 'Hydra Scan can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'IBM AppScan DAST': {
+        'module': 'dojo.tools.ibm_app.parser',
+        'class': 'IbmAppParser',
+        'mode': None,
+        'description': 'XML file from IBM App Scanner.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Immuniweb Scan': {
+        'module': 'dojo.tools.immuniweb.parser',
+        'class': 'ImmuniwebParser',
+        'mode': None,
+        'description': 'XML Scan Result File from Imuniweb Scan.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'IntSights Report': {
+        'module': 'dojo.tools.intsights.parser',
+        'class': 'IntSightsParser',
+        'mode': None,
+        'description': 'IntSights report file can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'JFrog Xray API Summary Artifact Scan': {
+        'module': 'dojo.tools.jfrog_xray_api_summary_artifact.parser',
+        'class': 'JFrogXrayApiSummaryArtifactParser',
+        'mode': None,
+        'description': 'Import Xray findings in JSON format from the JFrog Xray API Summary/Artifact JSON response',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'JFrog Xray On Demand Binary Scan': {
+        'module': 'dojo.tools.jfrog_xray_on_demand_binary_scan.parser',
+        'class': 'JFrogXrayOnDemandBinaryScanParser',
+        'mode': None,
+        'description': 'Import Xray findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'JFrog Xray Scan': {
+        'module': 'dojo.tools.jfrogxray.parser',
+        'class': 'JFrogXrayParser',
+        'mode': None,
+        'description': 'Import Xray findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'JFrog Xray Unified Scan': {
+        'module': 'dojo.tools.jfrog_xray_unified.parser',
+        'class': 'JFrogXrayUnifiedParser',
+        'mode': None,
+        'description': 'Import Xray Unified (i.e. Xray version 3+) findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'KICS Scan': {
+        'module': 'dojo.tools.kics.parser',
+        'class': 'KICSParser',
+        'mode': None,
+        'description': 'Import JSON output for KICS scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Kiuwan Scan': {
+        'module': 'dojo.tools.kiuwan.parser',
+        'class': 'KiuwanParser',
+        'mode': None,
+        'description': 'Import Kiuwan Scan in CSV format. Export as CSV Results on Kiuwan.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'KubeHunter Scan': {
+        'module': 'dojo.tools.kubehunter.parser',
+        'class': 'KubeHunterParser',
+        'mode': None,
+        'description': 'KubeHunter JSON vulnerability report format..',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'MSDefender Parser': {
+        'module': 'dojo.tools.ms_defender.parser',
+        'class': 'MSDefenderParser',
+        'mode': None,
+        'description': 'MSDefender findings can be retrieved using the REST API',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Meterian Scan': {
+        'module': 'dojo.tools.meterian.parser',
+        'class': 'MeterianParser',
+        'mode': None,
+        'description': 'Meterian JSON report output file can be imported.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Microfocus Webinspect Scan': {
+        'module': 'dojo.tools.microfocus_webinspect.parser',
+        'class': 'MicrofocusWebinspectParser',
+        'mode': None,
+        'description': 'Import XML report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'MobSF Scan': {
+        'module': 'dojo.tools.mobsf.parser',
+        'class': 'MobSFParser',
+        'mode': None,
+        'description': 'Export a JSON file using the API, api/v1/report_json.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Mobsfscan Scan': {
+        'module': 'dojo.tools.mobsfscan.parser',
+        'class': 'MobsfscanParser',
+        'mode': None,
+        'description': 'Import JSON report for mobsfscan report file.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Mozilla Observatory Scan': {
+        'module': 'dojo.tools.mozilla_observatory.parser',
+        'class': 'MozillaObservatoryParser',
+        'mode': None,
+        'description': 'Import JSON report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'NPM Audit Scan': {
+        'module': 'dojo.tools.npm_audit.parser',
+        'class': 'NpmAuditParser',
+        'mode': None,
+        'description': 'NPM Audit Scan json output up to v6 can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Netsparker Scan': {
+        'module': 'dojo.tools.netsparker.parser',
+        'class': 'NetsparkerParser',
+        'mode': None,
+        'description': 'Netsparker JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'NeuVector (REST)': {
+        'module': 'dojo.tools.neuvector.parser',
+        'class': 'NeuVectorParser',
+        'mode': None,
+        'description': 'JSON output of /v1/scan/{entity}/{id} endpoint.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'NeuVector (compliance)': {
+        'module': 'dojo.tools.neuvector_compliance.parser',
+        'class': 'NeuVectorComplianceParser',
+        'mode': None,
+        'description': 'Imports compliance scans returned by REST API.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Nexpose Scan': {
+        'module': 'dojo.tools.nexpose.parser',
+        'class': 'NexposeParser',
+        'mode': None,
+        'description': 'Use the full XML export template from Nexpose.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Nikto Scan': {
+        'module': 'dojo.tools.nikto.parser',
+        'class': 'NiktoParser',
+        'mode': None,
+        'description': 'XML output (old and new nxvmlversion="1.2" type) or JSON output',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Nmap Scan': {
+        'module': 'dojo.tools.nmap.parser',
+        'class': 'NmapParser',
+        'mode': None,
+        'description': 'XML output (use -oX)',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Node Security Platform Scan': {
+        'module': 'dojo.tools.nsp.parser',
+        'class': 'NspParser',
+        'mode': None,
+        'description': 'Node Security Platform (NSP) output file can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Nuclei Scan': {
+        'module': 'dojo.tools.nuclei.parser',
+        'class': 'NucleiParser',
+        'mode': None,
+        'description': 'Import JSON output for nuclei scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'ORT evaluated model Importer': {
+        'module': 'dojo.tools.ort.parser',
+        'class': 'OrtParser',
+        'mode': None,
+        'description': 'Import Outpost24 endpoint vulnerability scan in XML format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'OpenVAS CSV': {
+        'module': 'dojo.tools.openvas_csv.parser',
+        'class': 'OpenVASCsvParser',
+        'mode': None,
+        'description': 'Import OpenVAS Scan in CSV format. Export as CSV Results on OpenVAS.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'OpenVAS XML': {
+        'module': 'dojo.tools.openvas_xml.parser',
+        'class': 'OpenVASXMLParser',
+        'mode': None,
+        'description': 'Import XML output of Greenbone OpenVAS XML report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Openscap Vulnerability Scan': {
+        'module': 'dojo.tools.openscap.parser',
+        'class': 'OpenscapParser',
+        'mode': None,
+        'description': 'Import Openscap Vulnerability Scan in XML formats.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'OssIndex Devaudit SCA Scan Importer': {
+        'module': 'dojo.tools.ossindex_devaudit.parser',
+        'class': 'OssIndexDevauditParser',
+        'mode': None,
+        'description': 'Import OssIndex Devaudit SCA Scan in json format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Outpost24 Scan': {
+        'module': 'dojo.tools.outpost24.parser',
+        'class': 'Outpost24Parser',
+        'mode': None,
+        'description': 'Import Outpost24 endpoint vulnerability scan in XML format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'PHP Security Audit v2': {
+        'module': 'dojo.tools.php_security_audit_v2.parser',
+        'class': 'PhpSecurityAuditV2Parser',
+        'mode': None,
+        'description': 'Import PHP Security Audit v2 Scan in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'PHP Symfony Security Check': {
+        'module': 'dojo.tools.php_symfony_security_check.parser',
+        'class': 'PhpSymfonySecurityCheckParser',
+        'mode': None,
+        'description': 'Import results from the PHP Symfony Security Checker by Sensioslabs.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'PMD Scan': {
+        'module': 'dojo.tools.pmd.parser',
+        'class': 'PmdParser',
+        'mode': None,
+        'description': 'CSV Report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'PWN SAST': {
+        'module': 'dojo.tools.pwn_sast.parser',
+        'class': 'PWNSASTParser',
+        'mode': None,
+        'description': 'Import pwn_sast Driver findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Popeye Scan': {
+        'module': 'dojo.tools.popeye.parser',
+        'class': 'PopeyeParser',
+        'mode': None,
+        'description': 'Popeye report file can be imported in JSON format (option --json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Qualys Infrastructure Scan (WebGUI XML)': {
+        'module': 'dojo.tools.qualys_infrascan_webgui.parser',
+        'class': 'QualysInfrascanWebguiParser',
+        'mode': None,
+        'description': 'Qualys WebGUI output files can be imported in XML format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Qualys Scan': {
+        'module': 'dojo.tools.qualys.parser',
+        'class': 'QualysParser',
+        'mode': None,
+        'description': 'Qualys WebGUI output files can be imported in XML format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Qualys Webapp Scan': {
+        'module': 'dojo.tools.qualys_webapp.parser',
+        'class': 'QualysWebAppParser',
+        'mode': None,
+        'description': 'Qualys WebScan output files can be imported in XML format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Retire.js Scan': {
+        'module': 'dojo.tools.retirejs.parser',
+        'class': 'RetireJsParser',
+        'mode': None,
+        'description': 'Retire.js JavaScript scan (--js) output file can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Risk Recon API Importer': {
+        'module': 'dojo.tools.risk_recon.parser',
+        'class': 'RiskReconParser',
+        'mode': None,
+        'description': 'Risk Recon ApI will be accessed to gather finding information. Report format here.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Rubocop Scan': {
+        'module': 'dojo.tools.rubocop.parser',
+        'class': 'RubocopParser',
+        'mode': None,
+        'description': 'Import Rubocop JSON scan report (with option -f json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Rusty Hog Scan': {
+        'module': 'dojo.tools.rusty_hog.parser',
+        'class': 'RustyhogParser',
+        'mode': None,
+        'description': 'Rusty Hog Scan - JSON Report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SARIF': {
+        'module': 'dojo.tools.sarif.parser',
+        'class': 'SarifParser',
+        'mode': None,
+        'description': 'SARIF report file can be imported in SARIF format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SKF Scan': {
+        'module': 'dojo.tools.skf.parser',
+        'class': 'SKFParser',
+        'mode': None,
+        'description': 'Output of SKF Sprint summary export.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SSH Audit Importer': {
+        'module': 'dojo.tools.ssh_audit.parser',
+        'class': 'SSHAuditParser',
+        'mode': None,
+        'description': 'Import result of SSH Audit JSON output.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SSL Labs Scan': {
+        'module': 'dojo.tools.ssl_labs.parser',
+        'class': 'SslLabsParser',
+        'mode': None,
+        'description': 'JSON Output of ssllabs-scan cli.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SSLyze Scan (JSON)': {
+        'module': 'dojo.tools.sslyze.parser',
+        'class': 'SslyzeParser',
+        'mode': None,
+        'description': 'Import JSON report of SSLyze version 3 and higher.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Scantist Scan': {
+        'module': 'dojo.tools.scantist.parser',
+        'class': 'ScantistParser',
+        'mode': None,
+        'description': 'Import Scantist Dependency Scanning Report vulnerabilities in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Scout Suite Scan': {
+        'module': 'dojo.tools.scout_suite.parser',
+        'class': 'ScoutSuiteParser',
+        'mode': None,
+        'description': 'JS file in scoutsuite-results/scoutsuite_results_*.js.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Semgrep JSON Report': {
+        'module': 'dojo.tools.semgrep.parser',
+        'class': 'SemgrepParser',
+        'mode': None,
+        'description': 'Import Semgrep output (--json)',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Snyk Scan': {
+        'module': 'dojo.tools.snyk.parser',
+        'class': 'SnykParser',
+        'mode': None,
+        'description': 'Snyk output file (snyk test --json > snyk.json) can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Solar Appscreener Scan': {
+        'module': 'dojo.tools.solar_appscreener.parser',
+        'class': 'SolarAppscreenerParser',
+        'mode': None,
+        'description': 'Solar Appscreener report file can be imported in CSV format from Detailed_Results.csv.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SonarQube API Import': {
+        'module': 'dojo.tools.api_sonarqube.parser',
+        'class': 'ApiSonarQubeParser',
+        'mode': None,
+        'description': 'SonarQube findings can be directly imported using the SonarQube API. An API Scan Configuration has to be setup in the Product.',
+        'requires_file': False,
+        'requires_tool_type': 'SonarQube',
+        'api_scan_configuration_hint': 'the field <b>Service key 1</b> has to be set with the SonarQube project key. <b>Service key 2</b> can be used for the Organization ID if using SonarCloud.',
+    },
+    'SonarQube Scan': {
+        'module': 'dojo.tools.sonarqube.parser',
+        'class': 'SonarQubeParser',
+        'mode': None,
+        'description': 'Aggregates findings per cwe, title, description, file_path. SonarQube output file can be imported in HTML format. Generate with https://github.com/soprasteria/sonar-report version >= 1.1.0',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SonarQube Scan detailed': {
+        'module': 'dojo.tools.sonarqube.parser',
+        'class': 'SonarQubeParser',
+        'mode': 'detailed',
+        'description': 'Import all findings from sonarqube html report. SonarQube output file can be imported in HTML format. Generate with https://github.com/soprasteria/sonar-report version >= 1.1.0',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Sonatype Application Scan': {
+        'module': 'dojo.tools.sonatype.parser',
+        'class': 'SonatypeParser',
+        'mode': None,
+        'description': 'Can be imported in JSON format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'SpotBugs Scan': {
+        'module': 'dojo.tools.spotbugs.parser',
+        'class': 'SpotbugsParser',
+        'mode': None,
+        'description': 'XML report of textui cli.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Sslscan': {
+        'module': 'dojo.tools.sslscan.parser',
+        'class': 'SslscanParser',
+        'mode': None,
+        'description': 'Import XML output of sslscan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Sslyze Scan': {
+        'module': 'dojo.tools.sslyze.parser',
+        'class': 'SslyzeParser',
+        'mode': None,
+        'description': 'Import XML report of SSLyze version 2 scan.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'StackHawk HawkScan': {
+        'module': 'dojo.tools.stackhawk.parser',
+        'class': 'StackHawkParser',
+        'mode': None,
+        'description': 'StackHawk webhook event can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Sysdig Vulnerability Report - Pipeline, Registry and Runtime (CSV)': {
+        'module': 'dojo.tools.sysdig_reports.parser',
+        'class': 'SysdigReportsParser',
+        'mode': None,
+        'description': 'Import of Sysdig Pipeline, Registry and Runtime Vulnerability Report Scans in CSV format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'TFSec Scan': {
+        'module': 'dojo.tools.tfsec.parser',
+        'class': 'TFSecParser',
+        'mode': None,
+        'description': 'Import JSON output for TFSec scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Talisman Scan': {
+        'module': 'dojo.tools.talisman.parser',
+        'class': 'TalismanParser',
+        'mode': None,
+        'description': 'Import Talisman Scan findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Tenable Scan': {
+        'module': 'dojo.tools.tenable.parser',
+        'class': 'TenableParser',
+        'mode': None,
+        'description': 'Reports can be imported as CSV or .nessus (XML) report formats.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Terrascan Scan': {
+        'module': 'dojo.tools.terrascan.parser',
+        'class': 'TerrascanParser',
+        'mode': None,
+        'description': 'Import JSON output for Terrascan scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Testssl Scan': {
+        'module': 'dojo.tools.testssl.parser',
+        'class': 'TestsslParser',
+        'mode': None,
+        'description': 'Import CSV output of testssl scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Threagile risks report': {
+        'module': 'dojo.tools.threagile.parser',
+        'class': 'ThreagileParser',
+        'mode': None,
+        'description': 'Threagile Risks Report in JSON format (risks.json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Trivy Operator Scan': {
+        'module': 'dojo.tools.trivy_operator.parser',
+        'class': 'TrivyOperatorParser',
+        'mode': None,
+        'description': 'Import trivy-operator JSON scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Trivy Scan': {
+        'module': 'dojo.tools.trivy.parser',
+        'class': 'TrivyParser',
+        'mode': None,
+        'description': 'Import trivy JSON scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Trufflehog Scan': {
+        'module': 'dojo.tools.trufflehog.parser',
+        'class': 'TruffleHogParser',
+        'mode': None,
+        'description': 'JSON Output of Trufflehog. Supports version 2 and 3 of https://github.com/trufflesecurity/trufflehog',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Trufflehog3 Scan': {
+        'module': 'dojo.tools.trufflehog3.parser',
+        'class': 'TruffleHog3Parser',
+        'mode': None,
+        'description': 'JSON Output of Trufflehog3, a fork of TruffleHog located at https://github.com/feeltheajf/truffleHog3',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Trustwave Fusion API Scan': {
+        'module': 'dojo.tools.trustwave_fusion_api.parser',
+        'class': 'TrustwaveFusionAPIParser',
+        'mode': None,
+        'description': 'Trustwave Fusion API report file can be imported in JSON format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Trustwave Scan (CSV)': {
+        'module': 'dojo.tools.trustwave.parser',
+        'class': 'TrustwaveParser',
+        'mode': None,
+        'description': 'CSV output of Trustwave vulnerability scan.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Twistlock Image Scan': {
+        'module': 'dojo.tools.twistlock.parser',
+        'class': 'TwistlockParser',
+        'mode': None,
+        'description': 'JSON output of twistcli image scan or CSV.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'VCG Scan': {
+        'module': 'dojo.tools.vcg.parser',
+        'class': 'VCGParser',
+        'mode': None,
+        'description': 'VCG output can be imported in CSV or Xml formats.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Veracode Scan': {
+        'module': 'dojo.tools.veracode.parser',
+        'class': 'VeracodeParser',
+        'mode': None,
+        'description': 'Reports can be imported as JSON or XML report formats.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Veracode SourceClear Scan': {
+        'module': 'dojo.tools.veracode_sca.parser',
+        'class': 'VeracodeScaParser',
+        'mode': None,
+        'description': 'Veracode SourceClear CSV or JSON report format',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Vulners': {
+        'module': 'dojo.tools.api_vulners.parser',
+        'class': 'ApiVulnersParser',
+        'mode': None,
+        'description': 'Import Vulners Audit reports in JSON.',
+        'requires_file': False,
+        'requires_tool_type': 'Vulners',
+        'api_scan_configuration_hint': 'the field <b>Service key 1</b> has to be set with the Vulners API key.',
+    },
+    'WFuzz JSON report': {
+        'module': 'dojo.tools.wfuzz.parser',
+        'class': 'WFuzzParser',
+        'mode': None,
+        'description': 'Import WFuzz findings in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Wapiti Scan': {
+        'module': 'dojo.tools.wapiti.parser',
+        'class': 'WapitiParser',
+        'mode': None,
+        'description': 'Import XML report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Wazuh': {
+        'module': 'dojo.tools.wazuh.parser',
+        'class': 'WazuhParser',
+        'mode': None,
+        'description': 'Wazuh',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Whispers Scan': {
+        'module': 'dojo.tools.whispers.parser',
+        'class': 'WhispersParser',
+        'mode': None,
+        'description': 'Whispers report file can be imported in JSON format (option --json).',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'WhiteHat Sentinel': {
+        'module': 'dojo.tools.whitehat_sentinel.parser',
+        'class': 'WhiteHatSentinelParser',
+        'mode': None,
+        'description': 'WhiteHat Sentinel output from api/vuln/query_site can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Whitesource Scan': {
+        'module': 'dojo.tools.whitesource.parser',
+        'class': 'WhitesourceParser',
+        'mode': None,
+        'description': 'Import JSON report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Wpscan': {
+        'module': 'dojo.tools.wpscan.parser',
+        'class': 'WpscanParser',
+        'mode': None,
+        'description': 'Import JSON report',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Xanitizer Scan': {
+        'module': 'dojo.tools.xanitizer.parser',
+        'class': 'XanitizerParser',
+        'mode': None,
+        'description': "Import XML findings list report, preferably with parameter 'generateDetailsInFindingsListReport=true'.",
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'Yarn Audit Scan': {
+        'module': 'dojo.tools.yarn_audit.parser',
+        'class': 'YarnAuditParser',
+        'mode': None,
+        'description': 'Yarn Audit Scan output file can be imported in JSON format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'ZAP Scan': {
+        'module': 'dojo.tools.zap.parser',
+        'class': 'ZapParser',
+        'mode': None,
+        'description': 'ZAP XML report format.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'docker-bench-security Scan': {
+        'module': 'dojo.tools.dockerbench.parser',
+        'class': 'DockerBenchParser',
+        'mode': None,
+        'description': 'Import JSON reports of Docker CIS benchmark scans.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'kube-bench Scan': {
+        'module': 'dojo.tools.kubebench.parser',
+        'class': 'KubeBenchParser',
+        'mode': None,
+        'description': 'Import JSON reports of Kubernetes CIS benchmark scans.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+    'pip-audit Scan': {
+        'module': 'dojo.tools.pip_audit.parser',
+        'class': 'PipAuditParser',
+        'mode': None,
+        'description': 'Import pip-audit JSON scan report.',
+        'requires_file': True,
+        'requires_tool_type': None,
+        'api_scan_configuration_hint': None,
+    },
+}
@@ -30,12 +30,14 @@ class SarifParser(object):
 
     def get_findings(self, filehandle, test):
         """For simple interface of parser contract we just aggregate everything"""
+        return list(self.iter_findings(filehandle, test))
+
+    def iter_findings(self, filehandle, test):
+        """The report is loaded as one document, the results refer to the rules and artifacts of their run: only the findings are produced one by one"""
         tree = json.load(filehandle)
-        items = list()
         # for each runs we just aggregate everything
         for run in tree.get("runs", list()):
-            items.extend(self.__get_items_from_run(run))
-        return items
+            yield from self.__get_items_from_run(run)
 
     def get_tests(self, scan_type, handle):
         tree = json.load(handle)
@@ -46,12 +48,11 @@ class SarifParser(object):
                 type=run["tool"]["driver"]["name"],
                 version=run["tool"]["driver"].get("version"),
             )
-            test.findings = self.__get_items_from_run(run)
+            test.findings = list(self.__get_items_from_run(run))
             tests.append(test)
         return tests
 
     def __get_items_from_run(self, run):
-        items = list()
         # load rules
         rules = get_rules(run)
         artifacts = get_artifacts(run)
@@ -60,8 +61,7 @@ class SarifParser(object):
         for result in run.get("results", list()):
             item = get_item(result, rules, artifacts, run_date)
             if item is not None:
-                items.append(item)
-        return items
+                yield item
 
     def __get_last_invocation_date(self, data):
         invocations = data.get("invocations", [])
@@ -68,6 +68,10 @@ class TrivyParser:
             return "Critical"
 
     def get_findings(self, scan_file, test):
+        return list(self.iter_findings(scan_file, test))
+
+    def iter_findings(self, scan_file, test):
+        """The report is loaded as one document, only the findings are produced one by one"""
         scan_data = scan_file.read()
 
         try:
@@ -77,19 +81,18 @@ class TrivyParser:
 
         # Legacy format is empty
         if data is None:
-            return list()
+            return
         # Legacy format with results
         elif isinstance(data, list):
-            return self.get_result_items(test, data)
+            yield from self.get_result_items(test, data)
         else:
             schema_version = data.get("SchemaVersion", None)
             artifact_name = data.get("ArtifactName", "")
             cluster_name = data.get("ClusterName")
             if schema_version == 2:
                 results = data.get("Results", [])
-                return self.get_result_items(test, results, artifact_name=artifact_name)
+                yield from self.get_result_items(test, results, artifact_name=artifact_name)
             elif cluster_name:
-                findings = list()
                 vulnerabilities = data.get("Vulnerabilities", [])
                 for service in vulnerabilities:
                     namespace = service.get("Namespace")
@@ -104,7 +107,7 @@ class TrivyParser:
                         service_name += f"{name} / "
                     if len(service_name) >= 3:
                         service_name = service_name[:-3]
-                    findings += self.get_result_items(
+                    yield from self.get_result_items(
                         test, service.get("Results", []), service_name
                     )
                 misconfigurations = data.get("Misconfigurations", [])
@@ -121,7 +124,7 @@ class TrivyParser:
                         service_name += f"{name} / "
                     if len(service_name) >= 3:
                         service_name = service_name[:-3]
-                    findings += self.get_result_items(
+                    yield from self.get_result_items(
                         test, service.get("Results", []), service_name
                     )
                 resources = data.get("Resources", [])
@@ -137,17 +140,15 @@ class TrivyParser:
                         resource_name += f"{name} / "
                     if len(resource_name) >= 3:
                         resource_name = resource_name[:-3]
-                    findings += self.get_result_items(
+                    yield from self.get_result_items(
                         test, resource.get("Results", []), resource_name
                     )
-                return findings
             else:
                 raise ValueError(
                     "Schema of Trivy json report is not supported"
                 )
 
     def get_result_items(self, test, results, service_name=None, artifact_name=""):
-        items = list()
         for target_data in results:
             if (
                 not isinstance(target_data, dict)
@@ -233,7 +234,7 @@ class TrivyParser:
                 if vuln_id:
                     finding.unsaved_vulnerability_ids = [vuln_id]
 
-                items.append(finding)
+                yield finding
 
             misconfigurations = target_data.get("Misconfigurations", [])
             for misconfiguration in misconfigurations:
@@ -283,7 +284,7 @@ class TrivyParser:
                     tags=[target_type, target_class],
                     service=service_name,
                 )
-                items.append(finding)
+                yield finding
 
             secrets = target_data.get("Secrets", [])
             for secret in secrets:
@@ -313,7 +314,7 @@ class TrivyParser:
                     tags=[target_class],
                     service=service_name,
                 )
-                items.append(finding)
+                yield finding
 
             licenses = target_data.get("Licenses", [])
             for license in licenses:
@@ -346,9 +347,7 @@ class TrivyParser:
                     tags=[target_class],
                     service=service_name,
                 )
-                items.append(finding)
-
-        return items
+                yield finding
 
     def get_lines_as_string_table(self, lines):
         if lines is None:
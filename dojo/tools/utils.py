@@ -1,5 +1,8 @@
 import json
 import logging
+import re
+
+from defusedxml import ElementTree
 
 logger = logging.getLogger(__name__)
 
@@ -27,3 +30,22 @@ def get_npm_cwe(item_node):
 
     # Use CWE-1035 as fallback (vulnerable third party component)
     return 1035
+
+
+def iterparse_elements(file, paths):
+    """
+    Streaming counterpart of root.findall(path) for large XML reports. Yields the elements matching one of
+    the paths below the root element, e.g. ["site", "alerts", "alertitem"], once they are completely read.
+    The elements are cleared afterwards, so the document is never held in memory as a whole.
+    Tags are compared without namespace.
+    """
+    paths = [list(path) for path in paths]
+    current_path = []
+    for event, element in ElementTree.iterparse(file, events=("start", "end")):
+        if event == "start":
+            current_path.append(re.sub(r"^\{.*\}", "", element.tag))
+        else:
+            if current_path[1:] in paths:
+                yield element
+                element.clear()
+            current_path.pop()
@@ -1,7 +1,9 @@
 from dojo.authorization.roles_permissions import Permissions
 from dojo.finding.queries import get_authorized_findings
+from dojo.product.queries import get_authorized_products
 import re
 import binascii
+import threading
 import os
 import hashlib
 import bleach
@@ -10,15 +12,19 @@ import hyperlink
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 from calendar import monthrange
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from math import pi, sqrt
 import vobject
 from dateutil.relativedelta import relativedelta, MO, SU
 from django.conf import settings
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.core.paginator import Paginator
 from django.urls import get_resolver, reverse
-from django.db.models import Q, Sum, Case, When, IntegerField, Value, Count
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.dispatch import receiver
@@ -28,7 +34,7 @@ import calendar as tcalendar
 from dojo.github import add_external_issue_github, update_external_issue_github, close_external_issue_github, reopen_external_issue_github
 from dojo.models import Finding, Engagement, Finding_Group, Finding_Template, Product, \
     Test, User, Dojo_User, System_Settings, Notifications, Endpoint, Benchmark_Type, \
-    Language_Type, Languages, Dojo_Group_Member, NOTIFICATION_CHOICES
+    Language_Type, Languages, Dojo_Group_Member, Endpoint_Status, Finding_Daily_Count, NOTIFICATION_CHOICES
 from asteval import Interpreter
 from dojo.notifications.helper import create_notification
 import logging
@@ -37,13 +43,18 @@ from django.contrib import messages
 from django.http import HttpResponseRedirect
 import crum
 from dojo.celery import app
-from dojo.decorators import dojo_async_task, dojo_model_from_id, dojo_model_to_id
+from dojo.decorators import dojo_async_task, dojo_model_from_id, dojo_model_to_id, we_want_async
+from dojo.metrics.rollup import defer_finding_counts, get_product_id
+from dojo.metrics.timeseries import get_cached_series
+from dojo.shared_cache import is_shared_cache
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
 
 
 logger = logging.getLogger(__name__)
 deduplicationLogger = logging.getLogger("dojo.specific-loggers.deduplication")
 WEEKDAY_FRIDAY = 4  # date.weekday() starts with 0
+# how long a pending product grade calculation may stay unprocessed before a new one is submitted
+PRODUCT_GRADE_PENDING_TIMEOUT = 300
 
 """
 Helper functions for DefectDojo
@@ -268,6 +279,7 @@ def are_endpoints_duplicates(new_finding, to_duplicate_finding):
 @dojo_async_task
 @app.task
 @dojo_model_from_id
+@defer_finding_counts()
 def do_dedupe_finding_task(new_finding, *args, **kwargs):
     return do_dedupe_finding(new_finding, *args, **kwargs)
 
@@ -296,7 +308,13 @@ def do_dedupe_finding(new_finding, *args, **kwargs):
         deduplicationLogger.debug("dedupe: skipping dedupe because it's disabled in system settings get()")
 
 
-def deduplicate_legacy(new_finding):
+def exclude_newer_in_test(findings, new_finding):
+    # findings that are deduplicated as a batch all exist before the first one is deduplicated, so the findings
+    # of the same test that were created after this one have to be ignored to match a sequential import
+    return findings.exclude(test=new_finding.test, id__gt=new_finding.id)
+
+
+def deduplicate_legacy(new_finding, ignore_newer_in_test=False):
     # ---------------------------------------------------------
     # 1) Collects all the findings that have the same:
     #      (title  and static_finding and dynamic_finding)
@@ -320,6 +338,8 @@ def deduplicate_legacy(new_finding):
             title=new_finding.title).exclude(id=new_finding.id).exclude(duplicate=True).values('id')
 
     total_findings = Finding.objects.filter(Q(id__in=eng_findings_cwe) | Q(id__in=eng_findings_title)).prefetch_related('endpoints', 'test', 'test__engagement', 'found_by', 'original_finding', 'test__test_type')
+    if ignore_newer_in_test:
+        total_findings = exclude_newer_in_test(total_findings, new_finding)
     deduplicationLogger.debug("Found " +
         str(len(eng_findings_cwe)) + " findings with same cwe, " +
         str(len(eng_findings_title)) + " findings with same title: " +
@@ -744,111 +764,135 @@ def is_title_in_breadcrumbs(title):
     return False
 
 
+def get_punchcard_window(start_date, weeks):
+    # gather findings over past half year, make sure to start on a sunday
+    first_sunday = start_date - relativedelta(weekday=SU(-1))
+    last_sunday = start_date + relativedelta(weeks=weeks)
+    return first_sunday, last_sunday
+
+
 def get_punchcard_data(objs, start_date, weeks, view='Finding'):
     # use try catch to make sure any teething bugs in the bunchcard don't break the dashboard
     try:
-        # gather findings over past half year, make sure to start on a sunday
-        first_sunday = start_date - relativedelta(weekday=SU(-1))
-        last_sunday = start_date + relativedelta(weeks=weeks)
+        first_sunday, last_sunday = get_punchcard_window(start_date, weeks)
 
         # reminder: The first week of a year is the one that contains the year’s first Thursday
         # so we could have for 29/12/2019: week=1 and year=2019 :-D. So using week number from db is not practical
         if view == 'Finding':
             severities_by_day = objs.filter(created__date__gte=first_sunday).filter(created__date__lt=last_sunday) \
-                                        .values('created__date') \
+                                        .values_list('created__date') \
                                         .annotate(count=Count('id')) \
                                         .order_by('created__date')
         elif view == 'Endpoint':
             severities_by_day = objs.filter(date__gte=first_sunday).filter(date__lt=last_sunday) \
-                                        .values('date') \
+                                        .values_list('date') \
                                         .annotate(count=Count('id')) \
                                         .order_by('date')
-        # return empty stuff if no findings to be statted
-        if severities_by_day.count() <= 0:
-            return None, None
-
-        # day of the week numbers:
-        # javascript  database python
-        # sun 6         1       6
-        # mon 5         2       0
-        # tue 4         3       1
-        # wed 3         4       2
-        # thu 2         5       3
-        # fri 1         6       4
-        # sat 0         7       5
-
-        # map from python to javascript, do not use week numbers or day numbers from database.
-        day_offset = {0: 5, 1: 4, 2: 3, 3: 2, 4: 1, 5: 0, 6: 6}
-
-        punchcard = list()
-        ticks = list()
-        highest_day_count = 0
-        tick = 0
-        day_counts = [0, 0, 0, 0, 0, 0, 0]
+        return get_punchcard(list(severities_by_day), first_sunday, weeks)
 
-        start_of_week = timezone.make_aware(datetime.combine(first_sunday, datetime.min.time()))
-        start_of_next_week = start_of_week + relativedelta(weeks=1)
-
-        for day in severities_by_day:
-            if view == 'Finding':
-                created = day['created__date']
-            elif view == 'Endpoint':
-                created = day['date']
-            day_count = day['count']
+    except Exception as e:
+        logger.exception('Not showing punchcard graph due to exception gathering data', e)
+        return None, None
 
-            created = timezone.make_aware(datetime.combine(created, datetime.min.time()))
 
-            if created < start_of_week:
-                raise ValueError('date found outside supported range: ' + str(created))
-            else:
-                if created >= start_of_week and created < start_of_next_week:
-                    # add day count to current week data
-                    day_counts[day_offset[created.weekday()]] = day_count
-                    highest_day_count = max(highest_day_count, day_count)
-                else:
-                    # created >= start_of_next_week, so store current week, prepare for next
-                    while created >= start_of_next_week:
-                        week_data, label = get_week_data(start_of_week, tick, day_counts)
-                        punchcard.extend(week_data)
-                        ticks.append(label)
-                        tick += 1
-
-                        # new week, new values!
-                        day_counts = [0, 0, 0, 0, 0, 0, 0]
-                        start_of_week = start_of_next_week
-                        start_of_next_week += relativedelta(weeks=1)
-
-                    # finally a day that falls into the week bracket
-                    day_counts[day_offset[created.weekday()]] = day_count
-                    highest_day_count = max(highest_day_count, day_count)
-
-        # add week in progress + empty weeks on the end if needed
-        while tick < weeks + 1:
-            # print(tick)
-            week_data, label = get_week_data(start_of_week, tick, day_counts)
-            # print(week_data, label)
-            punchcard.extend(week_data)
-            ticks.append(label)
-            tick += 1
-
-            day_counts = [0, 0, 0, 0, 0, 0, 0]
-            start_of_week = start_of_next_week
-            start_of_next_week += relativedelta(weeks=1)
-
-        # adjust the size or circles
-        ratio = (sqrt(highest_day_count / pi))
-        for punch in punchcard:
-            # front-end needs both the count for the label and the ratios of the radii of the circles
-            punch.append(punch[2])
-            punch[2] = (sqrt(punch[2] / pi)) / ratio
-
-        return punchcard, ticks
+def get_products_punchcard_data(products, start_date, weeks):
+    """
+    Punchcard of the findings of the products that are not duplicates. The counts per day are cached per set of
+    products and window, and shared by the users authorized for the same products.
+    """
+    try:
+        first_sunday, last_sunday = get_punchcard_window(start_date, weeks)
+        findings = Finding.objects.filter(test__engagement__product__in=products, duplicate=False,
+                                          created__date__gte=first_sunday, created__date__lt=last_sunday)
+        days = get_cached_series('punchcard', products.values_list('id', flat=True), (first_sunday, last_sunday),
+                                 lambda: list(findings.values_list('created__date').annotate(count=Count('id')).order_by('created__date')))
+        return get_punchcard(days, first_sunday, weeks)
 
     except Exception as e:
         logger.exception('Not showing punchcard graph due to exception gathering data', e)
         return None, None
 
 
+def get_punchcard(severities_by_day, first_sunday, weeks):
+    """
+    Builds the punchcard from a list of (day, count) ordered by day.
+    """
+    # return empty stuff if no findings to be statted
+    if len(severities_by_day) <= 0:
+        return None, None
+
+    # day of the week numbers:
+    # javascript  database python
+    # sun 6         1       6
+    # mon 5         2       0
+    # tue 4         3       1
+    # wed 3         4       2
+    # thu 2         5       3
+    # fri 1         6       4
+    # sat 0         7       5
+
+    # map from python to javascript, do not use week numbers or day numbers from database.
+    day_offset = {0: 5, 1: 4, 2: 3, 3: 2, 4: 1, 5: 0, 6: 6}
+
+    punchcard = list()
+    ticks = list()
+    highest_day_count = 0
+    tick = 0
+    day_counts = [0, 0, 0, 0, 0, 0, 0]
+
+    start_of_week = timezone.make_aware(datetime.combine(first_sunday, datetime.min.time()))
+    start_of_next_week = start_of_week + relativedelta(weeks=1)
+
+    for created, day_count in severities_by_day:
+        created = timezone.make_aware(datetime.combine(created, datetime.min.time()))
+
+        if created < start_of_week:
+            raise ValueError('date found outside supported range: ' + str(created))
+        else:
+            if created >= start_of_week and created < start_of_next_week:
+                # add day count to current week data
+                day_counts[day_offset[created.weekday()]] = day_count
+                highest_day_count = max(highest_day_count, day_count)
+            else:
+                # created >= start_of_next_week, so store current week, prepare for next
+                while created >= start_of_next_week:
+                    week_data, label = get_week_data(start_of_week, tick, day_counts)
+                    punchcard.extend(week_data)
+                    ticks.append(label)
+                    tick += 1
+
+                    # new week, new values!
+                    day_counts = [0, 0, 0, 0, 0, 0, 0]
+                    start_of_week = start_of_next_week
+                    start_of_next_week += relativedelta(weeks=1)
+
+                # finally a day that falls into the week bracket
+                day_counts[day_offset[created.weekday()]] = day_count
+                highest_day_count = max(highest_day_count, day_count)
+
+    # add week in progress + empty weeks on the end if needed
+    while tick < weeks + 1:
+        # print(tick)
+        week_data, label = get_week_data(start_of_week, tick, day_counts)
+        # print(week_data, label)
+        punchcard.extend(week_data)
+        ticks.append(label)
+        tick += 1
+
+        day_counts = [0, 0, 0, 0, 0, 0, 0]
+        start_of_week = start_of_next_week
+        start_of_next_week += relativedelta(weeks=1)
+
+    # adjust the size or circles
+    ratio = (sqrt(highest_day_count / pi))
+    for punch in punchcard:
+        # front-end needs both the count for the label and the ratios of the radii of the circles
+        punch.append(punch[2])
+        punch[2] = (sqrt(punch[2] / pi)) / ratio
+
+    return punchcard, ticks
+
+
 def get_week_data(week_start_date, tick, day_counts):
     data = []
     for i in range(0, len(day_counts)):
@@ -948,16 +992,94 @@ def get_period_counts_legacy(findings,
     }
 
 
+def get_periods(period_interval, start_date, relative_delta='months'):
+    periods = []
+    for x in range(-1, period_interval):
+        if relative_delta == 'months':
+            # make interval the first through last of month
+            end_date = (start_date + relativedelta(months=x)) + relativedelta(
+                day=1, months=+1, days=-1)
+            new_date = (
+                start_date + relativedelta(months=x)) + relativedelta(day=1)
+        else:
+            # week starts the monday before
+            new_date = start_date + relativedelta(weeks=x, weekday=MO(1))
+            end_date = new_date + relativedelta(weeks=1, weekday=MO(1))
+        periods.append((new_date, end_date))
+    return periods
+
+
+def count_per_period(periods, rows, get_time):
+    """
+    Sums up the counts of rows grouped by the database into the periods. The periods include both their start and
+    end date, so a row can be counted in two consecutive periods.
+    """
+    counts = [0] * len(periods)
+    for row in rows:
+        row_time = get_time(row)
+        for index, (new_date, end_date) in enumerate(periods):
+            if new_date <= row_time <= end_date:
+                counts[index] += row['count']
+    return counts
+
+
 def get_period_counts(findings,
                       findings_closed,
                       accepted_findings,
                       period_interval,
                       start_date,
                       relative_delta='months'):
-
+    """
+    Counts the opened, active, closed and accepted findings or endpoint statuses per month or week, with one grouped
+    query per queryset instead of one query per period.
+    """
     tz = timezone.get_current_timezone()
 
     start_date = datetime(start_date.year, start_date.month, start_date.day, tzinfo=tz)
+    periods = get_periods(period_interval, start_date, relative_delta=relative_delta)
+    severities = ('Critical', 'High', 'Medium', 'Low')
+
+    def get_day_time(day):
+        return datetime.combine(day, datetime.min.time()).replace(tzinfo=tz)
+
+    # the severity and status of endpoint statuses are the ones of their finding
+    finding_prefix = 'finding__' if findings.model is Endpoint_Status else ''
+    rows = list(findings.filter(**{finding_prefix + 'severity__in': severities}).values(
+        'date', finding_prefix + 'severity', finding_prefix + 'active').annotate(count=Count('id')).order_by())
+
+    opened = {}
+    active = {}
+    for severity in severities:
+        severity_rows = [row for row in rows if row[finding_prefix + 'severity'] == severity]
+        opened[severity] = count_per_period(periods, severity_rows, lambda row: get_day_time(row['date']))
+        # active findings are counted from the beginning up to the end of the period
+        active[severity] = count_per_period([(get_day_time(date.min), end_date) for new_date, end_date in periods],
+                                            [row for row in severity_rows if row[finding_prefix + 'active']],
+                                            lambda row: get_day_time(row['date']))
+
+    if findings_closed.model is Endpoint_Status:
+        closed_rows = findings_closed.filter(mitigated_time__range=[periods[0][0], periods[-1][1]]).values(
+            'mitigated_time').annotate(count=Count('id')).order_by()
+        closed = count_per_period(periods, closed_rows, lambda row: row['mitigated_time'])
+    else:
+        closed_rows = findings_closed.filter(mitigated__date__range=[periods[0][0], periods[-1][1]]).annotate(
+            mitigated_date=TruncDate('mitigated')).values('mitigated_date').annotate(count=Count('id')).order_by()
+        closed = count_per_period([(new_date.date(), end_date.date()) for new_date, end_date in periods], closed_rows,
+                                  lambda row: row['mitigated_date'])
+
+    accepted = {severity: [0] * len(periods) for severity in severities}
+    if accepted_findings is not None:
+        date_ranges = [(new_date.date(), end_date.date()) for new_date, end_date in periods]
+        if accepted_findings.model is Endpoint_Status:
+            accepted_rows = accepted_findings.filter(date__range=[date_ranges[0][0], date_ranges[-1][1]]).annotate(
+                accepted_date=F('date'), accepted_severity=F('finding__severity'))
+        else:
+            accepted_rows = accepted_findings.filter(risk_acceptance__created__date__range=[date_ranges[0][0], date_ranges[-1][1]]).annotate(
+                accepted_date=TruncDate('risk_acceptance__created'), accepted_severity=F('severity'))
+        accepted_rows = list(accepted_rows.values('accepted_date', 'accepted_severity').annotate(count=Count('id')).order_by())
+        for severity in severities:
+            accepted[severity] = count_per_period(date_ranges, [row for row in accepted_rows if row['accepted_severity'] == severity],
+                                                  lambda row: row['accepted_date'])
 
     opened_in_period = list()
     active_in_period = list()
@@ -969,160 +1091,63 @@ def get_period_counts(findings,
     accepted_in_period.append(
         ['Timestamp', 'Date', 'S0', 'S1', 'S2', 'S3', 'Total', 'Closed'])
 
-    for x in range(-1, period_interval):
-        if relative_delta == 'months':
-            # make interval the first through last of month
-            end_date = (start_date + relativedelta(months=x)) + relativedelta(
-                day=1, months=+1, days=-1)
-            new_date = (
-                start_date + relativedelta(months=x)) + relativedelta(day=1)
-        else:
-            # week starts the monday before
-            new_date = start_date + relativedelta(weeks=x, weekday=MO(1))
-            end_date = new_date + relativedelta(weeks=1, weekday=MO(1))
-
-        try:
-            closed_in_range_count = findings_closed.filter(
-                mitigated__date__range=[new_date, end_date]).count()
-        except:
-            closed_in_range_count = findings_closed.filter(
-                mitigated_time__range=[new_date, end_date]).count()
+    for index, (new_date, end_date) in enumerate(periods):
+        timestamp = tcalendar.timegm(new_date.timetuple()) * 1000
+        counts = [opened[severity][index] for severity in severities]
+        opened_in_period.append([timestamp, new_date] + counts + [sum(counts), closed[index]])
+        counts = [accepted[severity][index] for severity in severities]
+        accepted_in_period.append([timestamp, new_date] + counts + [sum(counts)])
+        counts = [active[severity][index] for severity in severities]
+        active_in_period.append([timestamp, new_date] + counts + [sum(counts)])
 
-        if accepted_findings:
-            date_range = [
-                datetime(new_date.year, new_date.month, new_date.day, tzinfo=tz),
-                datetime(end_date.year, end_date.month, end_date.day, tzinfo=tz)
-            ]
-            try:
-                risks_a = accepted_findings.filter(risk_acceptance__created__date__range=date_range)
-            except:
-                risks_a = accepted_findings.filter(date__range=date_range)
-        else:
-            risks_a = None
-
-        f_crit_count, f_high_count, f_med_count, f_low_count, f_closed_count = [
-            0, 0, 0, 0, 0
-        ]
-        ra_crit_count, ra_high_count, ra_med_count, ra_low_count, ra_closed_count = [
-            0, 0, 0, 0, 0
-        ]
-        active_crit_count, active_high_count, active_med_count, active_low_count, active_closed_count = [
-            0, 0, 0, 0, 0
-        ]
+    return {
+        'opened_per_period': opened_in_period,
+        'accepted_per_period': accepted_in_period,
+        'active_per_period': active_in_period
+    }
 
-        for finding in findings:
-            try:
-                severity = finding.severity
-                active = finding.active
-#                risk_accepted = finding.risk_accepted TODO: in future release
-            except:
-                severity = finding.finding.severity
-                active = finding.finding.active
-#                risk_accepted = finding.finding.risk_accepted
 
-            try:
-                f_time = datetime.combine(finding.date, datetime.min.time()).replace(tzinfo=tz)
-            except:
-                f_time = finding.date
-
-            if f_time <= end_date:
-                if severity == 'Critical':
-                    if new_date <= f_time:
-                        f_crit_count += 1
-                    if active:
-                        active_crit_count += 1
-                elif severity == 'High':
-                    if new_date <= f_time:
-                        f_high_count += 1
-                    if active:
-                        active_high_count += 1
-                elif severity == 'Medium':
-                    if new_date <= f_time:
-                        f_med_count += 1
-                    if active:
-                        active_med_count += 1
-                elif severity == 'Low':
-                    if new_date <= f_time:
-                        f_low_count += 1
-                    if active:
-                        active_low_count += 1
+def get_period_date(value):
+    # the periods start and end on days in the current timezone
+    return datetime(value.year, value.month, value.day, tzinfo=timezone.get_current_timezone())
 
-        if risks_a is not None:
-            for finding in risks_a:
-                try:
-                    severity = finding.severity
-                except:
-                    severity = finding.finding.severity
-                if severity == 'Critical':
-                    ra_crit_count += 1
-                elif severity == 'High':
-                    ra_high_count += 1
-                elif severity == 'Medium':
-                    ra_med_count += 1
-                elif severity == 'Low':
-                    ra_low_count += 1
-
-        total = f_crit_count + f_high_count + f_med_count + f_low_count
-        opened_in_period.append(
-            [(tcalendar.timegm(new_date.timetuple()) * 1000), new_date,
-             f_crit_count, f_high_count, f_med_count, f_low_count, total,
-             closed_in_range_count])
 
-        total = ra_crit_count + ra_high_count + ra_med_count + ra_low_count
-        accepted_in_period.append(
-            [(tcalendar.timegm(new_date.timetuple()) * 1000), new_date,
-             ra_crit_count, ra_high_count, ra_med_count, ra_low_count, total])
+def get_daily_finding_counts(start_date, end_date, **filters):
+    """
+    Reads the daily finding counts of the main severities from start_date to end_date in two grouped queries, like
+    get_daily_finding_counts(start_date, end_date, product__prod_type=pt). Returns a dict of (date, status, severity)
+    to the count, and a dict of severity to the number of active findings opened before start_date.
+    """
+    counts = Finding_Daily_Count.objects.filter(severity__in=('Critical', 'High', 'Medium', 'Low'), **filters)
+    days = counts.filter(date__range=[start_date.date(), end_date.date()]) \
+        .values_list('date', 'status', 'severity').annotate(total=Sum('count')).order_by()
+    before = counts.filter(status=Finding_Daily_Count.ACTIVE, date__lt=start_date.date()) \
+        .values_list('severity').annotate(total=Sum('count')).order_by()
+    return {(day, status, severity): total for day, status, severity, total in days}, dict(before)
 
-        total = active_crit_count + active_high_count + active_med_count + active_low_count
-        active_in_period.append(
-            [(tcalendar.timegm(new_date.timetuple()) * 1000), new_date,
-             active_crit_count, active_high_count, active_med_count, active_low_count, total])
 
-    return {
-        'opened_per_period': opened_in_period,
-        'accepted_per_period': accepted_in_period,
-        'active_per_period': active_in_period
-    }
+def sum_daily_finding_counts(daily_counts, status, start_date=None, end_date=None):
+    """
+    Sums up the daily finding counts of a status per severity, for the days from start_date to end_date, both
+    included and both optional.
+    """
+    totals = {}
+    for (day, day_status, severity), count in daily_counts.items():
+        if day_status == status and (start_date is None or start_date <= day) and (end_date is None or day <= end_date):
+            totals[severity] = totals.get(severity, 0) + count
+    return totals
 
 
-def opened_in_period(start_date, end_date, pt):
-    start_date = datetime(
-        start_date.year,
-        start_date.month,
-        start_date.day,
-        tzinfo=timezone.get_current_timezone())
-    end_date = datetime(
-        end_date.year,
-        end_date.month,
-        end_date.day,
-        tzinfo=timezone.get_current_timezone())
-    opened_in_period = Finding.objects.filter(
-        date__range=[start_date, end_date],
-        test__engagement__product__prod_type=pt,
-        verified=True,
-        false_p=False,
-        duplicate=False,
-        out_of_scope=False,
-        mitigated__isnull=True,
-        severity__in=(
-            'Critical', 'High', 'Medium',
-            'Low')).values('numerical_severity').annotate(
-                Count('numerical_severity')).order_by('numerical_severity')
-    total_opened_in_period = Finding.objects.filter(
-        date__range=[start_date, end_date],
-        test__engagement__product__prod_type=pt,
-        verified=True,
-        false_p=False,
-        duplicate=False,
-        out_of_scope=False,
-        mitigated__isnull=True,
-        severity__in=('Critical', 'High', 'Medium', 'Low')).aggregate(
-            total=Sum(
-                Case(
-                    When(
-                        severity__in=('Critical', 'High', 'Medium', 'Low'),
-                        then=Value(1)),
-                    output_field=IntegerField())))['total']
+def count_in_period(daily_counts, before, start_date, end_date):
+    """
+    The opened and closed findings of a period and all findings opened up to the end of the period that are still
+    active, from the result of get_daily_finding_counts.
+    """
+    start_date = get_period_date(start_date)
+    end_date = get_period_date(end_date)
+    opened = sum_daily_finding_counts(daily_counts, Finding_Daily_Count.ACTIVE, start_date.date(), end_date.date())
+    closed = sum_daily_finding_counts(daily_counts, Finding_Daily_Count.CLOSED, start_date.date(), end_date.date())
+    to_date = sum_daily_finding_counts(daily_counts, Finding_Daily_Count.ACTIVE, end_date=end_date.date())
 
     oip = {
         'S0':
@@ -1134,40 +1159,32 @@ def opened_in_period(start_date, end_date, pt):
         'S3':
         0,
         'Total':
-        total_opened_in_period,
+        None,
         'start_date':
         start_date,
         'end_date':
         end_date,
         'closed':
-        Finding.objects.filter(
-            mitigated__date__range=[start_date, end_date],
-            test__engagement__product__prod_type=pt,
-            severity__in=('Critical', 'High', 'Medium', 'Low')).aggregate(
-                total=Sum(
-                    Case(
-                        When(
-                            severity__in=('Critical', 'High', 'Medium', 'Low'),
-                            then=Value(1)),
-                        output_field=IntegerField())))['total'],
+        None,
         'to_date_total':
-        Finding.objects.filter(
-            date__lte=end_date.date(),
-            verified=True,
-            false_p=False,
-            duplicate=False,
-            out_of_scope=False,
-            mitigated__isnull=True,
-            test__engagement__product__prod_type=pt,
-            severity__in=('Critical', 'High', 'Medium', 'Low')).count()
+        0,
     }
-
-    for o in opened_in_period:
-        oip[o['numerical_severity']] = o['numerical_severity__count']
+    for severity in ('Critical', 'High', 'Medium', 'Low'):
+        if opened.get(severity):
+            oip[Finding.get_numerical_severity(severity)] = opened[severity]
+            oip['Total'] = (oip['Total'] or 0) + opened[severity]
+        if closed.get(severity):
+            oip['closed'] = (oip['closed'] or 0) + closed[severity]
+        oip['to_date_total'] += before.get(severity, 0) + to_date.get(severity, 0)
 
     return oip
 
 
+def opened_in_period(start_date, end_date, pt):
+    daily_counts, before = get_daily_finding_counts(get_period_date(start_date), get_period_date(end_date), product__prod_type=pt)
+    return count_in_period(daily_counts, before, start_date, end_date)
+
+
 class FileIterWrapper(object):
     def __init__(self, flo, chunk_size=1024**2):
         self.flo = flo
@@ -1513,6 +1530,28 @@ def get_setting(setting):
     return getattr(settings, setting)
 
 
+@lru_cache(maxsize=8)
+def get_grade_interpreter(product_grade):
+    """
+    Interpreter with the grade_product function of the system settings already defined, so the function is only
+    parsed once per version of the system settings instead of for every product grade calculation.
+    """
+    aeval = Interpreter()
+    aeval(product_grade)
+    return aeval, threading.Lock()
+
+
+def grade_product(product_grade, critical, high, medium, low):
+    aeval, lock = get_grade_interpreter(product_grade)
+    # the interpreter keeps state during an evaluation, so it can't be shared between threads
+    with lock:
+        return aeval("grade_product(%s, %s, %s, %s)" % (critical, high, medium, low))
+
+
+def get_grade_cache_key(product_id):
+    return 'dojo_calculate_grade:%s' % product_id
+
+
 @dojo_model_to_id
 @dojo_async_task
 @app.task
@@ -1523,6 +1562,9 @@ def calculate_grade(product, *args, **kwargs):
         logger.warning('ignoring calculate product for product None!')
         return
 
+    # changes from now on need a new calculation
+    cache.delete(get_grade_cache_key(product.id))
+
     if system_settings.enable_product_grade:
         logger.debug('calculating product grade for %s:%s', product.id, product.name)
         severity_values = Finding.objects.filter(
@@ -1547,14 +1589,58 @@ def calculate_grade(product, *args, **kwargs):
                 medium = severity_count['numerical_severity__count']
             elif severity_count['severity'] == "Low":
                 low = severity_count['numerical_severity__count']
-        aeval = Interpreter()
-        aeval(system_settings.product_grade)
-        grade_product = "grade_product(%s, %s, %s, %s)" % (
-            critical, high, medium, low)
-        product.prod_numeric_grade = aeval(grade_product)
+        product.prod_numeric_grade = grade_product(system_settings.product_grade, critical, high, medium, low)
         product.save()
 
 
+_deferred_grades = threading.local()
+
+
+@contextmanager
+def defer_calculate_grade():
+    """
+    Products passed to schedule_calculate_grade inside this block are marked as dirty and their grade is
+    calculated once when the outermost block exits, instead of once per call.
+    """
+    outermost = getattr(_deferred_grades, 'products', None) is None
+    if outermost:
+        _deferred_grades.products = {}
+    try:
+        yield
+    finally:
+        if outermost:
+            products = _deferred_grades.products
+            _deferred_grades.products = None
+            for product in products.values():
+                schedule_calculate_grade(product)
+
+
+def schedule_calculate_grade(product):
+    """
+    Debounced calculate_grade for code that changes findings one by one. Inside defer_calculate_grade the
+    calculation is postponed to the end of the block. When calculate_grade runs as a celery task, it is only
+    submitted if no calculation is pending for the product yet, with a countdown so the changes of the
+    next few seconds are covered by the same calculation.
+    """
+    if not product:
+        logger.warning('ignoring calculate product for product None!')
+        return
+
+    products = getattr(_deferred_grades, 'products', None)
+    if products is not None:
+        products[product.id] = product
+        return
+
+    if we_want_async(func=calculate_grade):
+        countdown = settings.PRODUCT_GRADE_COUNTDOWN
+        if not cache.add(get_grade_cache_key(product.id), True, countdown + PRODUCT_GRADE_PENDING_TIMEOUT):
+            logger.debug('product grade calculation already pending for %s', product.id)
+            return
+        calculate_grade(product, countdown=countdown)
+    else:
+        calculate_grade(product)
+
+
 def get_celery_worker_status():
     from .tasks import celery_status
     res = celery_status.apply_async()
@@ -2000,22 +2086,89 @@ def sla_compute_and_notify(*args, **kwargs):
         logger.info("Findings SLA is not enabled.")
 
 
+FINDING_VALUES_CACHE_KEY = 'finding_values_{}_{}'
+# the fields of findings offered for autocompletion
+FINDING_WORDS_FIELDS = ['title', 'component_name']
+# the indexes are cleared when findings change, but only in the cache of the process without a shared cache
+FINDING_WORDS_CACHE_TIMEOUT = 60 * 60 * 24
+FINDING_WORDS_LOCAL_CACHE_TIMEOUT = 60 * 5
+
+
+def get_finding_values_key(product_id, fieldname):
+    return FINDING_VALUES_CACHE_KEY.format(fieldname, product_id)
+
+
+def get_finding_values(product_ids, fieldname):
+    """
+    Returns the distinct values of a field of the findings per product. The values are cached per product
+    and only the missing products are read, in one query.
+    """
+    max_results = getattr(settings, 'MAX_AUTOCOMPLETE_WORDS', 20000)
+    keys = {product_id: get_finding_values_key(product_id, fieldname) for product_id in product_ids}
+    cached = cache.get_many(list(keys.values()))
+    values = {product_id: cached[key] for product_id, key in keys.items() if key in cached}
+    missing = [product_id for product_id in product_ids if product_id not in values]
+    if missing:
+        missing_values = {product_id: set() for product_id in missing}
+        rows = Finding.objects.filter(**{'test__engagement__product__in': missing, '%s__isnull' % fieldname: False}) \
+            .values_list('test__engagement__product', fieldname).distinct().order_by()
+        for product_id, value in rows.iterator():
+            # no product needs more values than the words offered at once
+            if value and len(missing_values[product_id]) < max_results:
+                missing_values[product_id].add(value)
+        timeout = FINDING_WORDS_CACHE_TIMEOUT if is_shared_cache() else FINDING_WORDS_LOCAL_CACHE_TIMEOUT
+        cache.set_many({keys[product_id]: product_values for product_id, product_values in missing_values.items()}, timeout)
+        values.update(missing_values)
+    return values
+
+
+def clear_finding_values(product_id, fieldnames=FINDING_WORDS_FIELDS):
+    """
+    Invalidates the cached values of a product, called when the values of findings of the product change
+    """
+    cache.delete_many([get_finding_values_key(product_id, fieldname) for fieldname in fieldnames])
+
+
+def add_finding_values(findings):
+    """
+    Invalidates the cached values of the products of new findings, if they are not cached yet. Used for findings
+    created with bulk_create, which sends no signals.
+    """
+    new_values = {}
+    for finding in findings:
+        for fieldname in FINDING_WORDS_FIELDS:
+            value = getattr(finding, fieldname)
+            if value:
+                new_values.setdefault(get_finding_values_key(get_product_id(finding), fieldname), set()).add(value)
+    if new_values:
+        cached = cache.get_many(list(new_values.keys()))
+        cache.delete_many([key for key, values in new_values.items() if key in cached and not values <= cached[key]])
+
+
 def get_words_for_field(model, fieldname):
+    words = set()
     max_results = getattr(settings, 'MAX_AUTOCOMPLETE_WORDS', 20000)
-    models = None
-    if model == Finding:
-        models = get_authorized_findings(Permissions.Finding_View, user=get_current_user())
-    elif model == Finding_Template:
-        models = Finding_Template.objects.all()
-
-    if models is not None:
-        words = [
-            word for field_value in models.order_by().filter(**{'%s__isnull' % fieldname: False}).values_list(fieldname, flat=True).distinct()[:max_results] for word in (field_value.split() if field_value else []) if len(word) > 2
-        ]
+    if model == Finding and fieldname in FINDING_WORDS_FIELDS:
+        # findings are authorized by their product, so the values of the authorized products are combined
+        product_ids = list(get_authorized_products(Permissions.Finding_View, user=get_current_user())
+                           .order_by().values_list('id', flat=True))
+        values = set()
+        for product_values in get_finding_values(product_ids, fieldname).values():
+            values.update(itertools.islice(product_values - values, max_results - len(values)))
+        words = set(word for value in values for word in value.split() if len(word) > 2)
     else:
-        words = []
+        models = None
+        if model == Finding:
+            models = get_authorized_findings(Permissions.Finding_View, user=get_current_user())
+        elif model == Finding_Template:
+            models = Finding_Template.objects.all()
+
+        if models is not None:
+            words = set(
+                word for field_value in models.order_by().filter(**{'%s__isnull' % fieldname: False}).values_list(fieldname, flat=True).distinct()[:max_results] for word in (field_value.split() if field_value else []) if len(word) > 2
+            )
 
-    return sorted(set(words))
+    return sorted(words)
 
 
 def get_current_user():
@@ -2265,6 +2418,7 @@ class async_delete():
 
     @dojo_async_task
     @app.task
+    @defer_finding_counts()
     def delete_chunk(self, objects, **kwargs):
         for object in objects:
             try:
@@ -2277,6 +2431,7 @@ class async_delete():
 
     @dojo_async_task
     @app.task
+    @defer_finding_counts()
     def delete(self, object, **kwargs):
         logger.debug('ASYNC_DELETE: Deleting ' + self.get_object_name(object) + ': ' + str(object))
         model_list = self.mapping.get(self.get_object_name(object), None)
@@ -2391,6 +2546,13 @@ def sum_by_severity_level(metrics):
 
 
 def get_open_findings_burndown(product):
+    """
+    The open findings of a product per severity over the past 90 days, cached per product and day.
+    """
+    return get_cached_series('burndown', [product.id], datetime.now().date(), lambda: count_open_findings_burndown(product))
+
+
+def count_open_findings_burndown(product):
     findings = Finding.objects.filter(test__engagement__product=product, duplicate=False)
     f_list = list(findings)
 
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from ..dojo_test_case import DojoTestCase
 from unittest.mock import patch
@@ -138,6 +139,10 @@ class TestAuthorization(DojoTestCase):
         cls.global_role_user.user = cls.user5
         cls.global_role_user.role = Role.objects.get(id=Roles.Owner)
 
+    def setUp(self):
+        # the memberships of the users are kept in the cache between requests
+        cache.clear()
+
     def test_role_has_permission_exception(self):
         with self.assertRaisesMessage(RoleDoesNotExistError,
                 'Role 9999 does not exist'):
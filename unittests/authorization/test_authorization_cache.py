@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from ..dojo_test_case import DojoTestCase
+from dojo.authorization.authorization import get_groups, get_product_member_dict, user_has_permission
+from dojo.authorization.roles_permissions import Permissions
+from dojo.models import Dojo_Group, Dojo_Group_Member, Dojo_User, Product, Product_Member, Role
+from dojo.request_cache import cache_calculate_key
+from dojo.request_cache.middleware import RequestCache
+
+
+@override_settings(CACHE_SHARED=True)
+class TestAuthorizationCache(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        cache.clear()
+        self.user = Dojo_User.objects.get(username='user1')
+        self.role = Role.objects.get(id=4)
+
+    def test_key(self):
+        self.assertEqual(cache_calculate_key('get_groups', self.user),
+                         cache_calculate_key('get_groups', Dojo_User.objects.get(id=self.user.id)))
+        # products without a name have the same str()
+        self.assertNotEqual(cache_calculate_key('get_product', Product(id=1)),
+                            cache_calculate_key('get_product', Product(id=2)))
+        self.assertNotEqual(cache_calculate_key('get_groups', self.user), cache_calculate_key('get_groups', permission=self.user))
+
+    def test_memberships_are_cached_outside_of_requests(self):
+        self.assertEqual({1, 2}, set(get_product_member_dict(self.user)))
+        with self.assertNumQueries(0):
+            self.assertEqual({1, 2}, set(get_product_member_dict(self.user)))
+
+        product = Product.objects.get(id=3)
+        self.assertFalse(user_has_permission(self.user, product, Permissions.Product_View))
+        Product_Member.objects.create(product=product, user=self.user, role=self.role)
+        self.assertEqual({1, 2, 3}, set(get_product_member_dict(self.user)))
+        self.assertTrue(user_has_permission(self.user, product, Permissions.Product_View))
+        with self.assertNumQueries(0):
+            self.assertTrue(user_has_permission(self.user, product, Permissions.Product_View))
+
+    @override_settings(CACHE_SHARED=False)
+    def test_memberships_are_not_cached_without_a_shared_cache(self):
+        self.assertEqual({1, 2}, set(get_product_member_dict(self.user)))
+        # a change this process is not notified of, like a downgrade made by another process
+        Product_Member.objects.filter(user=self.user).update(role=Role.objects.get(name='Reader'))
+        self.assertEqual({'Reader'}, {member.role.name for member in get_product_member_dict(self.user).values()})
+        self.assertFalse(user_has_permission(self.user, Product.objects.get(id=2), Permissions.Product_Edit))
+
+    @override_settings(CACHE_SHARED=False)
+    def test_memberships_are_cached_for_the_request_without_a_shared_cache(self):
+        with patch('dojo.request_cache.get_request_cache', return_value=RequestCache()):
+            self.assertEqual({1, 2}, set(get_product_member_dict(self.user)))
+            product = Product.objects.get(id=2)
+            self.assertTrue(user_has_permission(self.user, product, Permissions.Product_View))
+            with self.assertNumQueries(0):
+                self.assertEqual({1, 2}, set(get_product_member_dict(self.user)))
+                self.assertTrue(user_has_permission(self.user, product, Permissions.Product_View))
+        # the next request reads the memberships again
+        with patch('dojo.request_cache.get_request_cache', return_value=RequestCache()):
+            with self.assertNumQueries(1):
+                get_product_member_dict(self.user)
+
+    def test_groups_are_invalidated(self):
+        group = Dojo_Group.objects.get(id=2)
+        self.assertNotIn(group, get_groups(self.user))
+        Dojo_Group_Member.objects.create(group=group, user=self.user, role=self.role)
+        self.assertIn(group, get_groups(self.user))
+        group.users.remove(self.user)
+        self.assertNotIn(group, get_groups(self.user))
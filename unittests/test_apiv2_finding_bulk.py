@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from dojo.models import Endpoint_Status, Finding
+
+
+class FindingBulkTest(APITestCase):
+    """
+    Test the bulk update, close and tags endpoints of the findings.
+    """
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        token = Token.objects.get(user__username='admin')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def results(self, response):
+        self.assertEqual(response.status_code, 200, response.content[:1000])
+        return {result['id']: result for result in response.json()['results']}
+
+    @patch('dojo.utils.schedule_calculate_grade')
+    def test_bulk_update(self, mock_grade):
+        response = self.client.patch(reverse('finding-bulk-update'), {
+            'findings': [227, 228, 3, 999999],
+            'verified': False,
+            'under_review': True,
+        }, format='json')
+        results = self.results(response)
+        self.assertEqual('updated', results[227]['status'])
+        self.assertEqual('updated', results[228]['status'])
+        self.assertEqual('not_found', results[999999]['status'])
+        # duplicates cannot be active or verified, 3 is a duplicate but stays inactive and unverified
+        self.assertEqual('updated', results[3]['status'])
+        for finding in Finding.objects.filter(id__in=[227, 228]):
+            self.assertFalse(finding.verified)
+            self.assertTrue(finding.under_review)
+            self.assertTrue(finding.active)
+            self.assertIsNotNone(finding.last_reviewed)
+        # the grade of each product is calculated once
+        self.assertEqual(2, mock_grade.call_count)
+
+    def test_bulk_update_invalid(self):
+        response = self.client.patch(reverse('finding-bulk-update'), {
+            'findings': [3, 227],
+            'active': True,
+        }, format='json')
+        results = self.results(response)
+        self.assertEqual('invalid', results[3]['status'])
+        self.assertEqual(['Duplicate findings cannot be verified or active'], results[3]['errors'])
+        self.assertEqual('updated', results[227]['status'])
+        self.assertFalse(Finding.objects.get(id=3).active)
+
+        response = self.client.patch(reverse('finding-bulk-update'), {'findings': [227]}, format='json')
+        self.assertEqual(400, response.status_code)
+
+    def test_bulk_update_mitigates(self):
+        response = self.client.patch(reverse('finding-bulk-update'), {
+            'findings': [229],
+            'false_p': True,
+            'verified': False,
+        }, format='json')
+        self.results(response)
+        finding = Finding.objects.get(id=229)
+        self.assertTrue(finding.false_p)
+        self.assertFalse(finding.active)
+        self.assertFalse(finding.verified)
+        self.assertTrue(finding.is_mitigated)
+        self.assertIsNotNone(finding.mitigated)
+
+    @patch('dojo.api_v2.views.create_notification')
+    def test_bulk_close(self, mock_notification):
+        response = self.client.post(reverse('finding-bulk-close'), {
+            'findings': [227, 228, 2],
+            'note': 'closed by the automation',
+        }, format='json')
+        results = self.results(response)
+        self.assertEqual({'updated'}, {result['status'] for result in results.values()})
+        for finding in Finding.objects.filter(id__in=[227, 228, 2]):
+            self.assertFalse(finding.active)
+            self.assertTrue(finding.is_mitigated)
+            self.assertEqual('admin', finding.mitigated_by.username)
+            self.assertEqual(['closed by the automation'], [note.entry for note in finding.notes.all()])
+        self.assertFalse(Endpoint_Status.objects.filter(finding__in=[227, 228, 2], mitigated=False).exists())
+        # one notification per product
+        self.assertEqual(2, mock_notification.call_count)
+
+    @patch('dojo.reports.helper.bump_report_data_version')
+    def test_bulk_tags(self, mock_bump):
+        response = self.client.post(reverse('finding-bulk-tags'), {
+            'findings': [227, 228],
+            'add_tags': ['Bulk', 'second'],
+        }, format='json')
+        self.results(response)
+        for finding in Finding.objects.filter(id__in=[227, 228]):
+            self.assertEqual(['bulk', 'second'], sorted(finding.tags.get_tag_list()))
+        # the rendered reports of the product are outdated
+        mock_bump.assert_called_once_with(1)
+
+        response = self.client.post(reverse('finding-bulk-tags'), {
+            'findings': [227],
+            'remove_tags': ['bulk'],
+        }, format='json')
+        self.results(response)
+        self.assertEqual(['second'], Finding.objects.get(id=227).tags.get_tag_list())
+        self.assertEqual(['bulk', 'second'], sorted(Finding.objects.get(id=228).tags.get_tag_list()))
+
+    def test_bulk_forbidden(self):
+        # user4 is a global reader, the findings can be viewed but not edited
+        self.client.force_authenticate(User.objects.get(username='user4'))
+        response = self.client.post(reverse('finding-bulk-close'), {'findings': [227, 2]}, format='json')
+        results = self.results(response)
+        self.assertEqual('forbidden', results[227]['status'])
+        self.assertEqual('forbidden', results[2]['status'])
+        self.assertTrue(Finding.objects.get(id=227).active)
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from dojo.models import Finding
+
+
+class PaginationTest(APITestCase):
+    """
+    Test the cursor and count options of the pagination of the APIv2 endpoints.
+    """
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        token = Token.objects.get(user__username='admin')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def get(self, url, params):
+        r = self.client.get(url, params)
+        self.assertEqual(r.status_code, 200, r.content[:1000])
+        return r.json()
+
+    def get_all(self, url, params):
+        ids = []
+        data = self.get(url, params)
+        while True:
+            ids += [result['id'] for result in data['results']]
+            if not data['next']:
+                return ids
+            data = self.get(data['next'], {})
+
+    def test_cursor(self):
+        ids = list(Finding.objects.order_by('id').values_list('id', flat=True))
+        self.assertGreater(len(ids), 2)
+        data = self.get(reverse('finding-list'), {'cursor': '', 'limit': 2})
+        self.assertIsNone(data['count'])
+        self.assertEqual(ids[:2], [result['id'] for result in data['results']])
+        self.assertIn('cursor=', data['next'])
+        self.assertIsNone(data['previous'])
+        # the ordering is ignored
+        self.assertEqual(ids, self.get_all(reverse('finding-list'), {'cursor': '', 'limit': 2, 'o': '-id'}))
+
+    def test_cursor_of_other_endpoints(self):
+        for name in ['endpoint-list', 'endpoint_status-list', 'engagement-list', 'test-list', 'test_import-list']:
+            with self.subTest(name=name):
+                ids = [result['id'] for result in self.get(reverse(name), {'limit': 1000})['results']]
+                self.assertEqual(sorted(ids), self.get_all(reverse(name), {'cursor': '', 'limit': 1}))
+
+    def test_cursor_does_not_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get(reverse('finding-list'), {'cursor': '', 'limit': 2})
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+
+    def test_skip_count(self):
+        count = Finding.objects.count()
+        data = self.get(reverse('finding-list'), {'limit': 2})
+        self.assertEqual(count, data['count'])
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(reverse('finding-list'), {'limit': 2, 'count': 'false', 'o': 'id'})
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+        self.assertIsNone(data['count'])
+        self.assertIn('offset=2', data['next'])
+        self.assertEqual(list(Finding.objects.order_by('id').values_list('id', flat=True)),
+                         self.get_all(reverse('finding-list'), {'limit': 2, 'count': 'false', 'o': 'id'}))
+
+        data = self.get(reverse('finding-list'), {'limit': count, 'count': 'false'})
+        self.assertEqual(count, len(data['results']))
+        self.assertIsNone(data['next'])
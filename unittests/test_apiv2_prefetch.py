@@ -0,0 +1,56 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from dojo.api_v2.prefetch.prefetcher import _Prefetcher
+from dojo.models import Finding
+
+
+class PrefetchTest(APITestCase):
+    """
+    Test the prefetching of related instances of the APIv2 endpoints.
+    """
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        token = Token.objects.get(user__username='admin')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def get_tables(self, queries):
+        return [query['sql'].split(' FROM ')[1].split()[0].strip('"') for query in queries
+                if query['sql'].startswith('SELECT') and ' FROM ' in query['sql']]
+
+    def test_same_data_as_per_entry(self):
+        findings = list(Finding.objects.order_by('id'))
+        fields = ['test', 'reporter', 'endpoints', 'reviewers', 'mitigated_by', 'notes', 'unknown', '']
+        expected = {}
+        for finding in findings:
+            per_entry = _Prefetcher()
+            per_entry._prefetch(finding, fields)
+            for field, data in per_entry.prefetched_data.items():
+                expected.setdefault(field, {}).update(data)
+
+        prefetcher = _Prefetcher()
+        prefetcher._prefetch_all(findings, fields)
+        self.assertEqual(expected, prefetcher.prefetched_data)
+
+    def test_related_instances_are_fetched_once(self):
+        findings = list(Finding.objects.order_by('id'))
+        self.assertGreater(len({finding.test_id for finding in findings}), 1)
+        with CaptureQueriesContext(connection) as queries:
+            _Prefetcher()._prefetch_all(findings, ['test', 'reporter', 'endpoints'])
+        tables = self.get_tables(queries)
+        for table in ['dojo_test', 'auth_user', 'dojo_endpoint', 'dojo_tagulous_test_tags', 'dojo_notes',
+                      'dojo_tagulous_endpoint_tags']:
+            self.assertEqual(1, tables.count(table), table)
+
+    def test_list(self):
+        r = self.client.get(reverse('finding-list'), {'prefetch': 'test,reporter,endpoints', 'limit': 100})
+        self.assertEqual(r.status_code, 200, r.content[:1000])
+        data = r.json()
+        self.assertEqual({result['test'] for result in data['results']}, {int(id) for id in data['prefetch']['test']})
+        self.assertEqual({id for result in data['results'] for id in result['endpoints']},
+                         {int(id) for id in data['prefetch']['endpoints']})
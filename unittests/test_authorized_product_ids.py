@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+from crum import impersonate
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.test import override_settings
+
+from dojo.authorization.roles_permissions import Permissions
+from dojo.endpoint.queries import get_authorized_endpoints
+from dojo.engagement.queries import get_authorized_engagements
+from dojo.finding.queries import get_authorized_findings
+from dojo.models import Dojo_Group, Dojo_Group_Member, Dojo_User, Endpoint, Engagement, Finding, Global_Role, Product, \
+    Product_Group, Product_Member, Product_Type, Role, Test
+from dojo.product.queries import get_authorized_product_ids, get_authorized_products
+from dojo.test.queries import get_authorized_tests
+from .dojo_test_case import DojoTestCase
+
+
+@override_settings(CACHE_SHARED=True)
+class TestAuthorizedProductIds(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        cache.clear()
+        self.user = Dojo_User.objects.get(username='user1')
+        self.role = Role.objects.get(id=4)
+        self.product = Product.objects.get(id=3)
+
+    def get_product_ids(self, user=None):
+        return sorted(get_authorized_product_ids(Permissions.Product_View, user=user or self.user))
+
+    def test_product_ids_of_memberships(self):
+        self.assertEqual([1, 2], self.get_product_ids())
+        self.assertEqual([], self.get_product_ids(Dojo_User.objects.get(username='user2')))
+        self.assertEqual(list(Product.objects.order_by('id').values_list('id', flat=True)),
+                         self.get_product_ids(Dojo_User.objects.get(username='admin')))
+        # the ids are cached
+        with self.assertNumQueries(0):
+            self.assertEqual([1, 2], self.get_product_ids())
+
+    @override_settings(CACHE_SHARED=False)
+    def test_product_ids_are_not_cached_without_a_shared_cache(self):
+        # the ids are a subquery of the authorized queries
+        self.assertIsInstance(get_authorized_product_ids(Permissions.Product_View, user=self.user), QuerySet)
+        self.assertEqual([1, 2], self.get_product_ids())
+        # a change this process is not notified of, like a change made by another process
+        Product_Member.objects.filter(user=self.user, product=2).update(product=self.product)
+        self.assertEqual([1, 3], self.get_product_ids())
+
+    def test_many_product_ids_are_a_subquery(self):
+        self.assertEqual([1, 2], get_authorized_product_ids(Permissions.Product_View, user=self.user))
+        with patch('dojo.product.queries.AUTHORIZED_PRODUCT_IDS_MAX_LIST', 1):
+            product_ids = get_authorized_product_ids(Permissions.Product_View, user=self.user)
+        self.assertIsInstance(product_ids, QuerySet)
+        self.assertEqual([1, 2], sorted(product_ids))
+
+    def test_product_ids_are_invalidated_by_product_members(self):
+        self.get_product_ids()
+        member = Product_Member.objects.create(product=self.product, user=self.user, role=self.role)
+        self.assertEqual([1, 2, 3], self.get_product_ids())
+        member.delete()
+        self.assertEqual([1, 2], self.get_product_ids())
+
+    def test_product_ids_are_invalidated_by_groups(self):
+        group = Dojo_Group.objects.get(id=2)
+        Product_Group.objects.create(product=self.product, group=group, role=self.role)
+        self.assertEqual([1, 2], self.get_product_ids())
+        Dojo_Group_Member.objects.create(group=group, user=self.user, role=self.role)
+        self.assertEqual([1, 2, 3], self.get_product_ids())
+        group.users.remove(self.user)
+        self.assertEqual([1, 2], self.get_product_ids())
+
+    def test_product_ids_are_invalidated_by_global_roles(self):
+        self.get_product_ids()
+        global_role = Global_Role.objects.create(user=self.user, role=self.role)
+        self.assertEqual(list(Product.objects.order_by('id').values_list('id', flat=True)), self.get_product_ids())
+        global_role.delete()
+        self.user.refresh_from_db()
+        self.assertEqual([1, 2], self.get_product_ids())
+
+    def test_product_ids_are_invalidated_by_products(self):
+        self.get_product_ids()
+        self.product.prod_type = Product_Type.objects.get(id=1)
+        self.product.save()
+        self.assertEqual([1, 2, 3], self.get_product_ids())
+        product = Product.objects.create(name='new product', description='new product', prod_type_id=1)
+        self.assertEqual([1, 2, 3, product.id], self.get_product_ids())
+
+    def test_querysets_are_filtered_by_product_ids(self):
+        with impersonate(self.user):
+            querysets = [
+                (get_authorized_products(Permissions.Product_View), Product.objects.filter(id__in=[1, 2])),
+                (get_authorized_engagements(Permissions.Engagement_View), Engagement.objects.filter(product__in=[1, 2])),
+                (get_authorized_tests(Permissions.Test_View), Test.objects.filter(engagement__product__in=[1, 2])),
+                (get_authorized_findings(Permissions.Finding_View),
+                 Finding.objects.filter(test__engagement__product__in=[1, 2])),
+                (get_authorized_endpoints(Permissions.Endpoint_View), Endpoint.objects.filter(product__in=[1, 2])),
+            ]
+        for authorized, expected in querysets:
+            with self.subTest(model=authorized.model):
+                self.assertNotIn('EXISTS', str(authorized.query))
+                self.assertEqual(set(expected), set(authorized))
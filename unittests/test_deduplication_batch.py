@@ -0,0 +1,88 @@
+import copy
+import logging
+
+from crum import impersonate
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from dojo.finding.deduplication import dedupe_batch
+from dojo.importers.importer.importer import DojoDefaultImporter as Importer
+from dojo.models import Development_Environment, Engagement, Finding, Product, Product_Type, System_Settings, User
+from dojo.tools.factory import get_parser
+from .dojo_test_case import DojoTestCase, get_unit_tests_path
+
+logger = logging.getLogger(__name__)
+
+
+class TestDeduplicationBatch(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def run(self, result=None):
+        testuser = User.objects.get(username='admin')
+        testuser.usercontactinfo.block_execution = True
+        testuser.save()
+
+        # run under a user with block_execution so the post processing happens in the foreground
+        with impersonate(testuser):
+            super().run(result)
+
+    def import_findings(self, filename, scan_type, product_name, times=1, dedupe=False):
+        # by default deduplication is disabled during the import, so the findings can be deduplicated afterwards
+        self.set_deduplication(dedupe)
+        user = User.objects.get(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="test batch dedupe")
+        product, _ = Product.objects.get_or_create(name=product_name, prod_type=product_type)
+        engagement, _ = Engagement.objects.get_or_create(
+            name="Test Batch Dedupe Engagement",
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        importer = Importer()
+        test = importer.create_test(scan_type, scan_type, engagement, user, environment)
+        with open(get_unit_tests_path() + filename) as scan:
+            parsed_findings = get_parser(scan_type).get_findings(scan, test)
+        parsed_findings = [copy.copy(finding) for _ in range(times) for finding in parsed_findings]
+        importer.process_parsed_findings(test, parsed_findings, scan_type, user, active=True, verified=True, sync=True)
+        self.set_deduplication(True)
+        return list(Finding.objects.filter(test=test).select_related('test__engagement__product', 'test__test_type').order_by('id'))
+
+    def set_deduplication(self, enabled):
+        system_settings = System_Settings.objects.get()
+        system_settings.enable_deduplication = enabled
+        system_settings.save()
+
+    def duplicates_summary(self, findings):
+        return [(finding.duplicate, finding.active, finding.duplicate_finding_id is not None) for finding in Finding.objects.filter(id__in=[finding.id for finding in findings]).order_by('id')]
+
+    def test_dedupe_batch_matches_dedupe_per_finding(self):
+        for filename, scan_type in [
+            ("/scans/zap/some_2.9.0.xml", "ZAP Scan"),
+            ("/scans/checkmarx/multiple_findings.xml", "Checkmarx Scan detailed"),
+            ("/scans/semgrep/many_findings.json", "Semgrep JSON Report"),
+        ]:
+            with self.subTest(scan_type=scan_type):
+                findings = self.import_findings(filename, scan_type, f"{scan_type} per finding", times=2, dedupe=True)
+                batch_findings = self.import_findings(filename, scan_type, f"{scan_type} batch", times=2)
+                dedupe_batch(batch_findings)
+
+                summary = self.duplicates_summary(findings)
+                self.assertEqual(len(findings) / 2, len([duplicate for duplicate, _, _ in summary if duplicate]))
+                self.assertEqual(summary, self.duplicates_summary(batch_findings))
+
+    def test_dedupe_batch_query_count_does_not_depend_on_finding_count(self):
+        # benchmark: the report is imported 1 and 10 times into a product that already has the findings of the report
+        query_counts = []
+        for times in [1, 10]:
+            product_name = f"Trivy Scan {times}"
+            self.import_findings("/scans/trivy/scheme_2_many_vulns.json", "Trivy Scan", product_name)
+            findings = self.import_findings("/scans/trivy/scheme_2_many_vulns.json", "Trivy Scan", product_name, times=times)
+            with CaptureQueriesContext(connection) as queries:
+                dedupe_batch(findings)
+            logger.info('batch dedupe of %i findings took %i queries', len(findings), len(queries))
+            self.assertEqual(len(findings), len([finding for finding in findings if finding.duplicate]))
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
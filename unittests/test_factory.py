@@ -1,4 +1,7 @@
-from dojo.tools.factory import get_parser
+from dojo.management.commands.generate_parser_manifest import get_manifest
+from dojo.tools.factory import ParserRegistry, get_parser, get_choices_sorted, requires_file, PARSERS
+from dojo.tools.manifest import PARSERS_MANIFEST
+from dojo.tools.zap.parser import ZapParser
 from dojo.models import Test, Test_Type
 from .dojo_test_case import DojoTestCase, get_unit_tests_path
 
@@ -52,3 +55,22 @@ class TestFactory(DojoTestCase):
         )
         parser = get_parser(scan_type)
         self.assertIsNotNone(parser)
+
+    def test_manifest_is_up_to_date(self):
+        # run `python manage.py generate_parser_manifest` if this fails after adding or changing a parser
+        self.assertEqual(get_manifest(), PARSERS_MANIFEST)
+
+    def test_parsers_are_loaded_lazily(self):
+        registry = ParserRegistry(PARSERS_MANIFEST)
+        self.assertIn("ZAP Scan", registry)
+        self.assertEqual(len(PARSERS_MANIFEST), len(list(registry)))
+        self.assertEqual({}, registry.parsers)
+        self.assertIsInstance(registry["ZAP Scan"], ZapParser)
+        self.assertEqual(["ZAP Scan"], list(registry.parsers))
+
+    def test_choices_and_requires_file_from_manifest(self):
+        self.assertIn(("ZAP Scan", "ZAP Scan"), get_choices_sorted())
+        self.assertTrue(requires_file("ZAP Scan"))
+        self.assertFalse(requires_file("SonarQube API Import"))
+        self.assertFalse(requires_file("type_that_doesn't_exist"))
+        self.assertEqual(PARSERS["Checkmarx Scan detailed"].mode, "detailed")
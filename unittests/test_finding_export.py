@@ -0,0 +1,196 @@
+import csv
+import io
+import os
+import pickle
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from dojo.authorization.roles_permissions import Permissions
+from dojo.finding.queries import get_authorized_findings
+from dojo.models import Endpoint, Endpoint_Status, Finding, User, Vulnerability_Id
+from dojo.reports.helper import get_attributes, get_excludes, get_export_path, stream_csv, write_excel
+from .dojo_test_case import DojoTestCase
+
+
+def get_csv_rows_per_finding(findings):
+    """
+    The csv export as it was before the export used a column plan, reading every attribute of every finding
+    """
+    rows = []
+    allowed_attributes = get_attributes()
+    excludes_list = get_excludes()
+    allowed_foreign_keys = get_attributes()
+    first_row = True
+
+    for finding in findings:
+        if first_row:
+            fields = []
+            for key in dir(finding):
+                try:
+                    if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith('_'):
+                        if callable(getattr(finding, key)) and key not in allowed_attributes:
+                            continue
+                        fields.append(key)
+                except Exception:
+                    fields.append(key)
+                    continue
+            fields += ['test', 'found_by', 'engagement_id', 'engagement', 'product_id', 'product', 'endpoints', 'vulnerability_ids']
+            rows.append(fields)
+            first_row = False
+
+        fields = []
+        for key in dir(finding):
+            try:
+                if key not in excludes_list and (not callable(getattr(finding, key)) or key in allowed_attributes) and not key.startswith('_'):
+                    if not callable(getattr(finding, key)):
+                        value = finding.__dict__.get(key)
+                    if (key in allowed_foreign_keys or key in allowed_attributes) and getattr(finding, key):
+                        if callable(getattr(finding, key)):
+                            value = getattr(finding, key)()
+                        else:
+                            value = str(getattr(finding, key))
+                    if value and isinstance(value, str):
+                        value = value.replace('\n', ' NEWLINE ').replace('\r', '')
+                    fields.append(value)
+            except Exception:
+                fields.append("Value not supported")
+                continue
+        fields += [finding.test.title, finding.test.test_type.name, finding.test.engagement.id, finding.test.engagement.name,
+                   finding.test.engagement.product.id, finding.test.engagement.product.name]
+
+        endpoint_value = ''
+        num_endpoints = 0
+        for endpoint in finding.endpoints.all():
+            num_endpoints += 1
+            if num_endpoints > 5:
+                endpoint_value += '...'
+                break
+            endpoint_value += f'{str(endpoint)}; '
+        if endpoint_value.endswith('; '):
+            endpoint_value = endpoint_value[:-2]
+        fields.append(endpoint_value)
+
+        vulnerability_ids_value = ''
+        num_vulnerability_ids = 0
+        for vulnerability_id in finding.vulnerability_ids:
+            num_vulnerability_ids += 1
+            if num_vulnerability_ids > 5:
+                vulnerability_ids_value += '...'
+                break
+            vulnerability_ids_value += f'{str(vulnerability_id)}; '
+        if finding.cve and vulnerability_ids_value.find(finding.cve) < 0:
+            vulnerability_ids_value += finding.cve
+        if vulnerability_ids_value.endswith('; '):
+            vulnerability_ids_value = vulnerability_ids_value[:-2]
+        fields.append(vulnerability_ids_value)
+        rows.append(fields)
+
+    return rows
+
+
+def read_csv(content):
+    return list(csv.reader(io.StringIO(content)))
+
+
+class TestFindingExport(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='admin')
+        self.client.force_login(self.user)
+        finding = Finding.objects.get(id=2)
+        finding.description = 'first line\nsecond line'
+        finding.cve = 'CVE-2020-1234'
+        finding.save_no_options()
+        for index in range(7):
+            endpoint = Endpoint.objects.create(host=f'host{index}.example.com', product=finding.test.engagement.product)
+            Endpoint_Status.objects.create(endpoint=endpoint, finding=finding)
+            Vulnerability_Id.objects.create(finding=finding, vulnerability_id=f'CVE-2021-{index}')
+
+    def get_csv(self, findings):
+        return read_csv(''.join(stream_csv(findings)))
+
+    def test_csv_matches_export_per_finding(self):
+        findings = Finding.objects.order_by('id')
+        expected = read_csv(self.write_rows(get_csv_rows_per_finding(findings)))
+        rows = self.get_csv(findings)
+        self.assertEqual(findings.count() + 1, len(rows))
+        self.assertEqual(expected, rows)
+
+    def write_rows(self, rows):
+        file = io.StringIO()
+        csv.writer(file).writerows(rows)
+        return file.getvalue()
+
+    def test_csv_query_count_does_not_depend_on_findings(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_csv(Finding.objects.filter(id__in=[2, 3]))
+        with CaptureQueriesContext(connection) as all_queries:
+            rows = self.get_csv(Finding.objects.all())
+        self.assertGreater(len(rows), 3)
+        self.assertEqual(len(queries), len(all_queries))
+
+    def test_csv_export_view(self):
+        response = self.client.get(reverse('csv_export') + '?url=/finding')
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.streaming)
+        self.assertEqual('attachment; filename=findings.csv', response['Content-Disposition'])
+        rows = read_csv(b''.join(response.streaming_content).decode())
+        self.assertEqual(Finding.objects.count() + 1, len(rows))
+
+    def test_excel(self):
+        findings = Finding.objects.order_by('id')
+        file = io.BytesIO()
+        write_excel(findings, file)
+        file.seek(0)
+        rows = list(load_workbook(file)['Findings'].values)
+
+        csv_rows = self.get_csv(findings)
+        self.assertEqual(len(csv_rows), len(rows))
+        # the excel export has no column with the title of the test
+        self.assertEqual(csv_rows[0][:-8] + csv_rows[0][-7:], list(rows[0]))
+        title = rows[0].index('title')
+        self.assertEqual([row[csv_rows[0].index('title')] for row in csv_rows[1:]], [row[title] for row in rows[1:]])
+        description = rows[0].index('description')
+        self.assertIn('first line\nsecond line', [row[description] for row in rows[1:]])
+
+        response = self.client.get(reverse('excel_export') + '?url=/finding')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(Finding.objects.count() + 1, len(list(load_workbook(io.BytesIO(b''.join(response.streaming_content)))['Findings'].values)))
+
+    def test_export_query_can_be_pickled(self):
+        # the query of the findings is passed to the celery task
+        findings = get_authorized_findings(Permissions.Finding_View, user=User.objects.get(username='user1')).order_by('-id')
+        unpickled = Finding.objects.all()
+        unpickled.query = pickle.loads(pickle.dumps(findings.query))
+        self.assertTrue(findings)
+        self.assertEqual(list(findings), list(unpickled))
+
+    def test_export_in_background(self):
+        # run the export in the foreground
+        self.user.usercontactinfo.block_execution = True
+        self.user.usercontactinfo.save()
+        directory = get_export_path('')
+        existing = set(os.listdir(directory)) if os.path.isdir(directory) else set()
+
+        response = self.client.get(reverse('csv_export_background') + '?url=/finding')
+        self.assertRedirects(response, '/finding', fetch_redirect_response=False)
+        names = set(os.listdir(directory)) - existing
+        self.assertEqual(1, len(names))
+        name = names.pop()
+        try:
+            self.assertTrue(name.startswith(f'{self.user.id}-'))
+            response = self.client.get(reverse('download_export', args=(name, )))
+            self.assertEqual(200, response.status_code)
+            rows = read_csv(b''.join(response.streaming_content).decode())
+            response = self.client.get(reverse('csv_export') + '?url=/finding')
+            self.assertEqual(read_csv(b''.join(response.streaming_content).decode()), rows)
+
+            self.client.force_login(User.objects.get(username='user2'))
+            response = self.client.get(reverse('download_export', args=(name, )))
+            self.assertEqual(404, response.status_code)
+        finally:
+            os.remove(get_export_path(name))
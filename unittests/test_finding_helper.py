@@ -1,13 +1,16 @@
 from .dojo_test_case import DojoTestCase
-from dojo.models import Finding, Test, Vulnerability_Id, Finding_Template, Vulnerability_Id_Template
+from dojo.models import Endpoint, Endpoint_Status, Finding, Test, Vulnerability_Id, Finding_Template, Vulnerability_Id_Template
+from auditlog.models import LogEntry
 from django.contrib.auth.models import User
 from unittest import mock
 from unittest.mock import patch
 from crum import impersonate
 import datetime
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 import logging
-from dojo.finding.helper import save_vulnerability_ids, save_vulnerability_ids_template
+from dojo.finding.helper import close_findings_batch, save_vulnerability_ids, save_vulnerability_ids_template
 
 logger = logging.getLogger(__name__)
 
@@ -242,3 +245,82 @@ class TestSaveVulnerabilityIds(DojoTestCase):
         delete_mock.assert_called_once()
         self.assertEqual(save_mock.call_count, 2)
         self.assertEqual('REF-1', finding_template.cve)
+
+
+class TestCloseFindingsBatch(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='admin')
+        self.test = Test.objects.get(id=3)
+        self.endpoint = Endpoint.objects.create(host='close.example.com', product=self.test.engagement.product)
+
+    def create_findings(self, count):
+        findings = []
+        for i in range(count):
+            finding = Finding(test=self.test, title=f'close {i}', severity='High', reporter=self.user, active=True)
+            finding.save_no_options()
+            Endpoint_Status.objects.create(finding=finding, endpoint=self.endpoint)
+            findings.append(Finding.objects.get(id=finding.id))
+        return findings
+
+    def get_closed_state(self, finding):
+        finding = Finding.objects.get(id=finding.id)
+        return (
+            self.get_status_fields(finding),
+            [note.entry for note in finding.notes.all()],
+            [(status.mitigated, status.mitigated_by_id) for status in finding.status_finding.all()],
+            [tag.name for tag in finding.tags.all()],
+            LogEntry.objects.get_for_object(finding).filter(action=LogEntry.Action.UPDATE).count(),
+        )
+
+    def get_status_fields(self, finding):
+        return finding.active, finding.verified, finding.false_p, finding.out_of_scope, finding.is_mitigated, finding.mitigated, finding.mitigated_by, finding.duplicate, finding.last_status_update
+
+    @mock.patch('dojo.finding.helper.timezone.now')
+    def test_close_findings_batch_matches_save(self, mock_tz):
+        mock_tz.return_value = frozen_datetime
+        with impersonate(self.user):
+            finding, batch_finding = self.create_findings(2)
+
+            # the way findings used to be closed one by one
+            finding.active = False
+            finding.is_mitigated = True
+            finding.mitigated = frozen_datetime
+            finding.notes.create(author=self.user, entry='closed')
+            for status in finding.status_finding.all():
+                status.mitigated = True
+                status.mitigated_by = self.user
+                status.save()
+            finding.tags.add('stale')
+            finding.save(dedupe_option=False)
+
+            closed = close_findings_batch([batch_finding], self.user, frozen_datetime, 'closed', tags=['stale'])
+
+            self.assertEqual([batch_finding], closed)
+            self.assertEqual(self.get_status_fields(batch_finding), self.get_status_fields(Finding.objects.get(id=batch_finding.id)))
+            self.assertEqual(self.get_closed_state(finding), self.get_closed_state(batch_finding))
+            self.assertEqual((False, False, False, False, True, frozen_datetime, self.user, False, frozen_datetime), self.get_status_fields(batch_finding))
+
+    def test_close_findings_batch_without_bulk_insert_ids(self):
+        # mysql doesn't return the ids of bulk created rows
+        features = mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', new_callable=mock.PropertyMock,
+                                     return_value=False)
+        with impersonate(self.user), features:
+            findings = self.create_findings(3)
+            close_findings_batch(findings, self.user, timezone.now(), 'closed', tags=['stale'])
+        for finding in findings:
+            self.assertEqual(['closed'], [note.entry for note in Finding.objects.get(id=finding.id).notes.all()])
+
+    def test_close_findings_batch_query_count(self):
+        query_counts = []
+        with impersonate(self.user):
+            # the first run creates the tag and fills the caches
+            for count in [1, 1, 10]:
+                findings = self.create_findings(count)
+                with CaptureQueriesContext(connection) as queries:
+                    close_findings_batch(findings, self.user, timezone.now(), 'closed', tags=['stale'])
+                query_counts.append(len(queries))
+                self.assertEqual(count, Finding.objects.filter(id__in=[finding.id for finding in findings], is_mitigated=True, notes__entry='closed').count())
+
+        self.assertEqual(query_counts[1], query_counts[2])
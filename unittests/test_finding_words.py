@@ -0,0 +1,97 @@
+from crum import impersonate
+from django.core.cache import cache
+from django.test import override_settings
+
+from dojo.models import Finding, Finding_Template, Product, User
+from dojo.utils import add_finding_values, get_finding_values_key, get_words_for_field
+from .dojo_test_case import DojoTestCase
+
+
+class TestFindingWords(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        cache.clear()
+        self.finding = Finding.objects.filter(test__engagement__product=2).first()
+        self.finding.title = 'unusual title of the finding'
+        self.finding.component_name = 'component'
+        self.finding.save_no_options()
+
+    def get_words(self, user, fieldname='title'):
+        with impersonate(User.objects.get(username=user) if isinstance(user, str) else user):
+            return get_words_for_field(Finding, fieldname)
+
+    def get_words_per_finding(self, findings, fieldname):
+        return sorted(set(word for value in findings.exclude(**{fieldname: None}).values_list(fieldname, flat=True)
+                          for word in value.split() if len(word) > 2))
+
+    def test_words_of_all_findings(self):
+        words = self.get_words('admin')
+        self.assertIn('Unusual', words)
+        self.assertNotIn('Of', words)
+        self.assertNotIn('of', words)
+        self.assertEqual(self.get_words_per_finding(Finding.objects.all(), 'title'), words)
+        self.assertEqual(['component'], self.get_words('admin', 'component_name'))
+
+    def test_words_are_authorized_by_product(self):
+        self.assertIn('Unusual', self.get_words('user1'))
+        self.assertEqual([], self.get_words('user2'))
+
+    def test_words_are_cached_per_product(self):
+        admin = User.objects.get(username='admin')
+        self.get_words(admin)
+        self.get_words(admin, 'component_name')
+        # the products of the user, the words come from the cache
+        with self.assertNumQueries(1):
+            words = self.get_words(admin)
+        self.assertIn('Unusual', words)
+        self.assertIn(self.finding.title, cache.get(get_finding_values_key(2, 'title')))
+
+        # saves that don't change the values keep them
+        self.finding.severity = 'Low'
+        self.finding.save_no_options()
+        self.assertIsNotNone(cache.get(get_finding_values_key(2, 'title')))
+
+        # only the values of the changed product and field are read again
+        self.finding.title = 'renamed title'
+        self.finding.save_no_options()
+        self.assertIsNone(cache.get(get_finding_values_key(2, 'title')))
+        self.assertIsNotNone(cache.get(get_finding_values_key(2, 'component_name')))
+        for product in Product.objects.exclude(id=2):
+            self.assertIsNotNone(cache.get(get_finding_values_key(product.id, 'title')))
+        words = self.get_words('admin')
+        self.assertIn('Renamed', words)
+        self.assertNotIn('Unusual', words)
+
+        self.finding.delete()
+        self.assertNotIn('Renamed', self.get_words('admin'))
+
+    def test_new_findings_with_known_values_keep_them(self):
+        self.get_words('admin')
+        Finding.objects.create(test=self.finding.test, title=self.finding.title, severity='High', reporter=self.finding.reporter)
+        self.assertIsNotNone(cache.get(get_finding_values_key(2, 'title')))
+        Finding.objects.create(test=self.finding.test, title='another title', severity='High', reporter=self.finding.reporter)
+        self.assertIsNone(cache.get(get_finding_values_key(2, 'title')))
+        self.assertIn('Another', self.get_words('admin'))
+
+    def test_words_are_limited_for_all_products(self):
+        # the limit applies to the values of all products of the user, not to each product
+        with override_settings(MAX_AUTOCOMPLETE_WORDS=1):
+            words = self.get_words('admin')
+        self.assertGreater(Product.objects.filter(engagement__test__finding__isnull=False).distinct().count(), 1)
+        self.assertIn(words, [sorted(set(word for word in title.split() if len(word) > 2))
+                              for title in Finding.objects.values_list('title', flat=True).distinct()])
+
+    def test_words_of_bulk_created_findings(self):
+        self.assertNotIn('imported', self.get_words('admin'))
+        findings = Finding.objects.bulk_create([Finding(test=self.finding.test, title='imported in bulk', severity='High',
+                                                        reporter=self.finding.reporter)])
+        # bulk creates send no signals, the importers add the values of the findings
+        add_finding_values(findings)
+        self.assertIn('imported', self.get_words('admin'))
+
+    def test_words_of_templates(self):
+        Finding_Template.objects.create(title='template title')
+        words = get_words_for_field(Finding_Template, 'title')
+        self.assertIn('template', words)
+        self.assertNotIn('CSRF', get_words_for_field(Finding, 'title'))
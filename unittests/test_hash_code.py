@@ -0,0 +1,107 @@
+import copy
+import logging
+import time
+
+from crum import impersonate
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from dojo.finding.hash_code import compute_hash_codes, get_hash_code_computer, recompute_hash_codes
+from dojo.importers.importer.importer import DojoDefaultImporter as Importer
+from dojo.models import Development_Environment, Engagement, Finding, Product, Product_Type, User
+from dojo.tools.factory import get_parser
+from .dojo_test_case import DojoTestCase, get_unit_tests_path
+
+logger = logging.getLogger(__name__)
+
+HASHCODE_FIELDS_PER_SCANNER = dict(settings.HASHCODE_FIELDS_PER_SCANNER, **{'ZAP Scan': ['title', 'cwe', 'severity', 'endpoints']})
+
+
+@override_settings(HASHCODE_FIELDS_PER_SCANNER=HASHCODE_FIELDS_PER_SCANNER)
+class TestHashCode(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def run(self, result=None):
+        testuser = User.objects.get(username='admin')
+        testuser.usercontactinfo.block_execution = True
+        testuser.save()
+
+        # run under a user with block_execution so the post processing happens in the foreground
+        with impersonate(testuser):
+            super().run(result)
+
+    def import_findings(self, filename, scan_type, product_name, times=1):
+        user = User.objects.get(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="test hash code")
+        product, _ = Product.objects.get_or_create(name=product_name, prod_type=product_type)
+        engagement, _ = Engagement.objects.get_or_create(
+            name="Test Hash Code Engagement",
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        importer = Importer()
+        test = importer.create_test(scan_type, scan_type, engagement, user, environment)
+        with open(get_unit_tests_path() + filename) as scan:
+            parsed_findings = get_parser(scan_type).get_findings(scan, test)
+        parsed_findings = [copy.copy(finding) for _ in range(times) for finding in parsed_findings]
+        importer.process_parsed_findings(test, parsed_findings, scan_type, user, active=True, verified=True, sync=True)
+        return Finding.objects.filter(test=test).order_by('id')
+
+    def test_hash_code_fields_are_resolved_once_per_test_type(self):
+        findings = self.import_findings("/scans/zap/some_2.9.0.xml", "ZAP Scan", "ZAP Scan computer")
+        computer = get_hash_code_computer(findings[0].test)
+        self.assertEqual(('title', 'cwe', 'severity', 'endpoints'), computer.hash_code_fields)
+        self.assertTrue(computer.uses_endpoints)
+        self.assertFalse(computer.uses_vulnerability_ids)
+        self.assertIs(computer, get_hash_code_computer(findings[1].test))
+
+    def test_recompute_hash_codes_matches_hash_codes_of_import(self):
+        for filename, scan_type in [
+            ("/scans/zap/some_2.9.0.xml", "ZAP Scan"),
+            ("/scans/trivy/scheme_2_many_vulns.json", "Trivy Scan"),
+            ("/scans/checkmarx/multiple_findings.xml", "Checkmarx Scan detailed"),
+        ]:
+            with self.subTest(scan_type=scan_type):
+                findings = self.import_findings(filename, scan_type, f"{scan_type} recompute")
+                hash_codes = list(findings.values_list('id', 'hash_code'))
+                self.assertTrue(all(hash_code for _, hash_code in hash_codes))
+
+                findings.update(hash_code='outdated')
+                self.assertEqual(len(hash_codes), recompute_hash_codes(findings, batch_size=3))
+                self.assertEqual(hash_codes, list(findings.values_list('id', 'hash_code')))
+                # the hash codes of the batch are the same as the ones computed finding by finding
+                self.assertEqual([hash_code for _, hash_code in hash_codes], [finding.compute_hash_code() for finding in findings])
+                self.assertEqual(0, recompute_hash_codes(findings))
+
+    def test_dedupe_command_recomputes_hash_codes_of_product(self):
+        findings = self.import_findings("/scans/zap/some_2.9.0.xml", "ZAP Scan", "ZAP Scan command")
+        other_findings = self.import_findings("/scans/zap/some_2.9.0.xml", "ZAP Scan", "ZAP Scan other product")
+        hash_codes = list(findings.values_list('id', 'hash_code'))
+        findings.update(hash_code='outdated')
+        other_findings.update(hash_code='outdated')
+
+        call_command('dedupe', '--hash_code_only', '--product', str(findings[0].test.engagement.product_id))
+
+        self.assertEqual(hash_codes, list(findings.values_list('id', 'hash_code')))
+        self.assertEqual({'outdated'}, set(other_findings.values_list('hash_code', flat=True)))
+
+    def test_compute_hash_codes_query_count_does_not_depend_on_finding_count(self):
+        # benchmark: the hash codes of the findings of a report imported 1 and 10 times are computed in one batch
+        query_counts = []
+        for times in [1, 10]:
+            for filename, scan_type in [("/scans/zap/some_2.9.0.xml", "ZAP Scan"), ("/scans/trivy/scheme_2_many_vulns.json", "Trivy Scan")]:
+                findings = list(self.import_findings(filename, scan_type, f"{scan_type} {times}", times=times))
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    compute_hash_codes(findings)
+                    duration = time.perf_counter() - start
+                logger.info('batch hash_code computation of %i %s findings took %i queries and %.3fs', len(findings), scan_type, len(queries), duration)
+                query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[:2], query_counts[2:])
@@ -1851,3 +1851,9 @@ class ImportReimportTestUI(DojoAPITestCase, ImportReimportMixin):
 # - Endpoints that are no longer present in the scan that is imported, are still retained by DD, which makes them look "active" in the product view
 # - Maybe test severity threshold?
 # - Not sure,but I doubt the Endpoint_Status objects are created at all during import/reimport? Or are those not needed?
+
+
+@override_settings(BULK_FINDING_IMPORT=True)
+class ImportReimportTestAPIBulkImport(ImportReimportTestAPI):
+    # runs all import/reimport tests with new findings of an import being bulk created
+    pass
@@ -1,18 +1,29 @@
 from unittest.mock import patch
+import copy
 import uuid
+from crum import impersonate
 from .dojo_test_case import DojoTestCase, get_unit_tests_path
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
+from dojo.celery import app
 from dojo.importers.importer.importer import DojoDefaultImporter as Importer
-from dojo.models import Development_Environment, Engagement, Finding, Product, Product_Type, Test, User
+from dojo.importers.reimporter.reimporter import DojoDefaultReImporter as ReImporter
+from dojo.models import Development_Environment, Endpoint, Engagement, Finding, Product, Product_Type, System_Settings, Test, User
 from dojo.tools.factory import get_parser
 from dojo.tools.sarif.parser import SarifParser
 from dojo.tools.gitlab_sast.parser import GitlabSastParser
 from .dojo_test_case import DojoAPITestCase
 from .test_utils import assertImportModelsCreated
 import logging
-from dojo.importers.utils import handle_vulnerability_ids
+from dojo.importers.utils import EndpointResolver, handle_vulnerability_ids, iter_chunks, parse_findings
+from dojo.endpoint.utils import endpoint_get_or_create
+from dojo.importers.reimporter.utils import ExistingFindingsIndex, match_new_finding_to_existing_finding
 
 from dojo.utils import get_object_or_none
 
@@ -158,6 +169,120 @@ class TestDojoDefaultImporter(DojoTestCase):
         self.assertEqual(0, len_closed_findings)
 
 
+class TestDojoDefaultImporterBulk(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def run(self, result=None):
+        testuser = User.objects.get(username='admin')
+        testuser.usercontactinfo.block_execution = True
+        testuser.save()
+
+        # run under a user with block_execution so the post processing (dedupe) happens in the foreground
+        with impersonate(testuser):
+            super().run(result)
+
+    def setUp(self):
+        system_settings = System_Settings.objects.get()
+        system_settings.enable_deduplication = True
+        system_settings.save()
+
+    def import_findings(self, filename, scan_type, product_name):
+        user = User.objects.get(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="test bulk")
+        product, _ = Product.objects.get_or_create(name=product_name, prod_type=product_type)
+        engagement, _ = Engagement.objects.get_or_create(
+            name="Test Bulk Engagement",
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        importer = Importer()
+        test = importer.create_test(scan_type, scan_type, engagement, user, environment)
+        with open(get_unit_tests_path() + filename) as scan:
+            parsed_findings = get_parser(scan_type).get_findings(scan, test)
+        # report every finding twice, so the second one becomes a duplicate of the first one
+        parsed_findings += [copy.copy(finding) for finding in parsed_findings]
+        new_findings = importer.process_parsed_findings(test, parsed_findings, scan_type, user, active=True, verified=True, sync=True)
+        return test, len(new_findings)
+
+    def findings_summary(self, test):
+        return [
+            (finding.title, finding.severity, finding.hash_code, finding.active, finding.duplicate, finding.static_finding, finding.dynamic_finding,
+             sorted(str(endpoint) for endpoint in finding.endpoints.all()),
+             sorted(finding.vulnerability_ids),
+             sorted(test_type.name for test_type in finding.found_by.all()))
+            for finding in Finding.objects.filter(test=test).order_by('id')
+        ]
+
+    def test_bulk_import_matches_regular_import(self):
+        for filename, scan_type in [
+            ("/scans/zap/some_2.9.0.xml", "ZAP Scan"),
+            ("/scans/trivy/scheme_2_many_vulns.json", "Trivy Scan"),
+            ("/scans/acunetix/many_findings.xml", "Acunetix Scan"),
+            ("/scans/checkmarx/multiple_findings.xml", "Checkmarx Scan detailed"),
+            ("/scans/semgrep/many_findings.json", "Semgrep JSON Report"),
+            ("/scans/burp/seven_findings.xml", "Burp Scan"),
+        ]:
+            with self.subTest(scan_type=scan_type):
+                # the second import only has duplicates of the findings of the first import
+                test, len_new_findings = self.import_findings(filename, scan_type, f"{scan_type} regular")
+                second_test, _ = self.import_findings(filename, scan_type, f"{scan_type} regular")
+                with override_settings(BULK_FINDING_IMPORT=True):
+                    bulk_test, bulk_len_new_findings = self.import_findings(filename, scan_type, f"{scan_type} bulk")
+                    second_bulk_test, _ = self.import_findings(filename, scan_type, f"{scan_type} bulk")
+
+                self.assertEqual(len_new_findings, bulk_len_new_findings)
+                summary = self.findings_summary(test)
+                self.assertEqual(len_new_findings / 2, len([finding for finding in summary if finding[4]]))
+                self.assertEqual(summary, self.findings_summary(bulk_test))
+                self.assertEqual(self.findings_summary(second_test), self.findings_summary(second_bulk_test))
+
+    def test_bulk_import_query_count(self):
+        with CaptureQueriesContext(connection) as regular_queries:
+            self.import_findings("/scans/trivy/scheme_2_many_vulns.json", "Trivy Scan", "regular")
+        with override_settings(BULK_FINDING_IMPORT=True), CaptureQueriesContext(connection) as bulk_queries:
+            self.import_findings("/scans/trivy/scheme_2_many_vulns.json", "Trivy Scan", "bulk")
+        self.assertLess(len(bulk_queries), len(regular_queries))
+
+
+class TestDojoDefaultImporterAsync(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def import_and_reimport(self, product_name):
+        user = User.objects.get(username="admin")
+        product_type, _ = Product_Type.objects.get_or_create(name="test async")
+        product, _ = Product.objects.get_or_create(name=product_name, prod_type=product_type)
+        engagement, _ = Engagement.objects.get_or_create(
+            name="Test Async Engagement",
+            product=product,
+            target_start=timezone.now(),
+            target_end=timezone.now(),
+        )
+        environment, _ = Development_Environment.objects.get_or_create(name="Development")
+        with open(get_unit_tests_path() + "/scans/zap/0_zap_sample.xml") as scan:
+            test, len_new_findings, _, _ = Importer().import_scan(scan, "ZAP Scan", engagement, lead=None, environment=environment,
+                        active=True, verified=True, tags=None, minimum_severity=None, user=user, endpoints_to_add=None,
+                        scan_date=None, version=None, branch_tag=None, build_id=None, commit_hash=None, push_to_jira=None,
+                        close_old_findings=False, group_by=None, api_scan_configuration=None)
+        with open(get_unit_tests_path() + "/scans/zap/1_zap_sample_0_and_new_absent.xml") as scan:
+            _, _, *reimport_counts, _ = ReImporter().reimport_scan(scan, "ZAP Scan", test, active=True, verified=True, user=user)
+        return [len_new_findings] + reimport_counts, list(test.finding_set.order_by('id').values_list('title', 'active', 'is_mitigated'))
+
+    def test_async_import_matches_sync_import(self):
+        sync_result = self.import_and_reimport("Sync")
+
+        # the chunk tasks run eagerly, their results are finding ids that are reloaded by the coordinator
+        app.conf.task_always_eager = True
+        try:
+            with override_settings(ASYNC_FINDING_IMPORT=True, ASYNC_FINDING_IMPORT_CHUNK_SIZE=2):
+                async_result = self.import_and_reimport("Async")
+        finally:
+            app.conf.task_always_eager = False
+
+        self.assertEqual(sync_result, async_result)
+
+
 class FlexibleImportTestAPI(DojoAPITestCase):
     def __init__(self, *args, **kwargs):
         # TODO remove __init__ if it does nothing...
@@ -596,3 +721,129 @@ class TestImporterUtils(DojoAPITestCase):
         handle_vulnerability_ids(finding)
 
         mock.assert_not_called()
+
+    def test_iter_chunks(self):
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6]], list(iter_chunks(iter(range(7)), 3)))
+        self.assertEqual([], list(iter_chunks(iter([]), 3)))
+
+    def test_parse_findings_iter_findings(self):
+        for filename, scan_type in [
+            ("scans/zap/some_2.9.0.xml", "ZAP Scan"),
+            ("scans/burp/seven_findings.xml", "Burp Scan"),
+            ("scans/dependency_check/multiple_vulnerabilities_has_multiple_findings.xml", "Dependency Check Scan"),
+            ("scans/trivy/scheme_2_many_vulns.json", "Trivy Scan"),
+            ("scans/sarif/appendix_k.sarif", "SARIF"),
+            ("scans/cyclonedx/spec1.xml", "CycloneDX Scan"),
+            ("scans/cyclonedx/log4j.json", "CycloneDX Scan"),
+        ]:
+            with self.subTest(filename=filename):
+                parser = get_parser(scan_type)
+                with open(get_unit_tests_path() + "/" + filename) as scan:
+                    findings = parser.get_findings(scan, Test())
+                with open(get_unit_tests_path() + "/" + filename) as scan:
+                    parsed_findings = parse_findings(parser, scan, Test())
+                    # the findings are produced while the report is being read
+                    self.assertNotIsInstance(parsed_findings, list)
+                    parsed_findings = list(parsed_findings)
+                self.assertEqual([(finding.title, finding.severity, finding.description) for finding in findings],
+                                 [(finding.title, finding.severity, finding.description) for finding in parsed_findings])
+
+    def test_parse_findings_invalid_report(self):
+        class Parser:
+            def iter_findings(self, scan, test):
+                yield Finding(title='first finding')
+                raise ValueError('invalid report')
+
+        parsed_findings = parse_findings(Parser(), None, Test())
+        self.assertEqual('first finding', next(parsed_findings).title)
+        with self.assertRaisesRegex(ValidationError, 'invalid report'):
+            next(parsed_findings)
+
+        class EmptyParser:
+            def iter_findings(self, scan, test):
+                raise ValueError('invalid report')
+                yield
+
+        with self.assertRaises(ValidationError):
+            parse_findings(EmptyParser(), None, Test())
+
+
+class TestReimporterUtils(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def test_existing_findings_index_matches_query(self):
+        for test in Test.objects.filter(finding__isnull=False).distinct():
+            findings = list(test.finding_set.all())
+            for deduplication_algorithm in ['hash_code', 'unique_id_from_tool', 'unique_id_from_tool_or_hash_code', 'legacy']:
+                existing_findings = ExistingFindingsIndex(findings, deduplication_algorithm)
+                for finding in findings:
+                    with self.subTest(test=test.id, finding=finding.id, deduplication_algorithm=deduplication_algorithm):
+                        self.assertEqual(
+                            list(match_new_finding_to_existing_finding(finding, test, deduplication_algorithm)),
+                            existing_findings.match(finding))
+
+    def test_existing_findings_index_loads_matched_findings(self):
+        new_finding = Finding.objects.filter(hash_code__isnull=False).first()
+        existing_findings = ExistingFindingsIndex.for_test(new_finding.test, 'hash_code')
+        self.assertEqual(set(new_finding.test.finding_set.values_list('id', flat=True)), existing_findings.finding_ids())
+        matched = existing_findings.match(new_finding)[0]
+        self.assertTrue(matched.get_deferred_fields())
+        with self.assertNumQueries(1):
+            finding = existing_findings.load(matched)
+        self.assertFalse(finding.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertIs(finding, existing_findings.load(matched))
+
+        # the findings to mitigate are the findings from before the reimport
+        finding.active = not finding.active
+        original_findings = existing_findings.get_original_findings(existing_findings.finding_ids())
+        self.assertEqual(sorted(existing_findings.finding_ids()), [original.id for original in original_findings])
+        self.assertEqual(Finding.objects.get(id=finding.id).active, [original for original in original_findings if original.id == finding.id][0].active)
+
+
+class TestEndpointResolver(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        cache.clear()
+
+    def get_endpoints(self):
+        return [Endpoint.from_uri(uri) for uri in [
+            "https://example.com/path",
+            "HTTPS://EXAMPLE.COM:443/path",
+            "https://example.com:8443/path",
+            "https://user@example.com/path?query=1#fragment",
+            "http://example.com",
+            "http://example.com:80",
+            "ftp://Example.com/path",
+        ]]
+
+    def test_resolver_matches_endpoint_get_or_create(self):
+        product = Product.objects.get(id=1)
+        expected = []
+        for endpoint in self.get_endpoints():
+            endpoint.clean()
+            ep, _ = endpoint_get_or_create(protocol=endpoint.protocol, userinfo=endpoint.userinfo, host=endpoint.host, port=endpoint.port,
+                                           path=endpoint.path, query=endpoint.query, fragment=endpoint.fragment, product=product)
+            expected.append(ep.id)
+
+        endpoints = EndpointResolver(product).get_or_create(self.get_endpoints())
+        self.assertEqual(expected, [ep.id for ep in endpoints])
+
+    def test_resolver_query_count(self):
+        product = Product.objects.get(id=1)
+        endpoint_count = Endpoint.objects.filter(product=product).count()
+        resolver = EndpointResolver(product)
+        with self.assertNumQueries(3):
+            # lookup of the existing endpoints, bulk insert of the missing ones, tag inheritance setting of the product
+            endpoints = resolver.get_or_create(self.get_endpoints() * 10)
+        self.assertEqual(endpoint_count + 5, Endpoint.objects.filter(product=product).count())
+        self.assertEqual(5, len({ep.id for ep in endpoints}))
+
+        # memoized by the resolver
+        with self.assertNumQueries(0):
+            self.assertEqual(endpoints, resolver.get_or_create(self.get_endpoints() * 10))
+
+        # memoized in the cache for the other chunks of the import
+        with self.assertNumQueries(1):
+            self.assertEqual([ep.id for ep in endpoints], [ep.id for ep in EndpointResolver(product).get_or_create(self.get_endpoints() * 10)])
@@ -0,0 +1,315 @@
+from datetime import date, datetime
+from unittest.mock import patch
+
+from dateutil.relativedelta import relativedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from dojo.metrics import views
+from dojo.metrics.rollup import defer_finding_counts, get_upsert_options, mark_findings_dirty, rebuild_finding_counts, refresh_finding_counts
+from dojo.models import Endpoint_Status, Engagement, Finding, Finding_Daily_Count, Product, Product_Type, Test, User
+from dojo.utils import opened_in_period
+from .dojo_test_case import DojoTestCase
+
+
+class MockMessages:
+    def add(*args, **kwargs):
+        pass
+
+
+def get_period_details_per_finding(findings):
+    """
+    The details as they were counted before the counts were grouped in the database, finding by finding
+    """
+    period_counts = {"Critical": 0, "High": 0, "Medium": 0, "Low": 0, "Info": 0, "Total": 0}
+    period_details = {}
+    age_detail = [0, 0, 0, 0]
+    for finding in findings:
+        age = finding.age
+        if 0 <= age <= 30:
+            age_detail[0] += 1
+        elif 30 < age <= 60:
+            age_detail[1] += 1
+        elif 60 < age <= 90:
+            age_detail[2] += 1
+        elif age > 90:
+            age_detail[3] += 1
+        product = finding.test.engagement.product
+        period_counts[finding.severity] += 1
+        period_counts['Total'] += 1
+        details = period_details.setdefault(product.name, {
+            'path': reverse('product_open_findings', args=(product.id,)),
+            'Critical': 0, 'High': 0, 'Medium': 0, 'Low': 0, 'Info': 0, 'Total': 0})
+        details[finding.severity] += 1
+        details['Total'] += 1
+    return period_counts, period_details, age_detail
+
+
+class TestFindingDailyCounts(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        # the fixture is loaded without signals
+        rebuild_finding_counts()
+
+    def get_counts(self):
+        return sorted(Finding_Daily_Count.objects.values_list('product', 'date', 'severity', 'status', 'count'))
+
+    def get_rebuilt_counts(self):
+        counts = self.get_counts()
+        rebuild_finding_counts()
+        return counts, self.get_counts()
+
+    def test_rebuild_counts_findings(self):
+        expected = {}
+        for finding in Finding.objects.select_related('test__engagement'):
+            key = (finding.test.engagement.product_id, finding.date, finding.severity)
+            statuses = []
+            if finding.verified:
+                statuses.append(Finding_Daily_Count.OPENED)
+            if finding.verified and not finding.false_p and not finding.duplicate and not finding.out_of_scope and finding.mitigated is None:
+                statuses.append(Finding_Daily_Count.ACTIVE)
+            if finding.risk_accepted:
+                statuses.append(Finding_Daily_Count.ACCEPTED)
+            for status in statuses:
+                expected[key + (status,)] = expected.get(key + (status,), 0) + 1
+            if finding.mitigated:
+                key = (finding.test.engagement.product_id, timezone.localtime(finding.mitigated).date(), finding.severity, Finding_Daily_Count.CLOSED)
+                expected[key] = expected.get(key, 0) + 1
+
+        self.assertTrue(expected)
+        self.assertEqual(sorted(key + (count,) for key, count in expected.items()), self.get_counts())
+
+    def test_counts_follow_finding_changes(self):
+        finding = Finding.objects.filter(verified=True, mitigated__isnull=True).first()
+        finding.mitigated = timezone.now()
+        finding.is_mitigated = True
+        finding.save()
+        self.assertEqual(*self.get_rebuilt_counts())
+
+        finding.date = date(2021, 3, 4)
+        finding.severity = 'Critical'
+        finding.save()
+        self.assertEqual(*self.get_rebuilt_counts())
+
+        finding.delete()
+        self.assertEqual(*self.get_rebuilt_counts())
+
+        finding = Finding.objects.filter(verified=True).first()
+        new_finding = Finding.objects.create(test=finding.test, title='new finding', severity='High', verified=True, reporter=finding.reporter)
+        self.assertEqual(*self.get_rebuilt_counts())
+
+        with defer_finding_counts():
+            new_finding.false_p = True
+            new_finding.save()
+            Finding.objects.filter(id=finding.id).update(risk_accepted=True, date=date(2021, 3, 4))
+            mark_findings_dirty(Finding.objects.filter(id=finding.id))
+            mark_findings_dirty([Finding(test=finding.test, date=finding.date)])
+        self.assertEqual(*self.get_rebuilt_counts())
+
+    def test_counts_are_upserted(self):
+        # the rows inserted by a concurrent refresh of the same days are updated
+        counts = self.get_counts()
+        stale = [Finding_Daily_Count(product_id=product, date=day, severity=severity, status=status, count=count + 10)
+                 for product, day, severity, status, count in counts]
+        Finding_Daily_Count.objects.bulk_create(stale, **get_upsert_options())
+        self.assertEqual([count[:4] + (count[4] + 10, ) for count in counts], self.get_counts())
+        Finding_Daily_Count.objects.bulk_create(stale, **get_upsert_options())
+        self.assertEqual(len(counts), Finding_Daily_Count.objects.count())
+
+    @patch('dojo.metrics.rollup.refresh_finding_counts', wraps=refresh_finding_counts)
+    def test_counts_are_changed_by_deltas(self, mock_refresh):
+        finding = Finding.objects.filter(verified=True, mitigated__isnull=True).first()
+        finding.false_p = True
+        finding.active = False
+        finding.save_no_options()
+        self.assertEqual(*self.get_rebuilt_counts())
+
+        new_finding = Finding.objects.create(test=finding.test, title='new finding', severity='Low', verified=True,
+                                             reporter=finding.reporter, date=date(2021, 3, 4))
+        self.assertEqual(*self.get_rebuilt_counts())
+        new_finding.delete()
+        self.assertEqual(*self.get_rebuilt_counts())
+        mock_refresh.assert_not_called()
+
+        # rows out of sync with the findings are recounted
+        new_finding = Finding.objects.create(test=finding.test, title='new finding', severity='Low', verified=True,
+                                             reporter=finding.reporter, date=date(2021, 3, 4))
+        Finding_Daily_Count.objects.filter(date=date(2021, 3, 4)).delete()
+        new_finding.verified = False
+        new_finding.save_no_options()
+        mock_refresh.assert_called_once()
+        self.assertEqual(*self.get_rebuilt_counts())
+
+    @patch('dojo.metrics.rollup.refresh_finding_counts', wraps=refresh_finding_counts)
+    def test_cascade_deletes(self, mock_refresh):
+        test = Test.objects.filter(engagement__product=2, finding__isnull=False).first()
+        self.assertGreater(test.finding_set.count(), 1)
+        test.delete()
+        self.assertEqual(*self.get_rebuilt_counts())
+
+        engagement = Engagement.objects.filter(product=2, test__finding__isnull=False).first()
+        engagement.delete()
+        self.assertEqual(*self.get_rebuilt_counts())
+
+        # the counts of a deleted product are deleted with it
+        Product.objects.get(id=2).delete()
+        self.assertFalse(Finding_Daily_Count.objects.filter(product=2).exists())
+        self.assertEqual(*self.get_rebuilt_counts())
+        mock_refresh.assert_not_called()
+
+    def test_rebuild_command(self):
+        counts = self.get_counts()
+        Finding_Daily_Count.objects.all().delete()
+        call_command('rebuild_finding_counts', '--product', '2', '--product', '3')
+        self.assertEqual([count for count in counts if count[0] in (2, 3)], self.get_counts())
+        call_command('rebuild_finding_counts')
+        self.assertEqual(counts, self.get_counts())
+
+    def test_opened_in_period(self):
+        for product_type in Product_Type.objects.all():
+            for start_date, end_date in [(datetime(2017, 12, 1), datetime(2017, 12, 31)), (datetime(2020, 1, 1), datetime(2023, 1, 1))]:
+                start = timezone.make_aware(start_date)
+                end = timezone.make_aware(end_date)
+                open_findings = Finding.objects.filter(test__engagement__product__prod_type=product_type, verified=True, false_p=False, duplicate=False,
+                                                       out_of_scope=False, mitigated__isnull=True, severity__in=('Critical', 'High', 'Medium', 'Low'))
+                opened = open_findings.filter(date__range=[start, end])
+                closed = Finding.objects.filter(test__engagement__product__prod_type=product_type, mitigated__date__range=[start, end],
+                                                severity__in=('Critical', 'High', 'Medium', 'Low'))
+                oip = opened_in_period(start_date, end_date, product_type)
+                # numerical_severity is derived from the severity on save, the fixture does not always match
+                for severity in ['Critical', 'High', 'Medium', 'Low']:
+                    self.assertEqual(opened.filter(severity=severity).count(), oip[Finding.get_numerical_severity(severity)])
+                self.assertEqual(opened.count() or None, oip['Total'])
+                self.assertEqual(closed.count() or None, oip['closed'])
+                self.assertEqual(open_findings.filter(date__lte=end.date()).count(), oip['to_date_total'])
+
+    def test_metrics_details_from_counts(self):
+        request = RequestFactory().get(reverse('metrics'), {'date': 7})
+        request.user = User.objects.get(username='admin')
+        request._messages = MockMessages()
+        prod_type = Product_Type.objects.all()
+        self.assertTrue(views.use_finding_counts(request, 'Finding'))
+
+        filters = views.finding_querys(prod_type, request)
+        details = views.get_finding_details_from_counts(request, prod_type, filters)
+
+        in_period_counts, in_period_details, age_detail = views.get_in_period_details(views.queryset_check(filters['all']))
+        self.assertNotEqual(0, in_period_counts['Total'])
+        self.assertEqual(in_period_counts, details['in_period_counts'])
+        self.assertEqual(in_period_details, details['in_period_details'])
+        self.assertEqual(age_detail, details['age_detail'])
+        self.assertEqual(views.get_accepted_in_period_details(filters['accepted']), details['accepted_in_period_details'])
+        closed_in_period_counts, closed_in_period_details = views.get_closed_in_period_details(filters['closed'])
+        self.assertEqual(closed_in_period_counts, details['closed_in_period_counts'])
+        self.assertEqual(closed_in_period_details, details['closed_in_period_details'])
+
+        request = RequestFactory().get(reverse('metrics'), {'date': 7, 'title': 'test'})
+        self.assertFalse(views.use_finding_counts(request, 'Finding'))
+
+    def test_period_details(self):
+        Finding.objects.filter(id__in=[2, 3]).update(mitigated=timezone.now(), date=date(2020, 1, 1))
+        Finding.objects.filter(id=4).update(date=date(2021, 1, 1))
+        findings = Finding.objects.filter(severity__in=('Critical', 'High', 'Medium', 'Low', 'Info'))
+        expected = get_period_details_per_finding(findings)
+        self.assertNotEqual(0, expected[2][3])
+        self.assertEqual(expected, views.get_in_period_details(findings))
+
+        # endpoint statuses are counted by their findings
+        statuses = Endpoint_Status.objects.filter(finding__severity__in=('Critical', 'High', 'Medium', 'Low', 'Info'))
+        self.assertTrue(statuses)
+        self.assertEqual(get_period_details_per_finding([status.finding for status in statuses]),
+                         views.get_in_period_details(statuses, 'finding__'))
+
+        # the number of queries does not depend on the number of findings
+        with self.assertNumQueries(3):
+            views.get_in_period_details(findings)
+        with self.assertNumQueries(1):
+            views.get_closed_in_period_details(findings)
+
+        self.client.force_login(User.objects.get(username='admin'))
+        for parameters in ({'view': 'Endpoint'}, {'title': 'test'}):
+            response = self.client.get(reverse('metrics'), parameters)
+            self.assertEqual(200, response.status_code)
+
+    def test_product_type_counts(self):
+        year = timezone.now().year - 1
+        finding = Finding.objects.filter(test__engagement__product__prod_type=1).first()
+        Finding.objects.create(test=finding.test, title='new finding', severity='High', verified=True, reporter=finding.reporter, date=date(year, 5, 3))
+
+        self.client.force_login(User.objects.get(username='admin'))
+        response = self.client.get(reverse('product_type_counts'), {'month': 5, 'year': year, 'product_type': 1})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(opened_in_period(datetime(year, 5, 1), datetime(year, 5, 31), Product_Type.objects.get(id=1)), response.context['opened_in_period'])
+        self.assertEqual(1, response.context['opened_in_period']['S1'])
+        self.assertEqual(13, len(response.context['trending_opened']))
+        self.assertEqual(response.context['opened_in_period']['to_date_total'], response.context['overall_in_pt']['Total'])
+
+    def add_findings(self, year, **kwargs):
+        finding = Finding.objects.filter(**kwargs).first()
+        for month, severity in [(1, 'Critical'), (3, 'High'), (5, 'High'), (5, 'Low'), (12, 'Medium')]:
+            Finding.objects.create(test=finding.test, title='new finding', severity=severity, verified=True, reporter=finding.reporter,
+                                   date=date(year, month, 3))
+        Finding.objects.create(test=finding.test, title='closed finding', severity='Critical', verified=True, reporter=finding.reporter,
+                               date=date(year - 2, 2, 3), mitigated=timezone.make_aware(datetime(year, 5, 10)), is_mitigated=True, active=False)
+
+    def test_product_type_counts_in_constant_queries(self):
+        year = timezone.now().year - 1
+        self.client.force_login(User.objects.get(username='admin'))
+        parameters = {'month': 5, 'year': year + 1, 'product_type': 1}
+        # an open finding, so the list of open findings is not empty
+        finding = Finding.objects.filter(test__engagement__product__prod_type=1).first()
+        Finding.objects.create(test=finding.test, title='open finding', severity='Low', verified=True, reporter=finding.reporter,
+                               date=date(year - 3, 1, 1))
+        self.client.get(reverse('product_type_counts'), parameters)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('product_type_counts'), parameters)
+
+        self.add_findings(year, test__engagement__product__prod_type=1)
+        with CaptureQueriesContext(connection) as more_queries:
+            response = self.client.get(reverse('product_type_counts'), parameters)
+        self.assertEqual(len(queries), len(more_queries))
+
+        product_type = Product_Type.objects.get(id=1)
+        trending = response.context['trending_opened']
+        self.assertEqual(13, len(trending))
+        for month, counts in enumerate(trending):
+            start = datetime(year, 5, 1) + relativedelta(months=month)
+            end = start + relativedelta(day=31)
+            self.assertEqual(opened_in_period(start, end, product_type), counts)
+        self.assertEqual(1, trending[7]['S2'])
+        self.assertEqual(trending[-1], response.context['opened_in_period'])
+
+        with self.assertNumQueries(2):
+            counts = views.count_in_month(timezone.make_aware(datetime(year, 5, 1)), timezone.make_aware(datetime(year, 5, 31)),
+                                          datetime(year, 5, 31, 23, 59), product__prod_type=product_type)
+        oip, trending, cip, aip = counts
+        findings = Finding.objects.filter(test__engagement__product__prod_type=product_type)
+        self.assertEqual(findings.filter(mitigated__year=year, mitigated__month=5, severity='Critical').count(), cip['S0'])
+        active = findings.filter(verified=True, false_p=False, duplicate=False, out_of_scope=False, mitigated__isnull=True,
+                                 severity__in=('Critical', 'High', 'Medium', 'Low'))
+        self.assertEqual(active.filter(date__lt=date(year, 5, 31), severity='High').count(), aip['S1'])
+        self.assertEqual(active.filter(date__lte=date(year, 5, 31)).count(), aip['Total'])
+        self.assertEqual(oip['to_date_total'], aip['Total'])
+
+    def test_product_counts(self):
+        year = timezone.now().year - 1
+        self.add_findings(year, test__engagement__product=2)
+        self.client.force_login(User.objects.get(username='user1'))
+        response = self.client.get(reverse('product_counts'), {'month': 5, 'year': year, 'product': 2})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, response.context['product'].id)
+        self.assertEqual(1, response.context['opened_in_period']['S1'])
+        self.assertEqual(1, response.context['closed_in_period']['S0'])
+        self.assertEqual(13, len(response.context['trending_opened']))
+        self.assertEqual(1, response.context['trending_opened'][10]['S1'])
+        self.assertContains(response, reverse('view_product_metrics', args=(2, )))
+
+        self.client.force_login(User.objects.get(username='user2'))
+        response = self.client.get(reverse('product_counts'), {'month': 5, 'year': year, 'product': 2})
+        self.assertIsNone(response.context['product'])
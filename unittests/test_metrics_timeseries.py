@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from dojo.metrics.rollup import rebuild_finding_counts
+from dojo.metrics.views import count_simple_metrics
+from dojo.models import Finding, Product, Product_Type, User
+from dojo.utils import get_open_findings_burndown, get_products_punchcard_data, get_punchcard_data
+from .dojo_test_case import DojoTestCase
+
+
+@override_settings(CACHE_SHARED=True)
+class TestMetricsTimeseries(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        cache.clear()
+        self.start_date = timezone.now().date() - relativedelta(weeks=26)
+        self.product = Product.objects.get(id=2)
+        self.finding = Finding.objects.filter(test__engagement__product=self.product, duplicate=False).first()
+
+    def get_punchcard(self, products):
+        return get_products_punchcard_data(products, self.start_date, 26)
+
+    def add_finding(self, **kwargs):
+        finding = Finding.objects.create(**dict({'test': self.finding.test, 'title': 'new finding', 'severity': 'High',
+                                                 'reporter': self.finding.reporter}, **kwargs))
+        # the punchcard ends before the current day
+        Finding.objects.filter(id=finding.id).update(created=timezone.now() - timedelta(days=3))
+        return finding
+
+    def test_punchcard(self):
+        products = Product.objects.all()
+        self.add_finding()
+        punchcard = self.get_punchcard(products)
+        self.assertIsNotNone(punchcard[0])
+        self.assertEqual(get_punchcard_data(Finding.objects.filter(duplicate=False), self.start_date, 26), punchcard)
+
+        # only the products are read
+        with self.assertNumQueries(1):
+            self.assertEqual(punchcard, self.get_punchcard(products))
+
+        # the punchcard changes with a new finding of one of the products
+        self.add_finding()
+        changed = self.get_punchcard(products)
+        self.assertNotEqual(punchcard, changed)
+        self.assertEqual(get_punchcard_data(Finding.objects.filter(duplicate=False), self.start_date, 26), changed)
+
+    def test_punchcard_is_shared_by_scope(self):
+        self.add_finding()
+        self.assertIsNotNone(self.get_punchcard(Product.objects.filter(id__in=[1, 2]))[0])
+        # other products are another scope
+        self.assertEqual((None, None), self.get_punchcard(Product.objects.filter(id=3)))
+        with self.assertNumQueries(1):
+            self.get_punchcard(Product.objects.filter(id__in=[2, 1]))
+
+    def test_charts_are_not_cached_without_a_shared_cache(self):
+        burndown = get_open_findings_burndown(self.product)
+        with override_settings(CACHE_SHARED=False), self.assertNumQueries(2):
+            self.assertEqual(burndown, get_open_findings_burndown(self.product))
+
+    def test_burndown(self):
+        burndown = get_open_findings_burndown(self.product)
+        with self.assertNumQueries(0):
+            self.assertEqual(burndown, get_open_findings_burndown(self.product))
+
+        # active is not counted in the rollup of the findings, but in the burndown
+        Finding.objects.filter(test__engagement__product=self.product).update(date=timezone.now().date() - timedelta(days=100))
+        self.finding.refresh_from_db()
+        self.finding.active = not self.finding.active
+        self.finding.save_no_options()
+        with self.assertNumQueries(2):
+            get_open_findings_burndown(self.product)
+
+    def test_cached_charts_of_all_products_are_invalidated_by_a_rebuild(self):
+        burndown = get_open_findings_burndown(self.product)
+        Finding.objects.filter(test__engagement__product=self.product).update(date=date(2020, 1, 1), active=True, duplicate=False)
+        self.assertEqual(burndown, get_open_findings_burndown(self.product))
+        rebuild_finding_counts()
+        self.assertNotEqual(burndown, get_open_findings_burndown(self.product))
+
+    def test_simple_metrics(self):
+        today = timezone.now()
+        self.add_finding(verified=True, date=today.date())
+        self.add_finding(verified=True, date=today.date(), severity='Info', mitigated=today)
+        product_type = self.product.prod_type
+        findings = Finding.objects.filter(test__engagement__product__prod_type=product_type, verified=True, false_p=False,
+                                          duplicate=False, out_of_scope=False, date__month=today.month, date__year=today.year)
+        counts = count_simple_metrics(product_type, today.year, today.month)
+        self.assertEqual(findings.count(), counts['Total'])
+        self.assertEqual(findings.count(), counts['Opened'])
+        self.assertEqual(findings.filter(severity='High').count(), counts['S1'])
+        self.assertEqual(1, counts['S4'])
+        self.assertEqual(len([finding for finding in findings if finding.mitigated and finding.mitigated.month == today.month]), counts['Closed'])
+
+        self.client.force_login(User.objects.get(username='admin'))
+        response = self.client.get(reverse('simple_metrics'))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(counts, response.context['findings'][product_type])
+        self.assertEqual(Product_Type.objects.count(), len(response.context['findings']))
+
+        # other users see the counts of their product types
+        self.client.force_login(User.objects.get(username='user1'))
+        response = self.client.get(reverse('simple_metrics'))
+        self.assertTrue(response.context['findings'])
+        for product_type, product_type_counts in response.context['findings'].items():
+            self.assertEqual(count_simple_metrics(product_type, today.year, today.month), product_type_counts)
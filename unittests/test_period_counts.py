@@ -0,0 +1,221 @@
+import calendar as tcalendar
+import logging
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta, MO
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from dojo.models import Endpoint_Status, Finding, Risk_Acceptance, User
+from dojo.utils import get_period_counts
+from .dojo_test_case import DojoTestCase
+
+logger = logging.getLogger(__name__)
+
+
+def get_period_counts_per_period(findings,
+                                 findings_closed,
+                                 accepted_findings,
+                                 period_interval,
+                                 start_date,
+                                 relative_delta='months'):
+    # implementation of get_period_counts before the counts were grouped by the database, with queries per period
+
+    tz = timezone.get_current_timezone()
+
+    start_date = datetime(start_date.year, start_date.month, start_date.day, tzinfo=tz)
+
+    opened_in_period = list()
+    active_in_period = list()
+    accepted_in_period = list()
+    opened_in_period.append(
+        ['Timestamp', 'Date', 'S0', 'S1', 'S2', 'S3', 'Total', 'Closed'])
+    active_in_period.append(
+        ['Timestamp', 'Date', 'S0', 'S1', 'S2', 'S3', 'Total', 'Closed'])
+    accepted_in_period.append(
+        ['Timestamp', 'Date', 'S0', 'S1', 'S2', 'S3', 'Total', 'Closed'])
+
+    for x in range(-1, period_interval):
+        if relative_delta == 'months':
+            # make interval the first through last of month
+            end_date = (start_date + relativedelta(months=x)) + relativedelta(
+                day=1, months=+1, days=-1)
+            new_date = (
+                start_date + relativedelta(months=x)) + relativedelta(day=1)
+        else:
+            # week starts the monday before
+            new_date = start_date + relativedelta(weeks=x, weekday=MO(1))
+            end_date = new_date + relativedelta(weeks=1, weekday=MO(1))
+
+        try:
+            closed_in_range_count = findings_closed.filter(
+                mitigated__date__range=[new_date, end_date]).count()
+        except:
+            closed_in_range_count = findings_closed.filter(
+                mitigated_time__range=[new_date, end_date]).count()
+
+        if accepted_findings:
+            date_range = [
+                datetime(new_date.year, new_date.month, new_date.day, tzinfo=tz),
+                datetime(end_date.year, end_date.month, end_date.day, tzinfo=tz)
+            ]
+            try:
+                risks_a = accepted_findings.filter(risk_acceptance__created__date__range=date_range)
+            except:
+                risks_a = accepted_findings.filter(date__range=date_range)
+        else:
+            risks_a = None
+
+        f_crit_count, f_high_count, f_med_count, f_low_count, f_closed_count = [
+            0, 0, 0, 0, 0
+        ]
+        ra_crit_count, ra_high_count, ra_med_count, ra_low_count, ra_closed_count = [
+            0, 0, 0, 0, 0
+        ]
+        active_crit_count, active_high_count, active_med_count, active_low_count, active_closed_count = [
+            0, 0, 0, 0, 0
+        ]
+
+        for finding in findings:
+            try:
+                severity = finding.severity
+                active = finding.active
+#                risk_accepted = finding.risk_accepted TODO: in future release
+            except:
+                severity = finding.finding.severity
+                active = finding.finding.active
+#                risk_accepted = finding.finding.risk_accepted
+
+            try:
+                f_time = datetime.combine(finding.date, datetime.min.time()).replace(tzinfo=tz)
+            except:
+                f_time = finding.date
+
+            if f_time <= end_date:
+                if severity == 'Critical':
+                    if new_date <= f_time:
+                        f_crit_count += 1
+                    if active:
+                        active_crit_count += 1
+                elif severity == 'High':
+                    if new_date <= f_time:
+                        f_high_count += 1
+                    if active:
+                        active_high_count += 1
+                elif severity == 'Medium':
+                    if new_date <= f_time:
+                        f_med_count += 1
+                    if active:
+                        active_med_count += 1
+                elif severity == 'Low':
+                    if new_date <= f_time:
+                        f_low_count += 1
+                    if active:
+                        active_low_count += 1
+
+        if risks_a is not None:
+            for finding in risks_a:
+                try:
+                    severity = finding.severity
+                except:
+                    severity = finding.finding.severity
+                if severity == 'Critical':
+                    ra_crit_count += 1
+                elif severity == 'High':
+                    ra_high_count += 1
+                elif severity == 'Medium':
+                    ra_med_count += 1
+                elif severity == 'Low':
+                    ra_low_count += 1
+
+        total = f_crit_count + f_high_count + f_med_count + f_low_count
+        opened_in_period.append(
+            [(tcalendar.timegm(new_date.timetuple()) * 1000), new_date,
+             f_crit_count, f_high_count, f_med_count, f_low_count, total,
+             closed_in_range_count])
+
+        total = ra_crit_count + ra_high_count + ra_med_count + ra_low_count
+        accepted_in_period.append(
+            [(tcalendar.timegm(new_date.timetuple()) * 1000), new_date,
+             ra_crit_count, ra_high_count, ra_med_count, ra_low_count, total])
+
+        total = active_crit_count + active_high_count + active_med_count + active_low_count
+        active_in_period.append(
+            [(tcalendar.timegm(new_date.timetuple()) * 1000), new_date,
+             active_crit_count, active_high_count, active_med_count, active_low_count, total])
+
+    return {
+        'opened_per_period': opened_in_period,
+        'accepted_per_period': accepted_in_period,
+        'active_per_period': active_in_period
+    }
+
+
+class TestGetPeriodCounts(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        tz = timezone.get_current_timezone()
+        findings = list(Finding.objects.order_by('id'))
+        # findings opened and closed on mondays, the boundaries of the weeks
+        for index, finding in enumerate(findings[:12]):
+            finding.date = datetime(2020, 5, 4).date() + timedelta(days=7 * (index % 4))
+            finding.severity = ['Critical', 'High', 'Medium', 'Low'][index % 4]
+            finding.active = index % 3 != 0
+            finding.save()
+        for index, finding in enumerate(findings[4:10]):
+            Finding.objects.filter(id=finding.id).update(mitigated=datetime(2020, 5, 11, tzinfo=tz) + timedelta(days=index * 5, hours=index))
+        admin = User.objects.get(username='admin')
+        for index, finding in enumerate(findings[2:8]):
+            risk_acceptance = Risk_Acceptance.objects.create(name='accepted %i' % index, owner=admin)
+            risk_acceptance.accepted_findings.add(finding)
+            Risk_Acceptance.objects.filter(id=risk_acceptance.id).update(created=datetime(2020, 5, 1, tzinfo=tz) + timedelta(days=index * 6))
+        Finding.objects.filter(status_finding__isnull=False).update(active=True, severity='High')
+        for index, endpoint_status in enumerate(Endpoint_Status.objects.order_by('id')):
+            Endpoint_Status.objects.filter(id=endpoint_status.id).update(
+                date=datetime(2020, 5, 4).date() + timedelta(days=7 * index),
+                mitigated=index % 2 == 0, mitigated_time=datetime(2020, 5, 18, tzinfo=tz) + timedelta(days=index * 3),
+                risk_accepted=index % 3 == 0)
+
+    def get_querysets(self):
+        yield Finding.objects.all(), Finding.objects.filter(mitigated__isnull=False), Finding.objects.filter(risk_accepted=True)
+        yield Finding.objects.all(), Finding.objects.filter(mitigated__isnull=False), Finding.objects.filter(risk_acceptance__isnull=False)
+        yield Finding.objects.all(), Finding.objects.none(), None
+        yield Endpoint_Status.objects.all(), Endpoint_Status.objects.filter(mitigated=True), Endpoint_Status.objects.filter(risk_accepted=True)
+
+    def test_get_period_counts_matches_counts_per_period(self):
+        tz = timezone.get_current_timezone()
+        counted = set()
+        for findings, findings_closed, accepted_findings in self.get_querysets():
+            for start_date, period_interval, relative_delta in [
+                (datetime(2020, 4, 15, tzinfo=tz), 4, 'months'),
+                (datetime(2020, 4, 29, tzinfo=tz), 10, 'weeks'),
+                (datetime(2017, 12, 1, tzinfo=tz), 60, 'months'),
+                (datetime(2020, 5, 11, tzinfo=tz), 1, 'weeks'),
+            ]:
+                with self.subTest(model=findings.model, relative_delta=relative_delta, start_date=start_date):
+                    expected = get_period_counts_per_period(findings, findings_closed, accepted_findings, period_interval, start_date, relative_delta=relative_delta)
+                    counts = get_period_counts(findings, findings_closed, accepted_findings, period_interval, start_date, relative_delta=relative_delta)
+                    self.assertEqual(expected, counts)
+                    for key, column in [('opened_per_period', 6), ('opened_per_period', 7), ('active_per_period', 6), ('accepted_per_period', 6)]:
+                        if any(row[column] for row in counts[key][1:]):
+                            counted.add((findings.model, key, column))
+
+        # the test data covers all columns
+        self.assertEqual(8, len(counted))
+
+    def test_get_period_counts_query_count_does_not_depend_on_periods(self):
+        # benchmark: the counts of 12 and 104 weeks take the same number of queries, one query for the findings, the closed
+        # findings and the accepted findings each
+        tz = timezone.get_current_timezone()
+        for findings, findings_closed, accepted_findings in self.get_querysets():
+            for period_interval in [12, 104]:
+                with self.subTest(model=findings.model, period_interval=period_interval):
+                    expected_queries = len([queryset for queryset in [findings, findings_closed, accepted_findings] if queryset is not None and queryset.query.is_empty() is False])
+                    with CaptureQueriesContext(connection) as queries:
+                        get_period_counts(findings, findings_closed, accepted_findings, period_interval, datetime(2020, 1, 1, tzinfo=tz), relative_delta='weeks')
+                    with CaptureQueriesContext(connection) as legacy_queries:
+                        get_period_counts_per_period(findings, findings_closed, accepted_findings, period_interval, datetime(2020, 1, 1, tzinfo=tz), relative_delta='weeks')
+                    logger.info('%i weeks of %s took %i queries instead of %i', period_interval, findings.model.__name__, len(queries), len(legacy_queries))
+                    self.assertEqual(expected_queries, len(queries))
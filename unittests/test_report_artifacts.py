@@ -0,0 +1,100 @@
+import os
+
+from django.test import override_settings
+from django.urls import reverse
+
+from dojo.models import Endpoint_Status, Finding, Notes, User
+from dojo.reports.helper import get_export_path
+from .dojo_test_case import DojoTestCase
+
+
+@override_settings(CACHE_SHARED=True)
+class TestReportArtifacts(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='admin')
+        self.client.force_login(self.user)
+        self.directory = get_export_path('')
+        self.existing = set(os.listdir(self.directory)) if os.path.isdir(self.directory) else set()
+
+    def tearDown(self):
+        for name in self.get_artifacts():
+            os.remove(get_export_path(name))
+
+    def get_artifacts(self):
+        return set(os.listdir(self.directory)) - self.existing if os.path.isdir(self.directory) else set()
+
+    def get_report(self, **parameters):
+        return self.client.get(reverse('product_report', args=(2, )), dict({'report_type': 'HTML', 'include_finding_notes': 1}, **parameters),
+                               HTTP_HOST='localhost')
+
+    def get_content(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_report_is_rendered_once(self):
+        response = self.get_report(_generate='')
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(response.streaming)
+        self.assertEqual(1, len(self.get_artifacts()))
+
+        cached = self.get_report(_generate='')
+        self.assertTrue(cached.streaming)
+        self.assertEqual(response.content, self.get_content(cached))
+
+        # other options are another report
+        self.assertFalse(self.get_report(_generate='', include_finding_images=1).streaming)
+        self.assertEqual(2, len(self.get_artifacts()))
+
+    def test_report_is_rendered_again_after_changes(self):
+        finding = Finding.objects.filter(test__engagement__product=2).first()
+        self.get_report(_generate='')
+        self.assertTrue(self.get_report(_generate='').streaming)
+
+        finding.title = 'changed title'
+        finding.save_no_options()
+        self.assertFalse(self.get_report(_generate='').streaming)
+        self.assertTrue(self.get_report(_generate='').streaming)
+
+        # status changes with an update do not send signals
+        Finding.objects.filter(id=finding.id).update(active=not finding.active)
+        self.assertFalse(self.get_report(_generate='').streaming)
+
+        note = Notes.objects.create(entry='a note', author=self.user)
+        finding.notes.add(note)
+        self.assertFalse(self.get_report(_generate='').streaming)
+
+        # changes made without signals, like the bulk changes of other processes
+        Endpoint_Status.objects.filter(finding__test__engagement__product=2).update(mitigated=True)
+        self.assertFalse(self.get_report(_generate='').streaming)
+        Finding.tags.through.objects.create(finding=finding, tagulous_finding_tags=Finding.tags.tag_model.objects.create(name='report'))
+        self.assertFalse(self.get_report(_generate='').streaming)
+
+    def test_report_in_background(self):
+        # run the task in the foreground
+        self.user.usercontactinfo.block_execution = True
+        self.user.usercontactinfo.save()
+
+        response = self.get_report(_background='')
+        self.assertEqual(302, response.status_code)
+        self.assertNotIn('_background', response.url)
+        self.assertEqual(1, len(self.get_artifacts()))
+
+        response = self.get_report(_generate='')
+        self.assertTrue(response.streaming)
+        self.assertIn(b'Product Security Report', self.get_content(response))
+
+    @override_settings(CACHE_SHARED=False)
+    def test_report_is_not_stored_without_a_shared_cache(self):
+        self.assertFalse(self.get_report(_generate='').streaming)
+        self.assertFalse(self.get_report(_generate='').streaming)
+        self.assertEqual(0, len(self.get_artifacts()))
+
+        # a report rendered in the background is handed out by the notification
+        self.user.usercontactinfo.block_execution = True
+        self.user.usercontactinfo.save()
+        self.get_report(_background='')
+        artifacts = self.get_artifacts()
+        self.assertEqual(1, len(artifacts))
+        response = self.client.get(reverse('download_export', args=(artifacts.pop(), )))
+        self.assertIn(b'Product Security Report', self.get_content(response))
@@ -0,0 +1,87 @@
+import json
+
+from crum import impersonate
+from django.test import override_settings
+from django.urls import reverse
+
+from dojo.endpoint.views import get_endpoint_ids
+from dojo.filters import EndpointFilter, ReportFindingFilter
+from dojo.models import Endpoint, Finding, User
+from dojo.reports.helper import get_batches
+from dojo.reports.widgets import EndpointList, FindingList
+from .dojo_test_case import DojoTestCase
+
+
+class TestReportWidgets(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='admin')
+
+    def get_finding_list(self):
+        return FindingList(request=None, findings=ReportFindingFilter({}, queryset=Finding.objects.all()), host='',
+                           user_id=self.user.id)
+
+    def get_endpoint_list(self):
+        endpoints = Endpoint.objects.filter(id__in=get_endpoint_ids(Endpoint.objects.all()))
+        return EndpointList(request=None, endpoints=EndpointFilter({}, queryset=endpoints, user=self.user), host='',
+                            user_id=self.user.id)
+
+    def render(self, widget, method, batch_size):
+        with override_settings(REPORT_CHUNK_SIZE=batch_size):
+            # the fragments only differ from a single fragment in whitespace
+            return ' '.join(getattr(widget, method)().split())
+
+    def test_batches(self):
+        findings = Finding.objects.order_by('id')
+        batches = list(get_batches(findings, 2))
+        self.assertEqual(list(findings), [finding for batch, last in batches for finding in batch])
+        self.assertTrue(all(len(batch) == 2 for batch, last in batches[:-1]))
+        self.assertEqual([False] * (len(batches) - 1) + [True], [last for batch, last in batches])
+        self.assertEqual([([], True)], list(get_batches(Finding.objects.none(), 2)))
+
+    def test_finding_list_in_batches(self):
+        with impersonate(self.user):
+            widget = self.get_finding_list()
+            count = widget.findings.qs.count()
+            self.assertGreater(count, 2)
+            for method in ['get_html', 'get_asciidoc']:
+                with self.subTest(method=method):
+                    self.assertEqual(self.render(widget, method, 1000), self.render(widget, method, 2))
+            html = self.render(widget, 'get_html', 2)
+        self.assertEqual(1, html.count('<div id="finding_list_content">'))
+        self.assertIn('Finding %i - ' % count, html)
+
+    def test_endpoint_list_in_batches(self):
+        with impersonate(self.user):
+            widget = self.get_endpoint_list()
+            self.assertGreater(widget.endpoints.qs.count(), 1)
+            for method in ['get_html', 'get_asciidoc']:
+                with self.subTest(method=method):
+                    self.assertEqual(self.render(widget, method, 1000), self.render(widget, method, 1))
+            html = self.render(widget, 'get_html', 1)
+        self.assertEqual(1, html.count('<div id="endpoint_content">'))
+
+    def test_finding_list_is_rendered_per_batch(self):
+        with impersonate(self.user), override_settings(REPORT_CHUNK_SIZE=2):
+            fragments = self.get_finding_list().iter_html()
+            first = next(fragments)
+            second = next(fragments)
+        self.assertIn('Finding 2 - ', first)
+        self.assertNotIn('Finding 3 - ', first)
+        self.assertIn('Finding 3 - ', second)
+        self.assertNotIn('<div id="finding_list_content">', second)
+
+    def test_custom_report_is_streamed(self):
+        self.client.force_login(self.user)
+        widgets = [{'report-options': [{'name': 'include_finding_notes', 'value': '1'},
+                                       {'name': 'include_finding_images', 'value': '0'},
+                                       {'name': 'report_type', 'value': 'HTML'},
+                                       {'name': 'report_name', 'value': 'Report'}]},
+                   {'finding-list': []}]
+        response = self.client.post(reverse('custom_report'), {'json': json.dumps(widgets)}, HTTP_HOST='localhost')
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('<div id="finding_list_content">', content)
+        self.assertNotIn('<!-- widget ', content)
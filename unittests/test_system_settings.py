@@ -1,5 +1,16 @@
+import threading
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
 from .dojo_test_case import DojoTestCase
-from dojo.models import System_Settings
+from dojo.finding.helper import post_process_finding_save
+from dojo.middleware import System_Settings_Manager, bump_system_settings_version
+from dojo.models import Finding, System_Settings
+from dojo.notifications.helper import create_notification
+from dojo.utils import calculate_grade, get_system_setting
 
 
 class TestSystemSettings(DojoTestCase):
@@ -25,3 +36,71 @@ class TestSystemSettings(DojoTestCase):
         system_settings.save()
         system_settings = System_Settings.objects.get(no_cache=True)
         self.assertEqual(system_settings.enable_jira, True)
+
+
+@override_settings(CACHE_SHARED=True)
+class TestSystemSettingsCache(DojoTestCase):
+    fixtures = ['dojo_testdata.json']
+
+    def setUp(self):
+        cache.clear()
+        # the settings saved by other tests were never committed
+        System_Settings_Manager.clear_cache()
+
+    def get_settings_queries(self, function, *args, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            function(*args, **kwargs)
+        return [query['sql'] for query in context.captured_queries if 'dojo_system_settings' in query['sql']]
+
+    def test_settings_are_kept_in_memory(self):
+        System_Settings.objects.get()
+        with self.assertNumQueries(0):
+            System_Settings.objects.get()
+
+        # the settings were saved by another process
+        bump_system_settings_version()
+        with self.assertNumQueries(1):
+            System_Settings.objects.get()
+
+    @override_settings(CACHE_SHARED=False)
+    def test_settings_are_read_without_a_shared_cache(self):
+        System_Settings.objects.get()
+        with self.assertNumQueries(1):
+            System_Settings.objects.get()
+
+    def test_uncommitted_settings_are_per_thread(self):
+        System_Settings.objects.get().save()
+        self.assertTrue(System_Settings_Manager.is_uncommitted())
+        other_thread = []
+        thread = threading.Thread(target=lambda: other_thread.append(System_Settings_Manager.is_uncommitted()))
+        thread.start()
+        thread.join()
+        self.assertEqual([False], other_thread)
+
+    def test_unsaved_changes_are_not_kept(self):
+        system_settings = System_Settings.objects.get()
+        system_settings.enable_jira = not system_settings.enable_jira
+        self.assertNotEqual(system_settings.enable_jira, System_Settings.objects.get().enable_jira)
+
+    def test_saved_settings_are_loaded_again(self):
+        system_settings = System_Settings.objects.get()
+        system_settings.enable_jira = not system_settings.enable_jira
+        system_settings.save()
+        # the transaction reads its own changes from the database
+        self.assertEqual(system_settings.enable_jira, System_Settings.objects.get().enable_jira)
+
+        System_Settings_Manager.committed()
+        with self.assertNumQueries(1):
+            self.assertEqual(system_settings.enable_jira, System_Settings.objects.get().enable_jira)
+        with self.assertNumQueries(0):
+            System_Settings.objects.get()
+
+    def test_settings_are_not_read_again_by_tasks(self):
+        System_Settings.objects.get()
+        finding = Finding.objects.get(id=2)
+        product = finding.test.engagement.product
+        self.assertEqual([], self.get_settings_queries(finding.save))
+        self.assertEqual([], self.get_settings_queries(post_process_finding_save, finding))
+        self.assertEqual([], self.get_settings_queries(calculate_grade, product))
+        self.assertEqual([], self.get_settings_queries(create_notification, event='other', title='settings'))
+        self.assertEqual([], self.get_settings_queries(get_system_setting, 'enable_jira'))
@@ -5,7 +5,9 @@ from dojo.models import IMPORT_CLOSED_FINDING, IMPORT_CREATED_FINDING, IMPORT_RE
 from contextlib import contextmanager
 from .dojo_test_case import DojoTestCase
 from unittest.mock import patch, Mock
-from dojo.utils import dojo_crypto_encrypt, prepare_for_view, user_post_save
+from dojo.utils import dojo_crypto_encrypt, prepare_for_view, user_post_save, defer_calculate_grade, \
+    get_grade_interpreter, grade_product, schedule_calculate_grade
+from django.core.cache import cache
 from dojo.authorization.roles_permissions import Roles
 import logging
 
@@ -162,6 +164,46 @@ class TestUtils(DojoTestCase):
         save_mock_member.save.assert_not_called()
 
 
+class TestCalculateGrade(DojoTestCase):
+    product_grade = "def grade_product(crit, high, med, low):\n    return 100 - crit * 10 - high * 5\n"
+
+    def setUp(self):
+        cache.clear()
+        self.product = Product(id=1, name='grade')
+
+    def test_grade_product_is_parsed_once(self):
+        get_grade_interpreter.cache_clear()
+        self.assertEqual(85, grade_product(self.product_grade, 1, 1, 0, 0))
+        self.assertEqual(70, grade_product(self.product_grade, 2, 2, 0, 0))
+        self.assertEqual(1, get_grade_interpreter.cache_info().misses)
+
+    def test_grade_product_error(self):
+        self.assertIsNone(grade_product("def grade_product(crit, high, med, low):\n    return 100 / crit\n", 0, 0, 0, 0))
+        self.assertEqual(50, grade_product("def grade_product(crit, high, med, low):\n    return 100 / crit\n", 2, 0, 0, 0))
+
+    @patch('dojo.utils.we_want_async', return_value=False)
+    @patch('dojo.utils.calculate_grade')
+    def test_defer_calculate_grade(self, mock_calculate_grade, mock_we_want_async):
+        with defer_calculate_grade():
+            with defer_calculate_grade():
+                schedule_calculate_grade(self.product)
+            schedule_calculate_grade(self.product)
+            mock_calculate_grade.assert_not_called()
+        mock_calculate_grade.assert_called_once_with(self.product)
+
+    @patch('dojo.utils.we_want_async', return_value=True)
+    @patch('dojo.utils.calculate_grade')
+    def test_schedule_calculate_grade_async(self, mock_calculate_grade, mock_we_want_async):
+        schedule_calculate_grade(self.product)
+        schedule_calculate_grade(self.product)
+        mock_calculate_grade.assert_called_once_with(self.product, countdown=10)
+
+        # the task removes the pending marker when it starts
+        cache.delete('dojo_calculate_grade:1')
+        schedule_calculate_grade(self.product)
+        self.assertEqual(2, mock_calculate_grade.call_count)
+
+
 class assertNumOfModelsCreated():
     def __init__(self, test_case, queryset, num):
         self.test_case = test_case